@@ -0,0 +1,429 @@
+"""vdt 吞吐基准：合成视频 + fake 模型，纯 CPU、可复现（固定随机种子）。
+
+逐项测量（每条结果一行 JSON 写到 stdout；``--out`` 另存带元信息的完整 JSON，供跨提交比对）：
+
+- ``decode``：``OcvDecoder`` 解码合成 mp4 的 fps（各 ``DecodeCfg.backend``，缺依赖则记 skipped）；
+- ``tracker``：``IouTracker`` / ``ReidTracker``（fake 嵌入器）每帧 ``update`` 耗时 vs 每帧目标数；
+- ``associate``：ReID 纯关联 ``associate`` 耗时 vs gallery 规模；
+- ``aggregate``：``aggregate`` 耗时 vs 轨迹数，及 json / jsonl / npz 写出耗时与体积；
+- ``pipeline``：``run_pipeline`` 端到端（合成视频 + fake 检测 + IoU 跟踪，有 / 无 pose
+  各一轮），附 :mod:`jxl.vdt.profile` 阶段报告。pose 轮用真实 ``RtmposeStep``（门控 +
+  预处理 + SimCC 解码 + 坐标回映），仅 ort session 换成 fake。
+
+fake 模型只产出确定性的数组，测到的是 vdt 自身（解码 / 关联 / 聚合 / 序列化）的开销，
+不含任何网络 forward。
+
+用法::
+
+    python benchmarks/bench_vdt.py                         # 全部基准
+    python benchmarks/bench_vdt.py --only tracker,associate --out bench.json
+    python benchmarks/bench_vdt.py --quick                 # 缩小规模（冒烟）
+"""
+
+from __future__ import annotations
+
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Annotated
+from unittest import mock
+
+import numpy as np
+import orjson
+import typer
+from jvi.geo.point2d import Point
+from jvi.geo.rectangle import Rect
+
+from jxl.det.d2d import D2dObject
+from jxl.vdt.profile import StageProfiler, StageStats
+from jxl.vdt.types import (
+    DecodeCfg,
+    DetCfg,
+    FrameResult,
+    IouCfg,
+    Keypoints,
+    PoseCfg,
+    PoseStep,
+    ReidCfg,
+    Tracker,
+    VdtConfig,
+)
+
+app = typer.Typer(add_completion=False)
+
+_BENCHES = ("decode", "tracker", "associate", "aggregate", "pipeline")
+_SEED = 0
+_EMB_DIM = 384  # DINOv2 ViT-S/14 嵌入维度
+_BOX = 0.03  # 合成目标边长（归一化）
+_IMG = (1280, 720)
+
+
+def _emit(results: list[dict[str, object]], rec: dict[str, object]) -> None:
+    results.append(rec)
+    sys.stdout.write(orjson.dumps(rec).decode() + "\n")
+    sys.stdout.flush()
+
+
+def _round(d: dict[str, object]) -> dict[str, object]:
+    return {k: round(v, 4) if isinstance(v, float) else v for k, v in d.items()}
+
+
+def _stats(samples: list[float]) -> dict[str, object]:
+    """秒级样本 → ms 统计（复用 ``StageProfiler`` 的分位数口径）。"""
+    prof = StageProfiler()
+    for s in samples:
+        prof.add("x", s)
+    st: StageStats = prof.report(1.0).stages["x"]
+    return _round({k: v for k, v in st.model_dump().items() if k.endswith("_ms")})
+
+
+def _time_each(fn: Callable[[], object], n: int) -> list[float]:
+    out = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def _iou_config() -> VdtConfig:
+    return VdtConfig(
+        tracker="iou", decode=DecodeCfg(fps=25.0), det=DetCfg(model="<fake>"), tracker_cfg=IouCfg()
+    )
+
+
+# ---------------------------------------------------------------------------
+# 合成场景 + fake 模型
+# ---------------------------------------------------------------------------
+
+
+def _scene(n_objects: int, n_frames: int, rng: np.random.Generator) -> list[list[D2dObject]]:
+    """``n_objects`` 个目标随机游走 ``n_frames`` 帧的逐帧检测（同一目标恒在同一下标）。"""
+    pos = rng.uniform(0.0, 1.0 - _BOX, size=(n_objects, 2))
+    frames: list[list[D2dObject]] = []
+    for _ in range(n_frames):
+        pos = np.clip(pos + rng.normal(0.0, 0.002, size=pos.shape), 0.0, 1.0 - _BOX)
+        frames.append(
+            [
+                D2dObject(id=0, cls=0, conf=0.9, rect=Rect.new(float(x), float(y), _BOX, _BOX))
+                for x, y in pos
+            ]
+        )
+    return frames
+
+
+def _unit_rows(n: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    v = rng.normal(size=(n, dim)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+class _IndexEmbedder:
+    """fake ``Embedder``：第 i 个 crop → 固定单位向量 i（场景中同一目标下标不变 → 同身份）。"""
+
+    def __init__(self, max_n: int, rng: np.random.Generator) -> None:
+        self._table = _unit_rows(max_n, _EMB_DIM, rng)
+
+    def embed(self, crop: np.ndarray) -> np.ndarray:
+        return self._table[0]
+
+    def embed_batch(self, crops: list[np.ndarray]) -> np.ndarray:
+        return self._table[: len(crops)].copy()
+
+
+class _SceneDetector:
+    """fake ``Detector``：按调用次序回放预生成的逐帧检测（循环）。"""
+
+    def __init__(self, frames: list[list[D2dObject]]) -> None:
+        self._frames = frames
+        self._i = 0
+
+    def detect(self, image: np.ndarray) -> list[D2dObject]:
+        dets = self._frames[self._i % len(self._frames)]
+        self._i += 1
+        return dets
+
+    def detect_batch(self, images: list[np.ndarray]) -> list[list[D2dObject]]:
+        return [self.detect(im) for im in images]
+
+
+class _Node:
+    def __init__(self, name: str, shape: list[int | str | None]) -> None:
+        self.name = name
+        self.shape = shape
+
+
+class _SimccSession:
+    """fake ort session（``OrtSessionLike``）：RTMPose IO 形状，输出固定随机 SimCC 分布。
+
+    输出按批大小切片，forward 近乎零成本——pose 轮测到的是门控 / 预处理 / 解码开销。
+    """
+
+    def __init__(self, rng: np.random.Generator, max_n: int = 256) -> None:
+        from jxl.vdt.rtmpose_proc import RTMPOSE_HW, SIMCC_SPLIT_RATIO
+
+        h, w = RTMPOSE_HW
+        self._x = rng.normal(size=(max_n, 17, int(w * SIMCC_SPLIT_RATIO))).astype(np.float32)
+        self._y = rng.normal(size=(max_n, 17, int(h * SIMCC_SPLIT_RATIO))).astype(np.float32)
+        self._in = [_Node("input", ["N", 3, h, w])]
+        self._out = [
+            _Node("simcc_x", ["N", 17, self._x.shape[2]]),
+            _Node("simcc_y", ["N", 17, self._y.shape[2]]),
+        ]
+
+    def run(
+        self, output_names: list[str] | None, input_feed: dict[str, np.ndarray]
+    ) -> list[np.ndarray]:
+        n = len(next(iter(input_feed.values())))
+        return [self._x[:n], self._y[:n]]
+
+    def get_inputs(self) -> list[_Node]:
+        return self._in
+
+    def get_outputs(self) -> list[_Node]:
+        return self._out
+
+    def get_providers(self) -> list[str]:
+        return ["CPUExecutionProvider"]
+
+
+def _fake_pose(tmp: Path, prof: StageProfiler) -> PoseStep:
+    """真实 ``RtmposeStep``（默认 ``PoseCfg`` 门控）+ :class:`_SimccSession`。"""
+    from jxl.vdt.pose import RtmposeStep
+
+    weight = tmp / "rtmpose.onnx"
+    weight.touch()
+    session = _SimccSession(np.random.default_rng(_SEED))
+    with mock.patch("jxl.vdt.pose.shared_ort_session", return_value=session):
+        return RtmposeStep(PoseCfg(model=str(weight), min_hits=1), timer=prof)
+
+
+def _keypoints(rng: np.random.Generator) -> Keypoints:
+    xy = rng.uniform(0.0, 1.0, size=(17, 2))
+    return Keypoints(pts=[Point(x=float(x), y=float(y)) for x, y in xy], conf=[0.9] * 17)
+
+
+# ---------------------------------------------------------------------------
+# 基准项
+# ---------------------------------------------------------------------------
+
+
+def bench_decode(results: list[dict[str, object]], tmp: Path, quick: bool) -> None:
+    from jxl.vdt.decoder import OcvDecoder, _make_synthetic_video
+
+    frames = 100 if quick else 500
+    video = tmp / "synthetic.mp4"
+    _make_synthetic_video(str(video), fps=25.0, frames=frames, size=(640, 360))
+    for backend in ("opencv", "ffmpeg", "pyav"):
+        rec: dict[str, object] = {"bench": "decode", "backend": backend, "size": "640x360"}
+        try:
+            t0 = time.perf_counter()
+            n = sum(1 for _ in OcvDecoder(str(video), DecodeCfg(fps=25.0, backend=backend)))
+            sec = time.perf_counter() - t0
+        except Exception as e:  # 缺 ffmpeg / av → 记录并跳过
+            rec["skipped"] = f"{type(e).__name__}: {e}"
+        else:
+            rec |= {"frames": n, "sec": round(sec, 4), "fps": round(n / sec, 2)}
+        _emit(results, rec)
+
+
+def bench_tracker(results: list[dict[str, object]], quick: bool) -> None:
+    from jxl.vdt.reid_tracker import ReidTracker
+    from jxl.vdt.tracker import IouTracker
+
+    n_frames = 10 if quick else 50
+    image = np.zeros((_IMG[1], _IMG[0], 3), np.uint8)
+    for n_obj in (10, 100, 500):
+        rng = np.random.default_rng(_SEED)
+        scene = _scene(n_obj, n_frames, rng)
+        for mode in ("iou", "reid"):
+            tracker: Tracker = (
+                IouTracker(IouCfg())
+                if mode == "iou"
+                else ReidTracker(ReidCfg(model="<fake>"), _IndexEmbedder(n_obj, rng))
+            )
+            tracker.reset()
+            it = iter(enumerate(scene))
+
+            def step(tr: Tracker = tracker, it: Iterator[tuple[int, list[D2dObject]]] = it) -> None:
+                i, dets = next(it)
+                tr.update(i, i * 40, image, dets)
+
+            samples = _time_each(step, n_frames)
+            _emit(
+                results,
+                {"bench": "tracker", "mode": mode, "objects": n_obj, "frames": n_frames}
+                | _stats(samples),
+            )
+
+
+def bench_associate(results: list[dict[str, object]], quick: bool) -> None:
+    from jxl.vdt.reid_assoc import Gallery, associate
+
+    cfg = ReidCfg(model="<fake>")
+    n_det = 50
+    reps = 20 if quick else 100
+    for size in (100, 1000, 10000):
+        rng = np.random.default_rng(_SEED)
+        gallery = Gallery.from_arrays(
+            ids=np.arange(1, size + 1, dtype=np.int64),
+            embeddings=_unit_rows(size, _EMB_DIM, rng),
+            positions=rng.uniform(0.0, 1.0, size=(size, 2)),
+            last_ts=np.zeros(size, np.int64),
+            hits=np.ones(size, np.int64),
+            next_id=size + 1,
+        )
+        # 一半检测是库内轨迹（嵌入加噪、位置就近），一半是新目标
+        rows = rng.choice(size, size=n_det // 2, replace=False)
+        embs = list(gallery.embeddings[rows] + rng.normal(0, 0.01, (len(rows), _EMB_DIM)))
+        embs += list(_unit_rows(n_det - len(rows), _EMB_DIM, rng))
+        centers = np.concatenate(
+            [gallery.positions[rows], rng.uniform(0.0, 1.0, size=(n_det - len(rows), 2))]
+        )
+        dets = [
+            D2dObject(id=0, cls=0, conf=0.9, rect=Rect.new(x - _BOX / 2, y - _BOX / 2, _BOX, _BOX))
+            for x, y in centers
+        ]
+        samples = _time_each(
+            lambda g=gallery, e=embs, d=dets: associate(e, d, g, 1000, cfg), reps
+        )
+        _emit(
+            results,
+            {"bench": "associate", "gallery": size, "detections": n_det, "dim": _EMB_DIM}
+            | _stats(samples),
+        )
+
+
+def bench_aggregate(results: list[dict[str, object]], tmp: Path, quick: bool) -> None:
+    from jxl.vdt.pipeline import aggregate
+    from jxl.vdt.tracks_io import write_tracks_as
+
+    cfg = _iou_config()
+    n_frames = 10 if quick else 20
+    for n_tracks in (100, 1000) if quick else (100, 1000, 5000):
+        rng = np.random.default_rng(_SEED)
+        scene = _scene(n_tracks, n_frames, rng)
+        kpt = _keypoints(rng)
+        frames = [
+            FrameResult(
+                frame_idx=i,
+                ts_ms=i * 40,
+                objects=[ob.model_copy(update={"id": k + 1}) for k, ob in enumerate(dets)],
+                kpts=[kpt] * len(dets),
+            )
+            for i, dets in enumerate(scene)
+        ]
+        t0 = time.perf_counter()
+        tracks = aggregate("synthetic.mp4", 25.0, n_frames * 40, frames, cfg)
+        agg_sec = time.perf_counter() - t0
+        rec: dict[str, object] = {
+            "bench": "aggregate",
+            "tracks": n_tracks,
+            "frames": n_frames,
+            "observations": n_tracks * n_frames,
+            "aggregate_sec": round(agg_sec, 4),
+        }
+        for fmt in ("json", "jsonl", "npz"):
+            out = tmp / f"tracks.{fmt}"
+            t0 = time.perf_counter()
+            write_tracks_as(tracks, out, fmt)
+            rec[f"{fmt}_write_sec"] = round(time.perf_counter() - t0, 4)
+            rec[f"{fmt}_bytes"] = out.stat().st_size
+        _emit(results, rec)
+
+
+def bench_pipeline(results: list[dict[str, object]], tmp: Path, quick: bool) -> None:
+    from jxl.vdt.decoder import OcvDecoder, _make_synthetic_video
+    from jxl.vdt.pipeline import run_pipeline
+    from jxl.vdt.tracker import IouTracker
+
+    frames = 50 if quick else 250
+    video = tmp / "pipeline.mp4"
+    _make_synthetic_video(str(video), fps=25.0, frames=frames, size=_IMG)
+    cfg = _iou_config()
+    for n_obj, with_pose in ((10, False), (10, True), (100, False), (100, True)):
+        prof = StageProfiler()
+        decoder = OcvDecoder(str(video), cfg.decode)
+        t0 = time.perf_counter()
+        run_pipeline(
+            decoder,
+            _SceneDetector(_scene(n_obj, 50, np.random.default_rng(_SEED))),
+            IouTracker(IouCfg()),
+            _fake_pose(tmp, prof) if with_pose else None,
+            src=str(video),
+            fps=decoder.fps,
+            duration_ms=decoder.duration_ms,
+            config=cfg,
+            timer=prof,
+        )
+        report = prof.report(round(time.perf_counter() - t0, 4))
+        _emit(
+            results,
+            {
+                "bench": "pipeline",
+                "objects": n_obj,
+                "pose": with_pose,
+                "size": f"{_IMG[0]}x{_IMG[1]}",
+            }
+            | _round(report.model_dump(exclude={"stages"}))
+            | {"stages": {k: _round(v.model_dump()) for k, v in report.stages.items()}},
+        )
+
+
+# ---------------------------------------------------------------------------
+# 入口
+# ---------------------------------------------------------------------------
+
+
+def _meta() -> dict[str, object]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+@app.command()
+def main(
+    only: Annotated[str, typer.Option(help="逗号分隔的基准项")] = ",".join(_BENCHES),
+    out: Annotated[Path | None, typer.Option(help="结果 JSON 路径（含提交号等元信息）")] = None,
+    quick: Annotated[bool, typer.Option(help="缩小规模（冒烟 / CI）")] = False,
+) -> None:
+    names = [s for s in only.split(",") if s]
+    unknown = sorted(set(names) - set(_BENCHES))
+    if unknown:
+        raise typer.BadParameter(f"未知基准项: {unknown}（可选 {list(_BENCHES)}）")
+    results: list[dict[str, object]] = []
+    with tempfile.TemporaryDirectory() as tmp_s:
+        tmp = Path(tmp_s)
+        if "decode" in names:
+            bench_decode(results, tmp, quick)
+        if "tracker" in names:
+            bench_tracker(results, quick)
+        if "associate" in names:
+            bench_associate(results, quick)
+        if "aggregate" in names:
+            bench_aggregate(results, tmp, quick)
+        if "pipeline" in names:
+            bench_pipeline(results, tmp, quick)
+    if out is not None:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        doc = {"meta": _meta() | {"quick": quick}, "results": results}
+        out.write_bytes(orjson.dumps(doc, option=orjson.OPT_INDENT_2))
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,74 @@
+"""VideoReader 稀疏采样基准：顺序 grab vs 关键帧 seek 的交叉点。
+
+对同一视频按一组 stride 分别以 ``seek="never"`` / ``seek="always"`` 完整迭代，记录耗时，
+并核对两条路径的 ``(frame_idx, ts_ms)`` 完全一致。每个 stride 输出一行 JSON，末行给出
+探测到的 GOP 与 ``seek="auto"`` 在各 stride 下会选的策略。
+
+用法::
+
+    python benchmarks/bench_video_seek.py                      # 合成 60s 640x360 mp4v
+    python benchmarks/bench_video_seek.py --video a.mkv --strides 5,25,50,125
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+import orjson
+import typer
+
+from jxl.io.video import VideoReader, probe_keyframe_interval
+
+app = typer.Typer(add_completion=False)
+
+
+def _time(video: str, fps: float, seek: str) -> tuple[float, list[tuple[int, int]]]:
+    t0 = time.perf_counter()
+    with VideoReader(video, sample_fps=fps, seek=seek) as r:  # type: ignore[arg-type]
+        keys = [(i, ts) for i, ts, _ in r]
+    return time.perf_counter() - t0, keys
+
+
+@app.command()
+def main(
+    video: Annotated[Path | None, typer.Option(help="视频路径（缺省合成 60s 640x360 mp4v）")] = None,
+    strides: Annotated[str, typer.Option(help="逗号分隔的 stride 列表")] = "2,6,12,25,50,125",
+) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        if video is None:
+            from jxl.vdt.decoder import _make_synthetic_video
+
+            path = f"{tmp}/synthetic.mp4"
+            _make_synthetic_video(path, fps=25.0, frames=1500, size=(640, 360))
+        else:
+            path = str(video)
+        with VideoReader(path) as probe:
+            src_fps = probe.fps
+        gop = probe_keyframe_interval(path)
+        auto: dict[str, str] = {}
+        for stride in (int(s) for s in strides.split(",")):
+            fps = src_fps / stride
+            grab_s, grab_keys = _time(path, fps, "never")
+            seek_s, seek_keys = _time(path, fps, "always")
+            if grab_keys != seek_keys:
+                raise SystemExit(f"stride={stride}: seek 与 grab 的 (frame_idx, ts_ms) 不一致")
+            with VideoReader(path, sample_fps=fps, keyframe_interval=gop) as r:
+                auto[str(stride)] = r.strategy
+            rec = {
+                "stride": stride,
+                "sample_fps": round(fps, 4),
+                "frames": len(grab_keys),
+                "grab_s": round(grab_s, 4),
+                "seek_s": round(seek_s, 4),
+                "seek_speedup": round(grab_s / seek_s, 2),
+            }
+            sys.stdout.write(orjson.dumps(rec).decode() + "\n")
+        sys.stdout.write(orjson.dumps({"gop": gop, "auto": auto}).decode() + "\n")
+
+
+if __name__ == "__main__":
+    app()
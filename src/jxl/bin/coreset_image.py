@@ -6,85 +6,49 @@ Re-ID(torchreid/insightface) 受阻时的可靠兜底:
 k-means 在图 embedding 上聚 k 簇, 每 cluster 取离 centroid 最近的图为代表,
 强制压到目标数(默认 5700, 即 -60%). 保姿态/场景多样, 不专门合并同实例(需 Re-ID).
 
+实现见 jxl.dedup.coreset(图 embedding 分块聚合 + 每簇一个代表); --method 选
+faiss k-means(默认)/kcenter(k-center 贪心)/sklearn(旧 MiniBatchKMeans).
+
 典型用法:
     coreset_image /path/embeddings.npy /path/samples /path/samples_core --target 5700
 """
 
-import re
-import shutil
-from collections import defaultdict
 from pathlib import Path
 from typing import Annotated
 
-import numpy as np
 import typer
 from loguru import logger
-from sklearn.cluster import MiniBatchKMeans
+
+from jxl.dedup.coreset import CoresetMethod, image_embeddings, select_coreset
+from jxl.dedup.export import LinkMode, export_samples
+from jxl.io.embed_store import open_embeddings
 
 # typer CLI 惯用模式: 参数校验异常消息豁免噪声规则
 
 app = typer.Typer(help="整图 core-set 去重(图前景 embedding)")
 
-CROP_RE = re.compile(r"(.*)_p\d+\.jpg$")
-"""前景 crop 文件名: <原图stem>_p<序号>.jpg"""
-
 
 @app.command()
 def main(
-    embeddings_npy: Annotated[Path, typer.Argument(help="crops 的 embeddings.npy")],
+    embeddings_npy: Annotated[Path, typer.Argument(help="crops 的 embedding 库目录或 .npy")],
     samples_dir: Annotated[Path, typer.Argument(help="samples 目录(images + labels)")],
     out_dir: Annotated[Path, typer.Argument(help="去重输出(samples_core)")],
     target: Annotated[int, typer.Option(help="目标代表数")] = 5700,
+    method: Annotated[
+        CoresetMethod, typer.Option(help="core-set 算法 faiss/kcenter/sklearn")
+    ] = "faiss",
+    link: Annotated[LinkMode, typer.Option(help="样本放置方式 hardlink/symlink/copy")] = "copy",
 ) -> None:
     """图前景 embedding k-means core-set, 强制减量到 target."""
-    emb = np.load(embeddings_npy).astype(np.float32)
-    files = embeddings_npy.with_suffix(".txt").read_text(encoding="utf-8").splitlines()
-    assert len(files) == len(emb), f"emb {len(emb)} != files {len(files)}"
+    src, files = open_embeddings(embeddings_npy)
 
-    # 图 stem -> [person crop embedding]
-    stem2embs: dict[str, list[np.ndarray]] = defaultdict(list)
-    for fname, e in zip(files, emb, strict=False):
-        m = CROP_RE.match(fname)
-        if m:
-            stem2embs[m.group(1)].append(e)
-
-    # 图 embedding = person crop 均值(person 聚焦), L2 归一化
-    stems = sorted(stem2embs.keys())
-    img_emb = np.array([np.mean(stem2embs[s], axis=0) for s in stems], dtype=np.float32)
-    img_emb /= np.linalg.norm(img_emb, axis=1, keepdims=True) + 1e-9
+    # 图 embedding = 前景 crop 均值(前景聚焦), L2 归一化
+    stems, img_emb = image_embeddings(src, files)
     logger.info("图 {} 张 | dim {} | 目标 {}", len(stems), img_emb.shape[1], target)
 
-    # k-means core-set(每簇离 centroid 最近的图)
-    k = min(target, len(stems))
-    km = MiniBatchKMeans(n_clusters=k, random_state=0, n_init=3, batch_size=2048)
-    labels = km.fit_predict(img_emb)
-    centers = km.cluster_centers_
-    nearest = [None] * k
-    nearest_d = [float("inf")] * k
-    for i, c in enumerate(labels):
-        d = float(np.linalg.norm(img_emb[i] - centers[c]))
-        if d < nearest_d[c]:
-            nearest_d[c] = d
-            nearest[c] = i
-    reps = sorted(i for i in nearest if i is not None)
-
-    # 复制代表图 + 标注
-    out_img = out_dir / "images"
-    out_lbl = out_dir / "labels"
-    out_img.mkdir(parents=True, exist_ok=True)
-    out_lbl.mkdir(parents=True, exist_ok=True)
-    image_dir = samples_dir / "images"
-    label_dir = samples_dir / "labels"
-    written = 0
-    for i in reps:
-        stem = stems[i]
-        img = image_dir / f"{stem}.jpg"
-        if img.is_file():
-            shutil.copy(img, out_img / img.name)
-            lbl = label_dir / f"{stem}.txt"
-            if lbl.is_file():
-                shutil.copy(lbl, out_lbl / lbl.name)
-            written += 1
+    # core-set(每簇一个代表图)
+    reps = select_coreset(img_emb, target, method)
+    written = export_samples((stems[i] for i in reps), samples_dir, out_dir, link)
 
     reduction = 1 - written / max(len(stems), 1)
     logger.info(
@@ -4,11 +4,14 @@
 DINOv2 是通用视觉模型, 区分不了实例身份(实测 39370 crop 聚成 1 大簇),
 但能可靠区分姿态/角度. 故采用研究方案 Stage1+2:
 1. SemDeDup: Faiss 余弦近邻(cos>=th) + 并查集, 去近重复姿态/角度, 每簇留 1 代表.
+   百万级走 IVF/HNSW 近似索引 + 分块流式(jxl.dedup.near_dup), --compare-sample 报告近似 vs 精确.
 2. k-means core-set: 在 SemDeDup 代表上聚类(k=目标数), 每 cluster 取离 centroid 最近样本,
-   保姿态/场景多样性, 压到目标子集.
+   保姿态/场景多样性, 压到目标子集. --method 选 faiss k-means(默认, 多线程 CPU)/
+   kcenter(k-center 贪心)/sklearn(旧 MiniBatchKMeans).
 输出 sem_cluster_map.npy(全 crop -> sem 簇 id, 供场景A整图姿态指纹去重) + 目标数代表 crop.
 
 身份级同实例合并需 Re-ID 模型(OSNet/ArcFace), DINOv2 不支持, 留作可选增强.
+各阶段实现在 jxl.dedup; 连同场景A指纹去重单进程跑完整链见 jxl_dedup(jxl.dedup.cli).
 
 典型用法:
     dedup_sem /path/embeddings.npy /path/crops /path/crops_dedup --target 8000
@@ -17,96 +20,67 @@ DINOv2 是通用视觉模型, 区分不了实例身份(实测 39370 crop 聚成
 from pathlib import Path
 from typing import Annotated
 
-import faiss
 import numpy as np
 import typer
 from loguru import logger
-from sklearn.cluster import MiniBatchKMeans
+
+from jxl.dedup.coreset import CoresetMethod, select_coreset
+from jxl.dedup.export import LinkMode, export_files
+from jxl.dedup.near_dup import (
+    IndexKind,
+    NearDupCfg,
+    compare_with_exact,
+    near_dup_labels,
+    representatives,
+)
+from jxl.io.embed_store import open_embeddings, take_rows
 
 # typer CLI 惯用模式: 参数校验异常消息豁免噪声规则
 
 app = typer.Typer(help="前景 crop 去重(SemDeDup + k-means core-set)")
 
 
-class UnionFind:
-    """并查集(近重复聚类)."""
-
-    def __init__(self, n: int) -> None:
-        self.parent = list(range(n))
-
-    def find(self, x: int) -> int:
-        while self.parent[x] != x:
-            self.parent[x] = self.parent[self.parent[x]]
-            x = self.parent[x]
-        return x
-
-    def union(self, a: int, b: int) -> None:
-        self.parent[self.find(a)] = self.find(b)
-
-
 @app.command()
 def main(
-    embeddings_npy: Annotated[Path, typer.Argument(help="embeddings.npy")],
+    embeddings_npy: Annotated[Path, typer.Argument(help="embedding 库目录或 embeddings.npy")],
     crops_dir: Annotated[Path, typer.Argument(help="crops 源目录")],
     out_dir: Annotated[Path, typer.Argument(help="去重后代表输出目录")],
     sem_threshold: Annotated[float, typer.Option(help="SemDeDup 余弦阈值")] = 0.95,
     target: Annotated[int, typer.Option(help="core-set 目标样本数")] = 8000,
     k_neighbors: Annotated[int, typer.Option(help="Faiss 搜索近邻数")] = 50,
+    index: Annotated[IndexKind, typer.Option(help="近邻索引 auto/flat/ivf/hnsw")] = "auto",
+    nprobe: Annotated[int, typer.Option(help="IVF 探测桶数(召回)")] = 16,
+    ef_search: Annotated[int, typer.Option(help="HNSW 查询候选数(召回)")] = 128,
+    compare_sample: Annotated[
+        int, typer.Option(help="抽样对比近似 vs 精确簇划分的样本数(0=不对比)")
+    ] = 0,
+    method: Annotated[
+        CoresetMethod, typer.Option(help="core-set 算法 faiss/kcenter/sklearn")
+    ] = "faiss",
+    link: Annotated[LinkMode, typer.Option(help="代表 crop 放置方式 hardlink/symlink/copy")] = "copy",
 ) -> None:
     """SemDeDup + k-means core-set, 输出目标数多样代表."""
-    import shutil
-
-    emb = np.load(embeddings_npy).astype(np.float32)
-    files = embeddings_npy.with_suffix(".txt").read_text(encoding="utf-8").splitlines()
+    src, files = open_embeddings(embeddings_npy)
     n = len(files)
-    assert len(files) == n, f"embedding {n} != files {len(files)}"
-    logger.info("加载 {} embedding, dim={}", n, emb.shape[1])
+    logger.info("打开 {} embedding(流式)", n)
 
     # ---- Stage 1: SemDeDup(Faiss 余弦近邻 + 并查集) ----
-    index = faiss.IndexFlatIP(emb.shape[1])
-    index.add(emb)
-    sims, nbrs = index.search(emb, k=min(n, k_neighbors))
-    uf = UnionFind(n)
-    for i in range(n):
-        for j, s in zip(nbrs[i], sims[i], strict=False):
-            if j < 0 or j == i:
-                continue
-            if s >= sem_threshold:
-                uf.union(i, j)
-    sem_cluster = np.array([uf.find(i) for i in range(n)], dtype=np.int64)
-    rep_of_sem: dict[int, int] = {}
-    for i in range(n):
-        rep_of_sem.setdefault(int(sem_cluster[i]), i)
-    reps = sorted(rep_of_sem.values())
+    cfg = NearDupCfg(
+        threshold=sem_threshold, k=k_neighbors, index=index, nprobe=nprobe, ef_search=ef_search
+    )
+    if compare_sample > 0:
+        logger.info("近似 vs 精确: {}", compare_with_exact(src, cfg, compare_sample))
+    sem_cluster = near_dup_labels(src, cfg)
+    reps = representatives(sem_cluster)
     logger.info("SemDeDup(cos>={}): {} -> {} 近重复代表", sem_threshold, n, len(reps))
 
-    # ---- Stage 2: k-means core-set(保姿态/场景多样性) ----
-    k = min(target, len(reps))
-    rep_emb = emb[reps]
-    km = MiniBatchKMeans(n_clusters=k, random_state=0, n_init=3, batch_size=2048)
-    labels = km.fit_predict(rep_emb)
-    centers = km.cluster_centers_
-    # 每 cluster 取离 centroid 最近的代表
-    nearest = [None] * k
-    nearest_dist = [float("inf")] * k
-    for idx, rep in enumerate(reps):
-        c = labels[idx]
-        d = float(np.linalg.norm(rep_emb[idx] - centers[c]))
-        if d < nearest_dist[c]:
-            nearest_dist[c] = d
-            nearest[c] = rep
-    core_reps = sorted(r for r in nearest if r is not None)
+    # ---- Stage 2: k-means core-set(保姿态/场景多样性, 每 cluster 取离 centroid 最近的代表) ----
+    core_reps = reps[select_coreset(take_rows(src, reps), target, method)]
 
     # ---- 输出: core-set 代表 crop + sem_cluster_map(供场景A) ----
-    out_dir.mkdir(parents=True, exist_ok=True)
-    for idx in core_reps:
-        src = crops_dir / files[idx]
-        if src.is_file():
-            shutil.copy(src, out_dir / src.name)
+    export_files((files[i] for i in core_reps), crops_dir, out_dir, link)
     np.save(out_dir / "sem_cluster_map.npy", sem_cluster)
-    (out_dir / "sem_cluster_files.txt").write_text(
-        "\n".join(files), encoding="utf-8"
-    )
+    (out_dir / "sem_cluster_files.txt").write_text("\n".join(files), encoding="utf-8")
     logger.info(
         "完成: {} crop -> SemDeDup {} -> core-set {} 代表 | sem_cluster_map 已存(供场景A)",
         n,
@@ -1,19 +1,25 @@
 import logging
-import subprocess
+from fractions import Fraction
 from pathlib import Path
 
+import cv2
+
+from jxl.io.video import Backend, VideoIoError, VideoReader
+
 
 def extract_frames_from_mkv_using_ffmpeg(
     src_dir: str | Path,
     dst_dir: str | Path,
-    frame_rate: int | str = 1,
+    frame_rate: float | str = 1,
+    backend: Backend = "ffmpeg",
 ) -> list[Path]:
-    """查找目录内所有MKV文件，使用ffmpeg解码为图片并保存
+    """查找目录内所有MKV文件，经 ``VideoReader`` 按帧率采样解码为图片并保存
 
     Args:
         src_dir: 源目录，包含MKV文件
         dst_dir: 目标目录，用于保存提取的图片
-        frame_rate: 提取帧率，可以是数字(如1表示每秒1帧)或ffmpeg格式字符串(如"1/10"表示每10秒1帧)
+        frame_rate: 提取帧率，可以是数字(如1表示每秒1帧)或分数字符串(如"1/10"表示每10秒1帧)
+        backend: 解码后端（ffmpeg 子进程裸流 / pyav 多线程 / opencv）
 
     Returns:
         List[Path]: 处理的MKV文件路径列表
@@ -29,6 +35,8 @@ def extract_frames_from_mkv_using_ffmpeg(
     logging.info(f"找到 {len(mkv_files)} 个MKV文件")
 
     processed_files: list[Path] = []
+    sample_fps = float(Fraction(str(frame_rate)))
+    jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, 95]  # 高质量，≈ ffmpeg -q:v 2
 
     # 处理每个MKV文件
     for mkv_file in mkv_files:
@@ -39,31 +47,16 @@ def extract_frames_from_mkv_using_ffmpeg(
         logging.info(f"处理文件: {mkv_file}")
         processed_files.append(mkv_file)
 
-        # 构建ffmpeg命令
-        output_pattern = str(output_dir / "%04d.jpg")
-
-        cmd = [
-            "ffmpeg",
-            "-i",
-            str(mkv_file),
-            "-vf",
-            f"fps={frame_rate}",
-            "-q:v",
-            "2",  # 图片质量设置，2表示高质量
-            output_pattern,
-        ]
-
-        # 执行ffmpeg命令
+        # 采样与解码交给 VideoReader（每 round(源fps/帧率) 帧取一帧）；图片按输出顺序
+        # 1, 2, 3... 连续编号（同 ffmpeg -vf fps 的 %04d），不用源帧号
         try:
-            subprocess.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+            reader = VideoReader(str(mkv_file), sample_fps=sample_fps, backend=backend)
+            with reader:
+                for n, (_, _, frame) in enumerate(reader, start=1):
+                    cv2.imwrite(str(output_dir / f"{n:04d}.jpg"), frame, jpeg_params)
             logging.info(f"文件 {mkv_file.name} 处理完成")
-        except subprocess.CalledProcessError as e:
-            logging.error(f"处理文件 {mkv_file.name} 时出错: {e.stderr}")
+        except VideoIoError as e:
+            logging.error(f"处理文件 {mkv_file.name} 时出错: {e}")
 
     return processed_files
 
@@ -1,59 +1,54 @@
 #!/usr/bin/env python3
 """从 mkv 视频提取编码关键帧（I-frame）→ 图片目录。
 
-ffmpeg 无损提取所有 I 帧（select=eq(pict_type,I)），全量不抽样。
-输出扁平 jpg，命名 {video_stem}_{frame_idx:06d}.jpg。
+解码器只解关键帧（``jxl.io.video_backends.iter_keyframes``：ffmpeg ``-skip_frame nokey``
+裸流管道 / PyAV ``skip_frame=NONKEY``），全量不抽样，非关键帧不解码。
+输出扁平 jpg，命名 {video_stem}_{k:06d}.jpg（k 为 1 起的关键帧序号）。
 
 用法:
-    mkv_keyframes <src_dir> <dst_dir>
+    mkv_keyframes <src_dir> <dst_dir> [--backend ffmpeg|pyav]
 """
 
-import shutil
-import subprocess
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Literal
 
+import cv2
 import typer
 
+from jxl.io.video import VideoIoError
+from jxl.io.video_backends import iter_keyframes
+
 app = typer.Typer(add_completion=False, help="mkv → 编码关键帧(I-frame)提取。")
 
 _MKV_EXT = ".mkv"
+_JPEG_QUALITY = 95  # ≈ ffmpeg -q:v 2
 
 
-def extract_keyframes(src_dir: Path, dst_dir: Path) -> tuple[list[Path], list[Path]]:
-    """递归找 mkv → ffmpeg 提取 I 帧 → 扁平 jpg。返回 (succeeded, failed)。"""
-    if not shutil.which("ffmpeg"):
-        typer.secho("未找到 ffmpeg，请先安装。", fg=typer.colors.RED, err=True)
-        raise typer.Exit(1)
+def extract_keyframes(
+    src_dir: Path, dst_dir: Path, backend: Literal["ffmpeg", "pyav"] = "ffmpeg"
+) -> tuple[list[Path], list[Path]]:
+    """递归找 mkv → 只解码 I 帧 → 扁平 jpg。返回 (succeeded, failed)。"""
     mkvs = sorted(src_dir.rglob(f"*{_MKV_EXT}"))
     if not mkvs:
         typer.secho(f"未找到 mkv: {src_dir}", fg=typer.colors.RED, err=True)
         raise typer.Exit(1)
     dst_dir.mkdir(parents=True, exist_ok=True)
+    params = [cv2.IMWRITE_JPEG_QUALITY, _JPEG_QUALITY]
     succeeded: list[Path] = []
     failed: list[Path] = []
     for mkv in mkvs:
-        out_pattern = str(dst_dir / f"{mkv.stem}_%06d.jpg")
-        cmd = [
-            "ffmpeg", "-i", str(mkv),
-            "-vf", r"select=eq(pict_type\,I)",
-            "-vsync", "vfr",
-            "-q:v", "2",
-            out_pattern,
-        ]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=False, timeout=600)
-        except subprocess.TimeoutExpired:
+            n = 0
+            for k, _, frame in iter_keyframes(str(mkv), backend=backend):
+                cv2.imwrite(str(dst_dir / f"{mkv.stem}_{k + 1:06d}.jpg"), frame, params)
+                n += 1
+        except VideoIoError as e:
             failed.append(mkv)
-            typer.secho(f"ffmpeg 超时 {mkv.name}", fg=typer.colors.YELLOW, err=True)
+            typer.secho(f"解码失败 {mkv.name}: {e}", fg=typer.colors.YELLOW, err=True)
             continue
-        if result.returncode != 0:
+        if n == 0:
             failed.append(mkv)
-            typer.secho(
-                f"ffmpeg 失败 {mkv.name}: {result.stderr[-300:]}",
-                fg=typer.colors.YELLOW,
-                err=True,
-            )
+            typer.secho(f"无关键帧 {mkv.name}", fg=typer.colors.YELLOW, err=True)
         else:
             succeeded.append(mkv)
     return succeeded, failed
@@ -63,9 +58,12 @@ def extract_keyframes(src_dir: Path, dst_dir: Path) -> tuple[list[Path], list[Pa
 def main(
     src_dir: Annotated[Path, typer.Argument(help="mkv 源目录（递归）")],
     dst_dir: Annotated[Path, typer.Argument(help="输出图片目录")],
+    backend: Annotated[
+        Literal["ffmpeg", "pyav"], typer.Option(help="解码后端：ffmpeg（子进程裸流）/ pyav（多线程）")
+    ] = "ffmpeg",
 ) -> None:
     """递归抽取所有 mkv 的编码关键帧到扁平 jpg 目录。全失败时非零退出。"""
-    succeeded, failed = extract_keyframes(src_dir, dst_dir)
+    succeeded, failed = extract_keyframes(src_dir, dst_dir, backend)
     typer.secho(
         f"成功 {len(succeeded)} / 失败 {len(failed)} → {dst_dir}",
         fg=typer.colors.GREEN if succeeded else typer.colors.RED,
@@ -10,6 +10,7 @@
     person_crop /path/to/samples /path/to/crops --limit 100   # 小批量验证
 """
 
+from itertools import chain
 from pathlib import Path
 from typing import Annotated
 
@@ -19,6 +20,8 @@ from jvi.geo.rectangle import Rect
 from jvi.image.image_nda import ImageNda
 from loguru import logger
 
+from jxl.io.image_loader import PrefetchLoader
+
 # typer CLI 惯用模式: 参数校验异常消息豁免噪声规则
 
 app = typer.Typer(help="截取 person crop(原图分辨率, 紧贴 bbox)")
@@ -37,6 +40,7 @@ def main(
     dst_dir: Annotated[Path, typer.Argument(help="输出 crops 目录")],
     person_class: Annotated[int, typer.Option(help="person 的 YOLO 类别 id")] = 0,
     limit: Annotated[int, typer.Option(help="只处理前 N 张图(0=全部)")] = 0,
+    workers: Annotated[int, typer.Option(help="解码线程数(0=主线程)")] = 8,
 ) -> None:
     """从 YOLO samples 截取每个 person bbox 为独立 crop(原图分辨率, 不 resize)."""
     image_dir = src_dir / "images"
@@ -50,14 +54,13 @@ def main(
         images = images[:limit]
     logger.info("输入 {} 张图 -> {}", len(images), dst_dir)
 
-    total = written = skipped = 0
-    for i, img_path in enumerate(images, 1):
+    total = written = 0
+    labeled = [f for f in images if (label_dir / (f.stem + LBL_EXT)).is_file()]
+    skipped = len(images) - len(labeled)
+    # 解码在线程池预取(cv2 解码释放 GIL), 主线程只做裁剪与写盘
+    loader = PrefetchLoader(labeled, ImageNda.load, batch=32, workers=workers)
+    for i, (img_path, image) in enumerate(chain.from_iterable(loader), 1):
         label_path = label_dir / (img_path.stem + LBL_EXT)
-        if not label_path.is_file():
-            skipped += 1
-            continue
-
-        image = ImageNda.load(img_path)
         idx = 0
         for line in label_path.read_text().splitlines():
             parts = line.strip().split()
@@ -82,8 +85,9 @@ def main(
 
         total += idx
         if i % 2000 == 0:
-            logger.info("进度 {}/{} 图, crop={}", i, len(images), written)
+            logger.info("进度 {}/{} 图, crop={}", i, len(labeled), written)
 
+    logger.info(loader.stats().summary())
     logger.info(
         "完成: 图={} person/crop={} 跳过(无label)={}", len(images), written, skipped
     )
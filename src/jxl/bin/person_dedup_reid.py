@@ -17,6 +17,8 @@ import typer
 from loguru import logger
 from sklearn.cluster import HDBSCAN
 
+from jxl.io.embed_store import load_embeddings
+
 # typer CLI 惯用模式: 参数校验异常消息豁免噪声规则
 
 app = typer.Typer(help="person Re-ID 同人聚类(HDBSCAN)")
@@ -24,13 +26,12 @@ app = typer.Typer(help="person Re-ID 同人聚类(HDBSCAN)")
 
 @app.command()
 def main(
-    reid_npy: Annotated[Path, typer.Argument(help="reid_embeddings.npy")],
+    reid_npy: Annotated[Path, typer.Argument(help="reid embedding 库目录或 .npy")],
     out_dir: Annotated[Path, typer.Argument(help="输出目录(identity_map)")],
     min_cluster_size: Annotated[int, typer.Option(help="HDBSCAN min_cluster_size")] = 5,
 ) -> None:
     """HDBSCAN(cosine) 同人聚类, 输出 identity_map(供场景A身份指纹)."""
-    emb = np.load(reid_npy).astype(np.float32)
-    files = reid_npy.with_suffix(".txt").read_text(encoding="utf-8").splitlines()
+    emb, files = load_embeddings(reid_npy)
     n = len(files)
     assert len(files) == n, f"emb {n} != files {len(files)}"
     logger.info("加载 {} reid embedding, dim={}", n, emb.shape[1])
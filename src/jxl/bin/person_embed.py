@@ -2,13 +2,15 @@
 """DINOv2 embedding 提取(person crop, SSL 前景特征).
 
 对目录下所有图像提取 DINOv2(自监督) embedding, L2 归一化,
-存 .npy + 同名 .txt(文件名列表, 顺序对齐). 用于后续 SemDeDup/HDBSCAN 去重.
+写入可续跑 embedding 库(jxl.io.embed_store: 分片 + 键索引), 重跑只提取新增/变化文件;
+解码 + 预处理在线程池预取(jxl.io.image_loader), 与 GPU 前向重叠;
+--export-npy 另导出旧格式 .npy + 同名 .txt. 用于后续 SemDeDup/HDBSCAN 去重.
 SSL 特征对 person 细粒度远优于 ImageNet supervised(SemDeDup 原论文强调).
 
 模型走 HuggingFace(facebook/dinov2-small 等价 vits14, 384d), 绕开 GitHub release 限速.
 
 典型用法:
-    person_embed /path/to/person_crops /path/to/embeddings.npy
+    person_embed /path/to/person_crops /path/to/emb_store
 """
 
 from pathlib import Path
@@ -20,7 +22,9 @@ import torch.nn.functional as F
 import typer
 from jcx.sys.fs import files_in
 from loguru import logger
-from PIL import Image
+
+from jxl.io.embed_store import EmbeddingStore, StoreDtype, embed_into, export_npy
+from jxl.io.image_loader import load_rgb
 
 # typer CLI 惯用模式: 参数校验异常消息豁免噪声规则
 
@@ -33,12 +37,18 @@ IMG_EXT = ".jpg"
 @app.command()
 def main(
     src_dir: Annotated[Path, typer.Argument(help="图像目录")],
-    out_npy: Annotated[Path, typer.Argument(help="输出 embedding .npy")],
+    out_store: Annotated[Path, typer.Argument(help="embedding 库目录(可续跑)")],
     model: Annotated[
         str, typer.Option(help="HF DINOv2 模型名")
     ] = "facebook/dinov2-small",
     batch: Annotated[int, typer.Option(help="batch size")] = 64,
     device: Annotated[str, typer.Option(help="设备 cuda/cpu")] = "cuda",
+    dtype: Annotated[StoreDtype, typer.Option(help="分片存储精度")] = "float32",
+    export_npy_path: Annotated[
+        Path | None, typer.Option("--export-npy", help="另导出旧格式 .npy + .txt")
+    ] = None,
+    workers: Annotated[int, typer.Option(help="解码/预处理线程数(0=主线程)")] = 8,
+    prefetch: Annotated[int, typer.Option(help="预取深度(批)")] = 4,
 ) -> None:
     """提取目录下所有图像的 DINOv2 embedding(L2 归一化)."""
     from transformers import AutoImageProcessor, AutoModel
@@ -56,45 +66,34 @@ def main(
     files = files_in(src_dir, IMG_EXT)
     logger.info("图像 {} 张 | embed_dim={}", len(files), embed_dim)
 
-    out_npy.parent.mkdir(parents=True, exist_ok=True)
-    embeddings = np.zeros((len(files), embed_dim), dtype=np.float32)
+    store = EmbeddingStore(out_store, model, embed_dim, dtype)
+
+    short = processor.size.get("shortest_edge")
+    min_size = (short, short) if short else None
+
+    def load(f: Path) -> np.ndarray:
+        # 工作线程内: JPEG 降采样解码 + HF 预处理, 与 GPU 前向重叠
+        im = load_rgb(f, min_size)
+        return processor(images=im, return_tensors="np")["pixel_values"][0]
 
     @torch.no_grad()
-    def embed_batch(imgs: list[Image.Image]) -> np.ndarray:
-        inputs = processor(images=imgs, return_tensors="pt").to(dev)
-        outputs = net(**inputs)
+    def embed_batch(pixels: list[np.ndarray]) -> np.ndarray:
+        x = torch.from_numpy(np.stack(pixels))
+        if dev.type == "cuda":
+            x = x.pin_memory()
+        outputs = net(pixel_values=x.to(dev, non_blocking=True))
         cls = outputs.last_hidden_state[:, 0]  # CLS token (N, embed_dim)
         return F.normalize(cls, dim=-1).float().cpu().numpy()
 
-    buf: list[Image.Image] = []
-    buf_idx: list[int] = []
-    done = 0
-    for i, f in enumerate(files):
-        try:
-            buf.append(Image.open(f).convert("RGB"))
-            buf_idx.append(i)
-        except OSError as e:
-            logger.warning("读取失败 {}: {}", f.name, e)
-        if len(buf) >= batch:
-            emb = embed_batch(buf)
-            for j, e in zip(buf_idx, emb, strict=False):
-                embeddings[j] = e
-            done += len(buf)
-            buf.clear()
-            buf_idx.clear()
-            if done % (batch * 20) == 0:
-                logger.info("进度 {}/{}", done, len(files))
-    if buf:
-        emb = embed_batch(buf)
-        for j, e in zip(buf_idx, emb, strict=False):
-            embeddings[j] = e
-        done += len(buf)
-
-    np.save(out_npy, embeddings)
-    out_npy.with_suffix(".txt").write_text(
-        "\n".join(f.name for f in files), encoding="utf-8"
-    )
-    logger.info("完成: {} embedding -> {}", done, out_npy)
+    with store:
+        stats = embed_into(
+            store, src_dir, files, embed_batch, batch, load, workers, prefetch, logger.info
+        )
+    logger.info(stats.summary())
+    if export_npy_path is not None:
+        export_npy(store, export_npy_path)
+        logger.info("导出 {} 条 -> {}", len(store), export_npy_path)
+    logger.info("完成: 新增 {} embedding, 库内共 {} -> {}", stats.n_ok, len(store), out_store)
 
 
 if __name__ == "__main__":
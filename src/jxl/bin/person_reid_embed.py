@@ -8,7 +8,10 @@
 依赖: torchreid 运行时(gdown/tensorboard/h5py/scipy/six/Cython)已装.
 
 典型用法:
-    person_reid_embed /path/person_crops /path/reid.npy
+    person_reid_embed /path/person_crops /path/reid_store
+
+写入可续跑 embedding 库(jxl.io.embed_store), 重跑只提取新增/变化文件; 解码 + 预处理在线程池预取, 与 GPU 前向重叠;
+--export-npy 另导出旧格式 .npy + 同名 .txt.
 """
 
 import subprocess
@@ -22,9 +25,11 @@ import torch.nn.functional as F
 import typer
 from jcx.sys.fs import files_in
 from loguru import logger
-from PIL import Image
 from torchvision import transforms
 
+from jxl.io.embed_store import EmbeddingStore, StoreDtype, embed_into, export_npy
+from jxl.io.image_loader import load_rgb
+
 # 自动 git clone torchreid 源码(不 pip build)
 TORCHREID_SRC = Path("/tmp/torchreid_src")
 if not TORCHREID_SRC.exists():
@@ -60,7 +65,7 @@ DEFAULT_WEIGHTS = Path(
 @app.command()
 def main(
     src_dir: Annotated[Path, typer.Argument(help="person crop 目录")],
-    out_npy: Annotated[Path, typer.Argument(help="输出 reid embedding .npy")],
+    out_store: Annotated[Path, typer.Argument(help="reid embedding 库目录(可续跑)")],
     weights: Annotated[Path, typer.Option(help="OSNet 权重 .pth")] = DEFAULT_WEIGHTS,
     model_name: Annotated[str, typer.Option(help="OSNet 模型名")] = "osnet_x0_75",
     num_classes: Annotated[
@@ -68,6 +73,12 @@ def main(
     ] = 4101,
     batch: Annotated[int, typer.Option(help="batch size")] = 64,
     device: Annotated[str, typer.Option(help="设备 cuda/cpu")] = "cuda",
+    dtype: Annotated[StoreDtype, typer.Option(help="分片存储精度")] = "float32",
+    export_npy_path: Annotated[
+        Path | None, typer.Option("--export-npy", help="另导出旧格式 .npy + .txt")
+    ] = None,
+    workers: Annotated[int, typer.Option(help="解码/预处理线程数(0=主线程)")] = 8,
+    prefetch: Annotated[int, typer.Option(help="预取深度(批)")] = 4,
 ) -> None:
     """提 person crop 的 OSNet Re-ID embedding(512d 身份特征, L2 归一化)."""
     from torchreid import models
@@ -99,44 +110,29 @@ def main(
 
     files = files_in(src_dir, IMG_EXT)
     logger.info("图像 {} 张 | feat_dim=512", len(files))
-    out_npy.parent.mkdir(parents=True, exist_ok=True)
-    embeddings = np.zeros((len(files), 512), dtype=np.float32)
+    store = EmbeddingStore(out_store, f"{model_name}:{weights.name}", 512, dtype)
+
+    def load(f: Path) -> torch.Tensor:
+        # 工作线程内: JPEG 降采样解码 + resize/normalize, 与 GPU 前向重叠
+        return tf(load_rgb(f, (INPUT_HW[1], INPUT_HW[0])))
 
     @torch.no_grad()
-    def embed_batch(imgs: list[Image.Image]) -> np.ndarray:
-        tensor = torch.stack([tf(im) for im in imgs]).to(dev)
-        feat = net(tensor)  # eval 模式返回 512d feature
+    def embed_batch(tensors: list[torch.Tensor]) -> np.ndarray:
+        x = torch.stack(tensors)
+        if dev.type == "cuda":
+            x = x.pin_memory()
+        feat = net(x.to(dev, non_blocking=True))  # eval 模式返回 512d feature
         return F.normalize(feat, dim=-1).float().cpu().numpy()
 
-    buf: list[Image.Image] = []
-    buf_idx: list[int] = []
-    done = 0
-    for i, f in enumerate(files):
-        try:
-            buf.append(Image.open(f).convert("RGB"))
-            buf_idx.append(i)
-        except OSError as e:
-            logger.warning("读取失败 {}: {}", f.name, e)
-        if len(buf) >= batch:
-            emb = embed_batch(buf)
-            for j, e in zip(buf_idx, emb, strict=False):
-                embeddings[j] = e
-            done += len(buf)
-            buf.clear()
-            buf_idx.clear()
-            if done % (batch * 20) == 0:
-                logger.info("进度 {}/{}", done, len(files))
-    if buf:
-        emb = embed_batch(buf)
-        for j, e in zip(buf_idx, emb, strict=False):
-            embeddings[j] = e
-        done += len(buf)
-
-    np.save(out_npy, embeddings)
-    out_npy.with_suffix(".txt").write_text(
-        "\n".join(f.name for f in files), encoding="utf-8"
-    )
-    logger.info("完成: {} reid embedding -> {}", done, out_npy)
+    with store:
+        stats = embed_into(
+            store, src_dir, files, embed_batch, batch, load, workers, prefetch, logger.info
+        )
+    logger.info(stats.summary())
+    if export_npy_path is not None:
+        export_npy(store, export_npy_path)
+        logger.info("导出 {} 条 -> {}", len(store), export_npy_path)
+    logger.info("完成: 新增 {} reid embedding, 库内共 {} -> {}", stats.n_ok, len(store), out_store)
 
 
 if __name__ == "__main__":
@@ -3,17 +3,18 @@
 
 When you film banknotes from many angles under different lighting, this turns
 each clip into still frames you can later annotate. Samples one frame every
-``--every-sec`` seconds and writes JPEGs into the output directory.
+``--every-sec`` seconds and writes JPEGs into the output directory. Decoding and
+sampling go through :class:`jxl.io.video.VideoReader`, so ``--backend ffmpeg|pyav``
+gets multi-threaded decode and only sampled frames are converted to RGB.
 """
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from pathlib import Path
 
 import imageio.v3 as iio
 import typer
 
-if TYPE_CHECKING:
-    from pathlib import Path
+from jxl.io.video import Backend, VideoIoError, VideoReader
 
 app = typer.Typer(add_completion=False, help="Sample frames from videos into a dataset folder.")
 
@@ -27,6 +28,7 @@ def run(
     every_sec: float = typer.Option(1.0, min=0.1, help="Sample one frame every N seconds."),
     max_per_video: int = typer.Option(0, min=0, help="Cap frames per video (0 = no cap)."),
     prefix: str = typer.Option("frame", help="Output filename prefix."),
+    backend: Backend = typer.Option("opencv", help="Decoder backend: opencv, ffmpeg or pyav."),
 ) -> None:
     """Walk each video and write sampled frames as JPEG."""
     dst.mkdir(parents=True, exist_ok=True)
@@ -41,22 +43,27 @@ def run(
 
     written = 0
     for vid in videos:
-        meta = iio.immeta(vid)
-        fps = float(meta.get("fps") or 25.0)
-        if fps <= 0:
-            fps = 25.0
-        step = max(1, round(fps * every_sec))
         tag = vid.stem
         kept = 0
-        for idx, frame in enumerate(iio.imiter(vid)):
-            if idx % step != 0:
-                continue
-            out_path = dst / f"{prefix}_{tag}_{written:06d}.jpg"
-            iio.imwrite(out_path, frame, extension=".jpeg", quality=90)
-            written += 1
-            kept += 1
-            if max_per_video and kept >= max_per_video:
-                break
+        try:
+            # One frame every round(fps * every_sec) source frames.
+            reader = VideoReader(
+                str(vid),
+                sample_fps=1.0 / every_sec,
+                color="rgb",
+                backend=backend,
+            )
+        except VideoIoError as e:
+            typer.secho(f"Skip {vid}: {e}", fg=typer.colors.YELLOW, err=True)
+            continue
+        with reader:
+            for _, _, frame in reader:
+                out_path = dst / f"{prefix}_{tag}_{written:06d}.jpg"
+                iio.imwrite(out_path, frame, extension=".jpeg", quality=90)
+                written += 1
+                kept += 1
+                if max_per_video and kept >= max_per_video:
+                    break
 
     typer.secho(f"Wrote {written} frames from {len(videos)} video(s) to {dst}", fg=typer.colors.GREEN)
 
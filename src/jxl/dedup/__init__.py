@@ -0,0 +1,61 @@
+"""jxl.dedup —— 基于 embedding 的样本去重与 core-set 选择。
+
+各阶段为可组合的函数，输入为 :data:`jxl.io.embed_store.EmbeddingSource`（embedding 库或
+mmap 的 ``.npy``），流式分块处理：
+
+- :mod:`~jxl.dedup.near_dup`：SemDeDup 近重复聚类（faiss 精确 / IVF / HNSW + 数组并查集）；
+- :mod:`~jxl.dedup.fingerprint`：整图姿态指纹去重（前景 crop 簇 id 集合）；
+- :mod:`~jxl.dedup.coreset`：core-set 选择（faiss k-means / k-center 贪心 / sklearn）、每簇最近
+  样本、图级 embedding 聚合；
+- :mod:`~jxl.dedup.export`：硬链接 / 软链接 / 复制放置输出。
+
+``jxl.dedup.cli``（``jxl_dedup``）单进程串起整条链。faiss / sklearn 仅在用到时按需 import。
+"""
+
+from jxl.dedup.coreset import (
+    CoresetMethod,
+    faiss_kmeans_coreset,
+    image_embeddings,
+    kcenter_greedy,
+    kmeans_coreset,
+    nearest_to_centroids,
+    select_coreset,
+)
+from jxl.dedup.export import LinkMode, export_files, export_samples, place
+from jxl.dedup.fingerprint import FpResult, crop_stem, fingerprint_dedup, image_clusters
+from jxl.dedup.near_dup import (
+    ArrayUnionFind,
+    ExactCompare,
+    IndexKind,
+    NearDupCfg,
+    compare_labels,
+    compare_with_exact,
+    near_dup_labels,
+    representatives,
+)
+
+__all__ = [
+    "ArrayUnionFind",
+    "CoresetMethod",
+    "ExactCompare",
+    "FpResult",
+    "IndexKind",
+    "LinkMode",
+    "NearDupCfg",
+    "compare_labels",
+    "compare_with_exact",
+    "crop_stem",
+    "export_files",
+    "export_samples",
+    "faiss_kmeans_coreset",
+    "fingerprint_dedup",
+    "image_clusters",
+    "image_embeddings",
+    "kcenter_greedy",
+    "kmeans_coreset",
+    "near_dup_labels",
+    "nearest_to_centroids",
+    "place",
+    "representatives",
+    "select_coreset",
+]
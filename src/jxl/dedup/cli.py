@@ -0,0 +1,243 @@
+"""jxl_dedup —— 单进程跑完整去重链（薄 CLI，编排 :mod:`jxl.dedup` 各阶段）。
+
+链路（中间结果全程在内存，不经 ``sem_cluster_map.npy`` 中转）::
+
+    crop embedding 库 ─► SemDeDup 近重复簇 ─┬─► [crop core-set] ─► crops 输出（可选）
+                                             └─► 整图姿态指纹去重 ─► [图 core-set] ─► samples 输出
+
+对应旧脚本：``dedup_sem``/``person_dedup``（SemDeDup + crop core-set）、
+``dedup_image_fp``/``samples_dedup``（指纹去重）、``coreset_image``/``samples_core``（图 core-set）。
+样本默认硬链接放置（``--link``），``--report`` 写出各阶段计数。
+
+典型用法::
+
+    jxl_dedup /path/emb_store /path/samples /path/samples_dedup --target-images 5700
+    jxl_dedup /path/emb_store /path/samples /path/out --crops-dir /path/crops \\
+        --crops-out /path/crops_dedup --target-crops 8000 --index ivf
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Annotated
+
+import numpy as np
+import typer
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field
+
+from jxl.dedup.coreset import CoresetMethod, image_embeddings, select_coreset
+from jxl.dedup.export import IMG_EXT, LinkMode, export_files, export_samples
+from jxl.dedup.fingerprint import fingerprint_dedup, image_clusters
+from jxl.dedup.near_dup import (
+    IndexKind,
+    NearDupCfg,
+    compare_with_exact,
+    near_dup_labels,
+    representatives,
+)
+from jxl.io.embed_store import EmbeddingSource, open_embeddings, take_rows
+
+app = typer.Typer(help="样本去重链: SemDeDup → 姿态指纹 → core-set (单进程, 链接输出)")
+
+
+class DedupReport(BaseModel):
+    """各阶段计数。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    n_crops: int = Field(description="crop embedding 数")
+    n_sem_reps: int = Field(description="SemDeDup 近重复代表数")
+    n_crops_out: int = Field(default=0, description="输出的 crop 数（未要求 crop 输出为 0）")
+    n_images: int = Field(description="samples 图数")
+    n_fp_kept: int = Field(description="指纹去重保留的有前景图数")
+    n_fp_dropped: int = Field(description="指纹重复去掉的图数")
+    n_no_crop: int = Field(description="无前景 crop 的图数")
+    n_core: int = Field(description="图 core-set 后的有前景图数（未启用 = n_fp_kept）")
+    n_exported: int = Field(description="输出的图数（含保留的无前景图）")
+
+
+def dedup_chain(
+    src: EmbeddingSource,
+    names: list[str],
+    samples_dir: Path,
+    out_dir: Path,
+    near: NearDupCfg,
+    target_images: int = 0,
+    keep_no_crop: bool = True,
+    link: LinkMode = "hardlink",
+    crops_dir: Path | None = None,
+    crops_out: Path | None = None,
+    target_crops: int = 0,
+    method: CoresetMethod = "faiss",
+) -> DedupReport:
+    """跑完整去重链并放置输出（库函数形态，CLI 与测试共用）。
+
+    Args:
+        src: crop embedding（与 ``names`` 行对齐）。
+        names: crop 文件名（``<原图stem>_p<序号>.jpg``）。
+        samples_dir: samples 目录（``images/`` + ``labels/``）。
+        out_dir: samples 输出目录。
+        near: SemDeDup 配置。
+        target_images: 图 core-set 目标数（0 = 不做 core-set）。
+        keep_no_crop: 保留无前景 crop 的图（负样本）。
+        link: 放置方式。
+        crops_dir: crop 源目录（给 ``crops_out`` 时必填）。
+        crops_out: crop 代表输出目录（None = 不输出 crop）。
+        target_crops: crop core-set 目标数（0 = 输出全部近重复代表）。
+        method: core-set 算法（见 :func:`~jxl.dedup.coreset.select_coreset`）。
+    """
+    labels = near_dup_labels(src, near)
+    reps = representatives(labels)
+    logger.info("SemDeDup(cos>={}): {} -> {} 近重复代表", near.threshold, len(names), len(reps))
+
+    n_crops_out = 0
+    if crops_out is not None:
+        if crops_dir is None:
+            raise ValueError("crops_out 需要 crops_dir")
+        core = reps
+        if 0 < target_crops < len(reps):
+            core = reps[select_coreset(take_rows(src, reps), target_crops, method)]
+        n_crops_out = export_files((names[i] for i in core), crops_dir, crops_out, link)
+        logger.info("crop core-set: {} -> {} -> {}", len(reps), n_crops_out, crops_out)
+
+    stems = sorted(p.stem for p in (samples_dir / "images").glob(f"*{IMG_EXT}"))
+    fp = fingerprint_dedup(stems, image_clusters(names, labels))
+    logger.info(
+        "指纹去重: {} 图 -> 保留 {} / 重复 {} / 无前景 {}",
+        len(stems),
+        len(fp.kept),
+        len(fp.dropped),
+        len(fp.no_crop),
+    )
+
+    kept = fp.kept
+    if 0 < target_images < len(kept):
+        img_stems, img_emb = image_embeddings(src, names, only=set(kept))
+        kept = [img_stems[i] for i in select_coreset(img_emb, target_images, method)]
+        logger.info("图 core-set: {} -> {}", len(fp.kept), len(kept))
+
+    out_stems = kept + fp.no_crop if keep_no_crop else kept
+    n_exported = export_samples(sorted(out_stems), samples_dir, out_dir, link)
+    return DedupReport(
+        n_crops=len(names),
+        n_sem_reps=len(reps),
+        n_crops_out=n_crops_out,
+        n_images=len(stems),
+        n_fp_kept=len(fp.kept),
+        n_fp_dropped=len(fp.dropped),
+        n_no_crop=len(fp.no_crop),
+        n_core=len(kept),
+        n_exported=n_exported,
+    )
+
+
+@app.command()
+def main(
+    embeddings: Annotated[Path, typer.Argument(help="crop embedding 库目录或 .npy(+.txt)")],
+    samples_dir: Annotated[Path, typer.Argument(help="samples 目录(images + labels)")],
+    out_dir: Annotated[Path, typer.Argument(help="samples 去重输出目录")],
+    sem_threshold: Annotated[float, typer.Option(help="SemDeDup 余弦阈值")] = 0.95,
+    k_neighbors: Annotated[int, typer.Option(help="Faiss 搜索近邻数")] = 50,
+    index: Annotated[IndexKind, typer.Option(help="近邻索引 auto/flat/ivf/hnsw")] = "auto",
+    nprobe: Annotated[int, typer.Option(help="IVF 探测桶数(召回)")] = 16,
+    ef_search: Annotated[int, typer.Option(help="HNSW 查询候选数(召回)")] = 128,
+    compare_sample: Annotated[
+        int, typer.Option(help="抽样对比近似 vs 精确簇划分的样本数(0=不对比)")
+    ] = 0,
+    target_images: Annotated[int, typer.Option(help="图 core-set 目标数(0=不做)")] = 0,
+    keep_no_crop: Annotated[
+        bool, typer.Option("--keep-no-crop/--drop-no-crop", help="保留无前景 crop 的图")
+    ] = True,
+    crops_dir: Annotated[Path | None, typer.Option(help="crop 源目录(配 --crops-out)")] = None,
+    crops_out: Annotated[Path | None, typer.Option(help="crop 代表输出目录")] = None,
+    target_crops: Annotated[int, typer.Option(help="crop core-set 目标数(0=全部代表)")] = 0,
+    method: Annotated[
+        CoresetMethod, typer.Option(help="core-set 算法 faiss/kcenter/sklearn")
+    ] = "faiss",
+    link: Annotated[LinkMode, typer.Option(help="放置方式 hardlink/symlink/copy")] = "hardlink",
+    report: Annotated[Path | None, typer.Option(help="各阶段计数 JSON 输出")] = None,
+) -> None:
+    """SemDeDup → 整图姿态指纹 → (可选) core-set, 结果以链接放置."""
+    if crops_out is not None and crops_dir is None:
+        raise typer.BadParameter("--crops-out 需要 --crops-dir")
+    src, names = open_embeddings(embeddings)
+    near = NearDupCfg(
+        threshold=sem_threshold, k=k_neighbors, index=index, nprobe=nprobe, ef_search=ef_search
+    )
+    if compare_sample > 0:
+        logger.info("近似 vs 精确: {}", compare_with_exact(src, near, compare_sample))
+    rep = dedup_chain(
+        src,
+        names,
+        samples_dir,
+        out_dir,
+        near,
+        target_images=target_images,
+        keep_no_crop=keep_no_crop,
+        link=link,
+        crops_dir=crops_dir,
+        crops_out=crops_out,
+        target_crops=target_crops,
+        method=method,
+    )
+    if report is not None:
+        report.parent.mkdir(parents=True, exist_ok=True)
+        report.write_text(rep.model_dump_json(indent=2), encoding="utf-8")
+    logger.info("完成: {} 图 -> {} | {}", rep.n_images, rep.n_exported, out_dir)
+
+
+# ---------------------------------------------------------------------------
+# 单测（自包含：临时 samples + 合成 crop embedding；faiss 未安装时跳过）
+# ---------------------------------------------------------------------------
+
+import pytest  # noqa: E402
+from typer.testing import CliRunner  # noqa: E402
+
+
+def _fixture(root: Path) -> tuple[Path, Path]:
+    """4 张图：a/b 前景相同姿态（重复），c 不同，d 无前景；crop 向量落在 2 个方向上。"""
+    samples = root / "samples"
+    (samples / "images").mkdir(parents=True)
+    (samples / "labels").mkdir()
+    for stem in "abcd":
+        (samples / "images" / f"{stem}.jpg").write_bytes(stem.encode())
+        (samples / "labels" / f"{stem}.txt").write_text("0 0.5 0.5 0.1 0.1\n")
+    names = ["a_p0.jpg", "b_p0.jpg", "c_p0.jpg"]
+    emb = np.array([[1.0, 0.0], [1.0, 0.001], [0.0, 1.0]], np.float32)
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    np.save(root / "emb.npy", emb)
+    (root / "emb.txt").write_text("\n".join(names), encoding="utf-8")
+    return root / "emb.npy", samples
+
+
+def test_dedup_chain_fingerprint_and_links(tmp_path: Path) -> None:
+    pytest.importorskip("faiss")
+    emb_path, samples = _fixture(tmp_path)
+    src, names = open_embeddings(emb_path)
+    out = tmp_path / "out"
+    rep = dedup_chain(src, names, samples, out, NearDupCfg(), link="hardlink")
+    assert (rep.n_sem_reps, rep.n_fp_kept, rep.n_fp_dropped, rep.n_no_crop) == (2, 2, 1, 1)
+    assert sorted(p.stem for p in (out / "images").iterdir()) == ["a", "c", "d"]
+    assert (out / "images" / "a.jpg").stat().st_nlink == 2
+
+
+def test_main_drop_no_crop_and_report(tmp_path: Path) -> None:
+    pytest.importorskip("faiss")
+    emb_path, samples = _fixture(tmp_path)
+    out = tmp_path / "out"
+    res = CliRunner().invoke(
+        app,
+        [str(emb_path), str(samples), str(out), "--drop-no-crop", "--link", "copy",
+         "--report", str(tmp_path / "r.json")],
+    )  # fmt: skip
+    assert res.exit_code == 0, res.output
+    rep = DedupReport.model_validate_json((tmp_path / "r.json").read_text(encoding="utf-8"))
+    assert rep.n_exported == 2
+
+
+def test_main_crops_out_requires_crops_dir(tmp_path: Path) -> None:
+    res = CliRunner().invoke(
+        app, [str(tmp_path / "e.npy"), str(tmp_path), str(tmp_path / "o"), "--crops-out", "x"]
+    )
+    assert res.exit_code != 0 and "crops-dir" in res.output
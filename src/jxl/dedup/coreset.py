@@ -0,0 +1,233 @@
+"""core-set 选择：聚 k 簇，每簇取一个代表（统一契约：返回代表行号，升序，每簇一个）。
+
+旧 ``coreset_image`` / ``samples_core`` / ``yolo_coreset`` / ``dedup_sem`` 阶段2 各自
+拷了一份 ``MiniBatchKMeans`` + Python 循环找最近样本，k 上千、百万级向量时 CPU 上要数小时。
+:func:`select_coreset` 按 ``method`` 分派：
+
+- ``faiss``（默认）：:func:`faiss_kmeans_coreset`——``faiss.Kmeans`` 在 ``k * points_per_centroid``
+  行采样上训练（多线程），再分块流式把全部向量分配到最近 centroid，边分配边维护每簇最近样本；
+- ``kcenter``：:func:`kcenter_greedy`——k-center 贪心（最远点采样），每选一个中心分块增量更新
+  各点到已选中心的最近距离；覆盖半径意义上最分散，对离群样本敏感；
+- ``sklearn``：:func:`kmeans_coreset`——旧 ``MiniBatchKMeans`` 路径（全量读入，结果对照用）。
+
+辅助：
+
+- :func:`nearest_to_centroids`：向量化「每簇最近样本」（``lexsort`` 取每簇距离最小者）；
+- :func:`image_embeddings`：图 embedding = 该图全部前景 crop embedding 的均值（L2 归一化），
+  从 :data:`~jxl.io.embed_store.EmbeddingSource` 分块累加，不整体读入 crop 向量。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Container, Sequence
+from typing import Literal
+
+import numpy as np
+
+from jxl.dedup.fingerprint import crop_stem
+from jxl.io.embed_store import EmbeddingSource, iter_blocks, source_dim, take_rows
+
+CoresetMethod = Literal["faiss", "kcenter", "sklearn"]
+"""core-set 选择算法。"""
+
+_BLOCK = 65_536
+"""分块累加 / 分配的行数。"""
+
+
+def _best_per_label(labels: np.ndarray, d: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """每个出现的标签中 ``d`` 最小的行：``(标签升序, 行号)``。"""
+    order = np.lexsort((d, labels))
+    uniq, first = np.unique(labels[order], return_index=True)
+    return uniq, order[first]
+
+
+def nearest_to_centroids(x: np.ndarray, labels: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """每个非空簇中离其 centroid 最近的样本行号（升序）。"""
+    diff = x - centers[labels]
+    _, rows = _best_per_label(labels, np.einsum("ij,ij->i", diff, diff))
+    return np.sort(rows)
+
+
+def kmeans_coreset(x: np.ndarray, k: int, seed: int = 0) -> np.ndarray:
+    """MiniBatchKMeans 聚 ``min(k, n)`` 簇，返回每簇最近样本的行号（升序）。"""
+    from sklearn.cluster import MiniBatchKMeans  # noqa: PLC0415  # 重依赖按需拉入
+
+    k = min(k, len(x))
+    km = MiniBatchKMeans(n_clusters=k, random_state=seed, n_init=3, batch_size=2048)
+    labels = km.fit_predict(x)
+    return nearest_to_centroids(x, labels, km.cluster_centers_.astype(np.float32))
+
+
+def faiss_kmeans_coreset(
+    src: EmbeddingSource,
+    k: int,
+    seed: int = 0,
+    niter: int = 20,
+    points_per_centroid: int = 256,
+    threads: int = 0,
+) -> np.ndarray:
+    """``faiss.Kmeans`` core-set：采样训练 + 分块流式分配，返回每簇最近样本行号（升序）。
+
+    Args:
+        src: embedding（库 / mmap ``.npy`` / 数组）。
+        k: 簇数（``>= n`` 时全选）。
+        seed: 采样与初始化种子。
+        niter: k-means 迭代数。
+        points_per_centroid: 训练采样每簇行数（训练集 = ``k *`` 该值，不超过 n）。
+        threads: OpenMP 线程数（0 = faiss 默认，即全部核）。
+    """
+    import faiss  # noqa: PLC0415  # 可选重依赖：仅 faiss 路径拉入
+
+    n = len(src)
+    if k >= n:
+        return np.arange(n)
+    if threads > 0:
+        faiss.omp_set_num_threads(threads)
+    rng = np.random.default_rng(seed)
+    train = take_rows(src, np.sort(rng.choice(n, min(n, k * points_per_centroid), replace=False)))
+    km = faiss.Kmeans(
+        source_dim(src), k, niter=niter, seed=seed, max_points_per_centroid=points_per_centroid
+    )
+    km.train(train)
+    best_d = np.full(k, np.inf, np.float32)
+    best_i = np.full(k, -1, np.int64)
+    for start, x in iter_blocks(src, _BLOCK):
+        d, a = km.index.search(x, 1)  # 多线程最近 centroid 分配
+        uniq, rows = _best_per_label(a[:, 0], d[:, 0])
+        better = d[rows, 0] < best_d[uniq]
+        best_d[uniq[better]] = d[rows[better], 0]
+        best_i[uniq[better]] = start + rows[better]
+    return np.sort(best_i[best_i >= 0])
+
+
+def kcenter_greedy(src: EmbeddingSource, k: int, seed: int = 0) -> np.ndarray:
+    """k-center 贪心：反复选离已选中心最远的点，返回中心行号（升序、不重复）。
+
+    维护每点到已选中心的最近平方距离 ``min_d``（n 个 float32 常驻内存），每选一个中心只对
+    新中心分块算一遍距离并 ``minimum`` 合并——增量更新，总代价 O(k·n·dim)，无需两两距离。
+    不同向量不足 k 个时（``min_d`` 全为 0）提前停止，返回数少于 k。
+    """
+    n = len(src)
+    if k >= n:
+        return np.arange(n)
+    rng = np.random.default_rng(seed)
+    centers = [int(rng.integers(n))]
+    min_d = np.full(n, np.inf, np.float32)
+    for _ in range(k - 1):
+        c = take_rows(src, np.array(centers[-1:]))[0]
+        for start, x in iter_blocks(src, _BLOCK):
+            diff = x - c
+            seg = min_d[start : start + len(x)]
+            np.minimum(seg, np.einsum("ij,ij->i", diff, diff), out=seg)
+        far = int(np.argmax(min_d))
+        if min_d[far] <= 0:  # 剩余点都与已选中心重合
+            break
+        centers.append(far)
+    return np.unique(np.array(centers, np.int64))
+
+
+def select_coreset(
+    src: EmbeddingSource, k: int, method: CoresetMethod = "faiss", seed: int = 0
+) -> np.ndarray:
+    """按 ``method`` 选至多 ``min(k, n)`` 个代表，返回行号（升序、不重复，每簇一个）。"""
+    if method == "faiss":
+        return faiss_kmeans_coreset(src, k, seed)
+    if method == "kcenter":
+        return kcenter_greedy(src, k, seed)
+    return kmeans_coreset(take_rows(src, np.arange(len(src))), k, seed)
+
+
+def image_embeddings(
+    src: EmbeddingSource, names: Sequence[str], only: Container[str] | None = None
+) -> tuple[list[str], np.ndarray]:
+    """按原图 stem 聚合 crop embedding（均值 + L2 归一化）。
+
+    Args:
+        src: crop embedding。
+        names: crop 文件名（与 ``src`` 行对齐）。
+        only: 只聚合这些 stem（None = 全部）。
+
+    Returns:
+        ``(stems 升序, float32 [len(stems), dim])``。
+    """
+    stem_of = [crop_stem(n) for n in names]
+    stems = sorted({s for s in stem_of if s is not None and (only is None or s in only)})
+    pos = {s: i for i, s in enumerate(stems)}
+    row2img = np.array([pos.get(s, -1) if s is not None else -1 for s in stem_of], np.int64)
+    sums = np.zeros((len(stems), source_dim(src)), np.float64)
+    for start, x in iter_blocks(src, _BLOCK):
+        tgt = row2img[start : start + len(x)]
+        keep = tgt >= 0
+        np.add.at(sums, tgt[keep], x[keep])
+    counts = np.bincount(row2img[row2img >= 0], minlength=len(stems))
+    emb = (sums / np.maximum(counts, 1)[:, None]).astype(np.float32)
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True) + 1e-9
+    return stems, emb
+
+
+# ---------------------------------------------------------------------------
+# 单测（自包含：合成向量；sklearn / faiss 用例在未安装时跳过）
+# ---------------------------------------------------------------------------
+
+from pathlib import Path  # noqa: E402
+
+import pytest  # noqa: E402
+
+
+def test_nearest_to_centroids() -> None:
+    x = np.array([[0.0, 0.0], [0.9, 0.0], [0.1, 0.0], [5.0, 5.0], [6.0, 5.0]], np.float32)
+    labels = np.array([0, 0, 0, 2, 2])
+    centers = np.array([[0.0, 0.0], [9.0, 9.0], [5.9, 5.0]], np.float32)  # 簇 1 为空
+    np.testing.assert_array_equal(nearest_to_centroids(x, labels, centers), [0, 4])
+
+
+def test_image_embeddings_mean_and_filter() -> None:
+    names = ["a_p0.jpg", "b_p0.jpg", "a_p1.jpg", "junk.jpg"]
+    x = np.array([[1.0, 0.0], [0.0, 2.0], [0.0, 1.0], [7.0, 7.0]], np.float32)
+    stems, emb = image_embeddings(x, names)
+    assert stems == ["a", "b"]
+    np.testing.assert_allclose(emb, [[2**-0.5, 2**-0.5], [0.0, 1.0]], atol=1e-6)
+    stems, emb = image_embeddings(x, names, only={"b"})
+    assert stems == ["b"] and emb.shape == (1, 2)
+
+
+def test_kmeans_coreset_one_per_cluster() -> None:
+    pytest.importorskip("sklearn")
+    rng = np.random.default_rng(0)
+    centers = np.array([[0, 0], [10, 0], [0, 10]], np.float32)
+    x = np.repeat(centers, 20, axis=0) + 0.1 * rng.standard_normal((60, 2)).astype(np.float32)
+    reps = kmeans_coreset(x, 3)
+    assert len(reps) == 3 and sorted(int(r) // 20 for r in reps) == [0, 1, 2]
+
+
+def _blobs(per: int = 20) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    centers = np.array([[0, 0], [10, 0], [0, 10]], np.float32)
+    return np.repeat(centers, per, axis=0) + 0.1 * rng.standard_normal((3 * per, 2)).astype(
+        np.float32
+    )
+
+
+def test_kcenter_greedy_covers_clusters_and_streams(tmp_path: Path) -> None:
+    from jxl.io.embed_store import EmbeddingStore
+
+    x = _blobs()
+    reps = kcenter_greedy(x, 3)
+    assert sorted(int(r) // 20 for r in reps) == [0, 1, 2]
+    with EmbeddingStore(tmp_path, "m", 2, chunk=7) as store:
+        store.append([(f"{i}.jpg", 0, 0) for i in range(len(x))], x)
+    np.testing.assert_array_equal(kcenter_greedy(store, 3), reps)
+    np.testing.assert_array_equal(kcenter_greedy(x, 100), np.arange(60))
+
+
+def test_kcenter_greedy_stops_on_duplicates() -> None:
+    x = np.repeat(np.eye(3, dtype=np.float32), 4, axis=0)  # 3 个不同向量各 4 份
+    reps = kcenter_greedy(x, 5)
+    assert len(reps) == 3 and len(np.unique(reps)) == 3
+    assert sorted(int(r) // 4 for r in reps) == [0, 1, 2]
+
+
+def test_faiss_kmeans_coreset_one_per_cluster() -> None:
+    pytest.importorskip("faiss")
+    reps = select_coreset(_blobs(100), 3, "faiss")
+    assert len(reps) == 3 and sorted(int(r) // 100 for r in reps) == [0, 1, 2]
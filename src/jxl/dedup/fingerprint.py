@@ -0,0 +1,87 @@
+"""整图姿态指纹去重（场景A）：每张图 = 其前景 crop 的近重复簇 id 集合。
+
+监控背景完全相同，整图 pHash/CLIP 被背景主导；改用前景指纹——相同簇集合的图视为重复
+（同实例同姿态的相邻帧），按图序留第一张。簇 id 直接取自 :func:`jxl.dedup.near_dup.near_dup_labels`
+的内存结果，不再经 ``sem_cluster_map.npy`` 中转。
+
+无前景 crop 的图（负样本 / 空标、退化极小 bbox）不参与指纹，单独列出，由调用方决定保留与否
+（负样本对假阳抑制重要，统一 CLI 默认保留）。
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from collections.abc import Sequence
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+CROP_RE = re.compile(r"(.*)_p\d+\.jpg$")
+"""前景 crop 文件名: ``<原图stem>_p<序号>.jpg``（见 ``person_crop`` / ``crop_foreground``）。"""
+
+
+def crop_stem(name: str) -> str | None:
+    """crop 文件名（可含子目录）→ 原图 stem；不符合命名约定返回 None。"""
+    m = CROP_RE.match(name.rsplit("/", 1)[-1])
+    return m.group(1) if m else None
+
+
+def image_clusters(names: Sequence[str], labels: np.ndarray) -> dict[str, frozenset[int]]:
+    """原图 stem → 其 crop 的簇 id 集合（指纹）。"""
+    groups: dict[str, set[int]] = defaultdict(set)
+    for name, cid in zip(names, labels.tolist(), strict=True):
+        stem = crop_stem(name)
+        if stem is not None:
+            groups[stem].add(cid)
+    return {s: frozenset(c) for s, c in groups.items()}
+
+
+class FpResult(BaseModel):
+    """指纹去重结果（均保持输入图序）。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    kept: list[str] = Field(description="指纹首次出现的图 stem（去重代表）")
+    dropped: list[str] = Field(description="指纹重复而去掉的图 stem")
+    no_crop: list[str] = Field(description="无前景 crop（无指纹）的图 stem")
+
+
+def fingerprint_dedup(stems: Sequence[str], clusters: dict[str, frozenset[int]]) -> FpResult:
+    """按 ``stems`` 顺序做指纹去重：相同指纹只留第一张。"""
+    seen: set[frozenset[int]] = set()
+    kept: list[str] = []
+    dropped: list[str] = []
+    no_crop: list[str] = []
+    for stem in stems:
+        fp = clusters.get(stem)
+        if not fp:
+            no_crop.append(stem)
+        elif fp in seen:
+            dropped.append(stem)
+        else:
+            seen.add(fp)
+            kept.append(stem)
+    return FpResult(kept=kept, dropped=dropped, no_crop=no_crop)
+
+
+# ---------------------------------------------------------------------------
+# 单测（自包含：合成文件名 + 簇标签）
+# ---------------------------------------------------------------------------
+
+
+def test_crop_stem() -> None:
+    assert crop_stem("cam1_0001_p0.jpg") == "cam1_0001"
+    assert crop_stem("sub/a_b_p12.jpg") == "a_b"
+    assert crop_stem("cam1_0001.jpg") is None
+
+
+def test_fingerprint_dedup_keeps_first_and_lists_no_crop() -> None:
+    names = ["a_p0.jpg", "a_p1.jpg", "b_p0.jpg", "b_p1.jpg", "c_p0.jpg", "junk.jpg"]
+    labels = np.array([0, 2, 2, 0, 0, 9])
+    clusters = image_clusters(names, labels)
+    assert clusters == {"a": frozenset({0, 2}), "b": frozenset({0, 2}), "c": frozenset({0})}
+    res = fingerprint_dedup(["a", "b", "c", "d"], clusters)
+    assert res.kept == ["a", "c"]
+    assert res.dropped == ["b"]
+    assert res.no_crop == ["d"]
@@ -23,13 +23,13 @@ from pathlib import Path
 
 import cv2
 import numpy as np
-import onnxruntime as ort
 from jvi.geo.rectangle import Rect
 from jvi.image.image_nda import ImageNda
 from numpy.typing import NDArray
 from sklearn.cluster import DBSCAN
 
 from jxl.det.d2d import D2dObject, D2dOpt, D2dResult, Detector2D
+from jxl.onnx.session import OrtCfg, shared_ort_session
 
 
 class PeopleNetClass(IntEnum):
@@ -199,23 +199,24 @@ _CUDA_EP = "CUDAExecutionProvider"
 _CPU_DEVICE = "cpu"
 
 
-def _providers_for(device_name: str) -> list[str]:
-    """device_name → onnxruntime providers 列表。
+def _ort_cfg_for(device_name: str) -> OrtCfg:
+    """device_name → ort 会话配置。
 
     device_name == _CPU_DEVICE 显式走 CPU（保留 ml-peoplenet 数值基准的对照能力）;
     其余（"cuda:0" / "" 等）走 GPU。
     """
-    if device_name == _CPU_DEVICE:
-        return ["CPUExecutionProvider"]
-    return [_CUDA_EP]
+    return OrtCfg(provider="cpu" if device_name == _CPU_DEVICE else "cuda")
 
 
 class D2dPeopleNet(Detector2D):
     """PeopleNet 2D 检测器 (DetectNet_v2 + ResNet34)。
 
     onnxruntime 推理 + 手写 GridBox 后处理。默认 GPU (CUDAExecutionProvider);
-    device_name="cpu" 显式走 CPU。GPU 不可用时立即报错, 不静默回退 CPU
-    （No Silent Degradation, 对齐 jxl/bin/person_embed.py 的 device 校验惯例）。
+    device_name="cpu" 显式走 CPU。GPU 不可用时立即报错 ``RuntimeError``, 不静默回退 CPU
+    （No Silent Degradation, 对齐 jxl/bin/person_embed.py 的 device 校验惯例）;
+    CUDA EP 缺失 / 权重加载失败抛 :class:`jxl.onnx.session.OrtLoadError`（``RuntimeError``
+    子类）。session 取自进程级注册表（:func:`jxl.onnx.session.shared_ort_session`），
+    同进程内重复构造检测器不重复加载权重。
     """
 
     model_class = "D2dPeopleNet"
@@ -228,8 +229,8 @@ class D2dPeopleNet(Detector2D):
         verbose: bool = False,
     ) -> None:
         super().__init__(model_path, opt, device_name, verbose)
-        providers = _providers_for(device_name)
-        self._sess = ort.InferenceSession(str(model_path), providers=providers)
+        # 进程级注册表：同权重同 device 的多个实例共享一个 session（只加载一次）。
+        self._sess = shared_ort_session(str(model_path), _ort_cfg_for(device_name))
         # No Silent Degradation: 要求 GPU 时校验 CUDAExecutionProvider 实际生效。
         if device_name != _CPU_DEVICE and _CUDA_EP not in self._sess.get_providers():
             raise RuntimeError(
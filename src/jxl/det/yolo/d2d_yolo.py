@@ -4,7 +4,7 @@ from jvi.image.image_nda import ImageNda
 from ultralytics import YOLO
 
 from jxl.det.d2d import D2dOpt, D2dResult, Detector2D
-from jxl.yolo.results import results_list_to_d2d_result
+from jxl.yolo.results import results_list_to_d2d_result, results_list_to_d2d_results
 
 
 class D2dYolo(Detector2D):
@@ -55,3 +55,30 @@ class D2dYolo(Detector2D):
                 verbose=self._verbose,
             )
         return results_list_to_d2d_result(results_list)
+
+    def detect_batch(self, images: list[ImageNda]) -> list[D2dResult]:
+        """批量检测多帧图像
+
+        多帧拼成一个 batch 走单次 predict forward, 摊薄逐帧调用开销. 仅支持检测模式:
+        跟踪模式有跨帧状态, 须逐帧 detect.
+
+        Args:
+            images: list[ImageNda] - 输入图像列表(BGR), 尺寸可不同(由 letterbox 统一)
+
+        Returns:
+            list[D2dResult] - 与 images 逐位置对齐的检测结果
+
+        Raises:
+            ValueError: 跟踪模式(opt.track=True)下调用
+        """
+        if self._opt.track:
+            raise ValueError("跟踪模式有跨帧状态, 不支持批量检测, 请逐帧调用 detect")
+        if not images:
+            return []
+        results_list = self._model.predict(
+            [image.data() for image in images],
+            conf=self._opt.conf_thr,
+            iou=self._opt.iou_thr,
+            verbose=self._verbose,
+        )
+        return results_list_to_d2d_results(results_list)
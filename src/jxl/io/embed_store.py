@@ -0,0 +1,539 @@
+"""可续跑的 embedding 库 —— 分片落盘、增量追加、mmap 读取。
+
+``embed_dino`` / ``person_embed`` / ``person_reid_embed`` 旧流程各自把全部向量攒在内存里，
+末尾一次性写 ``.npy`` + ``.txt``：中途崩溃前功尽弃，目录增长后重跑要全量重算。
+:class:`EmbeddingStore` 把 embedding 写成目录::
+
+    store/
+      meta.json           模型 id / 维度 / 存储 dtype
+      index.jsonl         每行一条: {"name", "mtime_ns", "size", "shard", "row"}
+      shard_00000.npy     [n, dim] float16|float32, 每满 chunk 行落一片
+      shard_00001.npy
+      ...
+
+- **续跑**：分片先写临时文件再 ``os.replace``，之后才追加索引行；崩溃最多丢未落盘的
+  一个 chunk，索引未引用的孤儿分片在下次落盘时被覆盖。
+- **增量**：键 = 相对路径 + mtime + size（模型 id 在 ``meta.json``，换模型即拒绝打开）；
+  :meth:`EmbeddingStore.pending` 只返回库中没有或已变化的文件。同名条目以最后写入为准。
+- **读取**：:meth:`EmbeddingStore.iter_chunks` 按分片 mmap 迭代（不整体进内存）；
+  :func:`load_embeddings` 兼容旧 ``.npy`` + ``.txt`` 与库目录，供 dedup/coreset 工具统一读取。
+
+**不依赖任何业务子包**（同 :mod:`jxl.io.video`）。
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterator, Sequence
+from pathlib import Path
+from types import TracebackType
+from typing import Literal, Self
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field
+
+from jxl.io.image_loader import LoadStats, PrefetchLoader, load_rgb
+
+StoreDtype = Literal["float16", "float32"]
+"""分片存储精度：float16 省一半磁盘与页缓存，读出统一转 float32。"""
+
+META_FILE = "meta.json"
+INDEX_FILE = "index.jsonl"
+
+
+class EmbedStoreError(Exception):
+    """embedding 库错误：meta 不匹配（模型 / 维度 / dtype）、向量形状非法、目录非库。"""
+
+
+class StoreMeta(BaseModel):
+    """库元信息（``meta.json``）。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    model: str = Field(description="模型 id（名称 + 权重标识），换模型须换库")
+    dim: int = Field(gt=0, description="embedding 维度")
+    dtype: StoreDtype = Field(description="分片存储精度")
+
+
+class IndexEntry(BaseModel):
+    """索引行：文件键 + 向量位置。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str = Field(description="相对源目录的路径（posix）")
+    mtime_ns: int = Field(description="文件修改时间（纳秒）")
+    size: int = Field(description="文件字节数")
+    shard: int = Field(ge=0, description="分片序号")
+    row: int = Field(ge=0, description="分片内行号")
+
+
+def shard_path(root: Path, shard: int) -> Path:
+    """第 ``shard`` 片的路径。"""
+    return root / f"shard_{shard:05d}.npy"
+
+
+def file_key(path: Path, root: Path) -> tuple[str, int, int]:
+    """文件键 ``(相对路径, mtime_ns, size)``。"""
+    st = path.stat()
+    return path.relative_to(root).as_posix(), st.st_mtime_ns, st.st_size
+
+
+class EmbeddingStore:
+    """分片 embedding 库（上下文管理器：退出时落盘剩余缓冲）。"""
+
+    def __init__(
+        self,
+        root: Path,
+        model: str,
+        dim: int,
+        dtype: StoreDtype = "float32",
+        chunk: int = 4096,
+    ) -> None:
+        """打开或新建库；已有库的 ``model`` / ``dim`` / ``dtype`` 须一致。
+
+        Args:
+            root: 库目录（不存在则创建）。
+            model: 模型 id，写入 ``meta.json``，续跑时校验。
+            dim: embedding 维度。
+            dtype: 分片存储精度。
+            chunk: 每片行数（崩溃最多丢失一个 chunk 的计算量）。
+        """
+        if chunk <= 0:
+            raise ValueError(f"chunk 必须 > 0，实际 {chunk}")
+        meta = StoreMeta(model=model, dim=dim, dtype=dtype)
+        root.mkdir(parents=True, exist_ok=True)
+        meta_path = root / META_FILE
+        if meta_path.exists():
+            old = StoreMeta.model_validate_json(meta_path.read_text(encoding="utf-8"))
+            if old != meta:
+                raise EmbedStoreError(f"库 meta 不匹配: 已有 {old}, 请求 {meta} ({root})")
+        else:
+            meta_path.write_text(meta.model_dump_json(indent=2), encoding="utf-8")
+        self.root = root
+        self.meta = meta
+        self._chunk = chunk
+        self._entries = _read_index(root)
+        self._latest = _latest_by_name(self._entries)
+        self._next_shard = max((e.shard for e in self._entries), default=-1) + 1
+        self._buf_keys: list[tuple[str, int, int]] = []
+        self._buf_vecs: list[np.ndarray] = []
+        self._n_buf = 0
+
+    @classmethod
+    def open(cls, root: Path) -> Self:
+        """按已有 ``meta.json`` 打开库（读取侧无需知道模型参数）。"""
+        meta_path = root / META_FILE
+        if not meta_path.is_file():
+            raise EmbedStoreError(f"不是 embedding 库（缺 {META_FILE}）: {root}")
+        meta = StoreMeta.model_validate_json(meta_path.read_text(encoding="utf-8"))
+        return cls(root, meta.model, meta.dim, meta.dtype)
+
+    def __len__(self) -> int:
+        """有效条目数（同名以最后写入为准，不含未落盘缓冲）。"""
+        return len(self._latest)
+
+    def names(self) -> list[str]:
+        """有效条目名，顺序同 :meth:`iter_chunks` / :meth:`vectors`。"""
+        return [name for name, _ in self._live()]
+
+    def pending(self, files: Sequence[Path], root: Path) -> list[Path]:
+        """``files`` 中库里没有、或 mtime/size 已变化的文件（保持原顺序）。"""
+        out = []
+        for f in files:
+            name, mtime_ns, size = file_key(f, root)
+            e = self._latest.get(name)
+            if e is None or e.mtime_ns != mtime_ns or e.size != size:
+                out.append(f)
+        return out
+
+    def append(self, keys: Sequence[tuple[str, int, int]], vecs: np.ndarray) -> None:
+        """追加一批 ``(键, 向量)``；缓冲满 ``chunk`` 行即落盘一片。"""
+        if vecs.ndim != 2 or vecs.shape[1] != self.meta.dim or len(keys) != len(vecs):
+            raise EmbedStoreError(
+                f"向量形状 {vecs.shape} 与键数 {len(keys)} / dim {self.meta.dim} 不符"
+            )
+        self._buf_keys.extend(keys)
+        self._buf_vecs.append(np.asarray(vecs, self.meta.dtype))
+        self._n_buf += len(keys)
+        while self._n_buf >= self._chunk:
+            self._flush(self._chunk)
+
+    def flush(self) -> None:
+        """缓冲剩余行落盘为一片（无缓冲则不动）。"""
+        if self._n_buf:
+            self._flush(self._n_buf)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.flush()  # 异常退出也落盘已算好的向量——续跑的意义所在
+
+    def iter_chunks(self) -> Iterator[tuple[list[str], np.ndarray]]:
+        """按分片迭代 ``(names, vecs)``；``vecs`` 为只读 mmap 视图（存储 dtype）。"""
+        by_shard: dict[int, list[IndexEntry]] = {}
+        for _, e in self._live():
+            by_shard.setdefault(e.shard, []).append(e)
+        for shard, entries in by_shard.items():
+            arr = np.load(shard_path(self.root, shard), mmap_mode="r")
+            rows = [e.row for e in entries]
+            view = arr if rows == list(range(len(arr))) else arr[rows]
+            yield [e.name for e in entries], view
+
+    def vectors(self) -> np.ndarray:
+        """全部有效向量拼为 float32 矩阵（顺序同 :meth:`names`）。"""
+        parts = [np.asarray(v, np.float32) for _, v in self.iter_chunks()]
+        if not parts:
+            return np.zeros((0, self.meta.dim), np.float32)
+        return np.concatenate(parts)
+
+    # -- 内部 --------------------------------------------------------------
+
+    def _live(self) -> list[tuple[str, IndexEntry]]:
+        """有效条目（按所在分片 / 行排序，保证分片内顺序读）。"""
+        return sorted(self._latest.items(), key=lambda kv: (kv[1].shard, kv[1].row))
+
+    def _flush(self, n: int) -> None:
+        vecs = np.concatenate(self._buf_vecs)
+        keys = self._buf_keys
+        shard = self._next_shard
+        path = shard_path(self.root, shard)
+        tmp = path.with_suffix(".tmp.npy")
+        np.save(tmp, vecs[:n])
+        os.replace(tmp, path)
+        entries = [
+            IndexEntry(name=k[0], mtime_ns=k[1], size=k[2], shard=shard, row=i)
+            for i, k in enumerate(keys[:n])
+        ]
+        index = self.root / INDEX_FILE
+        _drop_torn_tail(index)
+        with index.open("a", encoding="utf-8") as fp:
+            fp.write("".join(e.model_dump_json() + "\n" for e in entries))
+            fp.flush()
+            os.fsync(fp.fileno())
+        self._entries.extend(entries)
+        self._latest.update((e.name, e) for e in entries)
+        self._next_shard += 1
+        self._buf_keys = keys[n:]
+        self._buf_vecs = [vecs[n:]] if n < len(vecs) else []
+        self._n_buf -= n
+
+
+def _read_index(root: Path) -> list[IndexEntry]:
+    """读索引；无换行结尾的末行视为追加中崩溃的残缺行而丢弃，其余行损坏照常报错。"""
+    path = root / INDEX_FILE
+    if not path.exists():
+        return []
+    done, _, _ = path.read_text(encoding="utf-8").rpartition("\n")
+    return [IndexEntry.model_validate_json(line) for line in done.splitlines()]
+
+
+def _drop_torn_tail(path: Path) -> None:
+    """把索引截回最后一个换行（去掉残缺末行），使追加从新行开始。"""
+    if not path.exists():
+        return
+    with path.open("rb+") as fp:
+        if fp.seek(0, os.SEEK_END) == 0:
+            return
+        fp.seek(-1, os.SEEK_END)
+        if fp.read(1) == b"\n":
+            return
+        fp.seek(0)
+        fp.truncate(fp.read().rfind(b"\n") + 1)
+
+
+def _latest_by_name(entries: list[IndexEntry]) -> dict[str, IndexEntry]:
+    latest: dict[str, IndexEntry] = {}
+    for e in entries:
+        latest[e.name] = e
+    return latest
+
+
+def embed_into[T](
+    store: EmbeddingStore,
+    src_dir: Path,
+    files: Sequence[Path],
+    embed_batch: Callable[[list[T]], np.ndarray],
+    batch: int,
+    load: Callable[[Path], T] = load_rgb,  # type: ignore[assignment]
+    workers: int = 4,
+    depth: int = 4,
+    log: Callable[[str], None] = logger.info,
+) -> LoadStats:
+    """增量提取：只对 ``store`` 中缺失/变化的文件跑 ``embed_batch``，逐批追加入库。
+
+    解码 + 逐图预处理（``load``）由 :class:`~jxl.io.image_loader.PrefetchLoader` 在工作池
+    中预取，与 ``embed_batch`` 的推理重叠。读图失败的文件记日志后跳过（不入库，下次仍在
+    pending 中）。
+
+    Args:
+        store: 目标库。
+        src_dir: 源目录（键为相对它的路径）。
+        files: 候选文件。
+        embed_batch: ``list[load 结果] -> [n, dim]`` 推理函数。
+        batch: 推理批大小。
+        load: 逐图加载 + 预处理（默认 PIL RGB）。
+        workers: 解码工作线程数（0 = 主线程同步）。
+        depth: 预取深度（批）。
+        log: 进度日志函数。
+
+    Returns:
+        加载吞吐报告（``n_ok`` 即本次新写入的条目数）。
+    """
+    todo = store.pending(files, src_dir)
+    log(f"候选 {len(files)} 张, 库中已有 {len(files) - len(todo)}, 待提取 {len(todo)}")
+    loader = PrefetchLoader(
+        todo,
+        load,
+        batch,
+        workers=workers,
+        depth=depth,
+        on_error=lambda f, e: log(f"读取失败 {f.name}: {e}"),
+    )
+    done = 0
+    every = batch * 20
+    for items in loader:
+        keys = [file_key(f, src_dir) for f, _ in items]
+        store.append(keys, embed_batch([x for _, x in items]))
+        prev, done = done, done + len(items)
+        if done // every != prev // every:  # 跨过 every 的整数倍即报（不要求 done 恰好整除）
+            log(f"进度 {done}/{len(todo)}")
+    store.flush()
+    return loader.stats()
+
+
+def export_npy(store: EmbeddingStore, out_npy: Path) -> None:
+    """导出旧格式 ``.npy``（float32）+ 同名 ``.txt``（条目名，顺序对齐）。"""
+    out_npy.parent.mkdir(parents=True, exist_ok=True)
+    np.save(out_npy, store.vectors())
+    out_npy.with_suffix(".txt").write_text("\n".join(store.names()), encoding="utf-8")
+
+
+def load_embeddings(path: Path) -> tuple[np.ndarray, list[str]]:
+    """读 embedding：库目录或旧 ``.npy`` + 同名 ``.txt``，返回 ``(float32 [n, dim], names)``。"""
+    src, names = open_embeddings(path)
+    if isinstance(src, EmbeddingStore):
+        return src.vectors(), names
+    return np.asarray(src, np.float32), names
+
+
+# ---------------------------------------------------------------------------
+# 流式读取：库与旧 .npy（mmap）统一为 EmbeddingSource，按块 / 按行取，不整体进内存
+# ---------------------------------------------------------------------------
+
+type EmbeddingSource = EmbeddingStore | np.ndarray
+"""embedding 来源：库，或 ``[n, dim]`` 数组（含旧 ``.npy`` 的 mmap）。"""
+
+
+def open_embeddings(path: Path) -> tuple[EmbeddingSource, list[str]]:
+    """打开库目录或旧 ``.npy``（``mmap_mode="r"``）+ 同名 ``.txt``，不读入向量。"""
+    if path.is_dir():
+        store = EmbeddingStore.open(path)
+        return store, store.names()
+    emb = np.load(path, mmap_mode="r")
+    names = path.with_suffix(".txt").read_text(encoding="utf-8").splitlines()
+    if len(names) != len(emb):
+        raise EmbedStoreError(f"{path} 行数 {len(emb)} 与文件名数 {len(names)} 不符")
+    return emb, names
+
+
+def source_dim(src: EmbeddingSource) -> int:
+    """embedding 维度。"""
+    return src.meta.dim if isinstance(src, EmbeddingStore) else int(src.shape[1])
+
+
+def iter_blocks(src: EmbeddingSource, block: int) -> Iterator[tuple[int, np.ndarray]]:
+    """按行块迭代 ``(起始行, float32 [<=block, dim])``，行号与 ``names()`` 对齐。"""
+    chunks = (v for _, v in src.iter_chunks()) if isinstance(src, EmbeddingStore) else (src,)
+    start = 0
+    for v in chunks:
+        for s in range(0, len(v), block):
+            x = np.ascontiguousarray(v[s : s + block], np.float32)
+            yield start, x
+            start += len(x)
+
+
+def take_rows(src: EmbeddingSource, idx: np.ndarray) -> np.ndarray:
+    """按全局行号取向量（float32，顺序同 ``idx``）；库按分片逐片 gather。"""
+    idx = np.asarray(idx, np.int64)
+    if not isinstance(src, EmbeddingStore):
+        return np.asarray(src[idx], np.float32)
+    out = np.empty((len(idx), src.meta.dim), np.float32)
+    order = np.argsort(idx, kind="stable")
+    sorted_idx = idx[order]
+    offset = 0
+    for _, v in src.iter_chunks():
+        lo, hi = np.searchsorted(sorted_idx, [offset, offset + len(v)])
+        if hi > lo:
+            out[order[lo:hi]] = v[sorted_idx[lo:hi] - offset]
+        offset += len(v)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# 单测（自包含：临时目录 + 随机向量 / 合成图像，零模型）
+# ---------------------------------------------------------------------------
+
+import pytest  # noqa: E402
+
+
+def _keys(n: int, start: int = 0) -> list[tuple[str, int, int]]:
+    return [(f"{i:04d}.jpg", 1, 10) for i in range(start, start + n)]
+
+
+def test_append_chunks_and_mmap_reader(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    vecs = rng.standard_normal((10, 4)).astype(np.float32)
+    with EmbeddingStore(tmp_path, "m", 4, chunk=4) as store:
+        store.append(_keys(7), vecs[:7])
+        assert len(store) == 4  # 满 chunk 才落盘
+        store.append(_keys(3, 7), vecs[7:])
+    assert sorted(p.name for p in tmp_path.glob("shard_*.npy")) == [
+        "shard_00000.npy",
+        "shard_00001.npy",
+        "shard_00002.npy",
+    ]
+    store = EmbeddingStore.open(tmp_path)
+    chunks = list(store.iter_chunks())
+    assert [len(n) for n, _ in chunks] == [4, 4, 2]
+    assert isinstance(chunks[0][1], np.memmap)
+    np.testing.assert_array_equal(store.vectors(), vecs)
+    assert store.names() == [k[0] for k in _keys(10)]
+
+
+def test_float16_storage_reads_float32(tmp_path: Path) -> None:
+    vecs = np.full((3, 2), 0.5, np.float32)
+    with EmbeddingStore(tmp_path, "m", 2, dtype="float16") as store:
+        store.append(_keys(3), vecs)
+    assert np.load(shard_path(tmp_path, 0)).dtype == np.float16
+    emb, names = load_embeddings(tmp_path)
+    assert emb.dtype == np.float32 and len(names) == 3
+
+
+def test_meta_mismatch_rejected(tmp_path: Path) -> None:
+    EmbeddingStore(tmp_path, "dino-s", 384)
+    with pytest.raises(EmbedStoreError, match="meta"):
+        EmbeddingStore(tmp_path, "dino-b", 384)
+    with pytest.raises(EmbedStoreError, match="不是"):
+        EmbeddingStore.open(tmp_path / "nope")
+
+
+def test_bad_shape_rejected(tmp_path: Path) -> None:
+    store = EmbeddingStore(tmp_path, "m", 4)
+    with pytest.raises(EmbedStoreError, match="形状"):
+        store.append(_keys(2), np.zeros((2, 3), np.float32))
+
+
+def test_pending_and_latest_wins(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    files = [src / f"{i}.jpg" for i in range(3)]
+    for f in files:
+        f.write_bytes(b"x")
+    root = tmp_path / "store"
+    with EmbeddingStore(root, "m", 2) as store:
+        keys = [file_key(f, src) for f in files[:2]]
+        store.append(keys, np.zeros((2, 2), np.float32))
+    store = EmbeddingStore(root, "m", 2)
+    assert store.pending(files, src) == [files[2]]
+    files[0].write_bytes(b"changed")  # size 变化 → 重新提取
+    assert store.pending(files, src) == [files[0], files[2]]
+    with store:
+        store.append([file_key(files[0], src)], np.ones((1, 2), np.float32))
+    store = EmbeddingStore.open(root)
+    assert len(store) == 2 and store.names() == ["1.jpg", "0.jpg"]
+    np.testing.assert_array_equal(store.vectors()[1], [1.0, 1.0])
+
+
+def test_crash_leaves_resumable_store(tmp_path: Path) -> None:
+    """异常退出落盘缓冲；索引末行残缺被丢弃，孤儿分片被下次落盘覆盖。"""
+    with pytest.raises(RuntimeError), EmbeddingStore(tmp_path, "m", 2, chunk=8) as store:
+        store.append(_keys(3), np.zeros((3, 2), np.float32))
+        raise RuntimeError("boom")
+    with (tmp_path / INDEX_FILE).open("a", encoding="utf-8") as fp:
+        fp.write('{"name": "trunc')
+    np.save(shard_path(tmp_path, 1), np.zeros((5, 2), np.float32))  # 孤儿分片
+    with EmbeddingStore(tmp_path, "m", 2) as store:
+        assert len(store) == 3
+        store.append(_keys(1, 3), np.ones((1, 2), np.float32))
+    assert np.load(shard_path(tmp_path, 1)).shape == (1, 2)
+    store = EmbeddingStore.open(tmp_path)  # 残缺行已截掉，续写的条目完好可读
+    assert len(store) == 4 and store.vectors().shape == (4, 2)
+
+
+def test_embed_into_is_incremental(tmp_path: Path) -> None:
+    from PIL import Image
+
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(5):
+        Image.new("RGB", (4, 4), (i, 0, 0)).save(src / f"{i}.jpg")
+    (src / "bad.jpg").write_bytes(b"not a jpeg")
+    calls: list[int] = []
+
+    def embed(imgs: list) -> np.ndarray:
+        calls.append(len(imgs))
+        return np.ones((len(imgs), 3), np.float32)
+
+    files = sorted(src.glob("*.jpg"))
+    store = EmbeddingStore(tmp_path / "st", "m", 3)
+    assert embed_into(store, src, files[:3], embed, batch=2, log=lambda _: None).n_ok == 3
+    assert calls == [2, 1]
+    st = embed_into(store, src, files, embed, batch=2, workers=0, log=lambda _: None)
+    assert st.n_ok == 2 and st.n_failed == 1
+    assert len(store) == 5 and "bad.jpg" not in store.names()
+
+
+def test_embed_into_progress_with_failed_images(tmp_path: Path) -> None:
+    from PIL import Image
+
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "00_bad.jpg").write_bytes(b"not a jpeg")
+    for i in range(44):
+        Image.new("RGB", (2, 2)).save(src / f"{i + 1:02d}.jpg")
+    logs: list[str] = []
+    store = EmbeddingStore(tmp_path / "st", "m", 1)
+    files = sorted(src.glob("*.jpg"))
+    embed_into(store, src, files, lambda xs: np.ones((len(xs), 1), np.float32), 2, log=logs.append)
+    assert [m for m in logs if m.startswith("进度")] == ["进度 40/45"]
+
+
+def test_export_and_load_legacy(tmp_path: Path) -> None:
+    vecs = np.arange(6, dtype=np.float32).reshape(3, 2)
+    with EmbeddingStore(tmp_path / "st", "m", 2) as store:
+        store.append(_keys(3), vecs)
+    export_npy(store, tmp_path / "emb.npy")
+    emb, names = load_embeddings(tmp_path / "emb.npy")
+    np.testing.assert_array_equal(emb, vecs)
+    assert names == store.names()
+    (tmp_path / "emb.txt").write_text("a", encoding="utf-8")
+    with pytest.raises(EmbedStoreError, match="不符"):
+        load_embeddings(tmp_path / "emb.npy")
+
+
+def test_stream_helpers_match_dense(tmp_path: Path) -> None:
+    rng = np.random.default_rng(1)
+    vecs = rng.standard_normal((11, 3)).astype(np.float32)
+    with EmbeddingStore(tmp_path / "st", "m", 3, chunk=4) as store:
+        store.append(_keys(11), vecs)
+    np.save(tmp_path / "e.npy", vecs)
+    (tmp_path / "e.txt").write_text("\n".join(store.names()), encoding="utf-8")
+    idx = np.array([9, 0, 5, 5, 3])
+    for path in (tmp_path / "st", tmp_path / "e.npy"):
+        src, names = open_embeddings(path)
+        assert len(names) == 11 and source_dim(src) == 3
+        blocks = list(iter_blocks(src, 3))
+        starts = np.cumsum([0] + [len(b) for _, b in blocks[:-1]])
+        assert [s for s, _ in blocks] == starts.tolist()  # 跨分片行号连续
+        np.testing.assert_array_equal(np.concatenate([b for _, b in blocks]), vecs)
+        np.testing.assert_array_equal(take_rows(src, idx), vecs[idx])
@@ -9,9 +9,14 @@ vdt 与 vtag 共用的零业务依赖视频读写。提炼自 ``jxl/vdt/decoder.
 
 from __future__ import annotations
 
-from collections.abc import Iterator
+import itertools
+import queue
+import threading
+from collections.abc import Generator, Iterator
+from contextlib import closing
 from pathlib import Path
 from types import TracebackType
+from typing import Literal
 
 import cv2
 import numpy as np
@@ -25,6 +30,59 @@ class VideoIoError(Exception):
     """
 
 
+SeekMode = Literal["auto", "never", "always"]
+"""``VideoReader`` 采样策略：auto=按关键帧间隔自适应；never=始终顺序 grab；always=每个
+采样点都 seek（基准对照用）。"""
+
+Backend = Literal["opencv", "ffmpeg", "pyav"]
+"""``VideoReader`` 解码后端（非 opencv 见 :mod:`jxl.io.video_backends`）。"""
+
+ColorMode = Literal["bgr", "rgb", "gray"]
+"""``VideoReader`` 输出色彩空间（gray 为 ``[H,W]`` 单通道）。"""
+
+_CVT: dict[str, int] = {"rgb": cv2.COLOR_BGR2RGB, "gray": cv2.COLOR_BGR2GRAY}
+
+type _Frames = Generator[tuple[int, int, np.ndarray], None, None]
+"""解码内部流：``(源帧号, ts_ms, 帧)``（与 ``video_backends.Decoded`` 同构）。"""
+
+_SEEK_GOP_FACTOR = 2
+"""auto 模式 seek 门限 = GOP × 本系数。seek 需冲刷解码器并从关键帧重解（平均 GOP/2 帧
++ 固定开销），实测（``benchmarks/bench_video_seek.py``，640x360 mp4v，GOP=12）交叉点
+在 stride ≈ 2×GOP：stride=12 seek 慢 1.5×，stride=25 持平，stride=50 快 2×。"""
+
+_PROBE_PACKETS = 600
+"""``probe_keyframe_interval`` 默认探测的包数（仅解封装，25fps 下约 24s 视频）。"""
+
+
+def probe_keyframe_interval(path: str, max_packets: int = _PROBE_PACKETS) -> int | None:
+    """探测视频关键帧间隔（GOP，单位：帧）。
+
+    以 cv2 FFmpeg 后端的**原始包模式**（``CAP_PROP_FORMAT=-1``：``grab`` 只读包不解码）
+    扫前 ``max_packets`` 个包，取相邻关键帧的**最大**间距（保守：按最坏 GOP 决策）。
+    窗口内仅 1 个关键帧 → 返回已读包数（GOP 至少这么长）。
+
+    Returns:
+        关键帧间隔；后端不支持原始包模式 / 读不到关键帧 → None（调用方按顺序解码处理）。
+    """
+    cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG)
+    try:
+        if not cap.isOpened() or not cap.set(cv2.CAP_PROP_FORMAT, -1):
+            return None
+        keys: list[int] = []
+        n = 0
+        while n < max_packets and cap.grab():
+            if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                keys.append(n)
+            n += 1
+    finally:
+        cap.release()
+    if not keys:
+        return None
+    if len(keys) == 1:
+        return n - keys[0]
+    return max(b - a for a, b in itertools.pairwise(keys))
+
+
 class VideoReader:
     """逐帧视频解码器（spec §4）。
 
@@ -33,7 +91,21 @@ class VideoReader:
     沿用 ``OcvDecoder`` 的**顺序 ``grab()`` + 条件 ``retrieve()``** 优化——mp4v 等
     稀疏关键帧格式下 ``cap.set(POS_FRAMES)`` 每次 seek 会从最近 keyframe 全量重解码
     （实测 750 帧 244s），而顺序 ``grab``（仅解封装不解码）跳过非采样帧、仅对采样帧
-    ``retrieve`` 解码（同 750 帧 1.5s，~160×）。对任意 stride 均快且正确。
+    ``retrieve`` 解码（同 750 帧 1.5s，~160×）。对任意 stride 均正确。
+
+    **稀疏采样 seek**（``seek="auto"``）：stride 远大于关键帧间隔（GOP）时顺序 ``grab``
+    要把两个采样点之间的全部帧解码一遍，而 seek 只需从目标前最近的关键帧解码到目标
+    （≤ GOP 帧）——例如 25fps 源按 0.5fps 采样（stride=50）、GOP=12 时实测快 2×。
+    构造期用 :func:`probe_keyframe_interval` 探测 GOP，仅当 stride 超过实测交叉点
+    （``GOP × _SEEK_GOP_FACTOR``）时切到 seek 路径；否则（含探测失败）保持顺序
+    ``grab``。两条路径产出的 ``frame_idx`` / ``ts_ms`` / 帧内容一致（``ts_ms`` 都由
+    源帧号换算）。
+
+    **解码期缩放 / 色彩转换**：``max_side`` / ``out_size`` / ``color`` 在解码阶段对每个
+    采样帧只做一次（``INTER_AREA`` 缩小，不放大），下游拿到的就是小图——4K 源缩到
+    1280 长边后每帧字节数降为 1/9，检测 letterbox、队列缓冲、crop 都随之变小。归一化
+    坐标与缩放无关；需要源像素坐标时用 :meth:`to_source` 映射回去。``prefetch > 0``
+    时解码 + 缩放放到后台线程，经 ``prefetch`` 帧的有界队列交付（背压，不无限缓存）。
 
     有状态、仅程序内构造——持 ``cv2.VideoCapture``（不可序列化）；``__iter__`` 是
     一次性视频流语义，二次迭代 ``raise VideoIoError``。
@@ -41,60 +113,112 @@ class VideoReader:
     属性：
         fps: 配置的输出帧率（``sample_fps``；``None`` 时为源 fps）——与 ``OcvDecoder.fps``
             语义一致，供 ``VideoWriter`` 以同速率写出。
-        size: ``(width, height)``。
+        size: 输出帧 ``(width, height)``（未缩放时 = ``source_size``）。
+        source_size: 源视频 ``(width, height)``。
         duration_ms: 源视频时长（ms），``round(frame_count / source_fps * 1000)``——
             单一数据源暴露视频元数据，供 ``OcvDecoder`` 透传到 ``Tracks.duration_ms``。
     """
 
-    def __init__(self, path: str, sample_fps: float | None = None) -> None:
-        """打开 ``path`` 并按 ``sample_fps`` 计算采样步长。
+    def __init__(
+        self,
+        path: str,
+        sample_fps: float | None = None,
+        *,
+        seek: SeekMode = "auto",
+        keyframe_interval: int | None = None,
+        max_side: int | None = None,
+        out_size: tuple[int, int] | None = None,
+        color: ColorMode = "bgr",
+        prefetch: int = 0,
+        backend: Backend = "opencv",
+        threads: int = 0,
+    ) -> None:
+        """打开 ``path`` 并按 ``sample_fps`` 计算采样步长与采样策略。
 
         Args:
             path: 视频文件路径。
             sample_fps: 目标采样帧率；``None`` 读全帧（源 fps）。不得超源 fps（超则
                 stride 退化为 1，等价全帧）。
+            seek: 采样策略（见 :data:`SeekMode`）；stride=1 时恒为顺序读。
+            keyframe_interval: 已知 GOP（帧）；``None`` 且 ``seek="auto"`` 时自动探测。
+            max_side: 输出长边上限（等比缩小，源更小则不动）；与 ``out_size`` 互斥。
+            out_size: 输出 ``(width, height)``（精确缩放，可变比例）；与 ``max_side`` 互斥。
+            color: 输出色彩空间。
+            prefetch: 后台解码线程的队列深度（帧）；0 = 在迭代线程内解码。
+            backend: 解码后端；``ffmpeg`` / ``pyav`` 多线程解码，``seek`` 仅对 opencv 生效。
+            threads: 解码线程数（ffmpeg / pyav；0 = 自动）。
 
         Raises:
-            VideoIoError: ``sample_fps`` 非正 / 打不开 / 源 fps 非正 / 帧数非正 / 尺寸非法。
+            VideoIoError: ``sample_fps`` 非正 / 打不开 / 源 fps 非正 / 帧数非正 / 尺寸非法 /
+                缩放参数非法。
         """
         if sample_fps is not None and sample_fps <= 0.0:
             raise VideoIoError(f"sample_fps 非正: {sample_fps}")
-
-        cap = cv2.VideoCapture(path)
-        # cv2 无 stub，isOpened 返回 bool；打不开立即失败，不静默回退（No Silent Degradation）。
-        if not cap.isOpened():
-            cap.release()
-            raise VideoIoError(f"无法打开视频: {path}")
-
-        source_fps = float(cap.get(cv2.CAP_PROP_FPS))
+        if max_side is not None and out_size is not None:
+            raise VideoIoError("max_side 与 out_size 互斥")
+        if (max_side is not None and max_side <= 0) or (
+            out_size is not None and min(out_size) <= 0
+        ):
+            raise VideoIoError(f"缩放参数非法: max_side={max_side}, out_size={out_size}")
+        if prefetch < 0:
+            raise VideoIoError(f"prefetch 为负: {prefetch}")
+
+        cap: cv2.VideoCapture | None = None
+        if backend == "opencv":
+            cap = cv2.VideoCapture(path)
+            # cv2 无 stub，isOpened 返回 bool；打不开立即失败，不静默回退（No Silent Degradation）。
+            if not cap.isOpened():
+                cap.release()
+                raise VideoIoError(f"无法打开视频: {path}")
+            source_fps = float(cap.get(cv2.CAP_PROP_FPS))
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        else:
+            from jxl.io import video_backends
+
+            probe = video_backends.probe_av if backend == "pyav" else video_backends.probe_ffmpeg
+            source_fps, frame_count, width, height = probe(path)
+
+        bad = None
         if source_fps <= 0.0:
-            cap.release()
-            raise VideoIoError(f"视频 fps 非正（损坏？）: {path}, fps={source_fps}")
-
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        if frame_count <= 0:
-            cap.release()
-            raise VideoIoError(
-                f"视频帧数非正（损坏？）: {path}, frames={frame_count}"
-            )
-
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        if width <= 0 or height <= 0:
-            cap.release()
-            raise VideoIoError(f"视频尺寸非法: {path}, {width}x{height}")
+            bad = f"视频 fps 非正（损坏？）: {path}, fps={source_fps}"
+        elif frame_count <= 0:
+            bad = f"视频帧数非正（损坏？）: {path}, frames={frame_count}"
+        elif width <= 0 or height <= 0:
+            bad = f"视频尺寸非法: {path}, {width}x{height}"
+        if bad is not None:
+            if cap is not None:
+                cap.release()
+            raise VideoIoError(bad)
 
         effective_fps = source_fps if sample_fps is None else float(sample_fps)
         # round(source_fps / sample_fps)：每 N 源帧取一帧；下界 1（采样不得超源 fps）。
         stride = 1 if sample_fps is None else max(1, round(source_fps / sample_fps))
 
+        # seek 门限：相邻采样点间距 > _seek_gap 时 seek，否则顺序 grab；None = 全程顺序。
+        seek_gap: int | None = None
+        if backend == "opencv" and stride > 1:
+            if seek == "always":
+                seek_gap = 0
+            elif seek == "auto":
+                gop = keyframe_interval or probe_keyframe_interval(path)
+                if gop is not None and stride > gop * _SEEK_GOP_FACTOR:
+                    seek_gap = gop * _SEEK_GOP_FACTOR
+
         self._path = path
         self._cap = cap
         self._source_fps = source_fps
         self._frame_count = frame_count
         self._stride = stride
+        self._seek_gap = seek_gap
         self._sample_fps = effective_fps
-        self._size = (width, height)
+        self._source_size = (width, height)
+        self._size = out_size or _fit_max_side(width, height, max_side)
+        self._color = color
+        self._prefetch = prefetch
+        self._backend = backend
+        self._threads = threads
         self._consumed = False
 
     @property
@@ -104,14 +228,31 @@ class VideoReader:
 
     @property
     def size(self) -> tuple[int, int]:
-        """``(width, height)``。"""
+        """输出帧 ``(width, height)``。"""
         return self._size
 
+    @property
+    def source_size(self) -> tuple[int, int]:
+        """源视频 ``(width, height)``。"""
+        return self._source_size
+
+    def to_source(self, xy: np.ndarray) -> np.ndarray:
+        """输出帧像素坐标 ``[..., 2]``（x, y）→ 源视频像素坐标（新数组）。"""
+        sx = self._source_size[0] / self._size[0]
+        sy = self._source_size[1] / self._size[1]
+        out: np.ndarray = np.asarray(xy, dtype=np.float64) * np.array([sx, sy])
+        return out
+
     @property
     def duration_ms(self) -> int:
         """源视频时长（ms）：``round(frame_count / source_fps * 1000)``。"""
         return round(self._frame_count / self._source_fps * 1000)
 
+    @property
+    def strategy(self) -> Literal["grab", "seek"]:
+        """构造期选定的采样路径（顺序 grab | 关键帧 seek）。"""
+        return "grab" if self._seek_gap is None else "seek"
+
     def __enter__(self) -> VideoReader:
         return self
 
@@ -123,17 +264,19 @@ class VideoReader:
     ) -> None:
         # 迭代器正常消费完已在 finally release；此处覆盖未迭代 / 提前 ``with`` 退出的情形。
         # cv2 重复 release 是安全 no-op。
-        self._cap.release()
+        if self._cap is not None:
+            self._cap.release()
 
     def __iter__(self) -> Iterator[tuple[int, int, np.ndarray]]:
-        """按 ``stride`` 抽帧，yield ``(frame_idx, ts_ms, BGR ndarray)``。
+        """按 ``stride`` 抽帧，yield ``(frame_idx, ts_ms, ndarray)``（``size`` × ``color``）。
 
         ``frame_idx`` 为采样计数器（0 起连续递增）；``ts_ms`` 为源真实时间戳。
         以 ``grab()`` 返回 False 作 EOF（比 ``CAP_PROP_FRAME_COUNT`` 更可靠——后者对
-        部分编码不准）。抽帧得 0 帧 → raise（No Silent Degradation）。迭代器只能消费一次。
+        部分编码不准）；顺序 / seek 两条路径（见 :attr:`strategy`）产出一致。
+        抽帧得 0 帧 → raise（No Silent Degradation）。迭代器只能消费一次。
 
         取舍（No Silent Degradation 边界）：``grab()`` 成功后若 ``retrieve()`` 失败（流
-        中段损坏帧）会 ``break`` 静默结束、仅返回已抽到的部分帧——这与干净 EOF 无法可靠
+        中段损坏帧）会静默结束、仅返回已抽到的部分帧——这与干净 EOF 无法可靠
         区分（mp4v 尾包/部分编码下 ``retrieve()`` 亦返回 False），故不 raise；全损
         （``frame_idx==0``）仍 raise。调用方若需严格，应在调用侧比对预期帧数。
         """
@@ -143,24 +286,16 @@ class VideoReader:
             )
         self._consumed = True
 
-        cap = self._cap
-        source_fps = self._source_fps
-        stride = self._stride
+        frames = self._decode()
+        if self._prefetch > 0:
+            frames = _prefetched(frames, self._prefetch)
         try:
             frame_idx = 0
-            src_idx = 0
-            # grab() 推进一帧（仅解封装，廉价）；每逢采样位置 retrieve() 解码该帧。
-            while cap.grab():
-                if src_idx % stride == 0:
-                    ret, frame = cap.retrieve()
-                    if not ret or frame is None:
-                        break
-                    ts_ms = round(src_idx / source_fps * 1000)
-                    # frame 来自 cv2（无 stub→Any），asarray 既是运行时恒等（已是 ndarray）
-                    # 又把类型窄化为 ndarray，满足 mypy 严格返回类型。
-                    yield (frame_idx, ts_ms, np.asarray(frame))
+            # closing：提前退出时先停后台线程 / 关生成器，再 release（cap 不与线程并发）
+            with closing(frames):
+                for _, ts_ms, frame in frames:
+                    yield (frame_idx, ts_ms, frame)
                     frame_idx += 1
-                src_idx += 1
             # 抽帧得 0 帧（损坏/不可解码，构造期 FRAME_COUNT 对部分编码不准、可能误报正）
             # → raise，不静默产出空流（No Silent Degradation）。
             if frame_idx == 0:
@@ -168,7 +303,142 @@ class VideoReader:
                     f"视频抽帧得 0 帧（损坏或不可解码）: {self._path}"
                 )
         finally:
-            cap.release()
+            if self._cap is not None:
+                self._cap.release()
+
+    def _decode(self) -> _Frames:
+        """按后端与采样策略选内部流（解码 + 缩放 + 色彩，均在解码阶段完成）。"""
+        if self._backend != "opencv":
+            from jxl.io import video_backends
+
+            run = video_backends.iter_av if self._backend == "pyav" else video_backends.iter_ffmpeg
+            return run(
+                self._path,
+                stride=self._stride,
+                size=self._size,
+                color=self._color,
+                fps=self._source_fps,
+                threads=self._threads,
+            )
+        frames = self._iter_grab() if self._seek_gap is None else self._iter_seek(self._seek_gap)
+        if self._size == self._source_size and self._color == "bgr":
+            return frames
+        return (self._convert(item) for item in frames)
+
+    def _convert(self, item: tuple[int, int, np.ndarray]) -> tuple[int, int, np.ndarray]:
+        """缩放到 ``size`` + 转 ``color``（opencv 后端；解码阶段每帧一次）。"""
+        src_idx, ts_ms, frame = item
+        if self._size != self._source_size:
+            frame = cv2.resize(frame, self._size, interpolation=cv2.INTER_AREA)
+        if self._color != "bgr":
+            frame = cv2.cvtColor(frame, _CVT[self._color])
+        return src_idx, ts_ms, np.asarray(frame)
+
+    def _ts_ms(self, src_idx: int) -> int:
+        """源帧号 → 源时间戳（ms）。"""
+        return round(src_idx / self._source_fps * 1000)
+
+    def _retrieve(self) -> np.ndarray | None:
+        assert self._cap is not None
+        ret, frame = self._cap.retrieve()
+        if not ret or frame is None:
+            return None
+        # frame 来自 cv2（无 stub→Any），asarray 既是运行时恒等（已是 ndarray）
+        # 又把类型窄化为 ndarray，满足 mypy 严格返回类型。
+        return np.asarray(frame)
+
+    def _iter_grab(self) -> _Frames:
+        """顺序路径：yield ``(源帧号, ts_ms, 帧)``。"""
+        cap = self._cap
+        assert cap is not None
+        src_idx = 0
+        # grab() 推进一帧；每逢采样位置 retrieve() 取出该帧。
+        while cap.grab():
+            if src_idx % self._stride == 0:
+                frame = self._retrieve()
+                if frame is None:
+                    return
+                yield src_idx, self._ts_ms(src_idx), frame
+            src_idx += 1
+
+    def _iter_seek(self, gap: int) -> _Frames:
+        """seek 路径：yield ``(源帧号, ts_ms, 帧)``，采样点同 ``_iter_grab``。
+
+        ``pos`` = 下一次 ``grab`` 将得到的源帧号。到下个采样点的距离 > ``gap`` 时
+        ``cap.set(POS_FRAMES)``（后端从目标前最近关键帧解码到目标，帧精确），否则顺序
+        ``grab`` 过去。seek 越过 EOF 时随后的 ``grab`` 返回 False，同顺序路径结束。
+        """
+        cap = self._cap
+        assert cap is not None
+        pos = 0
+        target = 0
+        while True:
+            if target - pos > gap:
+                if not cap.set(cv2.CAP_PROP_POS_FRAMES, target):
+                    return
+                pos = target
+            while pos <= target:
+                if not cap.grab():
+                    return
+                pos += 1
+            frame = self._retrieve()
+            if frame is None:
+                return
+            yield target, self._ts_ms(target), frame
+            target += self._stride
+
+
+def _fit_max_side(width: int, height: int, max_side: int | None) -> tuple[int, int]:
+    """等比缩小到长边 ≤ ``max_side``（不放大；各边至少 1 像素）。"""
+    if max_side is None or max(width, height) <= max_side:
+        return width, height
+    s = max_side / max(width, height)
+    return max(1, round(width * s)), max(1, round(height * s))
+
+
+class _Stop:
+    """预取队列结束哨兵。"""
+
+
+def _prefetched[T](src: Iterator[T], depth: int) -> Generator[T, None, None]:
+    """后台线程迭代 ``src``，经深度 ``depth`` 的有界队列交付（异常原样重抛）。
+
+    消费方提前关闭 → 置 ``stop`` 并 ``join``，生产线程不遗留。
+    """
+    q: queue.Queue[object] = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def _put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _run() -> None:
+        try:
+            for item in src:
+                if not _put(item):
+                    return
+            _put(_Stop())
+        except BaseException as e:  # 搬运到消费线程原样重抛
+            _put(e)
+
+    worker = threading.Thread(target=_run, name="video-prefetch", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = q.get()
+            if isinstance(item, _Stop):
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item  # type: ignore[misc]  # 队列同构：生产侧只 put T / _Stop / 异常
+    finally:
+        stop.set()
+        worker.join()
 
 
 class VideoWriter:
@@ -384,3 +654,115 @@ def test_reader_writer_pipeline() -> None:
         finally:
             cap.release()
         assert got >= 8, f"预期 ~10 帧，实得 {got}"
+
+
+def test_probe_keyframe_interval() -> None:
+    """合成 mp4v 视频（cv2 默认 GOP=12）→ 探测值落在 [1, 帧数] 内且 ≤ 帧数。"""
+    import tempfile
+
+    from jxl.vdt.decoder import _make_synthetic_video
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = f"{tmp}/s.mp4"
+        _make_synthetic_video(video, fps=25.0, frames=100)
+        gop = probe_keyframe_interval(video)
+        assert gop is not None and 1 <= gop < 100
+        assert probe_keyframe_interval("/nonexistent/video.mp4") is None
+
+
+def test_seek_sampling_matches_sequential() -> None:
+    """seek 路径与顺序 grab 路径：frame_idx / ts_ms / 帧像素逐一相同（多个 stride）。"""
+    import tempfile
+
+    from jxl.vdt.decoder import _make_synthetic_video
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = f"{tmp}/s.mp4"
+        _make_synthetic_video(video, fps=25.0, frames=160, size=(96, 64))
+        for fps in (25.0 / 7, 25.0 / 13, 0.5, 0.2):
+            grab = VideoReader(video, sample_fps=fps, seek="never")
+            seek = VideoReader(video, sample_fps=fps, seek="always")
+            assert (grab.strategy, seek.strategy) == ("grab", "seek")
+            a, b = list(grab), list(seek)
+            assert len(a) == len(b) > 0
+            for (ia, ta, fa), (ib, tb, fb) in zip(a, b, strict=True):
+                assert (ia, ta) == (ib, tb)
+                assert np.array_equal(fa, fb)
+
+
+def test_seek_auto_strategy_follows_gop() -> None:
+    """auto：stride > 2×GOP 才 seek；其余（含全帧）保持顺序 grab。"""
+    import tempfile
+
+    from jxl.vdt.decoder import _make_synthetic_video
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = f"{tmp}/s.mp4"
+        _make_synthetic_video(video, fps=25.0, frames=30)
+        assert VideoReader(video, 0.5, keyframe_interval=12).strategy == "seek"
+        assert VideoReader(video, 5.0, keyframe_interval=12).strategy == "grab"
+        assert VideoReader(video, 25.0 / 20, keyframe_interval=12).strategy == "grab"
+        assert VideoReader(video, None, seek="always").strategy == "grab"
+
+
+def test_reader_max_side_and_color() -> None:
+    """max_side 等比缩小 + rgb/gray 输出；to_source 把输出像素映射回源像素。"""
+    import tempfile
+
+    from jxl.vdt.decoder import _make_synthetic_video
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = f"{tmp}/s.mp4"
+        _make_synthetic_video(video, fps=10.0, frames=5, size=(128, 64))
+        with VideoReader(video) as r:
+            ref = [f for _, _, f in r]
+
+        r = VideoReader(video, max_side=64, color="rgb")
+        assert (r.size, r.source_size) == ((64, 32), (128, 64))
+        got = [f for _, _, f in r]
+        assert len(got) == len(ref)
+        small = cv2.resize(ref[0], (64, 32), interpolation=cv2.INTER_AREA)
+        want = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+        assert np.array_equal(got[0], want)
+        np.testing.assert_allclose(r.to_source(np.array([[32.0, 16.0]])), [[64.0, 32.0]])
+
+        gray = [f for _, _, f in VideoReader(video, out_size=(40, 30), color="gray")]
+        assert gray[0].shape == (30, 40)
+        assert VideoReader(video, max_side=512).size == (128, 64)  # 不放大
+
+
+def test_reader_prefetch_matches_inline_and_stops_early() -> None:
+    """后台线程解码：产出与内联一致；消费方提前退出不遗留线程。"""
+    import tempfile
+
+    from jxl.vdt.decoder import _make_synthetic_video
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = f"{tmp}/s.mp4"
+        _make_synthetic_video(video, fps=25.0, frames=40)
+        inline = list(VideoReader(video, sample_fps=5.0, max_side=32))
+        pre = list(VideoReader(video, sample_fps=5.0, max_side=32, prefetch=2))
+        assert [(i, t) for i, t, _ in pre] == [(i, t) for i, t, _ in inline]
+        assert all(np.array_equal(a[2], b[2]) for a, b in zip(pre, inline, strict=True))
+
+        n_threads = threading.active_count()
+        it = iter(VideoReader(video, prefetch=1))
+        next(it)
+        it.close()  # type: ignore[attr-defined]
+        assert threading.active_count() == n_threads
+
+
+def test_reader_invalid_resize_raises() -> None:
+    import tempfile
+
+    import pytest
+
+    from jxl.vdt.decoder import _make_synthetic_video
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = f"{tmp}/s.mp4"
+        _make_synthetic_video(video, fps=10.0, frames=3)
+        with pytest.raises(VideoIoError, match="互斥"):
+            VideoReader(video, max_side=32, out_size=(32, 32))
+        with pytest.raises(VideoIoError, match="缩放参数"):
+            VideoReader(video, max_side=0)
@@ -0,0 +1,302 @@
+"""``VideoReader`` 的非 OpenCV 解码后端：ffmpeg 子进程裸流管道 / PyAV。
+
+``cv2.VideoCapture`` 单线程解码、拿不到包级关键帧标志与 PTS、也调不了解码线程数。
+本模块提供同一 ``(源帧号, ts_ms, ndarray)`` 内部流契约的两种替代实现，由
+``VideoReader(backend=...)`` / ``DecodeCfg.backend`` 选择：
+
+- ``ffmpeg``：``ffmpeg -threads N -i … -f rawvideo -`` 子进程，按 ``w×h×c`` 字节切帧。
+  采样（``select=not(mod(n,stride))``）、缩放（``scale=…:flags=area``）、色彩
+  （``-pix_fmt``）全在 ffmpeg 内完成，Python 侧只收最终尺寸的字节；``ts_ms`` 由源帧号
+  换算（与 OpenCV 后端一致）。元数据经 ``ffprobe`` 读取。
+- ``pyav``：PyAV 帧级多线程解码（``thread_type="AUTO"``），``reformat`` 在 swscale
+  内一次完成缩放 + 色彩转换；``ts_ms`` 取**真实 PTS**（相对流起点），VFR 源也准确。
+
+两者都是可选依赖（ffmpeg 可执行 / ``av`` 包），缺失即 ``VideoIoError``——显式选了
+后端就不静默换回 OpenCV（No Silent Degradation）。
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+import tempfile
+from collections.abc import Generator
+from fractions import Fraction
+from types import ModuleType
+from typing import NamedTuple
+
+import numpy as np
+
+from jxl.io.video import VideoIoError
+
+_PIX_FMT: dict[str, tuple[str, int]] = {
+    "bgr": ("bgr24", 3),
+    "rgb": ("rgb24", 3),
+    "gray": ("gray", 1),
+}
+"""输出色彩 → (ffmpeg/PyAV 像素格式, 通道数)。"""
+
+type Decoded = Generator[tuple[int, int, np.ndarray], None, None]
+"""后端内部流：``(源帧号, ts_ms, 帧)``。"""
+
+
+class VideoMeta(NamedTuple):
+    """后端探测到的视频元数据。"""
+
+    fps: float
+    frame_count: int
+    width: int
+    height: int
+
+
+def _tool(name: str) -> str:
+    exe = shutil.which(name)
+    if exe is None:
+        raise VideoIoError(f"未找到 {name}（backend='ffmpeg' 需要 ffmpeg/ffprobe 可执行）")
+    return exe
+
+
+def _import_av() -> ModuleType:
+    try:
+        import av  # heavy 可选依赖；lazy import
+    except ImportError as e:
+        raise VideoIoError("backend='pyav' 需要安装 av 包（pip install av）") from e
+    return av
+
+
+# ---------------------------------------------------------------------------
+# ffmpeg 子进程管道
+# ---------------------------------------------------------------------------
+
+
+def probe_ffmpeg(path: str) -> VideoMeta:
+    """``ffprobe`` 读取首个视频流的 fps / 帧数 / 尺寸（帧数缺失时由时长 × fps 估算）。"""
+    cmd = [
+        _tool("ffprobe"), "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "stream=width,height,avg_frame_rate,r_frame_rate,nb_frames,duration",
+        "-show_entries", "format=duration",
+        "-of", "json", path,
+    ]
+    res = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    if res.returncode != 0:
+        raise VideoIoError(f"无法打开视频: {path} ({res.stderr.strip()[-200:]})")
+    info = json.loads(res.stdout)
+    streams = info.get("streams") or []
+    if not streams:
+        raise VideoIoError(f"无视频流: {path}")
+    st = streams[0]
+    rate = st.get("avg_frame_rate") or "0/0"
+    if rate in ("0/0", "0/1"):
+        rate = st.get("r_frame_rate") or "0/1"
+    num, _, den = rate.partition("/")
+    fps = float(Fraction(int(num), int(den or 1))) if int(den or 1) else 0.0
+    duration = float(st.get("duration") or info.get("format", {}).get("duration") or 0.0)
+    frame_count = int(st.get("nb_frames") or round(duration * fps))
+    return VideoMeta(fps, frame_count, int(st.get("width", 0)), int(st.get("height", 0)))
+
+
+def iter_ffmpeg(
+    path: str,
+    *,
+    stride: int,
+    size: tuple[int, int],
+    color: str,
+    fps: float,
+    threads: int = 0,
+) -> Decoded:
+    """ffmpeg 裸流管道：每 ``stride`` 源帧一帧，输出 ``size`` × ``color``。
+
+    stderr 落匿名临时文件而非管道：只读 stdout 时 ffmpeg 写满 stderr 管道缓冲会阻塞，
+    与本侧阻塞在 stdout 上互等死锁；失败时再从临时文件取尾部错误信息。
+    """
+    w, h = size
+    pix_fmt, ch = _PIX_FMT[color]
+    filters = []
+    if stride > 1:
+        filters.append(rf"select=not(mod(n\,{stride}))")
+    filters.append(f"scale={w}:{h}:flags=area")
+    cmd = [
+        _tool("ffmpeg"), "-v", "error", "-nostdin",
+        "-threads", str(threads), "-i", path,
+        "-an", "-sn", "-vf", ",".join(filters), "-fps_mode", "passthrough",
+        "-f", "rawvideo", "-pix_fmt", pix_fmt, "-",
+    ]
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+        assert proc.stdout is not None
+        shape = (h, w) if ch == 1 else (h, w, ch)
+        nbytes = w * h * ch
+        try:
+            k = 0
+            while len(buf := proc.stdout.read(nbytes)) == nbytes:
+                src_idx = k * stride
+                img = np.frombuffer(buf, np.uint8).reshape(shape)
+                yield src_idx, round(src_idx / fps * 1000), img
+                k += 1
+            if proc.wait() != 0:
+                stderr.seek(0)
+                err = stderr.read().decode(errors="replace").strip()
+                raise VideoIoError(f"ffmpeg 解码失败: {path} ({err[-200:]})")
+        finally:
+            proc.kill()
+            proc.wait()
+            proc.stdout.close()
+
+
+def iter_keyframes_ffmpeg(path: str, *, color: str = "bgr") -> Decoded:
+    """仅解码关键帧（``-skip_frame nokey``）；源帧号不可得，记为关键帧序号。"""
+    meta = probe_ffmpeg(path)
+    pix_fmt, ch = _PIX_FMT[color]
+    cmd = [
+        _tool("ffmpeg"), "-v", "error", "-nostdin", "-skip_frame", "nokey", "-i", path,
+        "-an", "-sn", "-fps_mode", "passthrough", "-f", "rawvideo", "-pix_fmt", pix_fmt, "-",
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    assert proc.stdout is not None
+    w, h = meta.width, meta.height
+    shape = (h, w) if ch == 1 else (h, w, ch)
+    try:
+        k = 0
+        while len(buf := proc.stdout.read(w * h * ch)) == w * h * ch:
+            yield k, -1, np.frombuffer(buf, np.uint8).reshape(shape)
+            k += 1
+    finally:
+        proc.kill()
+        proc.wait()
+        proc.stdout.close()
+
+
+# ---------------------------------------------------------------------------
+# PyAV
+# ---------------------------------------------------------------------------
+
+
+def probe_av(path: str) -> VideoMeta:
+    """PyAV 读取首个视频流元数据（``frames`` 缺失时由时长 × fps 估算）。"""
+    av = _import_av()
+    try:
+        container = av.open(path)
+    except (OSError, av.FFmpegError) as e:
+        raise VideoIoError(f"无法打开视频: {path} ({e})") from e
+    with container:
+        if not container.streams.video:
+            raise VideoIoError(f"无视频流: {path}")
+        st = container.streams.video[0]
+        rate = st.average_rate or st.guessed_rate
+        fps = float(rate) if rate else 0.0
+        frame_count = st.frames
+        if not frame_count and st.duration is not None and st.time_base is not None:
+            frame_count = round(float(st.duration * st.time_base) * fps)
+        if not frame_count and container.duration:
+            frame_count = round(container.duration / 1_000_000 * fps)
+        ctx = st.codec_context
+        return VideoMeta(fps, int(frame_count or 0), ctx.width, ctx.height)
+
+
+def iter_av(
+    path: str,
+    *,
+    stride: int,
+    size: tuple[int, int],
+    color: str,
+    fps: float,
+    threads: int = 0,
+    keyframes_only: bool = False,
+) -> Decoded:
+    """PyAV 帧级多线程解码：每 ``stride`` 源帧一帧；``ts_ms`` = (PTS − 流起点) 毫秒。
+
+    PTS 缺失的帧回退到源帧号换算（与 OpenCV 后端同式）。``keyframes_only`` 时解码器
+    跳过非关键帧（``skip_frame="NONKEY"``），``stride`` 按关键帧计数。打开 / 解码失败
+    统一收口为 ``VideoIoError``（与 :func:`probe_av`、ffmpeg 后端同一异常契约）。
+    """
+    av = _import_av()
+    pix_fmt, _ = _PIX_FMT[color]
+    w, h = size
+    try:
+        container = av.open(path)
+    except (OSError, av.FFmpegError) as e:
+        raise VideoIoError(f"无法打开视频: {path} ({e})") from e
+    try:
+        st = container.streams.video[0]
+        st.thread_type = "AUTO"
+        st.thread_count = threads
+        if keyframes_only:
+            st.codec_context.skip_frame = "NONKEY"
+        tb = st.time_base
+        start = st.start_time or 0
+        for src_idx, frame in enumerate(container.decode(st)):
+            if src_idx % stride:
+                continue
+            if frame.pts is not None and tb is not None:
+                ts_ms = round(float((frame.pts - start) * tb) * 1000)
+            else:
+                ts_ms = round(src_idx / fps * 1000)
+            img = frame.reformat(width=w, height=h, format=pix_fmt, interpolation="AREA")
+            yield src_idx, ts_ms, img.to_ndarray()
+    except av.FFmpegError as e:
+        raise VideoIoError(f"PyAV 解码失败: {path} ({e})") from e
+    finally:
+        container.close()
+
+
+def iter_keyframes(path: str, *, backend: str = "ffmpeg", color: str = "bgr") -> Decoded:
+    """仅解码编码关键帧（I 帧），按 ``backend`` 分派到 ffmpeg / PyAV。"""
+    if backend == "pyav":
+        meta = probe_av(path)
+        size = (meta.width, meta.height)
+        return iter_av(path, stride=1, size=size, color=color, fps=meta.fps, keyframes_only=True)
+    if backend == "ffmpeg":
+        return iter_keyframes_ffmpeg(path, color=color)
+    raise VideoIoError(f"关键帧提取不支持 backend={backend!r}（可选 ffmpeg / pyav）")
+
+
+# ---------------------------------------------------------------------------
+# 单测（可选依赖缺失即跳过；对拍 OpenCV 后端）
+# ---------------------------------------------------------------------------
+
+import pytest  # noqa: E402
+
+
+def _parity(backend: str) -> None:
+    from jxl.io.video import VideoReader
+    from jxl.vdt.decoder import _make_synthetic_video
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = f"{tmp}/s.mp4"
+        _make_synthetic_video(video, fps=25.0, frames=60, size=(96, 64))
+        for fps in (None, 5.0):
+            ref = list(VideoReader(video, sample_fps=fps, seek="never"))
+            r = VideoReader(video, sample_fps=fps, backend=backend)  # type: ignore[arg-type]
+            got = list(r)
+            assert r.size == (96, 64) and r.strategy == "grab"
+            assert [i for i, _, _ in got] == [i for i, _, _ in ref]
+            for (_, ta, fa), (_, tb, fb) in zip(got, ref, strict=True):
+                assert abs(ta - tb) <= 1  # PTS 与帧号换算的舍入差
+                assert fa.shape == fb.shape
+                assert float(np.abs(fa.astype(np.int16) - fb).mean()) < 2.0
+
+
+def test_ffmpeg_backend_matches_opencv() -> None:
+    if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+        pytest.skip("ffmpeg/ffprobe 不可用")
+    _parity("ffmpeg")
+
+
+def test_pyav_backend_matches_opencv() -> None:
+    pytest.importorskip("av")
+    _parity("pyav")
+
+
+def test_pyav_open_failure_raises() -> None:
+    """``iter_av`` 打不开源 → VideoIoError（不外泄 PyAV 原生异常）。"""
+    pytest.importorskip("av")
+    with pytest.raises(VideoIoError, match="无法打开视频"):
+        next(iter_av("/nonexistent/x.mp4", stride=1, size=(8, 8), color="bgr", fps=25.0))
+
+
+def test_missing_backend_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    """显式选了后端但依赖缺失 → VideoIoError（不静默回退 OpenCV）。"""
+    monkeypatch.setattr(shutil, "which", lambda _n: None)
+    with pytest.raises(VideoIoError, match="ffmpeg"):
+        probe_ffmpeg("x.mp4")
@@ -0,0 +1,30 @@
+"""jxl.onnx —— onnxruntime 会话基础设施（与应用包无关，检测器 / vdt 管线共用）。
+
+onnxruntime 仅在构造 session 时按需 import，``import jxl.onnx`` 不拉入重依赖。
+"""
+
+from jxl.onnx.session import (
+    SESSIONS,
+    OrtCfg,
+    OrtLoadError,
+    OrtNodeLike,
+    OrtRegistryStats,
+    OrtSessionLike,
+    OrtSessionRegistry,
+    build_ort_session,
+    optimized_model_path,
+    shared_ort_session,
+)
+
+__all__ = [
+    "SESSIONS",
+    "OrtCfg",
+    "OrtLoadError",
+    "OrtNodeLike",
+    "OrtRegistryStats",
+    "OrtSessionLike",
+    "OrtSessionRegistry",
+    "build_ort_session",
+    "optimized_model_path",
+    "shared_ort_session",
+]
@@ -0,0 +1,446 @@
+"""onnxruntime 会话：配置 + CUDA fail-fast 构造 + 进程级复用 + 窄协议（单一数据源）。
+
+不依赖任何应用包（``jxl.det`` 检测器与 ``jxl.vdt`` 管线共用）：
+
+- ``OrtCfg``：会话配置（EP / 线程数 / 图优化级别 / 优化模型缓存）。
+- ``OrtSessionLike`` / ``OrtNodeLike``：``onnxruntime.InferenceSession`` 的结构化
+  窄接口（ISP——仅依赖 ``run``/``get_inputs``/``get_outputs``）；避免引用被 mypy
+  ignore 的 onnxruntime，也避免 ``Any``（j-python-strict）。
+- ``build_ort_session``：**No Silent Degradation / fail-fast**——默认要求
+  ``CUDAExecutionProvider``，缺失即 ``OrtLoadError``（禁止静默回退 CPU 低性能运行，
+  j-coding-style 硬件降级行）。CPU 推理须经 ``OrtCfg.provider="cpu"`` **显式**配置
+  （配置即授权，见 ``# FALLBACK:`` 标注），并可调线程数 / 图优化级别 / 优化模型缓存。
+- ``OrtSessionRegistry`` / ``shared_ort_session``：进程级 session 注册表，按
+  (权重绝对路径, mtime, ``OrtCfg``) 复用已构造的 session——批处理多视频、常驻服务
+  只付一次图优化 + 权重上传；LRU 容量上限 + 显式 ``evict``，记录命中/加载耗时。
+
+``OrtLoadError`` 继承 ``RuntimeError``：调用方按各自错误体系收口（vdt 转为
+``ModelLoadError``，见 :mod:`jxl.vdt._ort`）。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal, Protocol
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class OrtLoadError(RuntimeError):
+    """ort 会话构造失败（EP 不可用 / 权重不可读 / 解析失败）。"""
+
+
+class OrtCfg(BaseModel):
+    """onnxruntime 会话配置（见 :func:`build_ort_session`；vdt reid / pose、PeopleNet 共用）。
+
+    默认 ``provider="cuda"``：无 CUDA EP 即 fail-fast（不静默回退）。``"cpu"`` 是
+    **显式** opt-in 的 CPU 推理（纯 CPU 批处理节点），配线程数/图优化级别以获得可预期
+    吞吐；``cache_dir`` 缓存优化后模型，重复加载跳过图优化。
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    provider: Literal["cuda", "cpu"] = Field(
+        default="cuda", description="执行提供者：cuda=要求 CUDA EP（fail-fast）；cpu=显式 CPU 推理"
+    )
+    intra_op_threads: int = Field(
+        ge=0, default=0, description="算子内并行线程数（0=ort 默认，通常为物理核数）"
+    )
+    inter_op_threads: int = Field(
+        ge=0, default=0, description="算子间并行线程数（>0 时启用 ORT_PARALLEL 执行模式）"
+    )
+    graph_opt: Literal["disable", "basic", "extended", "all"] = Field(
+        default="all", description="图优化级别（对应 ort GraphOptimizationLevel）"
+    )
+    cache_dir: str | None = Field(
+        default=None, description="优化后模型缓存目录（None=不缓存；按权重/mtime/EP/ort 版本与设备分键）"
+    )
+
+
+_PROVIDERS: dict[str, str] = {"cuda": "CUDAExecutionProvider", "cpu": "CPUExecutionProvider"}
+"""``OrtCfg.provider`` → ort EP 名。"""
+
+_GRAPH_OPT: dict[str, str] = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+"""``OrtCfg.graph_opt`` → ``ort.GraphOptimizationLevel`` 成员名。"""
+
+
+class OrtNodeLike(Protocol):
+    """ort 输入/输出节点窄接口（``name`` + ``shape``；动态维为 str/None）。"""
+
+    name: str
+    shape: Sequence[int | str | None]
+
+
+class OrtSessionLike(Protocol):
+    """``ort.InferenceSession`` 结构化窄接口（``run`` / IO 节点 / 实际生效的 EP）。"""
+
+    def run(
+        self,
+        output_names: list[str] | None,
+        input_feed: dict[str, np.ndarray],
+    ) -> list[np.ndarray]: ...
+
+    def get_inputs(self) -> Sequence[OrtNodeLike]: ...
+
+    def get_outputs(self) -> Sequence[OrtNodeLike]: ...
+
+    def get_providers(self) -> list[str]: ...
+
+
+def optimized_model_path(model_path: str, cfg: OrtCfg) -> Path | None:
+    """优化后模型的缓存路径（``cfg.cache_dir`` 为 None → None）。
+
+    键 = 权重绝对路径 + mtime + EP + 图优化级别 + ort 版本 + ort 构建设备：换权重 /
+    改文件 / 换 EP（extended 以上的优化产物与 EP 相关）/ 升级 ort（序列化的融合算子
+    随版本变化）/ 换 CPU↔GPU 构建都落到新文件，不会误用旧缓存。
+    """
+    if cfg.cache_dir is None:
+        return None
+    import onnxruntime as ort  # heavy ML；lazy import
+
+    src = Path(model_path).resolve()
+    key = "|".join(
+        (
+            str(src),
+            str(src.stat().st_mtime_ns),
+            _PROVIDERS[cfg.provider],
+            cfg.graph_opt,
+            ort.__version__,
+            ort.get_device(),
+        )
+    )
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return Path(cfg.cache_dir) / f"{src.stem}.{cfg.provider}.{digest}.onnx"
+
+
+def build_ort_session(model_path: str, cfg: OrtCfg | None = None) -> OrtSessionLike:
+    """构造 ort ``InferenceSession``；默认**要求 CUDA**（fail-fast，No Silent Degradation）。
+
+    ``cfg.provider="cpu"`` 时用 ``CPUExecutionProvider``（显式配置，非回退）。
+    ``cfg.cache_dir`` 非空时：缓存命中 → 直接加载优化后模型并关闭图优化（跳过重复
+    优化）；未命中 → 本次加载顺带序列化优化结果（先写临时文件再原子改名，多进程
+    批处理并发加载互不踩）。
+
+    Args:
+        model_path: ONNX 权重路径。
+        cfg: 会话配置；None = ``OrtCfg()``（CUDA、ort 默认线程、全量图优化、无缓存）。
+
+    Returns:
+        OrtSessionLike: 已加载的 session。
+
+    Raises:
+        OrtLoadError: 所需 EP 不可用 / 权重加载失败（具体异常族收口，不裸 Exception）。
+    """
+    import onnxruntime as ort  # heavy ML；lazy import
+
+    cfg = cfg or OrtCfg()
+    provider = _PROVIDERS[cfg.provider]
+    if provider not in ort.get_available_providers():
+        raise OrtLoadError(
+            f"onnxruntime 无 {provider}（provider={cfg.provider!r}，不静默回退）: {model_path}"
+        )
+    # FALLBACK: provider="cpu" 仅由 OrtCfg 显式开启（配置即授权），默认路径不回退 CPU
+    so = ort.SessionOptions()
+    if cfg.intra_op_threads > 0:  # 0 = 保留 ort 默认
+        so.intra_op_num_threads = cfg.intra_op_threads
+    if cfg.inter_op_threads > 0:  # 算子间并行仅在 ORT_PARALLEL 执行模式下生效
+        so.inter_op_num_threads = cfg.inter_op_threads
+        so.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+    so.graph_optimization_level = getattr(ort.GraphOptimizationLevel, _GRAPH_OPT[cfg.graph_opt])
+    load_path = model_path
+    cached = optimized_model_path(model_path, cfg)
+    tmp: Path | None = None
+    if cached is not None and cached.is_file():
+        load_path = str(cached)
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    elif cached is not None:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        so.optimized_model_filepath = str(tmp)
+    try:
+        session = ort.InferenceSession(load_path, sess_options=so, providers=[provider])
+    except (RuntimeError, OSError, ValueError) as ex:
+        raise OrtLoadError(
+            f"ort 加载失败 ({load_path}): {type(ex).__name__}: {ex}"
+        ) from ex
+    if tmp is not None and tmp.is_file():
+        tmp.replace(cached)  # type: ignore[arg-type]  # tmp 非 None ⇒ cached 非 None
+    return session  # type: ignore[no-any-return]  # ort 无 stub→Any，OrtSessionLike 结构化收口
+
+
+_SessionKey = tuple[str, int, str]
+"""注册表键：(权重绝对路径, mtime_ns, ``OrtCfg`` JSON)。"""
+
+
+@dataclass(slots=True)
+class OrtRegistryStats:
+    """注册表计数（累计，``OrtSessionRegistry.stats`` 返回快照）。"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    load_s: dict[str, float] = field(default_factory=dict)
+    """权重路径 → 最近一次 session 构造耗时（秒）。"""
+
+    @property
+    def load_s_total(self) -> float:
+        """已记录的构造耗时合计（秒）。"""
+        return sum(self.load_s.values())
+
+
+class OrtSessionRegistry:
+    """进程级 ort session 注册表（LRU，线程安全）。
+
+    同一 (权重, mtime, ``OrtCfg``) 只构造一次；权重文件被改写（mtime 变）→ 新键重新
+    加载，同路径同配置的旧 session 随即淘汰。``InferenceSession.run`` 本身线程安全，
+    多个阶段 / 线程共享同一 session 无需额外同步。
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 8,
+        build: Callable[[str, OrtCfg], OrtSessionLike] = build_ort_session,
+    ) -> None:
+        """
+        Args:
+            max_sessions: 最多常驻的 session 数（超出按最久未用淘汰）。
+            build: session 构造函数（默认 :func:`build_ort_session`；单测注入 fake）。
+        """
+        if max_sessions < 1:
+            raise ValueError(f"max_sessions 必须 ≥ 1，实际 {max_sessions}")
+        self._max = max_sessions
+        self._build = build
+        self._sessions: OrderedDict[_SessionKey, OrtSessionLike] = OrderedDict()
+        self._stats = OrtRegistryStats()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, model_path: str, cfg: OrtCfg | None = None) -> OrtSessionLike:
+        """取（必要时构造）``model_path`` 在 ``cfg`` 下的 session。
+
+        Raises:
+            OrtLoadError: 权重不存在 / 构造失败（由 ``build`` 抛，失败不入表）。
+        """
+        cfg = cfg or OrtCfg()
+        src = Path(model_path).resolve()
+        try:
+            mtime = src.stat().st_mtime_ns
+        except OSError as ex:
+            raise OrtLoadError(f"ort 权重不可读 ({model_path}): {ex}") from ex
+        cfg_key = cfg.model_dump_json()
+        key = (str(src), mtime, cfg_key)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+                self._stats.hits += 1
+                return session
+            for stale in [k for k in self._sessions if k[0] == key[0] and k[2] == cfg_key]:
+                del self._sessions[stale]  # 同权重同配置、旧 mtime
+                self._stats.evictions += 1
+            t0 = time.perf_counter()
+            session = self._build(model_path, cfg)
+            self._stats.load_s[str(src)] = time.perf_counter() - t0
+            self._stats.misses += 1
+            self._sessions[key] = session
+            while len(self._sessions) > self._max:
+                self._sessions.popitem(last=False)
+                self._stats.evictions += 1
+            return session
+
+    def evict(self, model_path: str | None = None) -> int:
+        """淘汰 ``model_path`` 的全部 session（None = 清空），返回淘汰数。
+
+        已持有 session 的阶段不受影响（引用计数释放后显存才归还）。
+        """
+        with self._lock:
+            if model_path is None:
+                keys = list(self._sessions)
+            else:
+                src = str(Path(model_path).resolve())
+                keys = [k for k in self._sessions if k[0] == src]
+            for k in keys:
+                del self._sessions[k]
+            self._stats.evictions += len(keys)
+            return len(keys)
+
+    def stats(self) -> OrtRegistryStats:
+        """计数快照（副本，调用方可随意持有）。"""
+        with self._lock:
+            return OrtRegistryStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                load_s=dict(self._stats.load_s),
+            )
+
+
+SESSIONS = OrtSessionRegistry()
+"""进程级默认注册表（vdt reid / pose、PeopleNet 共用）。"""
+
+
+def shared_ort_session(model_path: str, cfg: OrtCfg | None = None) -> OrtSessionLike:
+    """经进程级注册表 :data:`SESSIONS` 取 session（见 :class:`OrtSessionRegistry`）。"""
+    return SESSIONS.get(model_path, cfg)
+
+
+# ---------------------------------------------------------------------------
+# 单测（fake onnxruntime 模块，零 GPU / 零权重）
+# ---------------------------------------------------------------------------
+
+import sys  # noqa: E402
+from types import ModuleType, SimpleNamespace  # noqa: E402
+
+import pytest  # noqa: E402
+
+
+class _FakeOrt(ModuleType):
+    """最小 onnxruntime 替身：记录 InferenceSession 构造参数；可模拟写优化模型。"""
+
+    def __init__(self, providers: list[str]) -> None:
+        super().__init__("onnxruntime")
+        self.__version__ = "1.0.0"
+        self._providers = providers
+        self.calls: list[tuple[str, SimpleNamespace, list[str]]] = []
+        self.GraphOptimizationLevel = SimpleNamespace(
+            ORT_DISABLE_ALL=0, ORT_ENABLE_BASIC=1, ORT_ENABLE_EXTENDED=2, ORT_ENABLE_ALL=99
+        )
+        self.ExecutionMode = SimpleNamespace(ORT_SEQUENTIAL=0, ORT_PARALLEL=1)
+        self.SessionOptions = lambda: SimpleNamespace(
+            intra_op_num_threads=0,
+            inter_op_num_threads=0,
+            execution_mode=0,
+            graph_optimization_level=99,
+            optimized_model_filepath="",
+        )
+
+    def get_available_providers(self) -> list[str]:
+        return self._providers
+
+    def get_device(self) -> str:
+        return "GPU" if "CUDAExecutionProvider" in self._providers else "CPU"
+
+    def InferenceSession(  # 模拟 ort 类名
+        self, path: str, sess_options: SimpleNamespace, providers: list[str]
+    ) -> str:
+        self.calls.append((path, sess_options, providers))
+        if sess_options.optimized_model_filepath:
+            Path(sess_options.optimized_model_filepath).write_bytes(b"opt")
+        return "session"
+
+
+def _install(monkeypatch: pytest.MonkeyPatch, providers: list[str]) -> _FakeOrt:
+    fake = _FakeOrt(providers)
+    monkeypatch.setitem(sys.modules, "onnxruntime", fake)
+    return fake
+
+
+def test_default_requires_cuda(monkeypatch: pytest.MonkeyPatch) -> None:
+    """未配置 → 仍要求 CUDA，CPU-only 环境 fail-fast（不静默回退）。"""
+    _install(monkeypatch, ["CPUExecutionProvider"])
+    with pytest.raises(OrtLoadError, match="CUDAExecutionProvider"):
+        build_ort_session("m.onnx")
+
+
+def test_cpu_provider_applies_threads_and_opt_level(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = _install(monkeypatch, ["CPUExecutionProvider"])
+    cfg = OrtCfg(provider="cpu", intra_op_threads=4, inter_op_threads=2, graph_opt="basic")
+    assert build_ort_session("m.onnx", cfg) == "session"
+    path, so, providers = fake.calls[0]
+    assert (path, providers) == ("m.onnx", ["CPUExecutionProvider"])
+    assert so.intra_op_num_threads == 4 and so.inter_op_num_threads == 2
+    assert so.execution_mode == 1  # ORT_PARALLEL
+    assert so.graph_optimization_level == 1  # ORT_ENABLE_BASIC
+
+
+def test_optimized_model_cache_roundtrip(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """首次加载写缓存；再次加载改读缓存并关闭图优化；权重 / ort 版本 / 设备改动 → 新缓存键。"""
+    fake = _install(monkeypatch, ["CPUExecutionProvider"])
+    weight = tmp_path / "m.onnx"
+    weight.write_bytes(b"w")
+    cfg = OrtCfg(provider="cpu", cache_dir=str(tmp_path / "cache"))
+
+    build_ort_session(str(weight), cfg)
+    cached = optimized_model_path(str(weight), cfg)
+    assert cached is not None and cached.read_bytes() == b"opt"
+    assert fake.calls[0][0] == str(weight)
+    assert not list(cached.parent.glob("*.tmp"))
+
+    build_ort_session(str(weight), cfg)
+    path, so, _ = fake.calls[1]
+    assert path == str(cached)
+    assert so.graph_optimization_level == 0  # ORT_DISABLE_ALL
+
+    monkeypatch.setattr(fake, "__version__", "1.1.0")
+    assert optimized_model_path(str(weight), cfg) != cached
+    monkeypatch.setattr(fake, "__version__", "1.0.0")
+    monkeypatch.setattr(fake, "_providers", ["CUDAExecutionProvider", "CPUExecutionProvider"])
+    assert optimized_model_path(str(weight), cfg) != cached  # GPU 构建的 ort
+    monkeypatch.setattr(fake, "_providers", ["CPUExecutionProvider"])
+    assert optimized_model_path(str(weight), cfg) == cached
+    os.utime(weight, ns=(0, 0))
+    assert optimized_model_path(str(weight), cfg) != cached
+    assert optimized_model_path(str(weight), OrtCfg(provider="cpu")) is None
+
+
+def test_registry_reuses_and_reloads_on_mtime(tmp_path: Path) -> None:
+    """同权重同配置只构造一次；配置不同 → 另一 session；mtime 变 → 重载并淘汰旧项。"""
+    built: list[tuple[str, str]] = []
+
+    def build(path: str, cfg: OrtCfg) -> OrtSessionLike:
+        built.append((path, cfg.provider))
+        return SimpleNamespace(n=len(built))
+
+    weight = tmp_path / "m.onnx"
+    weight.write_bytes(b"w")
+    reg = OrtSessionRegistry(build=build)
+    a = reg.get(str(weight))
+    assert reg.get(str(weight), OrtCfg()) is a
+    b = reg.get(str(weight), OrtCfg(provider="cpu"))
+    assert b is not a and len(reg) == 2
+
+    os.utime(weight, ns=(1, 1))
+    c = reg.get(str(weight))
+    assert c is not a and len(reg) == 2  # 旧 mtime 的 cuda session 被替换
+    st = reg.stats()
+    assert (st.hits, st.misses, st.evictions) == (1, 3, 1)
+    assert str(weight.resolve()) in st.load_s and st.load_s_total >= 0.0
+    assert len(built) == 3
+
+
+def test_registry_lru_and_evict(tmp_path: Path) -> None:
+    weights = []
+    for i in range(3):
+        w = tmp_path / f"m{i}.onnx"
+        w.write_bytes(b"w")
+        weights.append(str(w))
+    reg = OrtSessionRegistry(
+        max_sessions=2,
+        build=lambda p, _c: SimpleNamespace(p=p),
+    )
+    s0 = reg.get(weights[0])
+    reg.get(weights[1])
+    reg.get(weights[0])  # m0 变为最近使用
+    reg.get(weights[2])  # 淘汰最久未用的 m1
+    assert reg.get(weights[0]) is s0
+    assert reg.evict(weights[2]) == 1 and len(reg) == 1
+    assert reg.evict() == 1 and len(reg) == 0
+    with pytest.raises(OrtLoadError, match="不可读"):
+        reg.get(str(tmp_path / "missing.onnx"))
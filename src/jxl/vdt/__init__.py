@@ -13,16 +13,20 @@ from jxl.vdt.types import (
     Decoder,
     DetCfg,
     Detector,
+    ExecCfg,
     FrameResult,
+    FrameSink,
     IouCfg,
     Keypoints,
     ModelLoadError,
+    OrtCfg,
     Point,
     PoseCfg,
     PoseError,
     PoseStep,
     ReidCfg,
     ReidError,
+    StageTimer,
     Track,
     Tracker,
     Tracks,
@@ -36,16 +40,20 @@ __all__ = [
     "Decoder",
     "DetCfg",
     "Detector",
+    "ExecCfg",
     "FrameResult",
+    "FrameSink",
     "IouCfg",
     "Keypoints",
     "ModelLoadError",
+    "OrtCfg",
     "Point",
     "PoseCfg",
     "PoseError",
     "PoseStep",
     "ReidCfg",
     "ReidError",
+    "StageTimer",
     "Track",
     "Tracker",
     "Tracks",
@@ -0,0 +1,118 @@
+"""批量匀速卡尔曼滤波（IoU 跟踪运动模型，``IouCfg.motion="kalman"``）。
+
+状态 8 维 ``[cx, cy, w, h, vcx, vcy, vw, vh]``（归一化坐标，单位时间 = 一个采样帧），
+观测 4 维 ``[cx, cy, w, h]``。噪声标准差与框宽高成比例（ByteTrack / BoT-SORT 的
+XYWH 参数化：位置 1/20、速度 1/160），因而与坐标尺度无关。
+
+全部函数对 ``N`` 条轨迹**批量**运算（``mean [N,8]``、``cov [N,8,8]``），与
+:class:`jxl.vdt.tracker.IouTracker` 的 ndarray 轨迹状态同序；纯函数，不持状态。
+框的外部表示沿用 tracker 的左上角 ``xywh``。
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+_W_POS = 1.0 / 20
+"""位置噪声标准差 / 框边长。"""
+_W_VEL = 1.0 / 160
+"""速度噪声标准差 / 框边长。"""
+
+_F = np.eye(8)
+_F[:4, 4:] = np.eye(4)
+"""匀速转移矩阵：``x' = x + v``。"""
+
+_MIN_SIDE = 1e-6
+"""预测宽高下限（防负宽高 → IoU 计算退化）。"""
+
+
+def _wh4(wh: np.ndarray) -> np.ndarray:
+    """``[N,2]`` 宽高 → ``[N,4]`` 的 ``(w, h, w, h)`` 噪声尺度。"""
+    return np.concatenate([wh, wh], axis=1)
+
+
+def _to_cxcywh(xywh: np.ndarray) -> np.ndarray:
+    out = xywh.copy()
+    out[:, :2] += xywh[:, 2:] / 2
+    return out
+
+
+def to_xywh(mean: np.ndarray) -> np.ndarray:
+    """状态均值 ``[N,8]`` → 左上角 ``xywh`` 框 ``[N,4]``（宽高截断到正数）。"""
+    wh = np.maximum(mean[:, 2:4], _MIN_SIDE)
+    return np.concatenate([mean[:, :2] - wh / 2, wh], axis=1)
+
+
+def initiate(xywh: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """由首个观测建轨迹状态：速度 0，协方差按框尺寸放大（速度不确定度高）。"""
+    n = len(xywh)
+    mean = np.zeros((n, 8))
+    mean[:, :4] = _to_cxcywh(xywh)
+    s = _wh4(xywh[:, 2:])
+    std = np.concatenate([2 * _W_POS * s, 10 * _W_VEL * s], axis=1)
+    cov = np.zeros((n, 8, 8))
+    idx = np.arange(8)
+    cov[:, idx, idx] = std**2
+    return mean, cov
+
+
+def predict(mean: np.ndarray, cov: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """一步匀速预测：``x' = F x``，``P' = F P Fᵀ + Q``。"""
+    s = _wh4(mean[:, 2:4])
+    std = np.concatenate([_W_POS * s, _W_VEL * s], axis=1)
+    q = np.zeros_like(cov)
+    idx = np.arange(8)
+    q[:, idx, idx] = std**2
+    return mean @ _F.T, _F @ cov @ _F.T + q
+
+
+def update(
+    mean: np.ndarray, cov: np.ndarray, xywh: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """以观测框 ``xywh [N,4]`` 校正状态（标准卡尔曼增益，批量求解）。"""
+    z = _to_cxcywh(xywh)
+    s = _wh4(mean[:, 2:4])
+    r = np.zeros((len(mean), 4, 4))
+    idx = np.arange(4)
+    r[:, idx, idx] = (_W_POS * s) ** 2
+    ph = cov[:, :, :4]  # P Hᵀ（H = [I4 0]）
+    innov_cov = cov[:, :4, :4] + r
+    gain = np.linalg.solve(innov_cov, ph.transpose(0, 2, 1)).transpose(0, 2, 1)
+    innov = z - mean[:, :4]
+    new_mean = mean + np.einsum("nij,nj->ni", gain, innov)
+    new_cov = cov - gain @ cov[:, :4, :]
+    return new_mean, new_cov
+
+
+# ---------------------------------------------------------------------------
+# 单测（纯数值，零依赖）
+# ---------------------------------------------------------------------------
+
+
+def test_initiate_roundtrip_box() -> None:
+    box = np.array([[0.1, 0.2, 0.3, 0.4]])
+    mean, cov = initiate(box)
+    assert np.allclose(to_xywh(mean), box)
+    assert np.all(mean[:, 4:] == 0)
+    assert cov.shape == (1, 8, 8)
+
+
+def test_constant_velocity_is_learned() -> None:
+    """匀速运动若干步后，预测框逼近真实下一位置（速度被估计出来）。"""
+    v = 0.03
+    mean, cov = initiate(np.array([[0.1, 0.1, 0.1, 0.2]]))
+    for t in range(1, 8):
+        mean, cov = predict(mean, cov)
+        mean, cov = update(mean, cov, np.array([[0.1 + v * t, 0.1, 0.1, 0.2]]))
+    mean, _ = predict(mean, cov)
+    assert abs(to_xywh(mean)[0, 0] - (0.1 + v * 8)) < 0.005
+
+
+def test_batch_equals_single() -> None:
+    """批量运算与逐条运算一致（行间无耦合）。"""
+    boxes = np.array([[0.1, 0.1, 0.1, 0.2], [0.5, 0.4, 0.2, 0.1]])
+    meas = boxes + 0.01
+    m, c = update(*predict(*initiate(boxes)), meas)
+    for i in range(2):
+        mi, ci = update(*predict(*initiate(boxes[i : i + 1])), meas[i : i + 1])
+        assert np.allclose(m[i], mi[0]) and np.allclose(c[i], ci[0])
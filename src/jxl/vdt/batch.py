@@ -0,0 +1,463 @@
+"""vdt 多视频批处理：进程池 fan-out + 每 worker 模型复用 + 断点续跑。
+
+``vdt run`` 每次调用都重建 detector/tracker/pose，短视频场景下模型加载成本压过推理。
+本模块把**建阶段**与**跑视频**拆开：
+
+- 每个 worker 进程在 initializer 中 ``build_stages`` 一次（detector/tracker/pose 常驻）；
+- 每个视频仅新建 decoder，经 ``run_pipeline`` 执行——其入口已调用
+  ``tracker.reset()`` / ``pose.reset()``（Tracker/PoseStep 复用契约，spec §8），
+  视频之间不串状态；
+- 每个视频产出 ``<out_dir>/<相对路径去后缀>/tracks.json``（先写临时文件再 ``replace``，
+  原子落盘）；已存在即视为完成 → 续跑时跳过；同目录同名不同后缀的视频（``a.mp4`` /
+  ``a.mkv``）会落到同一输出，规划阶段直接报错；
+- 批次结束写 ``summary.json``（逐视频状态 + 汇总）。
+
+错误语义：单视频 ``VdtError``（坏视频/解码失败等）记入 summary 不中断批次；模型加载
+失败（initializer 抛错）及非 ``VdtError`` 异常原样上抛（fail-fast，不吞编程错误）。
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
+
+from jxl.vdt.types import Detector, PoseStep, Tracker, VdtConfig, VdtError
+
+VIDEO_SUFFIXES: frozenset[str] = frozenset(
+    {".mp4", ".mkv", ".avi", ".mov", ".m4v", ".webm", ".ts", ".flv"}
+)
+"""目录扫描时识别为视频的后缀（小写比较）。"""
+
+MANIFEST_SUFFIXES: frozenset[str] = frozenset({".txt", ".lst"})
+"""清单文件后缀：每行一个视频路径，``#`` 起注释，相对路径相对清单所在目录。"""
+
+TRACKS_NAME = "tracks.json"
+SUMMARY_NAME = "summary.json"
+
+
+# ---------------------------------------------------------------------------
+# 结果模型
+# ---------------------------------------------------------------------------
+
+
+class BatchItem(BaseModel):
+    """单视频处理结果（summary 行）。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    video: str
+    out: str
+    status: Literal["ok", "skipped", "failed"]
+    n_tracks: int = Field(ge=0, default=0, description="轨迹条数（skipped/failed 为 0）")
+    elapsed_s: float = Field(ge=0.0, default=0.0, description="本视频耗时（秒）")
+    error: str = Field(default="", description="failed 时的错误信息")
+
+
+class BatchSummary(BaseModel):
+    """批次汇总（写 ``summary.json``）。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    workers: int
+    n_ok: int
+    n_skipped: int
+    n_failed: int
+    elapsed_s: float
+    items: list[BatchItem]
+    config: VdtConfig
+
+
+# ---------------------------------------------------------------------------
+# 纯函数 helper
+# ---------------------------------------------------------------------------
+
+
+def _has_magic(spec: str) -> bool:
+    return any(c in spec for c in "*?[")
+
+
+def _read_manifest(path: Path) -> Iterator[Path]:
+    for line in path.read_text(encoding="utf-8").splitlines():
+        s = line.strip()
+        if not s or s.startswith("#"):
+            continue
+        p = Path(s)
+        yield p if p.is_absolute() else path.parent / p
+
+
+def collect_videos(specs: Iterable[str]) -> list[Path]:
+    """展开输入描述为视频列表（保序去重）。
+
+    每个 spec 可为：目录（递归扫描 ``VIDEO_SUFFIXES``，排序）、glob 模式（``**`` 递归）、
+    清单文件（``MANIFEST_SUFFIXES``）或单个视频文件。
+
+    Raises:
+        VdtError: spec 不存在 / glob 无匹配 / 清单中有缺失文件。
+    """
+    out: list[Path] = []
+    seen: set[Path] = set()
+
+    def _add(p: Path) -> None:
+        key = p.resolve()
+        if key not in seen:
+            seen.add(key)
+            out.append(p)
+
+    for spec in specs:
+        path = Path(spec)
+        if path.is_dir():
+            for p in sorted(path.rglob("*")):
+                if p.is_file() and p.suffix.lower() in VIDEO_SUFFIXES:
+                    _add(p)
+        elif path.is_file() and path.suffix.lower() in MANIFEST_SUFFIXES:
+            for p in _read_manifest(path):
+                if not p.is_file():
+                    raise VdtError(f"清单 {path} 中的视频不存在: {p}")
+                _add(p)
+        elif path.is_file():
+            _add(path)
+        elif _has_magic(spec):
+            hits = sorted(glob.glob(spec, recursive=True))
+            files = [Path(h) for h in hits if Path(h).is_file()]
+            if not files:
+                raise VdtError(f"glob 无匹配视频: {spec}")
+            for p in files:
+                _add(p)
+        else:
+            raise VdtError(f"输入不存在: {spec}")
+    return out
+
+
+def plan_outputs(videos: list[Path], out_dir: Path) -> list[tuple[Path, Path]]:
+    """为每个视频分配 ``tracks.json`` 路径：``out_dir/<相对公共根路径去后缀>/tracks.json``。
+
+    公共根取所有视频父目录的最长公共前缀，保留子目录结构，不同子目录下的同名视频不冲突。
+
+    Raises:
+        VdtError: 两个视频映射到同一输出（同目录仅后缀不同，如 ``a.mp4`` / ``a.mkv``）——
+            否则后者覆盖前者，续跑时还会被误判为已完成。
+    """
+    if not videos:
+        return []
+    resolved = [v.resolve() for v in videos]
+    root = Path(os.path.commonpath([str(v.parent) for v in resolved]))
+    jobs = [
+        (v, out_dir / r.relative_to(root).with_suffix("") / TRACKS_NAME)
+        for v, r in zip(videos, resolved, strict=True)
+    ]
+    owner: dict[Path, Path] = {}
+    for v, out in jobs:
+        if (prev := owner.setdefault(out, v)) != v:
+            raise VdtError(f"输出冲突: {prev} 与 {v} 都映射到 {out}（同名不同后缀）")
+    return jobs
+
+
+# ---------------------------------------------------------------------------
+# worker（每进程一份常驻阶段）
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class Stages:
+    """跨视频复用的有状态阶段（decoder 每视频新建，不在此列）。"""
+
+    detector: Detector
+    tracker: Tracker
+    pose: PoseStep | None
+
+
+type StagesBuilder = Callable[[VdtConfig], Stages]
+
+
+def build_stages(config: VdtConfig) -> Stages:
+    """按配置构造 detector/tracker/pose（加载模型，每 worker 调一次）。"""
+    from jxl.vdt.pipeline import build_detector, build_pose, build_tracker
+
+    return Stages(
+        detector=build_detector(config.det),
+        tracker=build_tracker(config),
+        pose=build_pose(config.pose),
+    )
+
+
+_worker_config: VdtConfig | None = None
+_worker_stages: Stages | None = None
+
+
+def _init_worker(config: VdtConfig, builder: StagesBuilder) -> None:
+    """进程池 initializer：本进程建一次阶段，后续视频复用。"""
+    global _worker_config, _worker_stages  # noqa: PLW0603 — 进程级单例，initializer 惯用法
+    _worker_config = config
+    _worker_stages = builder(config)
+
+
+def _process_one(video: Path, out: Path) -> BatchItem:
+    """用本进程常驻阶段处理一个视频并原子落盘 ``tracks.json``。"""
+    from jxl.vdt.cli import write_tracks
+    from jxl.vdt.pipeline import build_decoder, run_pipeline
+
+    if _worker_config is None or _worker_stages is None:
+        raise VdtError("batch worker 未初始化（_init_worker 未调用）")
+    config, stages = _worker_config, _worker_stages
+    t0 = time.perf_counter()
+    try:
+        decoder = build_decoder(str(video), config.decode)
+        tracks = run_pipeline(
+            decoder,
+            stages.detector,
+            stages.tracker,  # run_pipeline 入口 reset()，视频间不串状态
+            stages.pose,
+            src=str(video),
+            fps=decoder.fps,
+            duration_ms=decoder.duration_ms,
+            config=config,
+        )
+    except VdtError as e:
+        return BatchItem(
+            video=str(video),
+            out=str(out),
+            status="failed",
+            elapsed_s=time.perf_counter() - t0,
+            error=f"{type(e).__name__}: {e}",
+        )
+    tmp = out.with_name(f".{out.name}.tmp")
+    write_tracks(tracks, tmp)
+    tmp.replace(out)  # 原子落盘：中断不留半截 tracks.json，续跑判定可靠
+    return BatchItem(
+        video=str(video),
+        out=str(out),
+        status="ok",
+        n_tracks=len(tracks.tracks),
+        elapsed_s=time.perf_counter() - t0,
+    )
+
+
+# ---------------------------------------------------------------------------
+# 编排
+# ---------------------------------------------------------------------------
+
+
+def run_batch(
+    jobs: list[tuple[Path, Path]],
+    config: VdtConfig,
+    *,
+    workers: int = 1,
+    resume: bool = True,
+    builder: StagesBuilder = build_stages,
+    on_item: Callable[[BatchItem], None] | None = None,
+) -> BatchSummary:
+    """批量跑 ``(video, out)`` 作业。
+
+    Args:
+        jobs: ``plan_outputs`` 产出的作业列表。
+        config: 全批次共用配置。
+        workers: 进程数；1 = 当前进程串行（不起进程池）。
+        resume: True 时跳过 ``out`` 已存在的视频。
+        builder: 阶段构造器（须可 pickle——模块级函数）；测试注入 fake。
+        on_item: 每完成一个视频的回调（进度日志）。
+
+    Returns:
+        BatchSummary：items 顺序与 ``jobs`` 一致。
+    """
+    if workers < 1:
+        raise ValueError(f"workers 必须 ≥ 1，实际 {workers}")
+    t0 = time.perf_counter()
+    results: dict[int, BatchItem] = {}
+    todo: list[int] = []
+    for i, (video, out) in enumerate(jobs):
+        if resume and out.is_file():
+            results[i] = BatchItem(video=str(video), out=str(out), status="skipped")
+        else:
+            todo.append(i)
+
+    def _done(i: int, item: BatchItem) -> None:
+        results[i] = item
+        if on_item is not None:
+            on_item(item)
+
+    if todo and workers == 1:
+        _init_worker(config, builder)
+        for i in todo:
+            _done(i, _process_one(*jobs[i]))
+    elif todo:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(todo)),
+            initializer=_init_worker,
+            initargs=(config, builder),
+        ) as pool:
+            futures = {i: pool.submit(_process_one, *jobs[i]) for i in todo}
+            for i, fut in futures.items():
+                _done(i, fut.result())  # 非 VdtError / initializer 失败在此原样上抛
+
+    items = [results[i] for i in range(len(jobs))]
+    return BatchSummary(
+        workers=workers,
+        n_ok=sum(it.status == "ok" for it in items),
+        n_skipped=sum(it.status == "skipped" for it in items),
+        n_failed=sum(it.status == "failed" for it in items),
+        elapsed_s=time.perf_counter() - t0,
+        items=items,
+        config=config,
+    )
+
+
+def write_summary(summary: BatchSummary, path: Path) -> None:
+    """将 ``BatchSummary`` 写为 JSON（orjson，pydantic JSON 模式）。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(
+        orjson.dumps(summary.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+    )
+
+
+# ---------------------------------------------------------------------------
+# 单测（自包含：fake 阶段构造器 + 合成视频，零模型）
+# ---------------------------------------------------------------------------
+
+import pytest  # noqa: E402
+
+_FAKE_BUILDS = 0
+"""本进程 ``_fake_builder`` 调用次数（断言每 worker 只建一次阶段）。"""
+
+
+class _OneBoxDetector:
+    """合成检测器：每帧一个固定框。"""
+
+    def detect(self, image: object) -> list[object]:  # noqa: ARG002
+        from jvi.geo.point2d import Point
+        from jvi.geo.rectangle import Rect
+
+        from jxl.det.d2d import D2dObject
+
+        rect = Rect.from_ltrb(Point(x=0.1, y=0.1), Point(x=0.4, y=0.6))
+        return [D2dObject(id=0, cls=0, conf=0.9, rect=rect)]
+
+
+def _fake_builder(config: VdtConfig) -> Stages:
+    """模块级（可 pickle）fake：真实 IouTracker + 合成检测器，无 pose。"""
+    global _FAKE_BUILDS  # noqa: PLW0603
+    from jxl.vdt.tracker import IouTracker
+    from jxl.vdt.types import IouCfg
+
+    _FAKE_BUILDS += 1
+    assert isinstance(config.tracker_cfg, IouCfg)
+    return Stages(
+        detector=_OneBoxDetector(),  # type: ignore[arg-type]
+        tracker=IouTracker(config.tracker_cfg),
+        pose=None,
+    )
+
+
+def _iou_config() -> VdtConfig:
+    from jxl.vdt.types import DecodeCfg, DetCfg, IouCfg
+
+    return VdtConfig(
+        tracker="iou",
+        decode=DecodeCfg(fps=5.0),
+        det=DetCfg(model="x"),
+        tracker_cfg=IouCfg(min_hits=1),
+    )
+
+
+def _make_videos(root: Path, names: list[str]) -> list[Path]:
+    from jxl.vdt.decoder import _make_synthetic_video
+
+    out = []
+    for n in names:
+        p = root / n
+        p.parent.mkdir(parents=True, exist_ok=True)
+        _make_synthetic_video(str(p), fps=5.0, frames=4)
+        out.append(p)
+    return out
+
+
+def test_collect_videos_dir_glob_manifest(tmp_path: Path) -> None:
+    """目录递归 / glob / 清单三种输入展开，保序去重。"""
+    for rel in ["a/1.mp4", "a/2.MKV", "b/3.mp4", "a/note.txt"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_bytes(b"")
+    manifest = tmp_path / "list.txt"
+    manifest.write_text("# comment\nb/3.mp4\n\na/1.mp4\n", encoding="utf-8")
+
+    by_dir = collect_videos([str(tmp_path / "a")])
+    assert [p.name for p in by_dir] == ["1.mp4", "2.MKV"]
+    by_glob = collect_videos([str(tmp_path / "**" / "*.mp4")])
+    assert [p.name for p in by_glob] == ["1.mp4", "3.mp4"]
+    mixed = collect_videos([str(manifest), str(tmp_path / "a")])
+    assert [p.name for p in mixed] == ["3.mp4", "1.mp4", "2.MKV"]
+
+
+def test_collect_videos_missing_raises(tmp_path: Path) -> None:
+    with pytest.raises(VdtError, match="不存在"):
+        collect_videos([str(tmp_path / "nope.mp4")])
+    with pytest.raises(VdtError, match="glob"):
+        collect_videos([str(tmp_path / "*.mkv")])
+
+
+def test_plan_outputs_keeps_subdirs(tmp_path: Path) -> None:
+    """同名视频分属不同子目录 → 输出不冲突。"""
+    vids = [tmp_path / "x" / "v.mp4", tmp_path / "y" / "v.mp4"]
+    outs = [o for _, o in plan_outputs(vids, tmp_path / "out")]
+    assert outs == [
+        tmp_path / "out" / "x" / "v" / TRACKS_NAME,
+        tmp_path / "out" / "y" / "v" / TRACKS_NAME,
+    ]
+
+
+def test_plan_outputs_rejects_same_stem_videos(tmp_path: Path) -> None:
+    """同目录同名不同后缀 → 输出冲突，规划阶段即报错（不静默覆盖）。"""
+    vids = [tmp_path / "cam1.mp4", tmp_path / "cam1.mkv"]
+    with pytest.raises(VdtError, match="输出冲突"):
+        plan_outputs(vids, tmp_path / "out")
+
+
+def test_run_batch_in_process_reuses_stages_and_resumes(tmp_path: Path) -> None:
+    """workers=1：3 个视频只建一次阶段；二次运行全部 skipped。"""
+    from jxl.vdt.types import Tracks
+
+    global _FAKE_BUILDS  # noqa: PLW0603
+    _FAKE_BUILDS = 0
+    vids = _make_videos(tmp_path / "in", ["a.mp4", "b.mp4", "sub/c.mp4"])
+    jobs = plan_outputs(vids, tmp_path / "out")
+    s1 = run_batch(jobs, _iou_config(), builder=_fake_builder)
+    assert _FAKE_BUILDS == 1
+    assert (s1.n_ok, s1.n_skipped, s1.n_failed) == (3, 0, 0)
+    for _, out in jobs:
+        tr = Tracks.model_validate_json(out.read_bytes())
+        assert [t.id for t in tr.tracks] == [1]  # reset 生效：每视频 id 从 1 起
+
+    s2 = run_batch(jobs, _iou_config(), builder=_fake_builder)
+    assert (s2.n_ok, s2.n_skipped) == (0, 3)
+    assert _FAKE_BUILDS == 1  # 全跳过不建阶段
+
+
+def test_run_batch_records_bad_video_and_continues(tmp_path: Path) -> None:
+    """坏视频 → failed（记错误，无输出）；其余视频照常完成。"""
+    vids = _make_videos(tmp_path, ["ok.mp4"])
+    bad = tmp_path / "bad.mp4"
+    bad.write_bytes(b"not a video")
+    jobs = plan_outputs([bad, *vids], tmp_path / "out")
+    s = run_batch(jobs, _iou_config(), builder=_fake_builder)
+    assert [it.status for it in s.items] == ["failed", "ok"]
+    assert s.items[0].error
+    assert not jobs[0][1].exists()
+
+
+def test_run_batch_process_pool_matches_in_process(tmp_path: Path) -> None:
+    """workers=2 进程池产出与 workers=1 逐字节一致。"""
+    vids = _make_videos(tmp_path / "in", ["a.mp4", "b.mp4", "c.mp4"])
+    j1 = plan_outputs(vids, tmp_path / "o1")
+    j2 = plan_outputs(vids, tmp_path / "o2")
+    run_batch(j1, _iou_config(), builder=_fake_builder)
+    s = run_batch(j2, _iou_config(), workers=2, builder=_fake_builder)
+    assert s.n_ok == 3
+    for (_, a), (_, b) in zip(j1, j2, strict=True):
+        assert a.read_bytes() == b.read_bytes()
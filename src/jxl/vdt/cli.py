@@ -4,7 +4,13 @@
 lazy import 拉起，避免 app import 即拖入 torch/ultralytics/onnxruntime。
 
 命令：
-- ``vdt run <video> --config <toml>`` 跑管线，可选 ``--out-tracks`` / ``--out-video``。
+- ``vdt run <video> --config <toml>`` 跑管线，可选 ``--out-tracks`` / ``--out-video``；
+  ``--out-tracks`` 以 ``.jsonl``/``.ndjson`` 结尾时流式追加写轨迹（长录像内存有界），
+  ``.npz`` 写列式 NPZ；``--format`` 显式指定时覆盖后缀推断。
+  ``--profile out.json`` 输出阶段耗时报告（p50/p95/p99 + 有效 fps，见 :mod:`jxl.vdt.profile`）。
+- ``vdt convert <src> <dst>`` 轨迹文件格式互转（json / jsonl / npz，无损）。
+- ``vdt batch <dir|glob|manifest>... --out-dir <dir>`` 多视频批处理（进程池，
+  每 worker 复用模型，按已有 tracks.json 续跑）。
 - ``vdt info`` 打印模型槽位与配置示例。
 
 约定（j-python-strict）：纯函数 helper（``load_config``/``write_tracks``/
@@ -14,11 +20,12 @@ lazy import 拉起，避免 app import 即拖入 torch/ultralytics/onnxruntime
 from __future__ import annotations
 
 import sys
+import time
 import tomllib
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Annotated, get_args
 
-import orjson
 import typer
 from loguru import logger
 from pydantic import ValidationError
@@ -27,8 +34,8 @@ from jxl.det.d2d import D2dObject
 from jxl.vdt.draw import DrawOpts
 from jxl.vdt.types import (
     DecodeCfg,
-    DecodeError,
     DetCfg,
+    ExecCfg,
     FrameResult,
     IouCfg,
     Keypoints,
@@ -44,6 +51,12 @@ _TRACKR_MODES: tuple[str, ...] = get_args(VdtConfig.model_fields["tracker"].anno
 """合法 tracker 模式——**派生自** ``VdtConfig.tracker`` 的 Literal（单一数据源，
 新增模式仅改 types.py 一处，CLI 自动同步；j-design-principles 原则 8）。"""
 
+_EXEC_MODES: tuple[str, ...] = get_args(ExecCfg.model_fields["mode"].annotation)
+"""合法执行模式——派生自 ``ExecCfg.mode`` 的 Literal（同 ``_TRACKR_MODES``，单一数据源）。"""
+
+_TRACK_FORMATS: tuple[str, ...] = ("json", "jsonl", "npz")
+"""合法轨迹格式（同 ``tracks_io.TracksFormat``；jsonl 走流式管线 ``pipeline.run_stream``）。"""
+
 _REPO_ROOT = Path(__file__).resolve().parents[3]
 """py/jxl 仓库根（定位 gitignored 模型权重 yolo26n.pt / rtmpose-17-m.onnx）。"""
 
@@ -120,25 +133,23 @@ def load_config(path: Path | None, tracker_override: str | None, no_pose: bool)
 
 def write_tracks(tracks: Tracks, path: Path) -> None:
     """将 ``Tracks`` 序列化为 JSON 写入 ``path``（orjson，pydantic model_dump JSON 模式）。"""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    payload = tracks.model_dump(mode="json")
-    path.write_bytes(orjson.dumps(payload))
+    from jxl.vdt.tracks_io import write_tracks_as  # noqa: PLC0415
+
+    write_tracks_as(tracks, path, "json")
 
 
 def render_video(
     video_path: str, tracks: Tracks, out_path: Path, opts: DrawOpts
 ) -> None:
-    """按 ``tracks`` 重解码视频并渲染完整演示（框/骨架/尾迹/HUD），写出 mp4。
+    """按已有 ``tracks`` 重解码视频并渲染完整演示（框/骨架/尾迹/HUD），写出 mp4。
 
-    尾迹在渲染循环按 frame_idx 顺序累积（``Tracks`` 按 id 聚合，不直给尾迹）。
-    ``frame_idx`` 与 ``Tracks`` 对齐（``OcvDecoder`` 同 fps 采样）。视频写出由共享层
-    ``VideoWriter`` 完成（spec §3 单一数据源——编码逻辑仅此处一份）。
+    供"轨迹文件已落盘、事后补渲染"使用；``vdt run --out-video`` 走管线内
+    :class:`jxl.vdt.render.RenderSink`，单趟解码同时出轨迹与演示视频，不经此函数。
+    ``Tracks`` 按 id 聚合，此处拆回逐帧 ``FrameResult`` 后交同一 ``RenderSink`` 绘制编码
+    （绘制/编码逻辑单一数据源）。``frame_idx`` 与 ``Tracks`` 对齐（``OcvDecoder`` 同 fps 采样）。
     """
-    import numpy as np  # noqa: PLC0415
-
-    from jxl.io.video import VideoIoError, VideoWriter  # noqa: PLC0415
     from jxl.vdt.decoder import OcvDecoder  # noqa: PLC0415
-    from jxl.vdt.draw import TrailBuffer, render_demo_frame  # noqa: PLC0415
+    from jxl.vdt.render import RenderSink  # noqa: PLC0415
 
     # 从 Tracks（按 id 聚合）拆回逐帧：{frame_idx: (objects, kpts)}
     frame_map: dict[int, tuple[list[D2dObject], list[Keypoints | None]]] = {}
@@ -149,40 +160,12 @@ def render_video(
             kpts.extend(fr.kpts)
 
     decoder = OcvDecoder(video_path, tracks.config.decode)
-    trails = TrailBuffer(opts.trail_len)
-    frame_iter = iter(decoder)
-    try:
-        first_idx, _ts0, first_frame = next(frame_iter)
-    except StopIteration as e:
-        raise DecodeError(f"视频无帧可解码: {video_path}") from e
-    height, width = first_frame.shape[:2]
-
-    try:
-        with VideoWriter(out_path, tracks.fps, (width, height)) as w:
-
-            def _emit(frame_idx: int, ts_ms: int, frame: np.ndarray) -> None:
-                objs, kpts = frame_map.get(frame_idx, ([], []))
-                canvas = frame.copy()
-                for ob in objs:
-                    if ob.id != 0:
-                        trails.push(ob.id, ob.rect.center())
-                render_demo_frame(
-                    canvas,
-                    objs,
-                    kpts,
-                    trails,
-                    frame_idx,
-                    ts_ms,
-                    tracks.config.tracker,
-                    opts,
-                )
-                w.write(canvas)
-
-            _emit(first_idx, _ts0, first_frame)
-            for frame_idx, ts_ms, frame in frame_iter:
-                _emit(frame_idx, ts_ms, frame)
-    except VideoIoError as e:
-        raise DecodeError(str(e)) from e
+    with RenderSink(
+        out_path, tracks.fps, opts, tracks.config.tracker, tracks.config.exec.queue_size
+    ) as sink:
+        for frame_idx, ts_ms, frame in decoder:
+            objs, kpts = frame_map.get(frame_idx, ([], []))
+            sink(frame, FrameResult(frame_idx=frame_idx, ts_ms=ts_ms, objects=objs, kpts=kpts))
 
 
 # ---------------------------------------------------------------------------
@@ -202,7 +185,16 @@ def run_cmd(
         typer.Option("--tracker", help=f"覆盖配置中的 tracker ({'/'.join(_TRACKR_MODES)})"),
     ] = None,
     out_tracks: Annotated[
-        Path | None, typer.Option("--out-tracks", help="轨迹 JSON 输出路径")
+        Path | None,
+        typer.Option(
+            "--out-tracks", help="轨迹输出路径（.json 整体写；.jsonl 流式追加写；.npz 列式）"
+        ),
+    ] = None,
+    out_format: Annotated[
+        str | None,
+        typer.Option(
+            "--format", help=f"轨迹格式 ({'/'.join(_TRACK_FORMATS)})；省略=按 --out-tracks 后缀"
+        ),
     ] = None,
     out_video: Annotated[
         Path | None, typer.Option("--out-video", help="标注视频 mp4 输出路径")
@@ -210,6 +202,10 @@ def run_cmd(
     no_pose: Annotated[
         bool, typer.Option("--no-pose", help="禁用 pose 阶段（等价 config.pose=None）"),
     ] = False,
+    exec_mode: Annotated[
+        str | None,
+        typer.Option("--exec", help=f"覆盖配置中的执行模式 ({'/'.join(_EXEC_MODES)})"),
+    ] = None,
     no_box: Annotated[bool, typer.Option("--no-box", help="演示视频不画检测框")] = False,
     no_id: Annotated[
         bool, typer.Option("--no-id", help="不画目标 ID 标签")
@@ -224,38 +220,82 @@ def run_cmd(
     trail_len: Annotated[
         int, typer.Option("--trail-len", help="尾迹长度（帧，默认 30）")
     ] = 30,
+    profile: Annotated[
+        Path | None,
+        typer.Option("--profile", help="阶段耗时报告 JSON 输出路径（p50/p95/p99 + 有效 fps）"),
+    ] = None,
 ) -> None:
     """对 ``video`` 跑 detect → track →（可选）pose 管线，产出 tracks JSON 与/或演示视频。"""
     if tracker is not None and tracker not in _TRACKR_MODES:
         raise typer.BadParameter(f"--tracker 非法: {tracker} (合法: {_TRACKR_MODES})")
+    if exec_mode is not None and exec_mode not in _EXEC_MODES:
+        raise typer.BadParameter(f"--exec 非法: {exec_mode} (合法: {_EXEC_MODES})")
     if not video.is_file():
         raise typer.BadParameter(f"视频不存在: {video}")
     if out_tracks is None and out_video is None:
         raise typer.BadParameter("至少指定 --out-tracks 或 --out-video 之一")
     if trail_len <= 0:
         raise typer.BadParameter(f"--trail-len 必须 > 0，实际 {trail_len}")
+    if out_format is not None and out_format not in _TRACK_FORMATS:
+        raise typer.BadParameter(f"--format 非法: {out_format} (合法: {_TRACK_FORMATS})")
 
-    cfg = load_config(config, tracker, no_pose)
+    from jxl.vdt.tracks_io import infer_tracks_format  # noqa: PLC0415
 
-    from jxl.vdt.pipeline import run  # noqa: PLC0415（lazy import，避免 app import 拉 ML 栈）
+    fmt = out_format or (infer_tracks_format(out_tracks) if out_tracks is not None else "json")
+    cfg = load_config(config, tracker, no_pose)
+    if exec_mode is not None:
+        # 经 model_validate 重建（而非 model_copy(update=)）以保持 Literal 校验。
+        exec_cfg = ExecCfg.model_validate({**cfg.exec.model_dump(), "mode": exec_mode})
+        cfg = cfg.model_copy(update={"exec": exec_cfg})
 
-    logger.info("vdt run: {} | tracker={} | fps={}", video, cfg.tracker, cfg.decode.fps)
-    tracks = run(str(video), cfg)
+    from jxl.vdt.pipeline import run, run_stream  # noqa: PLC0415（lazy import，避免 app import 拉 ML 栈）
 
-    if out_tracks is not None:
-        write_tracks(tracks, out_tracks)
-        logger.info("tracks → {}", out_tracks)
+    logger.info(
+        "vdt run: {} | tracker={} | fps={} | exec={}",
+        video, cfg.tracker, cfg.decode.fps, cfg.exec.mode,
+    )
+    from jxl.vdt.profile import StageProfiler, write_profile  # noqa: PLC0415
+    from jxl.vdt.render import RenderSink  # noqa: PLC0415
+    from jxl.vdt.tracks_io import write_tracks_as  # noqa: PLC0415
+
+    prof = StageProfiler() if profile is not None else None
+    t_start = time.perf_counter()
+    # 演示视频由管线内 RenderSink 在同一趟解码中绘制 + 后台线程编码（不再二次解码）
+    with ExitStack() as stack:
+        sink = None
+        if out_video is not None:
+            opts = DrawOpts(
+                box=not no_box,
+                id=not no_id,
+                skeleton=not no_skeleton,
+                trail=not no_trails,
+                hud=not no_hud,
+                trail_len=trail_len,
+            )
+            sink = stack.enter_context(
+                RenderSink(out_video, cfg.decode.fps, opts, cfg.tracker, cfg.exec.queue_size)
+            )
+        if out_tracks is not None and fmt == "jsonl":
+            # 流式：轨迹结束即追加写出，内存只随活跃轨迹数增长（不读回全量轨迹）
+            n = run_stream(str(video), cfg, out_tracks, frame_sink=sink, timer=prof)
+            logger.info("完成: {} 条轨迹 (jsonl) → {}", n, out_tracks)
+            tracks = None
+        else:
+            tracks = run(str(video), cfg, frame_sink=sink, timer=prof)
+            if out_tracks is not None:
+                t0 = time.perf_counter()
+                write_tracks_as(tracks, out_tracks, fmt)  # type: ignore[arg-type]
+                if prof is not None:
+                    prof.add("write", time.perf_counter() - t0)
+                logger.info("tracks ({}) → {}", fmt, out_tracks)
     if out_video is not None:
-        opts = DrawOpts(
-            box=not no_box,
-            id=not no_id,
-            skeleton=not no_skeleton,
-            trail=not no_trails,
-            hud=not no_hud,
-            trail_len=trail_len,
-        )
-        render_video(str(video), tracks, out_video, opts)
         logger.info("demo video → {}", out_video)
+    if prof is not None and profile is not None:
+        report = prof.report(time.perf_counter() - t_start)
+        write_profile(report, profile)
+        logger.info("profile → {} | {} 帧 | 有效 fps={:.2f}", profile, report.n_frames, report.fps)
+    if tracks is None:
+        return
 
     duration_s = tracks.duration_ms / 1000.0
     n_objs = sum(len(fr.objects) for tr in tracks.tracks for fr in tr.frames)
@@ -265,6 +305,128 @@ def run_cmd(
     )
 
 
+@app.command("batch")
+def batch_cmd(
+    inputs: Annotated[
+        list[str],
+        typer.Argument(help="视频目录 / glob 模式 / 清单文件(.txt/.lst) / 视频文件，可多个"),
+    ],
+    out_dir: Annotated[
+        Path, typer.Option("--out-dir", help="输出根目录（每视频一个 tracks.json + summary.json）")
+    ],
+    config: Annotated[
+        Path | None,
+        typer.Option("--config", help="TOML 配置路径（可选；省略=内置默认配置）"),
+    ] = None,
+    tracker: Annotated[
+        str | None,
+        typer.Option("--tracker", help=f"覆盖配置中的 tracker ({'/'.join(_TRACKR_MODES)})"),
+    ] = None,
+    no_pose: Annotated[
+        bool, typer.Option("--no-pose", help="禁用 pose 阶段（等价 config.pose=None）"),
+    ] = False,
+    exec_mode: Annotated[
+        str | None,
+        typer.Option("--exec", help=f"覆盖配置中的执行模式 ({'/'.join(_EXEC_MODES)})"),
+    ] = None,
+    workers: Annotated[
+        int, typer.Option("--workers", help="worker 进程数（每进程加载一次模型；1=单进程）")
+    ] = 1,
+    no_resume: Annotated[
+        bool, typer.Option("--no-resume", help="不跳过已有 tracks.json 的视频（全部重跑）")
+    ] = False,
+) -> None:
+    """批量对多个视频跑管线：进程池 fan-out，每 worker 复用模型，已完成视频自动跳过。"""
+    if tracker is not None and tracker not in _TRACKR_MODES:
+        raise typer.BadParameter(f"--tracker 非法: {tracker} (合法: {_TRACKR_MODES})")
+    if exec_mode is not None and exec_mode not in _EXEC_MODES:
+        raise typer.BadParameter(f"--exec 非法: {exec_mode} (合法: {_EXEC_MODES})")
+    if workers <= 0:
+        raise typer.BadParameter(f"--workers 必须 > 0，实际 {workers}")
+
+    from jxl.vdt.batch import (  # noqa: PLC0415
+        SUMMARY_NAME,
+        BatchItem,
+        collect_videos,
+        plan_outputs,
+        run_batch,
+        write_summary,
+    )
+    from jxl.vdt.types import VdtError  # noqa: PLC0415
+
+    try:
+        videos = collect_videos(inputs)
+    except VdtError as e:
+        raise typer.BadParameter(str(e)) from e
+    if not videos:
+        raise typer.BadParameter(f"未找到视频: {inputs}")
+
+    cfg = load_config(config, tracker, no_pose)
+    if exec_mode is not None:
+        exec_cfg = ExecCfg.model_validate({**cfg.exec.model_dump(), "mode": exec_mode})
+        cfg = cfg.model_copy(update={"exec": exec_cfg})
+
+    try:
+        jobs = plan_outputs(videos, out_dir)
+    except VdtError as e:
+        raise typer.BadParameter(str(e)) from e
+    logger.info(
+        "vdt batch: {} 个视频 | workers={} | tracker={} | resume={}",
+        len(jobs), workers, cfg.tracker, not no_resume,
+    )
+
+    def _log_item(item: BatchItem) -> None:
+        if item.status == "failed":
+            logger.error("失败: {} | {}", item.video, item.error)
+        else:
+            logger.info(
+                "完成: {} | {} 条轨迹 | {:.1f}s", item.video, item.n_tracks, item.elapsed_s
+            )
+
+    summary = run_batch(
+        jobs, cfg, workers=workers, resume=not no_resume, on_item=_log_item
+    )
+    write_summary(summary, out_dir / SUMMARY_NAME)
+    logger.info(
+        "批次结束: ok={} skipped={} failed={} | {:.1f}s | summary → {}",
+        summary.n_ok, summary.n_skipped, summary.n_failed, summary.elapsed_s,
+        out_dir / SUMMARY_NAME,
+    )
+    if summary.n_failed:
+        raise typer.Exit(code=1)
+
+
+@app.command("convert")
+def convert_cmd(
+    src: Annotated[Path, typer.Argument(help="源轨迹文件（.json / .jsonl / .npz）")],
+    dst: Annotated[Path, typer.Argument(help="目标轨迹文件")],
+    out_format: Annotated[
+        str | None,
+        typer.Option("--format", help=f"目标格式 ({'/'.join(_TRACK_FORMATS)})；省略=按后缀"),
+    ] = None,
+) -> None:
+    """轨迹文件格式互转（无损：读回的 ``Tracks`` 与源逐字段相等）。"""
+    if out_format is not None and out_format not in _TRACK_FORMATS:
+        raise typer.BadParameter(f"--format 非法: {out_format} (合法: {_TRACK_FORMATS})")
+    if not src.is_file():
+        raise typer.BadParameter(f"轨迹文件不存在: {src}")
+
+    from jxl.vdt.tracks_io import (  # noqa: PLC0415
+        infer_tracks_format,
+        read_tracks,
+        write_tracks_as,
+    )
+    from jxl.vdt.types import VdtError  # noqa: PLC0415
+
+    fmt = out_format or infer_tracks_format(dst)
+    try:
+        tracks = read_tracks(src)
+    except VdtError as e:
+        raise typer.BadParameter(str(e)) from e
+    write_tracks_as(tracks, dst, fmt)  # type: ignore[arg-type]
+    logger.info("{} 条轨迹: {} → {} ({})", len(tracks.tracks), src, dst, fmt)
+
+
 @app.command("info")
 def info_cmd() -> None:
     """打印模型槽位说明与配置示例（纯文本，无副作用）。"""
@@ -276,7 +438,8 @@ def info_cmd() -> None:
 
   IoU 跟踪 (tracker="iou")
     实现: jxl.vdt.tracker.IouTracker（ByteTrack-on-detections 思路）
-    配置: [tracker_cfg.iou]  iou_thr / max_age / min_hits
+    配置: [tracker_cfg.iou]  iou_thr / max_age / min_hits / assign(greedy|hungarian)
+          motion(none|kalman) / two_stage / high_conf / low_iou_thr（ByteTrack 两阶段）
 
   ReID 嵌入 (tracker="reid", tracker_cfg.reid.model)
     默认: DINOv3 ViT-S/16 (frozen, ~21M)
@@ -303,12 +466,25 @@ def info_cmd() -> None:
   motion_radius = 0.3
   ema = 0.2
   ttl_sec = 600
+  # [tracker_cfg.reid.ort]   # 可选（[pose.ort] 同）；缺省 provider="cuda"，无 CUDA 即报错
+  # provider = "cpu"         # 纯 CPU 节点显式开启
+  # intra_op_threads = 8
+  # inter_op_threads = 1
+  # graph_opt = "all"        # disable | basic | extended | all
+  # cache_dir = ".cache/ort" # 缓存优化后模型，重复加载跳过图优化
   [pose]
   enabled = true
   model = "rtmpose-m.onnx"
   kpt_shape = [17, 3]
   keyframe_every = 5
+  keyframe_max = 0    # >keyframe_every 时框静止则间隔自适应拉长到此值
+  reuse = "copy"      # copy | warp（跳过帧按框平移/缩放变换上次关键点）
   min_hits = 3
+  max_per_frame = 0   # 每帧 pose crop 上限（0=不限）；超出按陈旧度/置信度/框面积排队顺延
+  max_ms = 0.0        # 每帧 pose forward 毫秒预算（0=不限）
+  [exec]
+  mode = "threaded"   # serial | threaded（decode/detect/track+pose 三阶段重叠）
+  queue_size = 8
 """
     sys.stdout.write(info)
 
@@ -445,6 +621,35 @@ def test_write_tracks_roundtrip(tmp_path: _Path) -> None:
     assert back.tracks[0].id == 1
 
 
+def test_convert_cmd_json_npz_roundtrip(tmp_path: _Path) -> None:
+    """json → npz → json 经 ``vdt convert`` 无损往返。"""
+    tracks = _synth_tracks()
+    src = tmp_path / "t.json"
+    write_tracks(tracks, src)
+    runner = CliRunner()
+    r1 = runner.invoke(app, ["convert", str(src), str(tmp_path / "t.npz")])
+    assert r1.exit_code == 0, r1.output
+    r2 = runner.invoke(app, ["convert", str(tmp_path / "t.npz"), str(tmp_path / "u.bin"),
+                             "--format", "json"])  # fmt: skip
+    assert r2.exit_code == 0, r2.output
+    assert (tmp_path / "u.bin").read_bytes() == src.read_bytes()
+
+
+def test_convert_and_run_bad_format(tmp_path: _Path) -> None:
+    src = tmp_path / "t.json"
+    write_tracks(_synth_tracks(), src)
+    runner = CliRunner()
+    result = runner.invoke(app, ["convert", str(src), str(tmp_path / "x"), "--format", "csv"])
+    assert result.exit_code != 0
+    video = tmp_path / "v.mp4"
+    video.write_bytes(b"")
+    result = runner.invoke(
+        app, ["run", str(video), "--out-tracks", str(tmp_path / "t.npz"), "--format", "csv"]
+    )
+    assert result.exit_code != 0
+    assert "--format" in result.output
+
+
 def test_info_cmd_exit_zero() -> None:
     runner = CliRunner()
     result = runner.invoke(app, ["info"])
@@ -556,6 +761,26 @@ def test_run_cmd_bad_trail_len(tmp_path: _Path) -> None:
     assert "trail-len" in result.stderr
 
 
+def test_load_config_exec_section(tmp_path: _Path) -> None:
+    """[exec] 子表 → ExecCfg；缺省 → serial。"""
+    from jxl.vdt.cli import load_config
+
+    cfg = load_config(_write(tmp_path, "iou.toml", _IOU_TOML), None, False)
+    assert cfg.exec.mode == "serial"
+    body = _IOU_TOML + '[exec]\nmode = "threaded"\nqueue_size = 4\n'
+    cfg = load_config(_write(tmp_path, "mt.toml", body), None, False)
+    assert cfg.exec.mode == "threaded"
+    assert cfg.exec.queue_size == 4
+
+
+def test_run_cmd_bad_exec_mode(tmp_path: _Path) -> None:
+    """--exec 非法值 → BadParameter（在进入管线前拦截）。"""
+    runner = CliRunner()
+    result = runner.invoke(app, ["run", str(tmp_path / "nope.mkv"), "--exec", "gpu"])
+    assert result.exit_code != 0
+    assert "--exec" in result.stderr
+
+
 def test_run_cmd_no_id_option_accepted(tmp_path: _Path) -> None:
     """--no-id 是合法选项：解析阶段被接受，继续到 trail-len 校验。
 
@@ -575,3 +800,52 @@ def test_run_cmd_no_id_option_accepted(tmp_path: _Path) -> None:
     )
     assert result.exit_code != 0
     assert "trail-len" in result.stderr  # --no-id 被接受，到达 trail-len 校验
+
+
+def test_batch_cmd_bad_workers(tmp_path: _Path) -> None:
+    """--workers 0 → BadParameter（在扫描输入前拦截）。"""
+    runner = CliRunner()
+    result = runner.invoke(
+        app, ["batch", str(tmp_path), "--out-dir", str(tmp_path / "o"), "--workers", "0"]
+    )
+    assert result.exit_code != 0
+    assert "--workers" in result.stderr
+
+
+def test_batch_cmd_no_videos_bad_param(tmp_path: _Path) -> None:
+    """输入目录无视频 → BadParameter（不加载模型）。"""
+    runner = CliRunner()
+    result = runner.invoke(app, ["batch", str(tmp_path), "--out-dir", str(tmp_path / "o")])
+    assert result.exit_code != 0
+    assert "未找到视频" in result.stderr
+
+
+def test_run_cmd_profile_writes_report(tmp_path: _Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """--profile：timer 透传到 pipeline.run，报告含管线阶段 + CLI 计时的 write。"""
+    import jxl.vdt.pipeline as pipeline_mod
+    from jxl.vdt.profile import ProfileReport
+    from jxl.vdt.types import FrameSink, StageTimer
+
+    def fake_run(
+        video_path: str,
+        config: VdtConfig,
+        *,
+        frame_sink: FrameSink | None = None,
+        timer: StageTimer | None = None,
+    ) -> Tracks:
+        assert timer is not None
+        timer.add("track", 0.01)
+        timer.count("frames", 2)
+        return Tracks(src=video_path, fps=5.0, duration_ms=400, tracks=[], config=config)
+
+    monkeypatch.setattr(pipeline_mod, "run", fake_run)
+    video = tmp_path / "v.mkv"
+    video.write_bytes(b"")
+    prof = tmp_path / "p.json"
+    out = tmp_path / "t.json"
+    args = ["run", str(video), "--out-tracks", str(out), "--profile", str(prof), "--no-pose"]
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 0, result.output
+    rep = ProfileReport.model_validate_json(prof.read_text(encoding="utf-8"))
+    assert list(rep.stages) == ["track", "write"]
+    assert rep.n_frames == 2 and rep.fps > 0
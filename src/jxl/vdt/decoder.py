@@ -34,7 +34,8 @@ class OcvDecoder:
     属性：
         fps: 采样帧率（= ``cfg.fps``），供 Aggregator 记录到 ``Tracks.fps``。
         duration_ms: 源视频时长（ms），供 Aggregator 记录到 ``Tracks.duration_ms``。
-        size: ``(width, height)``。
+        size: 输出帧 ``(width, height)``（``max_side`` 缩放后）。
+        source_size: 源视频 ``(width, height)``。
     """
 
     def __init__(self, video_path: str, cfg: DecodeCfg) -> None:
@@ -42,7 +43,8 @@ class OcvDecoder:
 
         Args:
             video_path: 视频文件路径。
-            cfg: 解码配置（``fps`` 为目标采样帧率）。
+            cfg: 解码配置（``fps`` 采样帧率 / ``seek`` 稀疏采样策略 / ``max_side``
+                解码期缩放 / ``prefetch`` 后台解码队列深度）。
 
         Raises:
             DecodeError: 视频打不开 / 源 fps 非正 / 帧数非正 / 尺寸非法 /
@@ -50,7 +52,15 @@ class OcvDecoder:
                 此处适配为 vdt 域的 ``DecodeError``）。
         """
         try:
-            self._reader = VideoReader(video_path, sample_fps=cfg.fps)
+            self._reader = VideoReader(
+                video_path,
+                sample_fps=cfg.fps,
+                seek=cfg.seek,
+                max_side=cfg.max_side,
+                prefetch=cfg.prefetch,
+                backend=cfg.backend,
+                threads=cfg.threads,
+            )
         except VideoIoError as e:
             raise DecodeError(str(e)) from e
         self._video_path = video_path
@@ -67,9 +77,14 @@ class OcvDecoder:
 
     @property
     def size(self) -> tuple[int, int]:
-        """``(width, height)``。"""
+        """输出帧 ``(width, height)``（``max_side`` 缩放后）。"""
         return self._reader.size
 
+    @property
+    def source_size(self) -> tuple[int, int]:
+        """源视频 ``(width, height)``——归一化坐标 × 此值 = 源像素坐标。"""
+        return self._reader.source_size
+
     def __iter__(self) -> Iterator[tuple[int, int, np.ndarray]]:
         """转发 ``VideoReader`` 迭代，yield ``(frame_idx, ts_ms, BGR ndarray)``。
 
@@ -170,3 +185,18 @@ def test_double_iteration_raises() -> None:
         assert len(first) > 0
         with pytest.raises(DecodeError):
             list(dec)
+
+
+def test_max_side_downscales_frames() -> None:
+    """``DecodeCfg.max_side`` → 帧等比缩小，``source_size`` 保留源尺寸，ts 不变。"""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = f"{tmp}/s.mp4"
+        _make_synthetic_video(video, fps=10.0, frames=10, size=(128, 64))
+        full = list(OcvDecoder(video, DecodeCfg(fps=5.0)))
+        dec = OcvDecoder(video, DecodeCfg(fps=5.0, max_side=64, prefetch=2))
+        small = list(dec)
+        assert (dec.size, dec.source_size) == ((64, 32), (128, 64))
+        assert [(i, t) for i, t, _ in small] == [(i, t) for i, t, _ in full]
+        assert all(img.shape == (32, 64, 3) for _, _, img in small)
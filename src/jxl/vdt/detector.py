@@ -28,10 +28,12 @@ if TYPE_CHECKING:
 
 
 class _DetectorLike(Protocol):
-    """``D2dYolo`` 的结构化窄接口（ISP）：仅依赖 ``detect(image)->D2dResult``。"""
+    """``D2dYolo`` 的结构化窄接口（ISP）：仅依赖 ``detect`` / ``detect_batch``。"""
 
     def detect(self, image: ImageNda) -> "D2dResult": ...
 
+    def detect_batch(self, images: list[ImageNda]) -> list[D2dResult]: ...
+
 
 class YoloDetector:
     """``Detector`` 协议的具体实现：包装 :class:`jxl.det.yolo.d2d_yolo.D2dYolo`。
@@ -91,9 +93,26 @@ class YoloDetector:
         """
         img = ImageNda(data=image)
         result = self._det.detect(img)
-        objs = result.objects
+        return self._keep(result.objects)
+
+    def detect_batch(self, images: list[np.ndarray]) -> list[list[D2dObject]]:
+        """对多帧 BGR ndarray 单次 forward 检测（``D2dYolo.detect_batch``）。
+
+        Args:
+            images: BGR ``np.ndarray`` 列表（尺寸可不同，由 YOLO letterbox 统一）。
+
+        Returns:
+            与 ``images`` 逐位置对齐的检测结果，过滤规则同 :meth:`detect`。
+        """
+        if not images:
+            return []
+        results = self._det.detect_batch([ImageNda(data=im) for im in images])
+        return [self._keep(r.objects) for r in results]
+
+    def _keep(self, objs: list[D2dObject]) -> list[D2dObject]:
+        """按 ``DetCfg.classes`` 过滤；空集合 = 不过滤。"""
         if self._classes:
-            objs = [o for o in objs if o.cls in self._classes]
+            return [o for o in objs if o.cls in self._classes]
         return objs
 
 
@@ -112,6 +131,7 @@ class _FakeD2dYolo:
 
     def __init__(self, factory: Callable[[], list[D2dObject]]) -> None:
         self._factory = factory
+        self.batch_sizes: list[int] = []
 
     def detect(self, image: ImageNda) -> "D2dResult":  # noqa: ARG002
         """fake detect：忽略 image，返回注入构造的对象。"""
@@ -119,6 +139,13 @@ class _FakeD2dYolo:
 
         return D2dResult(objects=self._factory())
 
+    def detect_batch(self, images: list[ImageNda]) -> list[D2dResult]:
+        """fake 批量 detect：每帧返回注入构造的对象，并记录批大小。"""
+        from jxl.det.d2d import D2dResult
+
+        self.batch_sizes.append(len(images))
+        return [D2dResult(objects=self._factory()) for _ in images]
+
 
 def _make_obj(cls: int, conf: float = 0.9, oid: int = 0) -> D2dObject:
     """构造测试用 D2dObject（全归一化坐标）。"""
@@ -168,6 +195,20 @@ def test_detect_handles_empty_result() -> None:
     assert det.detect(np.zeros((4, 4, 3), dtype=np.uint8)) == []
 
 
+def test_detect_batch_single_call_and_filters() -> None:
+    """detect_batch：N 帧单次下发，逐帧按 classes 过滤，结果与 images 对齐。"""
+    det = YoloDetector.__new__(YoloDetector)
+    fake = _FakeD2dYolo(lambda: [_make_obj(0), _make_obj(2)])
+    det._det = fake
+    det._classes = {0}
+    frames = [np.zeros((4, 4, 3), dtype=np.uint8) for _ in range(3)]
+    out = det.detect_batch(frames)
+    assert fake.batch_sizes == [3]
+    assert [[o.cls for o in objs] for objs in out] == [[0], [0], [0]]
+    assert det.detect_batch([]) == []
+    assert fake.batch_sizes == [3]  # 空批不下发
+
+
 def test_init_raises_on_missing_weight(tmp_path: Path) -> None:
     """权重不存在 → ModelLoadError（No Silent Degradation）。"""
     cfg = DetCfg(model=str(tmp_path / "nonexistent.pt"))
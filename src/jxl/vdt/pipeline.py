@@ -7,6 +7,8 @@
 2. ``run_pipeline`` —— 纯编排：阶段以 Protocol 注入，对双跟踪模式无感；
    pose=None 时 kpts 全 None（P1 无 pose 路径）。
 3. ``run`` —— 生产入口：建阶段（builders）→ 调 ``run_pipeline``。
+   ``run_stream`` / ``run_pipeline_stream`` 为流式变体：``StreamAggregator`` 在
+   tracker 报告结束时即定稿 ``Track`` 并追加写出，内存只随活跃轨迹数增长。
 
 builders 内部 lazy import 兄弟 impl（``decoder``/``detector``/``tracker``/
 ``reid``/``reid_tracker``/``pose``），避免 ``import jxl.vdt.pipeline`` 拉入
@@ -19,23 +21,31 @@ Functional Core），可确定性单测（设计原则 10）。
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
 from typing import TYPE_CHECKING
 
 import numpy as np
 
 from jxl.det.d2d import D2dObject
+from jxl.vdt.stages import iter_detected
 from jxl.vdt.types import (
     DecodeCfg,
     Decoder,
     Detector,
     DetCfg,
+    ExecCfg,
     FrameResult,
+    FrameSink,
     IouCfg,
     Keypoints,
     PoseCfg,
     PoseStep,
     ReidCfg,
+    StageTimer,
     Track,
     Tracker,
     Tracks,
@@ -47,6 +57,7 @@ if TYPE_CHECKING:
     # 仅类型注解用（``from __future__ import annotations`` 使注解惰性求值，
     # 运行时不触发 import；兄弟模块可在并行期分阶段落地）。
     from jxl.vdt.decoder import OcvDecoder
+    from jxl.vdt.reid_assoc import Embedder
 
 
 # ---------------------------------------------------------------------------
@@ -122,6 +133,101 @@ def aggregate(
     )
 
 
+@dataclass(slots=True)
+class StreamAggregator:
+    """流式 Aggregator：逐帧累积活跃轨迹，tracker 报告结束即定稿产出 ``Track``。
+
+    与 :func:`aggregate` 同语义（跳过 ``id=0``、frames 收窄到本 id、``cls`` 取首次），
+    但只持有**活跃**轨迹——内存上界 ≈ 活跃轨迹数 × 其已累积帧，而非整段视频的
+    全部 ``FrameResult``。定稿顺序 = 结束顺序；同批结束的按 id 升序。
+    """
+
+    _live: dict[int, Track] = field(default_factory=dict)
+
+    @property
+    def n_live(self) -> int:
+        """当前未定稿（活跃）轨迹数。"""
+        return len(self._live)
+
+    def push(self, fr: FrameResult, ended_ids: set[int]) -> list[Track]:
+        """并入一帧；返回因 ``ended_ids`` 而定稿的轨迹（``ended=True``）。"""
+        for ob, kpt in zip(fr.objects, fr.kpts, strict=True):
+            if ob.id == 0:
+                continue  # id=0 哨兵：未被 Tracker 关联，不进任何时间线
+            narrowed = FrameResult(
+                frame_idx=fr.frame_idx, ts_ms=fr.ts_ms, objects=[ob], kpts=[kpt]
+            )
+            live = self._live.get(ob.id)
+            if live is None:
+                self._live[ob.id] = Track(id=ob.id, cls=ob.cls, frames=[narrowed])
+            else:
+                live.frames.append(narrowed)
+        done = sorted(tid for tid in self._live if tid in ended_ids)
+        return [self._pop(tid, ended=True) for tid in done]
+
+    def finish(self, ended_ids: set[int]) -> list[Track]:
+        """视频结束：按 id 升序定稿全部剩余轨迹（``ended`` 取 ``ended_ids`` 成员性）。"""
+        return [self._pop(tid, ended=tid in ended_ids) for tid in sorted(self._live)]
+
+    def _pop(self, tid: int, *, ended: bool) -> Track:
+        track = self._live.pop(tid)
+        track.ended = ended
+        return track
+
+
+def _iter_frames(
+    decoder: Decoder,
+    detector: Detector,
+    tracker: Tracker,
+    pose: PoseStep | None,
+    config: VdtConfig,
+    frame_sink: FrameSink | None = None,
+    timer: StageTimer | None = None,
+) -> Iterator[FrameResult]:
+    """decode → detect → track → pose 逐帧产出 ``FrameResult``（入口先 reset 各阶段）。
+
+    ``frame_sink`` 非 None 时每帧先以 ``(image, FrameResult)`` 回调（同一趟解码的旁路消费）。
+    ``timer`` 非 None 时 decoder/detector 套计时代理，并逐帧上报 ``track``/``pose``/
+    ``frame_sink`` 耗时与 ``frames`` 计数（见 :mod:`jxl.vdt.profile`）。
+    """
+    tracker.reset()  # 视频边界清状态（批处理多视频防跨视频身份泄漏）
+    if pose is not None:
+        pose.reset()  # 同对称：清门控/帧序/复用缓存，防跨视频泄漏
+    if timer is not None:
+        from jxl.vdt.profile import TimedDecoder, TimedDetector
+
+        decoder = TimedDecoder(decoder, timer)
+        detector = TimedDetector(detector, timer)
+    # closing：track/pose/frame_sink 抛错或消费方提前关闭时立即回收 decode/detect 线程
+    with closing(iter_detected(decoder, detector, config.exec, config.det.batch)) as detected:
+        for frame_idx, ts_ms, image, dets in detected:
+            t0 = perf_counter()
+            tracked = tracker.update(frame_idx, ts_ms, image, dets)
+            t1 = perf_counter()
+            kpts = (
+                pose.step(image, tracked)
+                if pose is not None
+                else [None] * len(tracked)
+            )
+            t2 = perf_counter()
+            fr = FrameResult(
+                frame_idx=frame_idx,
+                ts_ms=ts_ms,
+                objects=tracked,
+                kpts=kpts,
+            )
+            if frame_sink is not None:
+                frame_sink(image, fr)
+            if timer is not None:
+                timer.add("track", t1 - t0)
+                if pose is not None:
+                    timer.add("pose", t2 - t1)
+                if frame_sink is not None:
+                    timer.add("frame_sink", perf_counter() - t2)
+                timer.count("frames")
+            yield fr
+
+
 def run_pipeline(
     decoder: Decoder,
     detector: Detector,
@@ -132,11 +238,16 @@ def run_pipeline(
     fps: float,
     duration_ms: int,
     config: VdtConfig,
+    frame_sink: FrameSink | None = None,
+    timer: StageTimer | None = None,
 ) -> Tracks:
     """纯编排：注入阶段，对双跟踪模式无感（spec §8 data flow）。
 
     管线不感知 IoU/ReID——注入哪个 Tracker impl 就走哪条关联路径。
-    ``pose=None`` 时 kpts 全 None（P1 无 pose 路径）。
+    ``pose=None`` 时 kpts 全 None（P1 无 pose 路径）。decode+detect 按
+    ``config.exec`` 串行或多线程执行（:func:`jxl.vdt.stages.iter_detected`）；
+    track+pose 恒在调用方线程按帧序执行，两种模式产出一致。``config.det.batch > 1``
+    时先攒微批再单次 forward 检测，逐帧送 tracker 的顺序不变。
 
     Args:
         decoder: 视频解码器（迭代采样帧）。
@@ -147,33 +258,62 @@ def run_pipeline(
         fps: 采样帧率（透传 Aggregator）。
         duration_ms: 源视频时长毫秒（透传 Aggregator）。
         config: 管线配置快照。
+        frame_sink: 逐帧旁路消费者（如演示视频渲染）；None 不回调。
+        timer: 阶段计时钩子（``vdt run --profile``）；None 不计时。
 
     Returns:
         Tracks: 整段视频的轨迹集合。
     """
-    tracker.reset()  # 视频边界清状态（批处理多视频防跨视频身份泄漏）
-    if pose is not None:
-        pose.reset()  # 同对称：清门控/帧序/复用缓存，防跨视频泄漏
-    frames: list[FrameResult] = []
-    for frame_idx, ts_ms, image in decoder:
-        dets = detector.detect(image)
-        tracked = tracker.update(frame_idx, ts_ms, image, dets)
-        kpts = (
-            pose.step(image, tracked)
-            if pose is not None
-            else [None] * len(tracked)
-        )
-        frames.append(
-            FrameResult(
-                frame_idx=frame_idx,
-                ts_ms=ts_ms,
-                objects=tracked,
-                kpts=kpts,
-            )
-        )
-    return aggregate(
+    frames = list(_iter_frames(decoder, detector, tracker, pose, config, frame_sink, timer))
+    t0 = perf_counter()
+    tracks = aggregate(
         src, fps, duration_ms, frames, config, ended_ids=tracker.ended_ids
     )
+    if timer is not None:
+        timer.add("aggregate", perf_counter() - t0)
+    return tracks
+
+
+def run_pipeline_stream(
+    decoder: Decoder,
+    detector: Detector,
+    tracker: Tracker,
+    pose: PoseStep | None,
+    sink: Callable[[Track], None],
+    *,
+    config: VdtConfig,
+    frame_sink: FrameSink | None = None,
+    timer: StageTimer | None = None,
+) -> int:
+    """流式编排：与 :func:`run_pipeline` 同阶段，轨迹一结束即交 ``sink``（不缓存全帧）。
+
+    ``sink`` 收到的轨迹集合与 ``run_pipeline(...).tracks`` 相同（仅顺序为结束顺序）；
+    按 id 排序即可还原（见 :func:`jxl.vdt.tracks_io.read_tracks_jsonl`）。
+    ``timer`` 非 None 时逐帧 ``agg.push`` 记为 ``aggregate``、每次 ``sink`` 记为 ``write``。
+
+    Returns:
+        交给 ``sink`` 的轨迹条数。
+    """
+    agg = StreamAggregator()
+    n = 0
+
+    def emit(tracks: list[Track]) -> None:
+        nonlocal n
+        for track in tracks:
+            t0 = perf_counter()
+            sink(track)
+            if timer is not None:
+                timer.add("write", perf_counter() - t0)
+            n += 1
+
+    for fr in _iter_frames(decoder, detector, tracker, pose, config, frame_sink, timer):
+        t0 = perf_counter()
+        done = agg.push(fr, tracker.ended_ids)
+        if timer is not None:
+            timer.add("aggregate", perf_counter() - t0)
+        emit(done)
+    emit(agg.finish(tracker.ended_ids))
+    return n
 
 
 # ---------------------------------------------------------------------------
@@ -181,20 +321,28 @@ def run_pipeline(
 # ---------------------------------------------------------------------------
 
 
-def run(video_path: str, config: VdtConfig) -> Tracks:
+def run(
+    video_path: str,
+    config: VdtConfig,
+    *,
+    frame_sink: FrameSink | None = None,
+    timer: StageTimer | None = None,
+) -> Tracks:
     """生产入口：建阶段 → ``run_pipeline``（spec §8）。
 
     Args:
         video_path: 源视频文件路径。
         config: 管线配置（决定 decoder/detector/tracker/pose 实例化）。
+        frame_sink: 逐帧旁路消费者（透传 ``run_pipeline``）。
+        timer: 阶段计时钩子（透传 ``run_pipeline`` 与 tracker/pose builders）。
 
     Returns:
         Tracks: 整段视频的轨迹集合。
     """
     decoder = build_decoder(video_path, config.decode)
     detector = build_detector(config.det)
-    tracker = build_tracker(config)
-    pose = build_pose(config.pose)
+    tracker = build_tracker(config, timer)
+    pose = build_pose(config.pose, timer)
     return run_pipeline(
         decoder,
         detector,
@@ -204,9 +352,56 @@ def run(video_path: str, config: VdtConfig) -> Tracks:
         fps=decoder.fps,
         duration_ms=decoder.duration_ms,
         config=config,
+        frame_sink=frame_sink,
+        timer=timer,
     )
 
 
+def run_stream(
+    video_path: str,
+    config: VdtConfig,
+    out_path: Path,
+    *,
+    frame_sink: FrameSink | None = None,
+    timer: StageTimer | None = None,
+) -> int:
+    """流式生产入口：建阶段 → ``run_pipeline_stream`` → 追加写 JSONL 轨迹文件。
+
+    Args:
+        video_path: 源视频文件路径。
+        config: 管线配置。
+        out_path: JSONL 轨迹输出路径（格式见 :mod:`jxl.vdt.tracks_io`）。
+        frame_sink: 逐帧旁路消费者（透传 ``run_pipeline_stream``）。
+        timer: 阶段计时钩子（透传 ``run_pipeline_stream`` 与 tracker/pose builders）。
+
+    Returns:
+        写出的轨迹条数。
+    """
+    from jxl.vdt.tracks_io import JsonlTracksWriter, TracksHeader
+
+    decoder = build_decoder(video_path, config.decode)
+    detector = build_detector(config.det)
+    tracker = build_tracker(config, timer)
+    pose = build_pose(config.pose, timer)
+    header = TracksHeader(
+        src=video_path,
+        fps=decoder.fps,
+        duration_ms=decoder.duration_ms,
+        config=config,
+    )
+    with JsonlTracksWriter(out_path, header) as writer:
+        return run_pipeline_stream(
+            decoder,
+            detector,
+            tracker,
+            pose,
+            writer.write,
+            config=config,
+            frame_sink=frame_sink,
+            timer=timer,
+        )
+
+
 # ---------------------------------------------------------------------------
 # builders（供 run 与 cli 复用；lazy import 兄弟 impl）
 # ---------------------------------------------------------------------------
@@ -241,11 +436,12 @@ def build_detector(cfg: DetCfg) -> Detector:
     return YoloDetector(cfg)
 
 
-def build_tracker(config: VdtConfig) -> Tracker:
+def build_tracker(config: VdtConfig, timer: StageTimer | None = None) -> Tracker:
     """按 ``config.tracker`` 分派跟踪器 impl（IoU | ReID）。
 
     Args:
         config: 管线配置（``tracker`` 模式 + ``tracker_cfg`` 实参）。
+        timer: 阶段计时钩子；ReID 模式下嵌入器套 ``TimedEmbedder``（``embed`` 阶段）。
 
     Returns:
         Tracker: IoU 模式返回 ``IouTracker``；ReID 模式返回 ``ReidTracker``
@@ -269,15 +465,20 @@ def build_tracker(config: VdtConfig) -> Tracker:
     cfg = config.tracker_cfg
     if not isinstance(cfg, ReidCfg):
         raise VdtError("tracker='reid' 需 ReidCfg（validator 应已保证）")
-    embedder = ReidEmbedder(cfg.model)
+    embedder: Embedder = ReidEmbedder(cfg.model, max_batch=cfg.batch, ort_cfg=cfg.ort)
+    if timer is not None:
+        from jxl.vdt.profile import TimedEmbedder
+
+        embedder = TimedEmbedder(embedder, timer)
     return ReidTracker(cfg, embedder)
 
 
-def build_pose(cfg: PoseCfg | None) -> PoseStep | None:
+def build_pose(cfg: PoseCfg | None, timer: StageTimer | None = None) -> PoseStep | None:
     """构造条件性 pose 步骤（``RtmposeStep``）。
 
     Args:
         cfg: pose 配置；``None`` 或 ``enabled=False`` 关闭 pose 路径。
+        timer: 阶段计时钩子（``pose_forward`` 耗时与 ``pose_forwards``/``pose_skipped`` 计数）。
 
     Returns:
         PoseStep | None：关闭则 None；否则 ``RtmposeStep``（持有 ort session）。
@@ -289,7 +490,7 @@ def build_pose(cfg: PoseCfg | None) -> PoseStep | None:
         return None
     from jxl.vdt.pose import RtmposeStep
 
-    return RtmposeStep(cfg)
+    return RtmposeStep(cfg, timer)
 
 
 # ---------------------------------------------------------------------------
@@ -315,6 +516,7 @@ class _FakeDetector:
 
     def __init__(self, n_objects: int = 2) -> None:
         self.n_objects = n_objects
+        self.batch_calls = 0
 
     def detect(self, image: np.ndarray) -> list[D2dObject]:
         from jvi.geo.rectangle import Rect
@@ -324,6 +526,10 @@ class _FakeDetector:
             for _ in range(self.n_objects)
         ]
 
+    def detect_batch(self, images: list[np.ndarray]) -> list[list[D2dObject]]:
+        self.batch_calls += 1
+        return [self.detect(im) for im in images]
+
 
 class _FakeTracker:
     """合成跟踪器：按位置填稳定 track_id（第 i 个检测 → id=i+1）。
@@ -363,6 +569,41 @@ class _FakePoseStep:
         """视频边界空操作（fake 无跨帧状态）。"""
 
 
+class _FailingTracker(_FakeTracker):
+    """第 ``fail_at`` 帧 ``update`` 抛错的跟踪器。"""
+
+    def __init__(self, fail_at: int) -> None:
+        super().__init__()
+        self.fail_at = fail_at
+
+    def update(
+        self,
+        frame_idx: int,
+        ts_ms: int,
+        image: np.ndarray,
+        dets: list[D2dObject],
+    ) -> list[D2dObject]:
+        if frame_idx == self.fail_at:
+            raise RuntimeError("boom")
+        return super().update(frame_idx, ts_ms, image, dets)
+
+
+def test_run_pipeline_threaded_tracker_error_joins_stage_threads() -> None:
+    """threaded 模式 tracker 抛错 → 原异常透出，且 decode/detect 线程已回收。"""
+    import threading
+
+    import pytest
+
+    cfg = _make_iou_config().model_copy(
+        update={"exec": ExecCfg(mode="threaded", queue_size=1)}
+    )
+    dec = _FakeDecoder(n_frames=10_000, fps=10.0, duration_ms=1_000_000)
+    with pytest.raises(RuntimeError, match="boom") as err:  # 持有 traceback（帧局部存活）
+        list(_iter_frames(dec, _FakeDetector(), _FailingTracker(fail_at=3), None, cfg))
+    assert err.traceback
+    assert [t.name for t in threading.enumerate() if t.name.startswith("vdt-")] == []
+
+
 def _make_iou_config() -> VdtConfig:
     """最小合法 IoU 模式 VdtConfig（单测用）。"""
     return VdtConfig(
@@ -528,6 +769,54 @@ def test_run_pipeline_with_pose_aligns_keypoints() -> None:
         assert len(fr.kpts[0].pts) == 17
 
 
+def test_run_pipeline_threaded_identical_to_serial() -> None:
+    """threaded 产出与 serial 一致（config 快照除外；track+pose 在调用方线程）。"""
+    cfg = _make_iou_config()
+    cfg_mt = cfg.model_copy(update={"exec": ExecCfg(mode="threaded", queue_size=2)})
+
+    def _run(c: VdtConfig) -> Tracks:
+        return run_pipeline(
+            _FakeDecoder(n_frames=20, fps=10.0, duration_ms=2000),
+            _FakeDetector(n_objects=3),
+            _FakeTracker(),
+            pose=_FakePoseStep(),
+            src="v.mkv",
+            fps=10.0,
+            duration_ms=2000,
+            config=c,
+        )
+
+    serial, threaded = _run(cfg), _run(cfg_mt)
+    assert serial.model_dump_json(exclude={"config"}) == threaded.model_dump_json(
+        exclude={"config"}
+    )
+
+
+def test_run_pipeline_micro_batch_identical_to_per_frame() -> None:
+    """``det.batch=4``：7 帧分 2 次 forward，产出与逐帧检测一致。"""
+    cfg = _make_iou_config()
+    cfg_b = cfg.model_copy(update={"det": cfg.det.model_copy(update={"batch": 4})})
+    detector = _FakeDetector(n_objects=2)
+
+    def _run(c: VdtConfig, det: _FakeDetector) -> Tracks:
+        return run_pipeline(
+            _FakeDecoder(n_frames=7, fps=10.0, duration_ms=700),
+            det,
+            _FakeTracker(),
+            pose=None,
+            src="v.mkv",
+            fps=10.0,
+            duration_ms=700,
+            config=c,
+        )
+
+    ref, got = _run(cfg, _FakeDetector(n_objects=2)), _run(cfg_b, detector)
+    assert detector.batch_calls == 2
+    assert ref.model_dump_json(exclude={"config"}) == got.model_dump_json(
+        exclude={"config"}
+    )
+
+
 def test_build_pose_none_returns_none() -> None:
     """``cfg=None`` → 返回 None（关闭 pose 路径）。"""
     assert build_pose(None) is None
@@ -604,3 +893,130 @@ def test_build_tracker_reid_constructs_tracker() -> None:
     )
     trk = build_tracker(cfg)
     assert isinstance(trk, ReidTracker)
+
+
+class _EndingTracker(_FakeTracker):
+    """合成跟踪器：id=1 全程在场；id=2 仅前 3 帧，第 4 帧报告结束。"""
+
+    def update(
+        self,
+        frame_idx: int,
+        ts_ms: int,
+        image: np.ndarray,
+        dets: list[D2dObject],
+    ) -> list[D2dObject]:
+        n = 2 if frame_idx < 3 else 1
+        if frame_idx == 4:
+            self.ended_ids.add(2)
+        return [d.model_copy(update={"id": i + 1}) for i, d in enumerate(dets[:n])]
+
+
+def test_stream_aggregator_matches_aggregate() -> None:
+    """流式定稿（按 id 排序后）与整段 aggregate 逐字节一致，且结束即产出。"""
+    cfg = _make_iou_config()
+
+    def _stages() -> tuple[_FakeDecoder, _FakeDetector, _EndingTracker]:
+        return (
+            _FakeDecoder(n_frames=8, fps=10.0, duration_ms=800),
+            _FakeDetector(n_objects=2),
+            _EndingTracker(),
+        )
+
+    dec, det, trk = _stages()
+    ref = run_pipeline(
+        dec, det, trk, _FakePoseStep(), src="v", fps=10.0, duration_ms=800, config=cfg
+    )
+    got: list[tuple[int, Track]] = []
+    dec, det, trk = _stages()
+    agg = StreamAggregator()
+    for fr in _iter_frames(dec, det, trk, _FakePoseStep(), cfg):
+        got += [(fr.frame_idx, t) for t in agg.push(fr, trk.ended_ids)]
+        assert agg.n_live <= 2
+    got += [(-1, t) for t in agg.finish(trk.ended_ids)]
+
+    assert [(i, t.id) for i, t in got] == [(4, 2), (-1, 1)]  # id=2 在结束帧即定稿
+    tracks = sorted((t for _, t in got), key=lambda t: t.id)
+    assert [t.model_dump() for t in tracks] == [t.model_dump() for t in ref.tracks]
+    assert tracks[1].ended and not tracks[0].ended
+
+
+def test_run_pipeline_stream_sink_count() -> None:
+    """run_pipeline_stream：sink 收到全部轨迹，返回值 = 条数。"""
+    sunk: list[Track] = []
+    n = run_pipeline_stream(
+        _FakeDecoder(n_frames=5, fps=10.0, duration_ms=500),
+        _FakeDetector(n_objects=3),
+        _FakeTracker(),
+        None,
+        sunk.append,
+        config=_make_iou_config(),
+    )
+    assert n == 3
+    assert [t.id for t in sunk] == [1, 2, 3]
+    assert all(len(t.frames) == 5 for t in sunk)
+
+
+def test_run_pipeline_frame_sink_sees_every_frame_in_order() -> None:
+    """frame_sink：每个采样帧按序回调一次，FrameResult 已含 track id。"""
+    seen: list[tuple[tuple[int, ...], int, list[int]]] = []
+
+    def sink(image: np.ndarray, fr: FrameResult) -> None:
+        seen.append((image.shape, fr.frame_idx, [o.id for o in fr.objects]))
+
+    run_pipeline(
+        _FakeDecoder(n_frames=4, fps=10.0, duration_ms=400),
+        _FakeDetector(n_objects=2),
+        _FakeTracker(),
+        pose=None,
+        src="v.mkv",
+        fps=10.0,
+        duration_ms=400,
+        config=_make_iou_config(),
+        frame_sink=sink,
+    )
+    assert [s[1] for s in seen] == sorted(s[1] for s in seen) and len(seen) == 4
+    assert all(ids == [1, 2] for _, _, ids in seen)
+
+
+def test_run_pipeline_timer_records_stages_and_counts() -> None:
+    """注入 timer：每帧 decode/detect/track/frame_sink 各一条样本，计数与帧/检测数一致。"""
+    from jxl.vdt.profile import StageProfiler
+
+    prof = StageProfiler()
+    out = run_pipeline(
+        _FakeDecoder(n_frames=4, fps=10.0, duration_ms=400),
+        _FakeDetector(n_objects=2),
+        _FakeTracker(),
+        pose=None,
+        src="v.mkv",
+        fps=10.0,
+        duration_ms=400,
+        config=_make_iou_config(),
+        frame_sink=lambda image, fr: None,
+        timer=prof,
+    )
+    rep = prof.report(1.0)
+    assert list(rep.stages) == ["decode", "detect", "track", "frame_sink", "aggregate"]
+    assert all(rep.stages[s].n == 4 for s in ("decode", "detect", "track", "frame_sink"))
+    assert rep.stages["aggregate"].n == 1
+    assert rep.counts == {"frames": 4, "detections": 8}
+    assert [t.id for t in out.tracks] == [1, 2]  # 计时不改变结果
+
+
+def test_run_pipeline_stream_timer_records_write_per_track() -> None:
+    from jxl.vdt.profile import StageProfiler
+
+    prof = StageProfiler()
+    sunk: list[Track] = []
+    n = run_pipeline_stream(
+        _FakeDecoder(n_frames=3, fps=10.0, duration_ms=300),
+        _FakeDetector(n_objects=2),
+        _FakeTracker(),
+        None,
+        sunk.append,
+        config=_make_iou_config(),
+        timer=prof,
+    )
+    rep = prof.report(1.0)
+    assert n == 2 and rep.stages["write"].n == 2
+    assert rep.stages["aggregate"].n == 3
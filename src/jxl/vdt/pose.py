@@ -10,18 +10,25 @@ RTMPose-m ONNX 批量 forward → SimCC 解码 → 坐标回映归一化 → 复
   周期 / aspect 跳变 / K_max 兜底）封装在 :mod:`jxl.vdt.pose_gate`，本模块只负责"按
   决策跑或不跑 + 复用缓存"。
 - **zero-forward 优化**：本帧无任何 ``decide=True`` 目标 → 不调 ``_forward``（省算力，
-  解耦收益）。多个 decide 目标 → 批量预处理 → 拼 batch → **单次** ``_forward`` →
-  分发解码（O(N) forward 收敛为 O(1)）。
-- **坐标回映**：``simcc_decode`` 产出的 ``kps_crop`` 在 crop 自身像素系（基于 crop 的
-  center/scale）；全帧像素 = crop 坐标 + crop 左上角像素 (x0,y0)；归一化 = /img_w,/img_h。
+  解耦收益）。多个 decide 目标 → ``preprocess_batch`` 整帧 ROI 仿射直出 ``[N,3,H,W]``
+  → **单次** ``_forward`` → ``simcc_decode_batch`` 一次解码 N×K 点（O(N) 的 forward /
+  Python 解码循环均收敛为数组运算）。
+- **warp 复用**（``PoseCfg.reuse="warp"``）：门控跳过帧不原样复用上次关键点，而是按
+  "上次 pose 时的框 → 本帧框" 的平移 + 各轴缩放变换（:func:`warp_keypoints`）。总是从
+  pose 帧的原始结果变换（不逐帧累积，无漂移）；配合 ``pose_gate`` 的自适应关键帧。
+- **每帧预算**（``PoseCfg.max_per_frame`` / ``max_ms``）：到期目标经
+  ``PoseGate.schedule`` 按优先级截断，未排上者顺延到后续帧（本帧照常复用缓存）；``max_ms``
+  按实测每 crop forward 耗时（EMA）折算 crop 数，首帧无估计时只跑 1 个校准。
+- **坐标回映**：``simcc_decode_batch`` 产出的关键点在各 crop 自身像素系（基于 crop 的
+  center/scale）；全帧像素 = crop 坐标 + 框左上角像素 (x0,y0)；归一化 = /img_w,/img_h。
 - **No Silent Degradation**（spec §9）：权重缺失 / ort 加载失败 / 输入或输出数不符 →
   ``ModelLoadError``，不回退别的模型。crop 退化 / decode 失败 → ``Keypoints=None``
   显式 null（不静默填零点）。
 
 兄弟模块依赖（签名已钉死，并行期 ``unresolved-import`` 可暂忽略，主控集成 mypy）：
 
-- :mod:`jxl.vdt.rtmpose_proc`：``preprocess_crop(crop)->(tensor,center,scale)``、
-  ``simcc_decode(simcc_x,simcc_y,center,scale)->Keypoints|None``。
+- :mod:`jxl.vdt.rtmpose_proc`：``preprocess_batch(image,boxes)->(tensor,centers,scales)``、
+  ``simcc_decode_batch(simcc_x,simcc_y,centers,scales)->(kpts[N,K,3],valid[N])``。
 - :mod:`jxl.vdt.pose_gate`：``PoseGate(cfg)``，``gate.step(id,cls,frame_idx,aspect)->bool``、
   ``gate.reset()``。
 """
@@ -29,6 +36,7 @@ RTMPose-m ONNX 批量 forward → SimCC 解码 → 坐标回映归一化 → 复
 from __future__ import annotations
 
 from pathlib import Path
+from time import perf_counter
 
 import numpy as np
 
@@ -36,11 +44,11 @@ from jvi.geo.point2d import Point
 from jvi.geo.rectangle import Rect
 from jxl.det.d2d import D2dObject
 from jxl.vdt._geom import pixel_box
-from jxl.vdt._ort import OrtSessionLike, build_ort_session
-from jxl.vdt.types import Keypoints, ModelLoadError, PoseCfg
+from jxl.vdt._ort import OrtSessionLike, shared_ort_session
+from jxl.vdt.types import Keypoints, ModelLoadError, PoseCfg, StageTimer
 
 # ---------------------------------------------------------------------------
-# ort 结构化窄接口 + CUDA fail-fast 构造：单一数据源见 :mod:`jxl.vdt._ort`
+# ort 窄接口 + CUDA fail-fast + 进程级 session 复用：见 :mod:`jxl.onnx.session`（经 :mod:`jxl.vdt._ort` 适配）
 # （ISP/No Silent Degradation；reid 与 pose 共用）。
 # ---------------------------------------------------------------------------
 
@@ -50,34 +58,39 @@ from jxl.vdt.types import Keypoints, ModelLoadError, PoseCfg
 # ---------------------------------------------------------------------------
 
 
-def _crop_rect(
-    image: np.ndarray, rect: Rect, img_w: int, img_h: int
-) -> tuple[np.ndarray, int, int] | None:
-    """裁剪 ``rect`` 对应的 crop，返回 ``(crop, x0_px, y0_px)``；零面积 → None。
+def _remap(
+    kps_crop: np.ndarray, valid: bool, x0: int, y0: int, img_w: int, img_h: int
+) -> Keypoints | None:
+    """crop 像素系关键点 ``[K,3] (x,y,conf)`` → 全帧归一化（``+=框左上角`` 再 ``/img_w,/img_h``）。
 
-    左上角像素 ``(x0_px, y0_px)`` 是坐标回映的偏移量，与 crop 同源于一次裁剪——单一
-    数据源（设计原则 8）。裁剪原语复用 :func:`jxl.vdt._geom.pixel_box`。
+    decode 失败（``valid=False``，全部点不可见）→ ``None``（spec §9 显式 null，不静默填零点）。
     """
-    box = pixel_box(rect, img_w, img_h)
-    if box is None:
+    if not valid:
         return None
-    x0, y0, x1, y1 = box
-    return image[y0:y1, x0:x1], x0, y0
+    xs = ((kps_crop[:, 0] + x0) / img_w).tolist()
+    ys = ((kps_crop[:, 1] + y0) / img_h).tolist()
+    pts = [Point(x=x, y=y) for x, y in zip(xs, ys, strict=True)]
+    return Keypoints(pts=pts, conf=kps_crop[:, 2].tolist())
 
 
-def _remap(
-    kps_crop: Keypoints | None, x0: int, y0: int, img_w: int, img_h: int
-) -> Keypoints | None:
-    """crop 像素系关键点 → 全帧归一化（``+=crop 左上角`` 再 ``/img_w,/img_h``）。
+def warp_keypoints(kpts: Keypoints, src: Rect, dst: Rect) -> Keypoints:
+    """按框 ``src → dst`` 的平移 + 各轴缩放变换归一化关键点（置信度不变）。
 
-    decode 失败（``None``）→ ``None``（spec §9 显式 null，不静默填零点）。
+    点在 ``src`` 内的相对位置映射到 ``dst`` 的同一相对位置：
+    ``x' = dst.x + (x - src.x) * dst.w / src.w``（y 同理）。``src`` 退化（宽或高为 0）
+    → 原样返回。
     """
-    if kps_crop is None:
-        return None
+    if src.width <= 0 or src.height <= 0:
+        return kpts
+    sx, sy = dst.width / src.width, dst.height / src.height
     pts = [
-        Point(x=(p.x + x0) / img_w, y=(p.y + y0) / img_h) for p in kps_crop.pts
+        Point(x=dst.x + (p.x - src.x) * sx, y=dst.y + (p.y - src.y) * sy) for p in kpts.pts
     ]
-    return Keypoints(pts=pts, conf=list(kps_crop.conf))
+    return Keypoints(pts=pts, conf=list(kpts.conf))
+
+
+_MS_EMA = 0.3
+"""每 crop forward 耗时估计的 EMA 系数（新样本权重）。"""
 
 
 # ---------------------------------------------------------------------------
@@ -96,22 +109,25 @@ class RtmposeStep:
     （``reset`` 归 -1）；门控的"距上次 pose 帧数"以此为时间本。
     """
 
-    def __init__(self, cfg: PoseCfg) -> None:
+    def __init__(self, cfg: PoseCfg, timer: StageTimer | None = None) -> None:
         """构造 ort session 与门控。
 
-        ort session 经 :func:`jxl.vdt._ort.build_ort_session` 构造——**要求 CUDA**
-        （fail-fast，No Silent Degradation；不静默回退 CPU）。
+        ort session 经 :func:`jxl.vdt._ort.shared_ort_session` 按 ``cfg.ort`` 取得（进程内
+        同权重同配置复用）——默认**要求 CUDA**（fail-fast，No Silent Degradation；CPU
+        仅经 ``provider="cpu"`` 显式开启）。
 
         Args:
-            cfg: pose 配置（model/kpt_shape/keyframe_every/min_hits）。
+            cfg: pose 配置（model/kpt_shape/keyframe_every/min_hits/ort）。
+            timer: 阶段计时钩子：``_forward_batch`` 记 ``pose_forward``，计数
+                ``pose_forwards`` / ``pose_skipped``（门控判定不跑）/ ``pose_deferred``；None 不计时。
 
         Raises:
-            ModelLoadError: 权重缺失 / 无 CUDA EP / ort 加载失败 / 输入或输出数不符。
+            ModelLoadError: 权重缺失 / 所需 EP 不可用 / ort 加载失败 / 输入或输出数不符。
         """
         model_path = Path(cfg.model)
         if not model_path.is_file():
             raise ModelLoadError(f"RTMPose 权重不存在: {cfg.model}")
-        session = build_ort_session(str(model_path))
+        session = shared_ort_session(str(model_path), cfg.ort)
 
         inputs = session.get_inputs()
         outputs = session.get_outputs()
@@ -131,6 +147,10 @@ class RtmposeStep:
         self._gate = PoseGate(cfg)
         self._frame_idx: int = -1
         self._last_kpts: dict[int, Keypoints | None] = {}
+        self._last_rect: dict[int, Rect] = {}
+        self._timer: StageTimer | None = timer
+        self._ms_per_crop: float | None = None
+        """每 crop forward 耗时估计（毫秒，EMA）；仅 ``cfg.max_ms > 0`` 时维护。"""
 
     # -- 协议方法 ----------------------------------------------------------
 
@@ -139,8 +159,9 @@ class RtmposeStep:
     ) -> list[Keypoints | None]:
         """对 tracked 决策门控 + 必要时跑 pose；返回与 tracked 同序的 list。
 
-        ``id==0`` 哨兵位恒 ``None``（不经门控）。``decide=True`` 跑 pose 并缓存；
-        ``decide=False`` 复用缓存（无缓存 → ``None``）。本帧无任何 decide → 不调
+        ``id==0`` 哨兵位恒 ``None``（不经门控）。``decide=True`` 的到期目标经每帧预算调度：
+        排上的跑 pose 并缓存（连同本帧框），未排上的顺延；``decide=False`` 与顺延者复用缓存
+        （无缓存 → ``None``；``reuse="warp"`` 时按框变换）。本帧无任何待跑目标 → 不调
         ``_forward``（zero-forward 优化）。
         """
         self._frame_idx += 1
@@ -148,27 +169,52 @@ class RtmposeStep:
         img_h, img_w = image.shape[:2]
 
         results: list[Keypoints | None] = [None] * len(tracked)
-        pending: list[tuple[int, np.ndarray, int, int]] = []  # (pos, crop, x0, y0)
+        due: list[int] = []  # 到期目标在 tracked 中的位置
+        n_skipped = 0
         for pos, ob in enumerate(tracked):
             if ob.id == 0:
                 continue  # 哨兵：results[pos] 保持 None，不经门控
             aspect = ob.rect.aspect_ratio()
-            decide = self._gate.step(ob.id, ob.cls, frame_idx, aspect)
-            if not decide:
-                results[pos] = self._last_kpts.get(ob.id)  # 复用（无缓存→None）
+            if not self._gate.observe(ob.id, ob.cls, frame_idx, aspect, ob.rect):
+                results[pos] = self._reuse(ob)  # 复用（无缓存→None）
+                n_skipped += 1
+                continue
+            due.append(pos)
+
+        chosen = self._gate.schedule(frame_idx, [tracked[p] for p in due], self._ms_limit())
+        pending: list[tuple[int, tuple[int, int, int, int]]] = []  # (pos, 像素框)
+        for k, pos in enumerate(due):
+            ob = tracked[pos]
+            if k not in chosen:
+                self._gate.defer(ob.id)  # 超预算：顺延，本帧复用
+                results[pos] = self._reuse(ob)
                 continue
-            cropped = _crop_rect(image, ob.rect, img_w, img_h)
-            if cropped is None:
+            self._gate.commit(ob.id, frame_idx, ob.rect.aspect_ratio(), ob.rect)
+            box = pixel_box(ob.rect, img_w, img_h)
+            if box is None:
                 self._last_kpts[ob.id] = None  # crop 退化：显式缓存 None
                 continue
-            crop, x0, y0 = cropped
-            pending.append((pos, crop, x0, y0))
+            pending.append((pos, box))
 
         if pending:
-            decoded = self._forward_batch(pending, img_w, img_h)
-            for (pos, _crop, _x0, _y0), kpts in zip(pending, decoded, strict=True):
-                self._last_kpts[tracked[pos].id] = kpts
+            t0 = perf_counter()
+            decoded = self._forward_batch(image, [box for _, box in pending])
+            sec = perf_counter() - t0
+            if self._timer is not None:
+                self._timer.add("pose_forward", sec)
+            if self._cfg.max_ms > 0:
+                ms = sec * 1000.0 / len(pending)
+                est = self._ms_per_crop
+                self._ms_per_crop = ms if est is None else est + _MS_EMA * (ms - est)
+            for (pos, _box), kpts in zip(pending, decoded, strict=True):
+                ob = tracked[pos]
+                self._last_kpts[ob.id] = kpts
+                self._last_rect[ob.id] = ob.rect
                 results[pos] = kpts
+        if self._timer is not None:
+            self._timer.count("pose_forwards", len(pending))
+            self._timer.count("pose_skipped", n_skipped)
+            self._timer.count("pose_deferred", len(due) - len(chosen))
         return results
 
     def reset(self) -> None:
@@ -179,42 +225,47 @@ class RtmposeStep:
         self._gate.reset()
         self._frame_idx = -1
         self._last_kpts.clear()
+        self._last_rect.clear()
 
     # -- 内部 --------------------------------------------------------------
 
+    def _ms_limit(self) -> int | None:
+        """``max_ms`` 折算的本帧 crop 上限（None=不限；无耗时估计时 1 个校准）。"""
+        if self._cfg.max_ms <= 0:
+            return None
+        if self._ms_per_crop is None:
+            return 1
+        return max(int(self._cfg.max_ms / max(self._ms_per_crop, 1e-6)), 1)
+
+    def _reuse(self, ob: D2dObject) -> Keypoints | None:
+        """门控跳过帧的复用值：``copy`` 原样；``warp`` 从 pose 帧框变换到本帧框。"""
+        kpts = self._last_kpts.get(ob.id)
+        if kpts is None or self._cfg.reuse == "copy":
+            return kpts
+        src = self._last_rect.get(ob.id)
+        return kpts if src is None else warp_keypoints(kpts, src, ob.rect)
+
     def _forward_batch(
-        self,
-        pending: list[tuple[int, np.ndarray, int, int]],
-        img_w: int,
-        img_h: int,
+        self, image: np.ndarray, boxes: list[tuple[int, int, int, int]]
     ) -> list[Keypoints | None]:
-        """批量预处理 → 单次 ``_forward`` → 分发解码 + 坐标回映。
+        """批量预处理 → 单次 ``_forward`` → 批量解码 + 坐标回映。
 
-        lazy import ``jxl.vdt.rtmpose_proc``（兄弟模块；并行期 unresolved 可暂忽略，
-        主控集成 mypy）。``preprocess_crop`` 返回 ``(tensor, center, scale)``，约定
-        tensor 形如 ``[1,3,H,W]``（ort-ready），squeeze 掉 singleton batch 后拼
-        ``[N,3,H,W]``；兼容直接给 ``[3,H,W]``。
+        lazy import ``jxl.vdt.rtmpose_proc``。``preprocess_batch`` 直接从整帧的 ROI 视图
+        仿射出 ``[N,3,H,W]``（不拷 crop、归一化一次完成）；``simcc_decode_batch`` 对
+        ``[N,K,*]`` 一次 argmax/max，返回 ``(kpts [N,K,3], valid [N])``。
         """
-        from jxl.vdt.rtmpose_proc import preprocess_crop, simcc_decode
-
-        tensors: list[np.ndarray] = []
-        metas: list[tuple[Point, Point, int, int]] = []  # (center, scale, x0, y0)
-        for _pos, crop, x0, y0 in pending:
-            tensor, center, scale = preprocess_crop(crop)
-            arr = np.asarray(tensor)
-            if arr.ndim == 4:
-                arr = arr[0]  # drop singleton batch
-            tensors.append(arr)
-            metas.append((center, scale, x0, y0))
-
-        batch = np.stack(tensors, axis=0)
+        from jxl.vdt.rtmpose_proc import preprocess_batch, simcc_decode_batch
+
+        img_h, img_w = image.shape[:2]
+        box_arr = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+        batch, centers, scales = preprocess_batch(image, box_arr)
         simcc_x, simcc_y = self._forward(batch)  # [N,17,W*2], [N,17,H*2]
+        kpts, valid = simcc_decode_batch(simcc_x, simcc_y, centers, scales)
 
-        out: list[Keypoints | None] = []
-        for i, (center, scale, x0, y0) in enumerate(metas):
-            kps_crop = simcc_decode(simcc_x[i], simcc_y[i], center, scale)
-            out.append(_remap(kps_crop, x0, y0, img_w, img_h))
-        return out
+        return [
+            _remap(kpts[i], bool(valid[i]), x0, y0, img_w, img_h)
+            for i, (x0, y0, _x1, _y1) in enumerate(boxes)
+        ]
 
     def _forward(self, batch_tensor: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
         """ort 单次推理（批量），返回 ``(simcc_x, simcc_y)`` 形如 ``[N,17,W*2]``。
@@ -257,52 +308,68 @@ class _ScriptedGate:
         self._decisions: list[bool] = list(decisions)
         self.calls: list[tuple[int, int, int, float]] = []
 
-    def step(self, oid: int, cls: int, frame_idx: int, aspect: float) -> bool:
+    def observe(
+        self, oid: int, cls: int, frame_idx: int, aspect: float, rect: Rect | None = None
+    ) -> bool:
         self.calls.append((oid, cls, frame_idx, aspect))
         return self._decisions.pop(0)
 
+    def commit(self, oid: int, frame_idx: int, aspect: float, rect: Rect | None = None) -> None:
+        pass
+
+    def defer(self, oid: int) -> None:
+        pass
+
+    def schedule(self, frame_idx: int, due: list[D2dObject], limit: int | None = None) -> set[int]:
+        return set(range(len(due)))
+
     def reset(self) -> None:
         self.calls.clear()
 
 
-def _make_step(gate: object) -> RtmposeStep:
+def _make_step(gate: object, reuse: str = "copy") -> RtmposeStep:
     """绕过 ``__init__``（避免 ort session）构造 ``RtmposeStep``，注入 fake gate。"""
     s = RtmposeStep.__new__(RtmposeStep)
     # _forward 被 monkeypatch，session 不被触达；仅占位以满足属性存在性。
     s._session = None  # type: ignore[assignment]
     s._in_name = "in"
-    s._cfg = PoseCfg(model="<fake>", kpt_shape=(17, 3))
+    s._cfg = PoseCfg(model="<fake>", kpt_shape=(17, 3), reuse=reuse)
     s._gate = gate  # type: ignore[assignment]
     s._frame_idx = -1
     s._last_kpts = {}
+    s._last_rect = {}
+    s._timer = None
+    s._ms_per_crop = None
     return s
 
 
 def _install_fake_rtmpose_proc(monkeypatch: pytest.MonkeyPatch) -> None:
-    """注册 fake ``jxl.vdt.rtmpose_proc``：``preprocess_crop`` 给零张量占位；
-    ``simcc_decode`` 按 (simcc_x, simcc_y) 各 keypoint 的 argmax 还原 crop 像素点。"""
+    """注册 fake ``jxl.vdt.rtmpose_proc``：``preprocess_batch`` 给零张量占位；
+    ``simcc_decode_batch`` 按 (simcc_x, simcc_y) 各 keypoint 的 argmax 还原 crop 像素点。"""
 
     mod = types.ModuleType("jxl.vdt.rtmpose_proc")
 
-    def preprocess_crop(crop: np.ndarray) -> tuple[np.ndarray, Point, Point]:
-        tensor = np.zeros((1, 3, 8, 8), dtype=np.float32)
-        center = Point(x=0.0, y=0.0)  # 占位（fake forward/decode 不依赖其值）
-        scale = Point(x=1.0, y=1.0)
-        return tensor, center, scale
+    def preprocess_batch(
+        image: np.ndarray, boxes: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        n = len(boxes)
+        # 占位 center/scale（fake forward/decode 不依赖其值）
+        return np.zeros((n, 3, 8, 8), dtype=np.float32), np.zeros((n, 2)), np.ones((n, 2))
 
-    def simcc_decode(
+    def simcc_decode_batch(
         simcc_x: np.ndarray,
         simcc_y: np.ndarray,
-        center: Point,
-        scale: Point,
-    ) -> Keypoints | None:
-        k = simcc_x.shape[0]
-        pts = [Point(x=float(np.argmax(simcc_x[i])), y=float(np.argmax(simcc_y[i])))
-               for i in range(k)]
-        return Keypoints(pts=pts, conf=[1.0] * k)
-
-    setattr(mod, "preprocess_crop", preprocess_crop)
-    setattr(mod, "simcc_decode", simcc_decode)
+        centers: np.ndarray,
+        scales: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        kpts = np.stack(
+            [simcc_x.argmax(axis=2), simcc_y.argmax(axis=2), np.ones(simcc_x.shape[:2])],
+            axis=2,
+        ).astype(np.float64)
+        return kpts, np.ones(len(kpts), dtype=bool)
+
+    setattr(mod, "preprocess_batch", preprocess_batch)
+    setattr(mod, "simcc_decode_batch", simcc_decode_batch)
     monkeypatch.setitem(sys.modules, "jxl.vdt.rtmpose_proc", mod)
 
 
@@ -345,14 +412,14 @@ def test_pixel_box_zero_area_returns_none() -> None:
     assert pixel_box(Rect.new(0.1, 0.1, 0.0, 0.5), 100, 100) is None
 
 
-def test_crop_rect_returns_crop_and_offset() -> None:
-    """``_crop_rect`` 返回 crop 切片 + 左上角偏移（坐标回映所需）。"""
-    image = np.arange(100 * 100 * 3, dtype=np.uint8).reshape(100, 100, 3)
-    out = _crop_rect(image, Rect.new(0.1, 0.2, 0.5, 0.6), 100, 100)
+def test_remap_adds_offset_and_keeps_null() -> None:
+    """``_remap``：crop 像素 + 框左上角 → 归一化；``valid=False`` → None（显式 null）。"""
+    kps = np.array([[2.0, 3.0, 0.9], [0.0, 0.0, 0.0]])
+    out = _remap(kps, True, 10, 20, 100, 100)
     assert out is not None
-    crop, x0, y0 = out
-    assert x0 == 10 and y0 == 20
-    assert crop.shape == (60, 50, 3)  # [y0:y1, x0:x1] → (80-20, 60-10)
+    assert (out.pts[0].x, out.pts[0].y) == pytest.approx((0.12, 0.23))
+    assert out.conf == pytest.approx([0.9, 0.0])
+    assert _remap(kps, False, 10, 20, 100, 100) is None
 
 
 # -- step 门控中继测试 ----------------------------------------------------
@@ -380,6 +447,87 @@ def test_gating_only_runs_forward_when_decide_true(monkeypatch: pytest.MonkeyPat
     assert len(gate.calls) == 4
 
 
+def test_timer_counts_forwards_and_gate_skips(monkeypatch: pytest.MonkeyPatch) -> None:
+    """注入 timer：``pose_forward`` 仅在有 pending 的帧记录；跳过数 = 门控 False 数。"""
+    from jxl.vdt.profile import StageProfiler
+
+    _install_fake_rtmpose_proc(monkeypatch)
+    step = _make_step(_ScriptedGate([True, False, False, True]))
+    prof = StageProfiler()
+    step._timer = prof
+    monkeypatch.setattr(RtmposeStep, "_forward", _spike_forward())
+
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    for _ in range(4):
+        step.step(image, [_det(0.1, 0.2)])
+
+    rep = prof.report(1.0)
+    assert rep.stages["pose_forward"].n == 2
+    assert rep.counts == {"pose_forwards": 2, "pose_skipped": 2, "pose_deferred": 0}
+
+
+def test_warp_keypoints_follows_box_translation_and_scale() -> None:
+    kp = Keypoints(pts=[Point(x=0.1, y=0.2), Point(x=0.3, y=0.8)], conf=[0.9, 0.1])
+    src = Rect.new(0.1, 0.2, 0.2, 0.6)  # 两点 = src 的左上角 / 右下角
+    out = warp_keypoints(kp, src, Rect.new(0.5, 0.1, 0.1, 0.3))
+    assert [(round(p.x, 9), round(p.y, 9)) for p in out.pts] == [(0.5, 0.1), (0.6, 0.4)]
+    assert out.conf == [0.9, 0.1]
+    assert warp_keypoints(kp, Rect.new(0.1, 0.2, 0.0, 0.6), src) is kp  # 退化 → 原样
+
+
+def test_reuse_warp_moves_cached_keypoints_with_box(monkeypatch: pytest.MonkeyPatch) -> None:
+    """reuse=warp：跳过帧的关键点跟随框平移；copy 模式原样复用；下次 forward 重新锚定。"""
+    _install_fake_rtmpose_proc(monkeypatch)
+    monkeypatch.setattr(RtmposeStep, "_forward", _spike_forward())
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    out: dict[str, list[Keypoints | None]] = {}
+    for mode in ("copy", "warp"):
+        step = _make_step(_ScriptedGate([True, False]), reuse=mode)
+        f0 = step.step(image, [_det(0.1, 0.2)])[0]
+        f1 = step.step(image, [_det(0.3, 0.2)])[0]  # 框右移 0.2
+        assert f0 is not None and f1 is not None
+        out[mode] = [f0, f1]
+    assert out["copy"][1] == out["copy"][0]
+    f0, f1 = out["warp"]
+    assert f1 is not None and f0 is not None
+    assert f1.pts[0].x == pytest.approx(f0.pts[0].x + 0.2)
+    assert f1.pts[0].y == pytest.approx(f0.pts[0].y)
+
+
+def test_budget_caps_crops_per_frame_and_defers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """max_per_frame=1 + 真 PoseGate：3 人同时确认 → 每帧 1 次单 crop forward，3 帧轮完。"""
+    from jxl.vdt.pose_gate import PoseGate
+
+    _install_fake_rtmpose_proc(monkeypatch)
+    batch_sizes: list[int] = []
+    spike = _spike_forward()
+
+    def fwd(self: RtmposeStep, b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        batch_sizes.append(b.shape[0])
+        return spike(self, b)
+
+    monkeypatch.setattr(RtmposeStep, "_forward", fwd)
+    cfg = PoseCfg(model="<fake>", min_hits=1, keyframe_every=30, max_per_frame=1)
+    step = _make_step(PoseGate(cfg))
+    step._cfg = cfg
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    people = [_det(0.1, 0.1, oid=1), _det(0.5, 0.1, oid=2), _det(0.1, 0.5, w=0.2, oid=3)]
+    frames = [step.step(image, people) for _ in range(3)]
+    assert batch_sizes == [1, 1, 1]
+    assert [sum(k is not None for k in f) for f in frames] == [1, 2, 3]
+
+
+def test_ms_limit_calibrates_then_scales() -> None:
+    step = _make_step(_ScriptedGate([]))
+    assert step._ms_limit() is None  # max_ms=0 → 不限
+    step._cfg = PoseCfg(model="<fake>", max_ms=10.0)
+    assert step._ms_limit() == 1  # 无估计 → 1 个校准
+    step._ms_per_crop = 2.5
+    assert step._ms_limit() == 4
+    step._ms_per_crop = 50.0
+    assert step._ms_limit() == 1  # 至少 1（保证前进）
+
+
 def test_reuse_returns_none_when_no_prior_cache(monkeypatch: pytest.MonkeyPatch) -> None:
     """decide=False 且无任何先前缓存 → None（首帧即 not decide）。"""
     _install_fake_rtmpose_proc(monkeypatch)
@@ -532,7 +680,7 @@ def test_init_raises_on_missing_model(tmp_path: Path) -> None:
 
 
 def test_smoke_real_model_optional(tmp_path: Path) -> None:
-    """真实 RTMPose onnx smoke：_crop_rect + preprocess + 真实 session 不崩。
+    """真实 RTMPose onnx smoke：pixel_box + preprocess_batch + 真实 session 不崩。
 
     本地通常无 rtmpose*.onnx → importorskip/skip 优雅跳过； CI 有权重时验证连通。
     """
@@ -10,12 +10,25 @@
   与上次 pose 帧序，避免 Tracker 暴露其内部确认逻辑。
 
 aspect 来自 ``D2dObject.rect.aspect_ratio()``（归一化 rect 的 w/h，无量纲）。
+
+自适应关键帧（``PoseCfg.keyframe_max > keyframe_every`` 时启用）：规则 ② 的间隔随
+"上次 pose 以来的框运动" :func:`box_motion` 在 ``[keyframe_every, keyframe_max]`` 间线性
+插值（:func:`keyframe_interval`）——静止目标少跑 forward，运动达 ``motion_thr`` 即回落到
+``keyframe_every``。配合 ``PoseCfg.reuse="warp"``（跳过帧按框变换复用关键点）使用。
+
+每帧预算（``PoseCfg.max_per_frame`` / ``max_ms``）：拥挤帧的到期目标不全跑——
+:meth:`PoseGate.schedule` 按 :func:`pose_priority`（从未 pose > 陈旧度 > 检测置信度 >
+框面积）取前 ``limit`` 个，其余 :meth:`PoseGate.defer` 标记顺延（规则 ⑤：下一帧仍到期，
+陈旧度更高、优先级随之上升），每帧 forward 数有上界、延迟可预期。
 """
 
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 
+from jvi.geo.rectangle import Rect
+from jxl.det.d2d import D2dObject
 from jxl.vdt.types import PoseCfg
 
 # aspect 跳变阈值（站→坐/转身等姿态变化引起的宽高比变化），spec §6 ④。
@@ -43,6 +56,40 @@ class GateState:
     """累计观察到该 id 的帧数（决策前；本帧 ``+1`` 后用于确认）。"""
     had_pose: bool
     """是否已对该 id 跑过 pose。"""
+    last_rect: Rect | None = None
+    """上次跑 pose 时的框（归一化）；``None`` 表示无（或调用方未提供框）。"""
+    deferred: bool = False
+    """上一帧到期但因每帧预算被顺延（下一帧必到期，见规则 ⑤）。"""
+
+
+def box_motion(src: Rect, dst: Rect) -> float:
+    """框 ``src → dst`` 的相对运动量（纯函数，无量纲）。
+
+    取中心位移（按 ``src`` 宽/高归一）与宽/高对数尺度变化四者的最大值；``src`` 退化
+    （宽或高为 0）→ ``inf``（视为剧烈运动）。
+    """
+    if src.width <= 0 or src.height <= 0 or dst.width <= 0 or dst.height <= 0:
+        return math.inf
+    c0, c1 = src.center(), dst.center()
+    return max(
+        abs(c1.x - c0.x) / src.width,
+        abs(c1.y - c0.y) / src.height,
+        abs(math.log(dst.width / src.width)),
+        abs(math.log(dst.height / src.height)),
+    )
+
+
+def keyframe_interval(motion: float, cfg: PoseCfg) -> int:
+    """规则 ② 的关键帧间隔（纯函数）：运动越小越接近 ``keyframe_max``。
+
+    ``keyframe_max <= keyframe_every``（含 0=关闭）→ 恒 ``keyframe_every``；否则按
+    ``min(motion / motion_thr, 1)`` 在 ``[keyframe_max, keyframe_every]`` 间线性插值。
+    """
+    lo, hi = cfg.keyframe_every, cfg.keyframe_max
+    if hi <= lo:
+        return lo
+    t = min(motion / cfg.motion_thr, 1.0)
+    return round(hi - (hi - lo) * t)
 
 
 def should_pose(
@@ -51,6 +98,7 @@ def should_pose(
     frame_idx: int,
     aspect: float,
     cfg: PoseCfg,
+    rect: Rect | None = None,
 ) -> bool:
     """门控决策（纯函数，读 ``state`` 不改）。
 
@@ -62,11 +110,14 @@ def should_pose(
     - 已确认后，满足任一触发即 ``True``：
       ① 首次——``not state.had_pose``（刚跨过 ``min_hits``，首次捕获 pose）。
       ② 周期关键帧（兼 staleness 兜底）——``state.had_pose and
-         (frame_idx - state.last_pose_frame) >= cfg.keyframe_every``。
+         (frame_idx - state.last_pose_frame) >= interval``；``interval`` 默认
+         ``cfg.keyframe_every``，自适应开启且有 ``rect`` 时为
+         ``keyframe_interval(box_motion(state.last_rect, rect), cfg)``。
       ③ aspect 跳变——``state.had_pose and state.last_aspect >= 0 and
          abs(aspect - state.last_aspect) > _ASPECT_JUMP``。
       ④ 遮挡退出——``state.hit_count > 0 and (frame_idx - state.last_seen_frame)
          > 1``（id 缺席后重现；``last_seen_frame`` 取自上一帧观察）。
+      ⑤ 预算顺延——``state.deferred``（上一帧到期但未排上，见 :meth:`PoseGate.schedule`）。
     """
     if cls != 0:
         return False
@@ -75,8 +126,13 @@ def should_pose(
     # 已确认
     if not state.had_pose:
         return True  # ① 首次
+    if state.deferred:
+        return True  # ⑤ 预算顺延
     gap = frame_idx - state.last_pose_frame
-    if gap >= cfg.keyframe_every:
+    interval = cfg.keyframe_every
+    if rect is not None and state.last_rect is not None:
+        interval = keyframe_interval(box_motion(state.last_rect, rect), cfg)
+    if gap >= interval:
         return True  # ② 周期关键帧（gap 越大即 staleness，单条覆盖，无需独立 K_max）
     if state.last_aspect >= 0 and abs(aspect - state.last_aspect) > _ASPECT_JUMP:
         return True  # ③ aspect 跳变
@@ -85,9 +141,20 @@ def should_pose(
     return False
 
 
+def pose_priority(state: GateState, ob: D2dObject, frame_idx: int) -> tuple[float, ...]:
+    """到期目标的调度排序键（纯函数；升序 = 优先）。
+
+    依次比较：从未 pose 者优先 → 陈旧度（距上次 pose 帧数）大者优先 → 检测置信度高者
+    优先 → 框面积大者优先（近处 / 大目标关键点更可靠）。
+    """
+    staleness = math.inf if not state.had_pose else float(frame_idx - state.last_pose_frame)
+    return (-staleness, -ob.conf, -ob.rect.width * ob.rect.height)
+
+
 class PoseGate:
     """per-id 门控状态机外壳：持 ``dict[int, GateState]``，每帧对每个 tracked id
-    调 :meth:`step`。
+    调 :meth:`step`（或预算模式下 :meth:`observe` → :meth:`schedule` →
+    :meth:`commit` / :meth:`defer`）。
 
     有状态、仅程序内构造（**非 pydantic**，docstring 注明）。``PoseStep`` 实现持
     本对象，按 ``tracked`` 中每个 ``D2dObject.id`` 调 :meth:`step`，对返回 ``True``
@@ -99,18 +166,31 @@ class PoseGate:
         self._cfg = cfg
         self._states: dict[int, GateState] = {}
 
-    def step(self, track_id: int, cls: int, frame_idx: int, aspect: float) -> bool:
-        """观察该 id 本帧（``frame_idx``, ``aspect``），更新状态，返回是否应跑 pose。
+    def step(
+        self, track_id: int, cls: int, frame_idx: int, aspect: float, rect: Rect | None = None
+    ) -> bool:
+        """观察该 id 本帧（``frame_idx``, ``aspect``, 可选框 ``rect``），更新状态，返回是否应跑 pose。
 
         - 首次见该 id → 新建 :class:`GateState`（``last_pose=-1``/``last_aspect=-1``/
           ``hit_count=0``/``had_pose=False``）。
         - ``decide = should_pose(state, cls, frame_idx, aspect, cfg)``。
-        - 更新：``hit_count += 1``；``last_seen_frame = frame_idx``。
-          若 ``decide``：``last_pose_frame = frame_idx``、``had_pose = True``、
-          ``last_aspect = aspect``（``last_aspect`` 仅在跑 pose 时更新——aspect
-          跳变检测相对"上次 pose"的姿态）。
+        - 更新：``hit_count += 1``；``last_seen_frame = frame_idx``（:meth:`observe`）。
+          若 ``decide``：:meth:`commit`（``last_pose_frame`` / ``had_pose`` /
+          ``last_aspect`` / ``last_rect``）。
         - return ``decide``。
+
+        不做每帧预算调度（预算模式由 ``RtmposeStep`` 走 observe/schedule/commit）。
         """
+        decide = self.observe(track_id, cls, frame_idx, aspect, rect)
+        if decide:
+            self.commit(track_id, frame_idx, aspect, rect)
+        return decide
+
+    def observe(
+        self, track_id: int, cls: int, frame_idx: int, aspect: float, rect: Rect | None = None
+    ) -> bool:
+        """:meth:`step` 的前半：决策 + 更新观察计数（``hit_count`` / ``last_seen_frame``），
+        **不**记为已 pose——由调用方对实际跑 pose 的目标调 :meth:`commit`。"""
         state = self._states.get(track_id)
         if state is None:
             state = GateState(
@@ -123,18 +203,51 @@ class PoseGate:
             )
             self._states[track_id] = state
 
-        decide = should_pose(state, cls, frame_idx, aspect, self._cfg)
+        decide = should_pose(state, cls, frame_idx, aspect, self._cfg, rect)
 
         # 就地更新（imperative shell）
         state.hit_count += 1
         state.last_seen_frame = frame_idx
-        if decide:
-            state.last_pose_frame = frame_idx
-            state.had_pose = True
-            state.last_aspect = aspect
-
         return decide
 
+    def commit(
+        self, track_id: int, frame_idx: int, aspect: float, rect: Rect | None = None
+    ) -> None:
+        """记该 id 本帧已跑 pose（``last_pose_frame`` / ``last_aspect`` / ``last_rect``，清顺延）。
+
+        ``last_aspect`` / ``last_rect`` 仅在跑 pose 时更新——aspect 跳变与自适应间隔都相对
+        "上次 pose" 的姿态与框。
+        """
+        state = self._states[track_id]
+        state.last_pose_frame = frame_idx
+        state.had_pose = True
+        state.last_aspect = aspect
+        state.last_rect = rect
+        state.deferred = False
+
+    def defer(self, track_id: int) -> None:
+        """到期但本帧未排上：标记顺延（下一帧规则 ⑤ 必到期）。"""
+        self._states[track_id].deferred = True
+
+    def schedule(self, frame_idx: int, due: list[D2dObject], limit: int | None = None) -> set[int]:
+        """每帧预算调度：从到期目标 ``due`` 中按 :func:`pose_priority` 选出本帧要跑的下标。
+
+        容量 = ``cfg.max_per_frame``（0=不限）与 ``limit``（调用方按耗时预算折算；None=不限）
+        的较小者，且至少 1（保证前进）。``due`` 中的 id 须已经 :meth:`observe`。
+
+        Returns:
+            选中目标在 ``due`` 中的下标集合；未选中者由调用方 :meth:`defer`。
+        """
+        caps = [c for c in (self._cfg.max_per_frame, limit) if c]
+        cap = max(min(caps), 1) if caps else len(due)
+        if len(due) <= cap:
+            return set(range(len(due)))
+        order = sorted(
+            range(len(due)),
+            key=lambda i: pose_priority(self._states[due[i].id], due[i], frame_idx),
+        )
+        return set(order[:cap])
+
     def reset(self) -> None:
         """清空所有 per-id 状态（视频边界，防跨视频身份状态泄漏）。"""
         self._states.clear()
@@ -145,11 +258,15 @@ class PoseGate:
 # ---------------------------------------------------------------------------
 
 
-def _cfg(keyframe_every: int = 5, min_hits: int = 3) -> PoseCfg:
+import pytest  # noqa: E402
+
+
+def _cfg(keyframe_every: int = 5, min_hits: int = 3, keyframe_max: int = 0) -> PoseCfg:
     """构造测试用 :class:`PoseCfg`（``model`` 占位，不加载）。"""
     return PoseCfg(
         model="dummy.onnx",
         keyframe_every=keyframe_every,
+        keyframe_max=keyframe_max,
         min_hits=min_hits,
     )
 
@@ -283,3 +400,102 @@ def test_pose_cfg_disabled_does_not_affect_gate() -> None:
     gate = PoseGate(cfg)
     # 门控逻辑无视 enabled——enabled=False 时上层根本不调 step，此处仅验证不爆
     assert gate.step(1, 0, 0, 0.5) is True
+
+
+def test_box_motion_translation_scale_and_degenerate() -> None:
+    a = Rect.new(0.1, 0.1, 0.2, 0.4)
+    assert box_motion(a, a) == 0.0
+    assert box_motion(a, Rect.new(0.15, 0.1, 0.2, 0.4)) == pytest.approx(0.25)  # Δx / w
+    assert box_motion(a, Rect.new(0.1, 0.1, 0.2, 0.8)) == pytest.approx(math.log(2.0))
+    assert box_motion(Rect.new(0.1, 0.1, 0.0, 0.4), a) == math.inf
+
+
+def test_keyframe_interval_interpolates_and_disabled_is_constant() -> None:
+    cfg = PoseCfg(model="dummy.onnx", keyframe_every=5, keyframe_max=25, motion_thr=0.2)
+    assert keyframe_interval(0.0, cfg) == 25
+    assert keyframe_interval(0.1, cfg) == 15
+    assert keyframe_interval(0.2, cfg) == 5
+    assert keyframe_interval(math.inf, cfg) == 5
+    assert keyframe_interval(0.0, _cfg(keyframe_every=5)) == 5  # keyframe_max=0 → 关闭
+
+
+def test_adaptive_keyframe_stretches_for_still_box() -> None:
+    """静止框：间隔拉长到 keyframe_max；同一 gate 不传 rect 时退回 keyframe_every。"""
+    still = Rect.new(0.4, 0.4, 0.1, 0.3)
+    gate = PoseGate(_cfg(keyframe_every=5, min_hits=1, keyframe_max=20))
+    assert gate.step(1, 0, 0, 0.5, still) is True
+    assert not any(gate.step(1, 0, f, 0.5, still) for f in range(1, 20))
+    assert gate.step(1, 0, 20, 0.5, still) is True
+    no_rect = PoseGate(_cfg(keyframe_every=5, min_hits=1, keyframe_max=20))
+    assert no_rect.step(1, 0, 0, 0.5) is True
+    assert no_rect.step(1, 0, 5, 0.5) is True
+
+
+def test_adaptive_keyframe_falls_back_when_box_moves() -> None:
+    """运动 ≥ motion_thr：间隔回落到 keyframe_every。"""
+    gate = PoseGate(_cfg(keyframe_every=5, min_hits=1, keyframe_max=20))
+    assert gate.step(1, 0, 0, 0.5, Rect.new(0.1, 0.4, 0.1, 0.3)) is True
+    for f in range(1, 5):
+        assert gate.step(1, 0, f, 0.5, Rect.new(0.1 + 0.01 * f, 0.4, 0.1, 0.3)) is False
+    assert gate.step(1, 0, 5, 0.5, Rect.new(0.15, 0.4, 0.1, 0.3)) is True  # 位移 0.5w
+
+
+def test_pose_cfg_rejects_keyframe_max_below_every() -> None:
+    from pydantic import ValidationError
+
+    with pytest.raises(ValidationError, match="keyframe_max"):
+        _cfg(keyframe_every=5, keyframe_max=3)
+
+
+def _person(oid: int, conf: float = 0.9, side: float = 0.1) -> D2dObject:
+    return D2dObject(id=oid, cls=0, conf=conf, rect=Rect.new(0.1, 0.1, side, side))
+
+
+def _observe_all(gate: PoseGate, obs: list[D2dObject], f: int) -> list[D2dObject]:
+    return [ob for ob in obs if gate.observe(ob.id, 0, f, 0.5, ob.rect)]
+
+
+def test_schedule_unlimited_selects_all() -> None:
+    gate = PoseGate(_cfg(min_hits=1))
+    due = _observe_all(gate, [_person(i) for i in range(1, 6)], 0)
+    assert gate.schedule(0, due) == set(range(5))
+
+
+def test_schedule_budget_defers_and_rotates_by_staleness() -> None:
+    """max_per_frame=2：5 个同时到期 → 每帧 2 个，顺延者下一帧优先，3 帧内全部覆盖。"""
+    cfg = PoseCfg(model="dummy.onnx", min_hits=1, keyframe_every=30, max_per_frame=2)
+    gate = PoseGate(cfg)
+    obs = [_person(i, conf=1.0 - 0.1 * i) for i in range(1, 6)]
+    posed: list[list[int]] = []
+    for f in range(3):
+        due = _observe_all(gate, obs, f)
+        chosen = gate.schedule(f, due)
+        assert len(chosen) <= 2
+        for k, ob in enumerate(due):
+            if k in chosen:
+                gate.commit(ob.id, f, 0.5, ob.rect)
+            else:
+                gate.defer(ob.id)
+        posed.append(sorted(due[k].id for k in chosen))
+    # 从未 pose 者按置信度排（id 1,2 最高），随后 3,4，再 5
+    assert posed == [[1, 2], [3, 4], [5]]
+
+
+def test_pose_priority_orders_staleness_conf_area() -> None:
+    st = GateState(0, 9, 5, 0.5, 3, True)
+    never = GateState(0, 9, -1, -1.0, 3, False)
+    ob = _person(1)
+    assert pose_priority(never, ob, 10) < pose_priority(st, ob, 10)
+    assert pose_priority(st, ob, 12) < pose_priority(st, ob, 10)  # 更陈旧优先
+    assert pose_priority(st, _person(1, conf=0.95), 10) < pose_priority(st, ob, 10)
+    assert pose_priority(st, _person(1, side=0.2), 10) < pose_priority(st, ob, 10)
+
+
+def test_deferred_is_due_next_frame() -> None:
+    gate = PoseGate(_cfg(keyframe_every=30, min_hits=1))
+    assert gate.step(1, 0, 0, 0.5) is True
+    assert gate.observe(1, 0, 1, 0.5) is False
+    gate.defer(1)
+    assert gate.observe(1, 0, 2, 0.5) is True  # ⑤ 顺延
+    gate.commit(1, 2, 0.5)
+    assert gate.observe(1, 0, 3, 0.5) is False
@@ -0,0 +1,273 @@
+"""vdt 阶段计时：``StageTimer`` 实现、计时代理与 ``vdt run --profile`` 报告。
+
+``run_pipeline(timer=...)`` 注入 :class:`StageProfiler` 后，各阶段逐帧上报耗时：
+
+- ``decode`` / ``detect``：:class:`TimedDecoder` / :class:`TimedDetector` 代理（阶段线程
+  内计时；``detect_batch`` 的单次 forward 按帧均摊）；
+- ``embed``：:class:`TimedEmbedder` 代理 ReID 嵌入（crop 预处理 + 推理，``track`` 的子集）；
+- ``track``：``tracker.update`` 全程（ReID 模式含 ``embed``，关联 ≈ ``track − embed``）；
+- ``pose``：``pose.step`` 全程（门控 + 复用 + ``pose_forward``）；
+- ``frame_sink`` / ``aggregate`` / ``write``：旁路消费、轨迹聚合、轨迹写出。
+
+计数器：``frames``、``detections``、``embeds``、``pose_forwards``、``pose_skipped``
+（门控判定不跑 pose 的目标）、``pose_deferred``（到期但超每帧预算顺延的目标）。报告给出每阶段 p50/p95/p99 与有效 fps（帧数 / 墙钟），
+用于 GPU 节点容量评估与优化前后对比。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+from jxl.det.d2d import D2dObject
+from jxl.vdt.reid_assoc import Embedder
+from jxl.vdt.types import Decoder, Detector, StageTimer
+
+STAGE_ORDER: tuple[str, ...] = (
+    "decode",
+    "detect",
+    "embed",
+    "track",
+    "pose_forward",
+    "pose",
+    "frame_sink",
+    "aggregate",
+    "write",
+)
+"""报告中的阶段顺序（未列出的阶段按首次出现顺序排在其后）。"""
+
+
+class StageStats(BaseModel):
+    """单阶段耗时统计（毫秒）。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    n: int = Field(description="样本数（调用次数）")
+    total_ms: float = Field(description="累计耗时")
+    mean_ms: float = Field(description="平均耗时")
+    p50_ms: float = Field(description="中位数")
+    p95_ms: float = Field(description="95 分位")
+    p99_ms: float = Field(description="99 分位")
+    max_ms: float = Field(description="最大值")
+
+
+class ProfileReport(BaseModel):
+    """``vdt run --profile`` 报告。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    n_frames: int = Field(description="处理的采样帧数")
+    wall_sec: float = Field(description="墙钟耗时（秒）")
+    fps: float = Field(description="有效吞吐：采样帧数 / 墙钟")
+    stages: dict[str, StageStats] = Field(description="阶段 → 耗时统计")
+    counts: dict[str, int] = Field(description="计数器（检测数、嵌入数、门控跳过数……）")
+
+
+class StageProfiler:
+    """``StageTimer`` 实现：线程安全地收集逐次耗时与计数，``report`` 汇总分位数。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._samples: dict[str, list[float]] = defaultdict(list)
+        self._counts: dict[str, int] = defaultdict(int)
+
+    def add(self, stage: str, sec: float) -> None:
+        """记录 ``stage`` 的一次耗时（秒）。"""
+        with self._lock:
+            self._samples[stage].append(sec)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """累加计数器 ``name``。"""
+        with self._lock:
+            self._counts[name] += n
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """``with`` 块计时（块内抛错不记录）。"""
+        t0 = time.perf_counter()
+        yield
+        self.add(stage, time.perf_counter() - t0)
+
+    def report(self, wall_sec: float) -> ProfileReport:
+        """汇总为报告；``n_frames`` 取计数器 ``frames``。"""
+        with self._lock:
+            samples = {k: np.asarray(v, np.float64) * 1000.0 for k, v in self._samples.items()}
+            counts = dict(self._counts)
+        order = [s for s in STAGE_ORDER if s in samples]
+        order += [s for s in samples if s not in STAGE_ORDER]
+        stages = {s: _stats(samples[s]) for s in order}
+        n_frames = counts.get("frames", 0)
+        fps = n_frames / wall_sec if wall_sec > 0 else 0.0
+        return ProfileReport(
+            n_frames=n_frames, wall_sec=wall_sec, fps=fps, stages=stages, counts=counts
+        )
+
+
+def _stats(ms: np.ndarray) -> StageStats:
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return StageStats(
+        n=int(ms.size),
+        total_ms=float(ms.sum()),
+        mean_ms=float(ms.mean()),
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        p99_ms=float(p99),
+        max_ms=float(ms.max()),
+    )
+
+
+def write_profile(report: ProfileReport, path: Path) -> None:
+    """报告写为缩进 JSON（父目录自动创建）。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report.model_dump_json(indent=2), encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# 计时代理（满足原协议，透明包裹具体实现）
+# ---------------------------------------------------------------------------
+
+
+class TimedDecoder:
+    """``Decoder`` 代理：每帧 ``next`` 耗时记为 ``decode``。"""
+
+    def __init__(self, inner: Decoder, timer: StageTimer) -> None:
+        self._inner = inner
+        self._timer = timer
+
+    def __iter__(self) -> Iterator[tuple[int, int, np.ndarray]]:
+        it = iter(self._inner)
+        try:
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+                self._timer.add("decode", time.perf_counter() - t0)
+                yield item
+        finally:
+            close = getattr(it, "close", None)
+            if close is not None:
+                close()  # 提前退出时释放内层生成器资源（如 VideoCapture）
+
+
+class TimedDetector:
+    """``Detector`` 代理：耗时记为 ``detect``（微批按帧均摊），累加 ``detections``。"""
+
+    def __init__(self, inner: Detector, timer: StageTimer) -> None:
+        self._inner = inner
+        self._timer = timer
+
+    def detect(self, image: np.ndarray) -> list[D2dObject]:
+        t0 = time.perf_counter()
+        dets = self._inner.detect(image)
+        self._timer.add("detect", time.perf_counter() - t0)
+        self._timer.count("detections", len(dets))
+        return dets
+
+    def detect_batch(self, images: list[np.ndarray]) -> list[list[D2dObject]]:
+        t0 = time.perf_counter()
+        out = self._inner.detect_batch(images)
+        per_frame = (time.perf_counter() - t0) / max(len(images), 1)
+        for dets in out:
+            self._timer.add("detect", per_frame)
+            self._timer.count("detections", len(dets))
+        return out
+
+
+class TimedEmbedder:
+    """``Embedder`` 代理：每次调用耗时记为 ``embed``，累加 ``embeds``（crop 数）。"""
+
+    def __init__(self, inner: Embedder, timer: StageTimer) -> None:
+        self._inner = inner
+        self._timer = timer
+
+    def embed(self, crop: np.ndarray) -> np.ndarray:
+        t0 = time.perf_counter()
+        emb = self._inner.embed(crop)
+        self._timer.add("embed", time.perf_counter() - t0)
+        self._timer.count("embeds")
+        return emb
+
+    def embed_batch(self, crops: list[np.ndarray]) -> np.ndarray:
+        t0 = time.perf_counter()
+        embs = self._inner.embed_batch(crops)
+        self._timer.add("embed", time.perf_counter() - t0)
+        self._timer.count("embeds", len(crops))
+        return embs
+
+
+# ---------------------------------------------------------------------------
+# 单测（自包含：合成耗时样本 + 内联 fake，零模型）
+# ---------------------------------------------------------------------------
+
+import pytest  # noqa: E402
+
+
+def test_report_percentiles_and_fps() -> None:
+    prof = StageProfiler()
+    for ms in range(1, 101):
+        prof.add("track", ms / 1000.0)
+    prof.add("decode", 0.002)
+    prof.count("frames", 100)
+    rep = prof.report(wall_sec=4.0)
+    assert list(rep.stages) == ["decode", "track"]  # STAGE_ORDER 顺序
+    st = rep.stages["track"]
+    assert st.n == 100 and st.max_ms == pytest.approx(100.0)
+    assert st.p50_ms == pytest.approx(50.5)
+    assert st.p99_ms == pytest.approx(99.01)
+    assert rep.fps == pytest.approx(25.0)
+    assert rep.counts == {"frames": 100}
+
+
+def test_report_unknown_stage_after_known() -> None:
+    prof = StageProfiler()
+    prof.add("custom", 0.001)
+    prof.add("write", 0.001)
+    assert list(prof.report(1.0).stages) == ["write", "custom"]
+
+
+def test_span_records_and_write_roundtrip(tmp_path: Path) -> None:
+    prof = StageProfiler()
+    with prof.span("aggregate"):
+        pass
+    out = tmp_path / "sub" / "p.json"
+    write_profile(prof.report(0.0), out)
+    rep = ProfileReport.model_validate_json(out.read_text(encoding="utf-8"))
+    assert rep.stages["aggregate"].n == 1 and rep.fps == 0.0
+
+
+class _ListDecoder:
+    def __iter__(self) -> Iterator[tuple[int, int, np.ndarray]]:
+        for i in range(3):
+            yield i, i * 100, np.zeros((2, 2, 3), np.uint8)
+
+
+class _TwoDetector:
+    def detect(self, image: np.ndarray) -> list[D2dObject]:
+        from jvi.geo.rectangle import Rect
+
+        return [D2dObject(id=0, cls=0, conf=0.9, rect=Rect.one()) for _ in range(2)]
+
+    def detect_batch(self, images: list[np.ndarray]) -> list[list[D2dObject]]:
+        return [self.detect(im) for im in images]
+
+
+def test_timed_proxies_pass_through_and_count() -> None:
+    prof = StageProfiler()
+    frames = list(TimedDecoder(_ListDecoder(), prof))
+    assert [f[0] for f in frames] == [0, 1, 2]
+    det = TimedDetector(_TwoDetector(), prof)
+    assert len(det.detect(frames[0][2])) == 2
+    assert len(det.detect_batch([f[2] for f in frames])) == 3
+    rep = prof.report(1.0)
+    assert rep.stages["decode"].n == 3
+    assert rep.stages["detect"].n == 4  # 1 次单帧 + 3 帧均摊
+    assert rep.counts["detections"] == 8
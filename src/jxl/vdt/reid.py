@@ -9,6 +9,9 @@
   别的模型）。
 - ``embed``：crop → BGR→RGB → resize 224 → /255 → ImageNet mean/std 标准化 →
   HWC→CHW → forward → 384-d CLS 嵌入 → L2 归一化。
+- ``embed_batch``：一帧全部 crop 逐个 resize 后**整批**做色彩翻转/标准化/转置，按
+  ``max_batch`` 分块 forward（同 ``RtmposeStep._forward_batch``）——ReID 成本随帧数
+  而非每帧人数增长。逐行结果与 ``embed`` 一致。
 - 零面积/全零 crop → 全零 384-d 向量（无效哨兵；``associate`` 据此判无效 → id=0）。
 
 > **模型 fallback**：spec §7 默认 DINOv3 ViT-S/16，本实现用可得的 DINOv2 ViT-S/14
@@ -30,9 +33,9 @@ import numpy as np
 # 测试段用（pytest 自动发现；常规 import，勿用 __import__ 动态导入——j-python-strict）
 from jvi.geo.size2d import Size as _Size
 
-from jxl.vdt._ort import OrtSessionLike, build_ort_session
+from jxl.vdt._ort import OrtSessionLike, shared_ort_session
 from jxl.vdt.reid_assoc import Embedder  # 协议单一数据源（纯函数核心模块）
-from jxl.vdt.types import ModelLoadError, ReidError
+from jxl.vdt.types import ModelLoadError, OrtCfg, ReidError
 
 # ---------------------------------------------------------------------------
 # 常量（DINOv2 官方预处理；单一数据源——本模块钉死，reid_tracker/reid_assoc 不重述）。
@@ -52,7 +55,7 @@ DINOV2_DIM: int = 384
 
 
 # ---------------------------------------------------------------------------
-# ort 结构化窄接口 + CUDA fail-fast 构造：单一数据源见 :mod:`jxl.vdt._ort`
+# ort 窄接口 + CUDA fail-fast + 进程级 session 复用：见 :mod:`jxl.onnx.session`（经 :mod:`jxl.vdt._ort` 适配）
 # ---------------------------------------------------------------------------
 
 
@@ -71,24 +74,32 @@ class ReidEmbedder:
     注明的 fallback 路径）。两者预处理与嵌入维数（384）一致。
     """
 
-    def __init__(self, model_path: str) -> None:
+    def __init__(
+        self, model_path: str, max_batch: int = 32, ort_cfg: OrtCfg | None = None
+    ) -> None:
         """构造 ort session。
 
-        ort session 经 :func:`jxl.vdt._ort.build_ort_session` 构造——**要求 CUDA**
-        （fail-fast，No Silent Degradation；不静默回退 CPU）。输出维度在 ``embed``
-        推理期由 ``reshape`` 校验，不符即 ``ReidError``（错误具体化，不裸泄漏）。
+        ort session 经 :func:`jxl.vdt._ort.shared_ort_session` 取得（进程内同权重同配置
+        复用，批处理多视频只构造一次）——默认**要求 CUDA**（fail-fast，No Silent
+        Degradation；CPU 仅经 ``ort_cfg.provider="cpu"`` 显式开启）。输出维度在
+        ``embed`` 推理期由 ``reshape`` 校验，不符即 ``ReidError``（错误具体化，不裸泄漏）。
+
+        导出时 batch 维被固定（``shape[0]`` 为具体整数）的 ONNX 只能按该值分块，
+        ``max_batch`` 自动收窄到它。
 
         Args:
             model_path: DINOv2 ONNX 权重路径。
+            max_batch: ``embed_batch`` 单次 forward 的最大 crop 数（``ReidCfg.batch``）。
+            ort_cfg: ort 会话配置（``ReidCfg.ort``）；None = 默认 CUDA。
 
         Raises:
-            ModelLoadError: 权重不存在 / 无 CUDA EP / ort 加载失败 / IO 节点数不符
+            ModelLoadError: 权重不存在 / 所需 EP 不可用 / ort 加载失败 / IO 节点数不符
                 （不回退替代模型）。
         """
         path = Path(model_path)
         if not path.is_file():
             raise ModelLoadError(f"DINOv2 权重不存在: {model_path}")
-        session = build_ort_session(str(path))
+        session = shared_ort_session(str(path), ort_cfg)
 
         inputs = session.get_inputs()
         outputs = session.get_outputs()
@@ -100,8 +111,15 @@ class ReidEmbedder:
                 f"DINOv2 应有 1 输出 (CLS 嵌入)，实际 {len(outputs)}: {names}"
             )
 
+        if max_batch < 1:
+            raise ModelLoadError(f"max_batch 必须 ≥ 1，实际 {max_batch}")
+        static_batch = inputs[0].shape[0] if len(inputs[0].shape) > 0 else None
+        if isinstance(static_batch, int) and static_batch > 0:
+            max_batch = min(max_batch, static_batch)
+
         self._session: OrtSessionLike = session
         self._in_name: str = inputs[0].name
+        self._max_batch: int = max_batch
 
     def embed(self, crop: np.ndarray) -> np.ndarray:
         """BGR [Hc,Wc,3] uint8 crop → 384-d L2 归一化嵌入。
@@ -121,30 +139,52 @@ class ReidEmbedder:
         Raises:
             ReidError: 推理期 ort 异常（错误具体化，不裸泄漏）。
         """
-        import cv2
+        return np.asarray(self.embed_batch([crop])[0], dtype=np.float32)
 
-        if crop.size == 0 or crop.shape[0] == 0 or crop.shape[1] == 0:
-            return np.zeros(DINOV2_DIM, dtype=np.float32)
+    def embed_batch(self, crops: list[np.ndarray]) -> np.ndarray:
+        """一批 BGR crop → ``[N,384]`` L2 归一化嵌入（逐行同 :meth:`embed`）。
+
+        逐 crop ``cv2.resize`` 到 224（尺寸各异，无法合批），其余步骤在
+        ``[M,224,224,3]`` 上一次完成：BGR→RGB（通道翻转，与先转色再 resize 逐位
+        一致——线性插值按通道独立）→ ``/255`` → mean/std → NHWC→NCHW；再按
+        ``max_batch`` 分块 forward。零面积 crop 不进 forward，对应行全零。
+
+        Raises:
+            ReidError: 推理期 ort 异常 / 输出形状不符。
+        """
+        import cv2
 
-        rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
-        resized = cv2.resize(rgb, (DINOV2_SIZE, DINOV2_SIZE), interpolation=cv2.INTER_LINEAR)
-        x = resized.astype(np.float32) / 255.0
+        out = np.zeros((len(crops), DINOV2_DIM), dtype=np.float32)
+        valid = [
+            i for i, c in enumerate(crops)
+            if c.size > 0 and c.shape[0] > 0 and c.shape[1] > 0
+        ]
+        if not valid:
+            return out
+
+        resized = np.stack([
+            cv2.resize(crops[i], (DINOV2_SIZE, DINOV2_SIZE), interpolation=cv2.INTER_LINEAR)
+            for i in valid
+        ])
+        x = resized[..., ::-1].astype(np.float32) / 255.0  # BGR→RGB
         mean = np.array(DINOV2_MEAN, dtype=np.float32)
         std = np.array(DINOV2_STD, dtype=np.float32)
-        x = (x - mean) / std  # 广播：HWC × 3
-        x = np.transpose(x, (2, 0, 1))[None, ...]  # [1,3,224,224]
-
-        try:
-            out = self._session.run(None, {self._in_name: x})[0]
-            emb = out.reshape(DINOV2_DIM).astype(np.float32)  # 维度不符→ValueError→ReidError
-        except (RuntimeError, ValueError) as ex:  # EP 失败 / 形状不匹配
-            raise ReidError(f"DINOv2 推理失败: {type(ex).__name__}: {ex}") from ex
-        norm = float(np.linalg.norm(emb))
-        if norm > 1e-12:
-            emb = emb / norm
-        else:
-            return np.zeros(DINOV2_DIM, dtype=np.float32)  # 全零嵌入兜底
-        return emb
+        x = (x - mean) / std  # 广播：NHWC × 3
+        x = np.ascontiguousarray(np.transpose(x, (0, 3, 1, 2)))  # [M,3,224,224]
+
+        embs: list[np.ndarray] = []
+        for lo in range(0, len(valid), self._max_batch):
+            chunk = x[lo : lo + self._max_batch]
+            try:
+                res = self._session.run(None, {self._in_name: chunk})[0]
+                embs.append(res.reshape(len(chunk), DINOV2_DIM).astype(np.float32))
+            except (RuntimeError, ValueError) as ex:  # EP 失败 / 形状不匹配
+                raise ReidError(f"DINOv2 推理失败: {type(ex).__name__}: {ex}") from ex
+        emb = np.concatenate(embs)
+        norm = np.linalg.norm(emb, axis=1, keepdims=True)
+        ok = norm[:, 0] > 1e-12  # 全零嵌入兜底：保持零行（无效哨兵）
+        out[np.asarray(valid)[ok]] = emb[ok] / norm[ok]
+        return out
 
 
 # ---------------------------------------------------------------------------
@@ -305,3 +345,99 @@ def test_embed_heterogeneous_crops_low_cosine() -> None:
     e_s = emb.embed(solid)
     cos = _cosine(e_p, e_s)
     assert cos < 0.5, f"异类余弦过高: {cos:.4f}"
+
+
+import types  # noqa: E402
+
+import pytest  # noqa: E402
+
+
+class _EchoSession:
+    """fake ort session：嵌入 = 输入张量各通道均值（前 3 维），记录每次 batch 大小。"""
+
+    def __init__(self, batch_dim: int | str = "N") -> None:
+        self.batch_dim = batch_dim
+        self.batches: list[int] = []
+
+    def get_inputs(self) -> list[types.SimpleNamespace]:
+        return [types.SimpleNamespace(name="x", shape=[self.batch_dim, 3, 224, 224])]
+
+    def get_outputs(self) -> list[types.SimpleNamespace]:
+        return [types.SimpleNamespace(name="y", shape=[self.batch_dim, DINOV2_DIM])]
+
+    def get_providers(self) -> list[str]:
+        return ["CPUExecutionProvider"]
+
+    def run(self, _names: object, feed: dict[str, np.ndarray]) -> list[np.ndarray]:
+        x = feed["x"]
+        self.batches.append(len(x))
+        out = np.zeros((len(x), DINOV2_DIM), dtype=np.float32)
+        out[:, :3] = x.mean(axis=(2, 3))
+        out[:, 3] = 10.0  # 保证非零范数
+        return [out]
+
+
+def _fake_embedder(session: _EchoSession, max_batch: int) -> ReidEmbedder:
+    emb = ReidEmbedder.__new__(ReidEmbedder)
+    emb._session = session
+    emb._in_name = "x"
+    emb._max_batch = max_batch
+    return emb
+
+
+def _legacy_tensor(crop: np.ndarray) -> np.ndarray:
+    """旧版逐 crop 预处理（cvtColor → resize → 标准化），用于对拍。"""
+    import cv2
+
+    rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+    resized = cv2.resize(rgb, (DINOV2_SIZE, DINOV2_SIZE), interpolation=cv2.INTER_LINEAR)
+    x = (resized.astype(np.float32) / 255.0 - np.array(DINOV2_MEAN, np.float32)) / np.array(
+        DINOV2_STD, np.float32
+    )
+    return np.transpose(x, (2, 0, 1))
+
+
+def test_embed_batch_chunks_and_matches_single() -> None:
+    """embed_batch：按 max_batch 分块 forward；逐行与 embed 一致；零面积行全零。"""
+    rng = np.random.RandomState(0)
+    crops = [rng.randint(0, 256, (h, 40, 3), dtype=np.uint8) for h in (30, 60, 90, 120, 50)]
+    crops.insert(2, np.zeros((0, 5, 3), dtype=np.uint8))
+    sess = _EchoSession()
+    emb = _fake_embedder(sess, max_batch=2)
+    out = emb.embed_batch(crops)
+    assert out.shape == (6, DINOV2_DIM)
+    assert sess.batches == [2, 2, 1]  # 5 个有效 crop，零面积不进 forward
+    assert np.all(out[2] == 0.0)
+    for i, c in enumerate(crops):
+        if c.size:
+            assert np.allclose(out[i], emb.embed(c), atol=1e-6)
+
+
+def test_embed_batch_preprocess_matches_legacy() -> None:
+    """向量化预处理（resize 后翻通道）与旧版逐 crop 预处理逐位一致。"""
+    rng = np.random.RandomState(1)
+    crops = [rng.randint(0, 256, (h, 33, 3), dtype=np.uint8) for h in (17, 80)]
+    seen: list[np.ndarray] = []
+
+    class _Spy(_EchoSession):
+        def run(self, _names: object, feed: dict[str, np.ndarray]) -> list[np.ndarray]:
+            seen.append(feed["x"].copy())
+            return super().run(_names, feed)
+
+    _fake_embedder(_Spy(), max_batch=8).embed_batch(crops)
+    assert np.array_equal(seen[0], np.stack([_legacy_tensor(c) for c in crops]))
+
+
+def test_static_batch_dim_caps_max_batch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """ONNX batch 维固定为 1 → max_batch 收窄到 1（逐 crop forward，不报错）。"""
+    from jxl.vdt import reid as reid_mod
+
+    weight = tmp_path / "m.onnx"
+    weight.write_bytes(b"")
+    sess = _EchoSession(batch_dim=1)
+    monkeypatch.setattr(reid_mod, "shared_ort_session", lambda _p, _c=None: sess)
+    emb = ReidEmbedder(str(weight), max_batch=16)
+    emb.embed_batch([np.ones((8, 8, 3), np.uint8)] * 3)
+    assert sess.batches == [1, 1, 1]
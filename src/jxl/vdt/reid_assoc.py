@@ -61,6 +61,16 @@ class Embedder(Protocol):
             （No Silent Degradation：不静默保留全零嵌入进匹配池）。
         """
 
+    def embed_batch(self, crops: list[np.ndarray]) -> np.ndarray:
+        """批量提取外观嵌入（一帧的全部 crop，摊薄逐 crop 推理开销）。
+
+        Args:
+            crops: 非空 BGR crop 列表（尺寸可各异）。
+
+        Returns:
+            ``[N, D]`` 嵌入矩阵，第 i 行与 ``embed(crops[i])`` 语义一致（含全零哨兵）。
+        """
+
 
 # ---------------------------------------------------------------------------
 # 数据结构（值对象；状态ful 的 ndarray 嵌入显式避免 pydantic，用 frozen dataclass）
@@ -91,21 +101,130 @@ class TrackState:
     hit_count: int
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True, init=False, eq=False)
 class Gallery:
-    """轨迹库（命令式外壳 ``ReidTracker`` 持有；``associate`` 纯函数返回新实例）。
+    """轨迹库：矩阵存储（命令式外壳 ``ReidTracker`` 持有；``associate`` 返回新实例）。
 
-    非 frozen——``ReidTracker`` 在视频边界 ``reset`` 时整体重建。``associate`` 不
-    mutate 入参 ``Gallery``，而是返回新 ``Gallery``（存活轨迹 + EMA 更新 + 新建轨迹）。
+    各数组按行对齐（第 ``k`` 行 = 一条轨迹，行序 = 入库顺序，与旧版 dict 迭代序一致），
+    使 TTL 淘汰 / 运动 gating / 余弦打分都是整库一次 NumPy 运算。``frozen`` + 本模块
+    约定**绝不就地写数组**——``associate`` 产出新数组，入参 gallery 不变。
+
+    构造沿用旧签名 ``Gallery(tracks=..., next_id=...)``（行序 = dict 迭代序）；热路径用
+    :meth:`from_arrays` 直接给矩阵。``tracks`` 属性按需物化为 ``{track_id: TrackState}``
+    （检查/调试用，非热路径）。相等比较逐数组 ``np.array_equal``（dataclass 生成的
+    ``__eq__`` 会对数组逐元素比较再取真值而抛错）；含可变数组，不可哈希。
 
     Attributes:
-        tracks: ``track_id`` → 状态。key >= 1（0 是哨兵，不入此 dict）。
+        ids: ``[T]`` int64，轨迹 id（>=1；0 是哨兵，不入库）。
+        embeddings: ``[T,D]`` 外观嵌入（空库为 ``[0,0]``，首个新轨迹定 D）。
+        positions: ``[T,2]`` float64，上次命中的归一化中心。
+        last_ts: ``[T]`` int64，上次命中时间戳（ms）。
+        hits: ``[T]`` int64，累计命中帧数。
         next_id: 下一个新轨迹 id，单调递增不复用（TTL 淘汰的 id 不回收）。
     """
 
-    tracks: dict[int, TrackState]
+    ids: np.ndarray
+    embeddings: np.ndarray
+    positions: np.ndarray
+    last_ts: np.ndarray
+    hits: np.ndarray
     next_id: int
 
+    def __init__(self, tracks: dict[int, TrackState], next_id: int) -> None:
+        """由 ``{track_id: TrackState}`` 构造（行序 = dict 迭代序）。"""
+        ts = list(tracks.values())
+        self._init(
+            np.array([t.track_id for t in ts], np.int64),
+            np.stack([t.embedding for t in ts]) if ts else np.zeros((0, 0), np.float32),
+            np.array([(t.last_pos.x, t.last_pos.y) for t in ts], np.float64).reshape(-1, 2),
+            np.array([t.last_ts for t in ts], np.int64),
+            np.array([t.hit_count for t in ts], np.int64),
+            next_id,
+        )
+
+    def _init(
+        self,
+        ids: np.ndarray,
+        embeddings: np.ndarray,
+        positions: np.ndarray,
+        last_ts: np.ndarray,
+        hits: np.ndarray,
+        next_id: int,
+    ) -> None:
+        # frozen：绕过 __setattr__ 只在构造时赋值一次
+        object.__setattr__(self, "ids", ids)
+        object.__setattr__(self, "embeddings", embeddings)
+        object.__setattr__(self, "positions", positions)
+        object.__setattr__(self, "last_ts", last_ts)
+        object.__setattr__(self, "hits", hits)
+        object.__setattr__(self, "next_id", next_id)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Gallery):
+            return NotImplemented
+        return self.next_id == other.next_id and all(
+            np.array_equal(a, b)
+            for a, b in (
+                (self.ids, other.ids),
+                (self.embeddings, other.embeddings),
+                (self.positions, other.positions),
+                (self.last_ts, other.last_ts),
+                (self.hits, other.hits),
+            )
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @classmethod
+    def from_arrays(
+        cls,
+        ids: np.ndarray,
+        embeddings: np.ndarray,
+        positions: np.ndarray,
+        last_ts: np.ndarray,
+        hits: np.ndarray,
+        next_id: int,
+    ) -> Gallery:
+        """由行对齐矩阵直接构造（不拷贝；调用方保证不再就地写入）。"""
+        g = cls.__new__(cls)
+        g._init(ids, embeddings, positions, last_ts, hits, next_id)
+        return g
+
+    @classmethod
+    def empty(cls, next_id: int = 1) -> Gallery:
+        """空库。"""
+        return cls(tracks={}, next_id=next_id)
+
+    @property
+    def tracks(self) -> dict[int, TrackState]:
+        """物化视图：``track_id`` → ``TrackState``（嵌入为库内行的只读视图）。"""
+        out: dict[int, TrackState] = {}
+        for k, tid in enumerate(self.ids.tolist()):
+            emb = self.embeddings[k]
+            emb.flags.writeable = False
+            out[tid] = TrackState(
+                track_id=tid,
+                embedding=emb,
+                last_pos=Point.new(float(self.positions[k, 0]), float(self.positions[k, 1])),
+                last_ts=int(self.last_ts[k]),
+                hit_count=int(self.hits[k]),
+            )
+        return out
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _take(self, rows: np.ndarray) -> Gallery:
+        """按行掩码/下标取子库（新数组）。"""
+        return Gallery.from_arrays(
+            ids=self.ids[rows],
+            embeddings=self.embeddings[rows],
+            positions=self.positions[rows],
+            last_ts=self.last_ts[rows],
+            hits=self.hits[rows],
+            next_id=self.next_id,
+        )
+
 
 # ---------------------------------------------------------------------------
 # 纯辅助函数（无 IO，可独立单测）
@@ -130,7 +249,9 @@ def embedding_valid(v: np.ndarray) -> bool:
 
 
 def cosine(a: np.ndarray, b: np.ndarray) -> float:
-    """余弦相似度（完整定义，不依赖向量已归一化）；任一零范数 → 0.0。"""
+    """余弦相似度（完整定义，不依赖向量已归一化；float64 计算）；任一零范数 → 0.0。"""
+    a = np.asarray(a, np.float64)
+    b = np.asarray(b, np.float64)
     na = float(np.linalg.norm(a))
     nb = float(np.linalg.norm(b))
     if na == 0.0 or nb == 0.0:
@@ -170,7 +291,7 @@ def associate(
     """把本帧检测关联到既有 gallery 轨迹，返回带 ``track_id`` 的检测 + 新 Gallery。
 
     纯函数：**不 mutate** 入参 ``gallery`` / ``detections`` / ``embeddings``——
-    匹配项产出新 ``TrackState``，存活 dict 整体重建（深拷贝证据见单测）。
+    库数组整体重建（TTL 掩码取行、matched 行拷贝后写、新轨迹拼接；证据见单测）。
 
     算法（iap ``reid_assoc.rs::associate`` 1:1 移植，HSV→DINOv3 不改逻辑）：
 
@@ -178,7 +299,7 @@ def associate(
       2. **候选对**：跳过零范数嵌入；运动 gating（归一化中心欧氏距 ≤
          ``cfg.motion_radius``）且余弦相似度 ≥ ``cfg.cos``。
       3. **降序贪心一对一**：候选按相似度降序，最高者先配，配过的 det/gal 不再参与
-         （近似匈牙利，帧内检测数小，O(n²) 可接受）。
+         （近似匈牙利；候选打分为整库 ``[N,T]`` 矩阵运算）。
       4. **匹配项 EMA 融合**嵌入（``cfg.ema*new + (1-cfg.ema)*old`` → L2 归一化），
          更新 ``last_pos`` / ``last_ts``、``hit_count+1``。
       5. **未匹配有效检测** → 新轨迹（``next_id`` 单调递增不复用）；零范数 → ``id=0``
@@ -199,113 +320,142 @@ def associate(
     n = len(detections)
     ttl_ms = cfg.ttl_sec * 1000
 
-    # 1. TTL 淘汰 → 存活轨迹（新 dict，不 mutate 入参 gallery.tracks）。
-    survived: dict[int, TrackState] = {
-        tid: t for tid, t in gallery.tracks.items() if ts_ms - t.last_ts <= ttl_ms
-    }
+    # 1. TTL 淘汰 → 存活子库（新数组，不 mutate 入参 gallery）。
+    survived = gallery._take(ts_ms - gallery.last_ts <= ttl_ms)
+    if n == 0:
+        return [], survived
 
-    # 2. 收集满足运动 gating + 余弦阈值的候选对 (det_idx, track_id, sim)。
-    candidates = _collect_candidates(embeddings, detections, survived, cfg)
+    emb = np.stack(embeddings)
+    centers = np.array(
+        [(c.x, c.y) for c in (d.rect.center() for d in detections)], np.float64
+    )
+    valid = np.linalg.norm(emb, axis=1) > 0.0
 
-    # 3. 降序贪心一对一 → per-detection track_id（0=未匹配）。
-    det_track = _greedy_match(candidates, n)
+    # 2. 运动 gating + 余弦阈值 → 候选矩阵 [N,T]（零范数行全 False）。
+    cand, sim = _candidates(emb, centers, valid, survived, cfg)
 
-    # 4. matched 轨迹 EMA 融合并替换为新 TrackState（unmatched 存活项保留引用）。
-    new_tracks = _apply_matched(survived, embeddings, detections, det_track, ts_ms, cfg)
+    # 3. 降序贪心一对一 → per-detection 行号（-1=未匹配）。
+    det_row = _greedy_match(cand, sim)
 
-    # 5. 未匹配有效检测 → 新轨迹（next_id 单调不复用）；零范数保持 id=0 哨兵。
-    next_id = gallery.next_id
-    for di, emb_i in enumerate(embeddings):
-        if det_track[di] != 0 or not embedding_valid(emb_i):
-            continue
-        tid = next_id
-        next_id += 1
-        new_tracks[tid] = TrackState(
-            track_id=tid,
-            embedding=emb_i.copy(),  # 复制防 aliasing（embedder 契约已 L2 归一化）
-            last_pos=detections[di].rect.center(),
-            last_ts=ts_ms,
-            hit_count=1,
-        )
-        det_track[di] = tid
+    # 4. matched 行 EMA 融合 + 位置/时间/命中数更新（新数组）。
+    new_g = _apply_matched(survived, emb, centers, det_row, ts_ms, cfg)
 
-    out = [detections[di].model_copy(update={"id": det_track[di]}) for di in range(n)]
-    return out, Gallery(tracks=new_tracks, next_id=next_id)
-
-
-def _collect_candidates(
-    embeddings: list[np.ndarray],
-    detections: list[D2dObject],
-    survived: dict[int, TrackState],
+    # 5. 未匹配有效检测 → 新轨迹（next_id 单调不复用）；零范数保持 id=0 哨兵。
+    spawn = np.flatnonzero(valid & (det_row < 0))
+    new_ids = np.arange(new_g.next_id, new_g.next_id + len(spawn), dtype=np.int64)
+    det_track = np.zeros(n, np.int64)
+    matched = det_row >= 0
+    det_track[matched] = new_g.ids[det_row[matched]]
+    det_track[spawn] = new_ids
+    new_g = _append(new_g, new_ids, emb[spawn], centers[spawn], ts_ms)
+
+    out = [
+        detections[di].model_copy(update={"id": int(det_track[di])}) for di in range(n)
+    ]
+    return out, new_g
+
+
+def _candidates(
+    emb: np.ndarray,
+    centers: np.ndarray,
+    valid: np.ndarray,
+    gallery: Gallery,
     cfg: ReidCfg,
-) -> list[tuple[int, int, float]]:
-    """收集满足运动 gating + 余弦阈值的 ``(det_idx, track_id, sim)`` 候选对。
+) -> tuple[np.ndarray, np.ndarray]:
+    """候选掩码 + 相似度矩阵 ``[N,T]``：有效嵌入 ∧ 中心距 ≤ radius ∧ 余弦 ≥ cos。
 
-    零范数嵌入跳过（其 ``det_track`` 保持 0 哨兵）。运动距离与余弦均用归一化中心 /
-    完整余弦定义（不假设嵌入已归一化）。
+    余弦用完整定义（不假设已归一化；任一零范数 → 0），同 :func:`cosine`。嵌入常为
+    float32，打分统一升到 float64 再算，免得 float32 矩阵乘的舍入让恰在 ``cfg.cos``
+    阈值上的匹配翻转（与逐对 :func:`cosine` 同精度）。
     """
-    candidates: list[tuple[int, int, float]] = []
-    for di, emb_i in enumerate(embeddings):
-        if not embedding_valid(emb_i):
-            continue
-        center = detections[di].rect.center()
-        for tid, t in survived.items():
-            if center.dist(t.last_pos) > cfg.motion_radius:
-                continue
-            sim = cosine(emb_i, t.embedding)
-            if sim < cfg.cos:
-                continue
-            candidates.append((di, tid, sim))
-    return candidates
-
-
-def _greedy_match(
-    candidates: list[tuple[int, int, float]], n_det: int
-) -> list[int]:
-    """按相似度降序贪心一对一匹配，返回 per-detection ``track_id``（0=未匹配）。
-
-    ``sorted`` 稳定：等相似度保持候选插入顺序（与 iap ``total_cmp`` 降序后稳定排序
-    行为一致）。配过的 det / track 不再参与（近似匈牙利，最高相似度对优先）。
+    if len(gallery) == 0:
+        empty = np.zeros((len(emb), 0))
+        return empty.astype(bool), empty
+    d = centers[:, None, :] - gallery.positions[None, :, :]
+    dist = np.sqrt(d[..., 0] * d[..., 0] + d[..., 1] * d[..., 1])
+    e = emb.astype(np.float64, copy=False)
+    g = gallery.embeddings.astype(np.float64, copy=False)
+    na = np.linalg.norm(e, axis=1)
+    nb = np.linalg.norm(g, axis=1)
+    denom = na[:, None] * nb[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sim = np.where(denom > 0, (e @ g.T) / denom, 0.0)
+    cand = valid[:, None] & (dist <= cfg.motion_radius) & (sim >= cfg.cos)
+    return cand, sim
+
+
+def _greedy_match(cand: np.ndarray, sim: np.ndarray) -> np.ndarray:
+    """按相似度降序贪心一对一，返回 per-detection 库行号（-1=未匹配）。
+
+    稳定排序：等相似度保持 (det, 行) 行优先序——即旧版候选插入顺序（与 iap
+    ``total_cmp`` 降序后稳定排序行为一致）。配过的 det / 行不再参与。
     """
-    ordered = sorted(candidates, key=lambda c: c[2], reverse=True)
-    det_assigned = [False] * n_det
-    gal_assigned: set[int] = set()
-    det_track = [0] * n_det
-    for di, tid, _sim in ordered:
-        if det_assigned[di] or tid in gal_assigned:
+    det_row = np.full(cand.shape[0], -1, np.int64)
+    di, ti = np.nonzero(cand)
+    if len(di) == 0:
+        return det_row
+    order = np.argsort(-sim[di, ti], kind="stable")
+    used: set[int] = set()
+    for d, t in zip(di[order].tolist(), ti[order].tolist(), strict=True):
+        if det_row[d] >= 0 or t in used:
             continue
-        det_assigned[di] = True
-        gal_assigned.add(tid)
-        det_track[di] = tid
-    return det_track
+        det_row[d] = t
+        used.add(t)
+    return det_row
 
 
 def _apply_matched(
-    survived: dict[int, TrackState],
-    embeddings: list[np.ndarray],
-    detections: list[D2dObject],
-    det_track: list[int],
+    gallery: Gallery,
+    emb: np.ndarray,
+    centers: np.ndarray,
+    det_row: np.ndarray,
     ts_ms: int,
     cfg: ReidCfg,
-) -> dict[int, TrackState]:
-    """构建新轨迹 dict：matched 项 EMA 融合并替换，unmatched 存活项保留。
+) -> Gallery:
+    """matched 行 EMA 融合嵌入并更新位置/时间/命中数；unmatched 行原样保留（新数组）。"""
+    dets = np.flatnonzero(det_row >= 0)
+    if len(dets) == 0:
+        return gallery
+    rows = det_row[dets]
+    embeddings = gallery.embeddings.copy()
+    merged = cfg.ema * emb[dets] + (1.0 - cfg.ema) * embeddings[rows]
+    norm = np.linalg.norm(merged, axis=1, keepdims=True)
+    embeddings[rows] = np.where(norm > 0.0, merged / np.where(norm > 0.0, norm, 1.0), merged)
+    positions = gallery.positions.copy()
+    positions[rows] = centers[dets]
+    last_ts = gallery.last_ts.copy()
+    last_ts[rows] = ts_ms
+    hits = gallery.hits.copy()
+    hits[rows] += 1
+    return Gallery.from_arrays(
+        ids=gallery.ids,
+        embeddings=embeddings,
+        positions=positions,
+        last_ts=last_ts,
+        hits=hits,
+        next_id=gallery.next_id,
+    )
 
-    unmatched 存活项与入参共享 frozen ``TrackState`` 引用——安全（绝不就地写 embedding）。
-    """
-    di_of_tid = {tid: di for di, tid in enumerate(det_track) if tid != 0}
-    new_tracks: dict[int, TrackState] = dict(survived)  # 浅拷贝容器；matched 项下面替换
-    for tid, t in survived.items():
-        di = di_of_tid.get(tid)
-        if di is None:
-            continue
-        new_tracks[tid] = TrackState(
-            track_id=tid,
-            embedding=_ema_blend(embeddings[di], t.embedding, cfg.ema),
-            last_pos=detections[di].rect.center(),
-            last_ts=ts_ms,
-            hit_count=t.hit_count + 1,
-        )
-    return new_tracks
+
+def _append(
+    gallery: Gallery,
+    ids: np.ndarray,
+    emb: np.ndarray,
+    centers: np.ndarray,
+    ts_ms: int,
+) -> Gallery:
+    """追加新轨迹行（``hit_count=1``），``next_id`` 前移。"""
+    if len(ids) == 0:
+        return gallery
+    old_emb = gallery.embeddings if len(gallery) else emb[:0]
+    return Gallery.from_arrays(
+        ids=np.concatenate([gallery.ids, ids]),
+        embeddings=np.concatenate([old_emb, emb]),  # emb 为 stack 新数组，不 alias 入参
+        positions=np.concatenate([gallery.positions, centers]),
+        last_ts=np.concatenate([gallery.last_ts, np.full(len(ids), ts_ms, np.int64)]),
+        hits=np.concatenate([gallery.hits, np.ones(len(ids), np.int64)]),
+        next_id=int(ids[-1]) + 1,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -440,6 +590,17 @@ def test_empty_detections_keeps_gallery() -> None:
     assert set(new_g.tracks.keys()) == {1}
 
 
+def test_gallery_eq_compares_arrays() -> None:
+    """值相等（逐数组比较，不因 ndarray 真值歧义抛错）；不可哈希。"""
+    g = Gallery(tracks={1: _track(1, _unit(0, 4), 0.5, 0.5)}, next_id=2)
+    same = Gallery(tracks={1: _track(1, _unit(0, 4), 0.5, 0.5)}, next_id=2)
+    assert g == same
+    assert g != Gallery(tracks={1: _track(1, _unit(1, 4), 0.5, 0.5)}, next_id=2)
+    assert g != Gallery(tracks={1: _track(1, _unit(0, 4), 0.5, 0.5)}, next_id=3)
+    assert Gallery.empty() == Gallery.empty()
+    assert Gallery.__hash__ is None
+
+
 def test_zero_norm_embedding_returns_zero_sentinel() -> None:
     """零范数嵌入 → id=0 哨兵（不匹配、不新建、不耗 next_id、gallery 不变）。"""
     g = Gallery(tracks={1: _track(1, _unit(0, 4), 0.5, 0.5)}, next_id=2)
@@ -508,3 +669,89 @@ def test_matched_detection_embedding_valid_invariant() -> None:
     for di, tid in enumerate(ids):
         if tid != 0:
             assert embedding_valid(embs[di]), "matched/new detection must have valid embedding"
+
+
+def _reference_associate(
+    embeddings: list[np.ndarray],
+    detections: list[D2dObject],
+    gallery: dict[int, TrackState],
+    next_id: int,
+    ts_ms: int,
+    cfg: ReidCfg,
+) -> tuple[list[int], dict[int, TrackState], int]:
+    """逐对 Python 循环参考实现（矩阵化前的原算法），供等价性单测。"""
+    ttl_ms = cfg.ttl_sec * 1000
+    live = {k: t for k, t in gallery.items() if ts_ms - t.last_ts <= ttl_ms}
+    cands: list[tuple[float, int, int]] = []
+    for di, (emb, det) in enumerate(zip(embeddings, detections, strict=True)):
+        if not embedding_valid(emb):
+            continue
+        c = det.rect.center()
+        for tid, t in live.items():
+            dist = float(np.hypot(c.x - t.last_pos.x, c.y - t.last_pos.y))
+            sim = cosine(emb, t.embedding)
+            if dist <= cfg.motion_radius and sim >= cfg.cos:
+                cands.append((sim, di, tid))
+    cands.sort(key=lambda x: -x[0])
+    det_tid: dict[int, int] = {}
+    used: set[int] = set()
+    for _, di, tid in cands:
+        if di in det_tid or tid in used:
+            continue
+        det_tid[di] = tid
+        used.add(tid)
+    for di, tid in det_tid.items():
+        t = live[tid]
+        live[tid] = TrackState(
+            track_id=tid,
+            embedding=_ema_blend(embeddings[di], t.embedding, cfg.ema),
+            last_pos=detections[di].rect.center(),
+            last_ts=ts_ms,
+            hit_count=t.hit_count + 1,
+        )
+    ids = []
+    for di, emb in enumerate(embeddings):
+        if di in det_tid:
+            ids.append(det_tid[di])
+        elif embedding_valid(emb):
+            live[next_id] = TrackState(
+                track_id=next_id,
+                embedding=emb.copy(),
+                last_pos=detections[di].rect.center(),
+                last_ts=ts_ms,
+                hit_count=1,
+            )
+            ids.append(next_id)
+            next_id += 1
+        else:
+            ids.append(0)
+    return ids, live, next_id
+
+
+def test_matrix_gallery_matches_reference_random_scenes() -> None:
+    """随机多帧场景：矩阵版 id 序列 / 库内容与逐对循环参考实现一致。"""
+    rng = np.random.default_rng(0)
+    cfg = ReidCfg(model="x", cos=0.5, motion_radius=0.3, ema=0.7, ttl_sec=2)
+    protos = rng.normal(size=(6, 8)).astype(np.float32)
+    g = Gallery.empty()
+    ref: dict[int, TrackState] = {}
+    ref_next = 1
+    for f in range(40):
+        n = int(rng.integers(0, 6))
+        who = rng.integers(0, len(protos), size=n)
+        embs = [
+            (protos[k] + 0.3 * rng.normal(size=8)).astype(np.float32) for k in who
+        ]
+        if n and rng.random() < 0.2:
+            embs[0] = np.zeros(8, np.float32)
+        dets = [_det(*rng.uniform(0.2, 0.8, size=2)) for _ in range(n)]
+        ts = f * 400
+        out, g = associate(embs, dets, g, ts, cfg)
+        ref_ids, ref, ref_next = _reference_associate(embs, dets, ref, ref_next, ts, cfg)
+        assert [o.id for o in out] == ref_ids
+        assert g.next_id == ref_next
+        got = g.tracks
+        assert list(got) == list(ref)
+        for tid, t in ref.items():
+            np.testing.assert_allclose(got[tid].embedding, t.embedding, atol=1e-6)
+            assert got[tid].hit_count == t.hit_count and got[tid].last_ts == t.last_ts
@@ -24,7 +24,7 @@
 兄弟模块依赖（签名已钉死，并行期 ``unresolved-import`` 可暂忽略，主控集成 mypy）：
 
 - :mod:`jxl.vdt.reid_assoc`：``associate(embeddings, detections, gallery, ts_ms, cfg)``
-  → ``(list[D2dObject], Gallery)``；``Gallery(tracks, next_id)``；``Embedder`` 协议。
+  → ``(list[D2dObject], Gallery)``；``Gallery.empty()``（矩阵存储轨迹库）；``Embedder`` 协议。
 - :mod:`jxl.vdt.reid`：``ReidEmbedder``（生产 embedder，集成测试用）。
 """
 
@@ -89,7 +89,7 @@ class ReidTracker:
         """
         self._cfg: ReidCfg = cfg
         self._embedder: Embedder = embedder
-        self._gallery: Gallery = Gallery(tracks={}, next_id=1)
+        self._gallery: Gallery = Gallery.empty()
         self._ended_ids: set[int] = set()
         self._dim: int | None = None
         """嵌入维度（模型内禀，跨帧/跨 reset 缓存）。首帧首个有效嵌入发现后锁定；
@@ -107,7 +107,7 @@ class ReidTracker:
         ``_dim`` 跨 reset 保留（嵌入维度是模型内禀属性，非视频状态；保留避免新视频首帧
         重新探测）。
         """
-        self._gallery = Gallery(tracks={}, next_id=1)
+        self._gallery = Gallery.empty()
         self._ended_ids = set()
 
     def update(
@@ -135,29 +135,31 @@ class ReidTracker:
         img_h, img_w = image.shape[:2]
         crops = [_crop(image, d.rect, img_w, img_h) for d in dets]
         embeddings = self._embed_all(crops)
-        old_ids = set(self._gallery.tracks)
+        old_ids = set(self._gallery.ids.tolist())
         tracked, new_gallery = associate(
             embeddings, dets, self._gallery, ts_ms, self._cfg
         )
         # TTL 淘汰：旧 gallery 有、新 gallery 无的 id（associate 内部按 ttl_sec 过滤）。
-        self._ended_ids |= old_ids - set(new_gallery.tracks)
+        self._ended_ids |= old_ids - set(new_gallery.ids.tolist())
         self._gallery = new_gallery
         return tracked
 
     def _embed_all(self, crops: list[np.ndarray | None]) -> list[np.ndarray]:
-        """对每个 crop 提嵌入；``None``（零面积）→ 零向量（id=0 哨兵，由 associate 识别）。
+        """对本帧全部有效 crop 一次 ``embed_batch``；``None``（零面积）→ 零向量（id=0
+        哨兵，由 associate 识别）。
 
-        两遍处理：先提有效 crop 发现/复用嵌入维度（``_dim`` 跨帧缓存），再用零向量填
-        ``None`` 位——避免 None 位与有效嵌入维度不一致（``np.zeros`` 需具体维度，且
+        两遍处理：先批量提有效 crop 发现/复用嵌入维度（``_dim`` 跨帧缓存），再用零向量
+        填 ``None`` 位——避免 None 位与有效嵌入维度不一致（``np.zeros`` 需具体维度，且
         不同维度向量无法做余弦）。零范数向量与 :func:`associate` 的 ``embedding_valid``
         契约对齐（移植自 iap，零范数 = 提取失败 → ``id=0`` 哨兵）。
         """
+        valid = [i for i, crop in enumerate(crops) if crop is not None]
         out: list[np.ndarray | None] = [None] * len(crops)
-        for i, crop in enumerate(crops):
-            if crop is not None:
-                emb = self._embedder.embed(crop)
-                if self._dim is None:
-                    self._dim = int(emb.shape[0])
+        if valid:
+            embs = self._embedder.embed_batch([c for c in crops if c is not None])
+            if self._dim is None:
+                self._dim = int(embs.shape[1])
+            for i, emb in zip(valid, embs, strict=True):
                 out[i] = emb
         dim = self._dim if self._dim is not None else 1
         return [
@@ -220,6 +222,9 @@ class _FakeEmbedder:
         v[idx] = 1.0
         return v
 
+    def embed_batch(self, crops: list[np.ndarray]) -> np.ndarray:
+        return np.stack([self.embed(c) for c in crops])
+
 
 _IMG_SIZE = 100
 """测试图边长（正方形，100x100）。"""
@@ -366,6 +371,7 @@ class _RecordingEmbedder:
     def __init__(self, dim: int = 4) -> None:
         self.dim = dim
         self.calls: list[np.ndarray] = []
+        self.batches: list[int] = []
 
     def embed(self, crop: np.ndarray) -> np.ndarray:
         self.calls.append(crop)
@@ -373,6 +379,10 @@ class _RecordingEmbedder:
         v[0] = 1.0
         return v
 
+    def embed_batch(self, crops: list[np.ndarray]) -> np.ndarray:
+        self.batches.append(len(crops))
+        return np.stack([self.embed(c) for c in crops])
+
 
 def test_embed_all_discovers_dim_and_fills_zeros() -> None:
     """``_embed_all``：有效 crop 提嵌入并发现 dim；None 位用同维度零向量填充。"""
@@ -382,6 +392,7 @@ def test_embed_all_discovers_dim_and_fills_zeros() -> None:
     # 有效 crop 提嵌入；None 位（零面积）→ 零向量（dim 与有效嵌入一致）。
     out = trk._embed_all([valid, None, valid])
     assert len(emb.calls) == 2  # 仅有效位调 embedder
+    assert emb.batches == [2]  # 整帧一次 embed_batch
     assert out[0].shape == (4,) and out[2].shape == (4,)
     assert np.array_equal(out[1], np.zeros(4, dtype=np.float32))  # 同 dim 零向量
     assert trk._dim == 4  # 维度已锁定
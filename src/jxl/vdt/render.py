@@ -0,0 +1,235 @@
+"""vdt 管线内演示视频渲染：单趟解码同时产出轨迹与演示 mp4。
+
+旧流程在管线跑完后用第二个 ``OcvDecoder`` 重解码全部采样帧，再把按 id 聚合的
+``Tracks`` 反拆成 ``frame_map`` 才能逐帧绘制——长录像下解码成本翻倍。``RenderSink``
+实现 :class:`jxl.vdt.types.FrameSink`，挂到 ``run_pipeline(frame_sink=...)`` 上：
+
+- 调用方线程（track+pose）只把 ``(image, FrameResult)`` 放入有界队列（满则阻塞——背压，
+  内存上限 ≈ ``queue_size`` 帧）；
+- 后台写线程按帧序累积尾迹、``render_demo_frame`` 绘制副本、``VideoWriter`` 编码。
+  ``VideoWriter`` 在首帧按其尺寸惰性打开（尺寸即解码输出尺寸，含 ``max_side`` 缩放）。
+
+错误语义（No Silent Degradation，同 :mod:`jxl.vdt.stages`）：写线程异常在下一次回调
+或 ``close`` 时于调用方线程原样重抛（``VideoIoError`` 适配为 ``DecodeError``）；调用方
+异常退出 → ``stop`` 通知写线程退出并 ``join``，不遗留后台线程。
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from contextlib import ExitStack
+from pathlib import Path
+from types import TracebackType
+from typing import Self, cast
+
+import numpy as np
+
+from jxl.io.video import VideoIoError, VideoWriter
+from jxl.vdt.draw import DrawOpts, TrailBuffer, render_demo_frame
+from jxl.vdt.types import DecodeError, FrameResult
+
+_POLL_SEC = 0.1
+"""队列阻塞操作的轮询周期（秒）：兼顾写线程故障 / ``stop`` 的响应延迟与空转开销。"""
+
+
+class _End:
+    """流结束哨兵（调用方正常 ``close``）。"""
+
+
+_END = _End()
+
+
+class RenderSink:
+    """``FrameSink`` 实现：逐帧绘制演示画面并在后台线程编码为 mp4（上下文管理器）。"""
+
+    def __init__(
+        self,
+        out_path: Path,
+        fps: float,
+        opts: DrawOpts,
+        tracker_mode: str,
+        queue_size: int = 8,
+    ) -> None:
+        """启动写线程（``VideoWriter`` 待首帧到达再打开）。
+
+        Args:
+            out_path: 演示视频输出路径（父目录自动创建）。
+            fps: 输出帧率（= 采样帧率 ``DecodeCfg.fps``）。
+            opts: 绘制开关。
+            tracker_mode: HUD 显示的跟踪模式。
+            queue_size: 待编码帧队列容量（帧）。
+        """
+        if queue_size <= 0:
+            raise ValueError(f"queue_size 必须 > 0，实际 {queue_size}")
+        self._out_path = out_path
+        self._fps = fps
+        self._opts = opts
+        self._tracker_mode = tracker_mode
+        self._q: queue.Queue[object] = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._n_frames = 0
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="vdt-render", daemon=True)
+        self._worker.start()
+
+    @property
+    def n_frames(self) -> int:
+        """已编码帧数（``close`` 后为终值）。"""
+        return self._n_frames
+
+    def __call__(self, image: np.ndarray, fr: FrameResult) -> None:
+        """入队一帧（队列满则阻塞）；写线程已失败 → 重抛其异常。"""
+        self._put((image, fr))
+
+    def close(self) -> None:
+        """送结束哨兵、等待写线程编码完剩余帧并关闭文件；写线程异常在此重抛。"""
+        if self._closed:
+            return
+        self._closed = True
+        self._put(_END)
+        self._worker.join()
+        self._raise_if_failed()
+        if self._n_frames == 0:
+            raise DecodeError(f"无帧可渲染: {self._out_path}")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # 调用方异常：叫停写线程，不掩盖原异常
+        self._closed = True
+        self._stop.set()
+        self._worker.join()
+
+    # -- 内部 --------------------------------------------------------------
+
+    def _put(self, item: object) -> None:
+        while True:
+            self._raise_if_failed()
+            try:
+                self._q.put(item, timeout=_POLL_SEC)
+            except queue.Full:
+                continue
+            return
+
+    def _raise_if_failed(self) -> None:
+        err = self._error
+        if err is None:
+            return
+        if isinstance(err, VideoIoError):
+            raise DecodeError(str(err)) from err
+        raise err
+
+    def _next(self) -> object:
+        while not self._stop.is_set():
+            try:
+                return self._q.get(timeout=_POLL_SEC)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _run(self) -> None:
+        trails = TrailBuffer(self._opts.trail_len)
+        try:
+            with ExitStack() as stack:
+                self._encode(stack, trails)
+        except BaseException as e:  # 搬运到调用方线程原样重抛
+            self._error = e
+
+    def _encode(self, stack: ExitStack, trails: TrailBuffer) -> None:
+        writer: VideoWriter | None = None
+        while not isinstance(item := self._next(), _End):
+            image, fr = cast("tuple[np.ndarray, FrameResult]", item)  # 队列只 put (image, fr) / _END
+            if writer is None:
+                h, w = image.shape[:2]
+                writer = stack.enter_context(VideoWriter(self._out_path, self._fps, (w, h)))
+            for ob in fr.objects:
+                if ob.id != 0:
+                    trails.push(ob.id, ob.rect.center())
+            canvas = image.copy()
+            render_demo_frame(
+                canvas,
+                fr.objects,
+                fr.kpts,
+                trails,
+                fr.frame_idx,
+                fr.ts_ms,
+                self._tracker_mode,
+                self._opts,
+            )
+            writer.write(canvas)
+            self._n_frames += 1
+
+
+# ---------------------------------------------------------------------------
+# 单测（自包含：合成帧 + 合成 FrameResult，零模型）
+# ---------------------------------------------------------------------------
+
+import pytest  # noqa: E402
+
+
+def _frame_result(i: int, oid: int = 1) -> FrameResult:
+    from jvi.geo.rectangle import Rect
+
+    from jxl.det.d2d import D2dObject
+
+    ob = D2dObject(id=oid, cls=0, conf=0.9, rect=Rect.new(0.1 + 0.01 * i, 0.2, 0.3, 0.5))
+    return FrameResult(frame_idx=i, ts_ms=i * 200, objects=[ob], kpts=[None])
+
+
+def test_render_sink_writes_every_frame(tmp_path: Path) -> None:
+    import cv2
+
+    out = tmp_path / "demo.mp4"
+    with RenderSink(out, 5.0, DrawOpts(), "iou", queue_size=2) as sink:
+        for i in range(12):
+            sink(np.zeros((48, 64, 3), np.uint8), _frame_result(i))
+    assert sink.n_frames == 12
+    cap = cv2.VideoCapture(str(out))
+    assert cap.isOpened()
+    ok, frame = cap.read()
+    cap.release()
+    assert ok and frame.shape == (48, 64, 3) and frame.any()  # 画上了框/HUD
+
+
+def test_render_sink_does_not_mutate_input(tmp_path: Path) -> None:
+    image = np.zeros((48, 64, 3), np.uint8)
+    with RenderSink(tmp_path / "d.mp4", 5.0, DrawOpts(), "iou") as sink:
+        sink(image, _frame_result(0))
+    assert not image.any()
+
+
+def test_render_sink_writer_error_surfaces(tmp_path: Path) -> None:
+    """写线程失败（fps 非法 → VideoIoError）→ 调用方线程得到 DecodeError。"""
+    sink = RenderSink(tmp_path / "d.mp4", 0.0, DrawOpts(), "iou", queue_size=1)
+    with pytest.raises(DecodeError, match="fps"):
+        for i in range(50):
+            sink(np.zeros((8, 8, 3), np.uint8), _frame_result(i))
+        sink.close()
+    assert not sink._worker.is_alive()
+
+
+def test_render_sink_caller_error_stops_worker(tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError), RenderSink(
+        tmp_path / "d.mp4", 5.0, DrawOpts(), "iou", queue_size=1
+    ) as sink:
+        sink(np.zeros((8, 8, 3), np.uint8), _frame_result(0))
+        raise RuntimeError("boom")
+    assert not sink._worker.is_alive()
+
+
+def test_render_sink_no_frames_raises(tmp_path: Path) -> None:
+    with pytest.raises(DecodeError, match="无帧"), RenderSink(
+        tmp_path / "d.mp4", 5.0, DrawOpts(), "iou"
+    ):
+        pass
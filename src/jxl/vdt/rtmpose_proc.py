@@ -292,6 +292,115 @@ def simcc_decode(
     return Keypoints(pts=pts, conf=confs)
 
 
+# ---------------------------------------------------------------------------
+# 批量 API（整帧 N 人一次：pose.py 的热路径）
+# ---------------------------------------------------------------------------
+
+
+def batch_center_scale(
+    boxes: np.ndarray,
+    out_hw: tuple[int, int] = RTMPOSE_HW,
+    padding: float = HBB2CS_PADDING,
+) -> tuple[np.ndarray, np.ndarray]:
+    """像素框 ``[N,4] (x0,y0,x1,y1)`` → ``(centers [N,2], scales [N,2])`` float64。
+
+    与逐个 ``hbb2cs`` + ``top_down_affine`` 的 aspect 调整同式；``centers`` 同
+    ``hbb2cs`` 在各自 **crop 像素系**（origin=框左上角），回映由调用方 ``+= (x0, y0)``。
+    """
+    b = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    wh = b[:, 2:] - b[:, :2]
+    centers = wh * 0.5
+    aspect = out_hw[1] / out_hw[0]
+    sw = wh[:, 0] * padding
+    sh = wh[:, 1] * padding
+    wide = sw > sh * aspect
+    scales = np.stack([np.where(wide, sw, sh * aspect), np.where(wide, sw / aspect, sh)], axis=1)
+    return centers, scales
+
+
+def preprocess_batch(
+    image: np.ndarray,
+    boxes: np.ndarray,
+    out_hw: tuple[int, int] = RTMPOSE_HW,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """整帧 + 像素框 ``[N,4]`` → ``(tensor [N,3,H,W] float32, centers [N,2], scales [N,2])``。
+
+    与逐个 ``preprocess_crop`` 数值一致（单测对拍），但：
+
+    - **不拷 crop**：``warpAffine`` 的源是整帧上的 ROI 视图 ``image[y0:y1, x0:x1]``
+      （行连续，opencv 直接按 step 读），仿射矩阵由 ``(center, scale)`` 闭式算出
+      （rot=0、shift=0 时三点仿射退化为等比缩放 + 平移）；ROI 外像素仍按
+      ``borderValue=0`` 填充，与 crop 语义相同。
+    - BGR→RGB 不再逐 crop ``[:, :, ::-1]`` 拷贝：warp 直出 BGR 到预分配的
+      ``[N,H,W,3]`` uint8，再在堆叠张量上**一次**完成通道翻转 + 减 mean + 除 std + CHW。
+
+    ``centers`` / ``scales`` 语义同 ``preprocess_crop``（crop 像素系、aspect 调整后 scale）。
+    """
+    h, w = out_hw
+    box = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+    centers, scales = batch_center_scale(box, out_hw)
+    n = box.shape[0]
+    # 闭式仿射：dst = s·(src - c) + (W/2, H/2)，s = W / scale_x（两轴同比，见 get_warp_matrix）。
+    s = w / scales[:, 0]
+    mats = np.zeros((n, 2, 3), dtype=np.float32)
+    mats[:, 0, 0] = s
+    mats[:, 1, 1] = s
+    mats[:, 0, 2] = w * 0.5 - s * centers[:, 0]
+    mats[:, 1, 2] = h * 0.5 - s * centers[:, 1]
+
+    warped = np.empty((n, h, w, 3), dtype=np.uint8)
+    for i, (x0, y0, x1, y1) in enumerate(box.tolist()):
+        cv2.warpAffine(
+            image[y0:y1, x0:x1],
+            mats[i],
+            (w, h),
+            dst=warped[i],
+            flags=cv2.INTER_LINEAR,
+            borderValue=0,
+        )
+
+    # [N,H,W,BGR] → [N,RGB,H,W]：翻转 + 转置是视图，写入 out 时一次完成类型转换。
+    mean = np.array(RTMPOSE_MEAN, dtype=np.float32)[:, None, None]
+    std = np.array(RTMPOSE_STD, dtype=np.float32)[:, None, None]
+    tensor = np.empty((n, 3, h, w), dtype=np.float32)
+    np.subtract(warped.transpose(0, 3, 1, 2)[:, ::-1], mean, out=tensor)
+    np.divide(tensor, std, out=tensor)
+    return tensor, centers, scales
+
+
+def simcc_decode_batch(
+    simcc_x: np.ndarray,
+    simcc_y: np.ndarray,
+    centers: np.ndarray,
+    scales: np.ndarray,
+    out_hw: tuple[int, int] = RTMPOSE_HW,
+    split_ratio: float = SIMCC_SPLIT_RATIO,
+    kconf: float = DEFAULT_KCONF,
+) -> tuple[np.ndarray, np.ndarray]:
+    """批量 SimCC 解码：``[N,K,W*s]`` / ``[N,K,H*s]`` → ``(kpts [N,K,3], valid [N])``。
+
+    与逐个 ``simcc_decode`` 同式（argmax/max 一次跨 N×K 完成）：``kpts[..., :2]`` 为
+    crop 像素坐标、``kpts[..., 2]`` 为 conf；conf ≤ kconf 的点置 ``(0, 0, 0)``。
+    ``valid[i]=False`` ⇔ 第 i 人全部点不可见（对应 ``simcc_decode`` 返回 None）。
+    """
+    h, w = out_hw
+    sx = np.asarray(simcc_x)
+    sy = np.asarray(simcc_y)
+    c = np.asarray(centers, dtype=np.float64)[:, None, :]
+    sc = np.asarray(scales, dtype=np.float64)[:, None, :]
+    x_loc = sx.argmax(axis=2)
+    y_loc = sy.argmax(axis=2)
+    conf = 0.5 * (sx.max(axis=2).astype(np.float64) + sy.max(axis=2))
+    vis = conf > kconf
+
+    kpts = np.zeros((*x_loc.shape, 3), dtype=np.float64)
+    kpts[..., 0] = x_loc * (sc[..., 0] / (split_ratio * w)) + (c[..., 0] - sc[..., 0] * 0.5)
+    kpts[..., 1] = y_loc * (sc[..., 1] / (split_ratio * h)) + (c[..., 1] - sc[..., 1] * 0.5)
+    kpts[..., 2] = conf
+    kpts[~vis] = 0.0
+    return kpts, vis.any(axis=1)
+
+
 # ---------------------------------------------------------------------------
 # 单测（自包含，合成数据，零模型依赖；pytest 发现 test_* 函数）
 # ---------------------------------------------------------------------------
@@ -452,6 +561,63 @@ def test_simcc_decode_all_low_conf_returns_none() -> None:
     assert kpts is None
 
 
+def _random_boxes(rng: np.random.Generator, n: int, img_w: int, img_h: int) -> np.ndarray:
+    x0 = rng.integers(0, img_w - 200, n)
+    y0 = rng.integers(0, img_h - 240, n)
+    return np.stack(
+        [x0, y0, x0 + rng.integers(1, 200, n), y0 + rng.integers(1, 240, n)], axis=1
+    )
+
+
+def test_preprocess_batch_matches_per_crop() -> None:
+    """整帧 ROI 批量预处理 ≡ 逐 crop ``preprocess_crop``（张量逐元素相等，含宽/窄/1px 框）。"""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    boxes = np.concatenate(
+        [_random_boxes(rng, 12, 640, 480), [[0, 0, 400, 50], [600, 0, 640, 480], [5, 5, 6, 6]]]
+    )
+    tensor, centers, scales = preprocess_batch(image, boxes)
+    assert tensor.shape == (len(boxes), 3, 256, 192)
+    assert tensor.dtype == np.float32
+    for i, (x0, y0, x1, y1) in enumerate(boxes.tolist()):
+        ref, c, sc = preprocess_crop(image[y0:y1, x0:x1])
+        np.testing.assert_array_equal(tensor[i], ref[0])
+        assert (centers[i, 0], centers[i, 1]) == (c.x, c.y)
+        assert abs(scales[i, 0] - sc.x) < 1e-9 and abs(scales[i, 1] - sc.y) < 1e-9
+
+
+def test_preprocess_batch_empty() -> None:
+    tensor, centers, _ = preprocess_batch(np.zeros((8, 8, 3), np.uint8), np.zeros((0, 4)))
+    assert tensor.shape == (0, 3, 256, 192) and centers.shape == (0, 2)
+
+
+def test_simcc_decode_batch_matches_per_person() -> None:
+    """批量解码 ≡ 逐人 ``simcc_decode``：坐标/conf 一致，全不可见 ⇔ ``valid=False``。"""
+    rng = np.random.default_rng(1)
+    n = 6
+    simcc_x = rng.random((n, 17, 384)).astype(np.float32) * 0.8
+    simcc_y = rng.random((n, 17, 512)).astype(np.float32) * 0.8
+    simcc_x[2] = 0.0  # 全不可见 → None
+    simcc_y[2] = 0.0
+    centers, scales = batch_center_scale(_random_boxes(rng, n, 640, 480))
+    kpts, valid = simcc_decode_batch(simcc_x, simcc_y, centers, scales)
+    assert kpts.shape == (n, 17, 3)
+    for i in range(n):
+        ref = simcc_decode(
+            simcc_x[i],
+            simcc_y[i],
+            Point(x=centers[i, 0], y=centers[i, 1]),
+            Point(x=scales[i, 0], y=scales[i, 1]),
+        )
+        if ref is None:
+            assert not valid[i]
+            continue
+        assert valid[i]
+        np.testing.assert_allclose(kpts[i, :, 0], [p.x for p in ref.pts], atol=1e-9)
+        np.testing.assert_allclose(kpts[i, :, 1], [p.y for p in ref.pts], atol=1e-9)
+        np.testing.assert_allclose(kpts[i, :, 2], ref.conf, atol=1e-9)
+
+
 def test_simcc_decode_kconf_threshold_boundary() -> None:
     """conf == kconf（≤ 不 >）→ 视为不可见；略高于 → 可见。"""
     center = Point(x=0.0, y=0.0)
@@ -0,0 +1,289 @@
+"""vdt 阶段执行器：decode → detect 的串行 / 多线程流水线（``ExecCfg.mode``）。
+
+``run_pipeline`` 的 track+pose 阶段有跨帧状态（tracker gallery / pose 门控），必须
+按帧序单线程执行；decode（CPU）与 detect（GPU）则无跨帧依赖，可与之重叠。本模块把
+"解码 + 检测"抽成统一迭代器 ``iter_detected``，对调用方产出
+``(frame_idx, ts_ms, image, dets)``：
+
+- ``serial``：逐帧 ``detector.detect``，与旧版 ``run_pipeline`` 内联循环等价。
+- ``threaded``：decode 线程 →[有界队列]→ detect 线程 →[有界队列]→ 调用方线程
+  （track+pose）。队列满则上游 ``put`` 阻塞（背压），内存上限 ≈ 2×``queue_size`` 帧。
+  每阶段单线程 FIFO → 帧序不变，结果与 ``serial`` 逐字节一致。
+
+错误语义（No Silent Degradation）：任一阶段抛错 → 异常对象沿队列下传，在调用方线程
+**原样重抛**（``DecodeError``/``ModelLoadError`` 类型不变）；调用方提前退出（自身抛错
+或 ``close``）→ ``stop`` 事件通知上游线程退出并 ``join``，不遗留后台线程。
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Generator, Iterable, Iterator
+from dataclasses import dataclass
+from typing import TypeVar
+
+import numpy as np
+
+from jxl.det.d2d import D2dObject
+from jxl.vdt.types import Decoder, Detector, ExecCfg
+
+T = TypeVar("T")
+
+type Detected = tuple[int, int, np.ndarray, list[D2dObject]]
+"""``(frame_idx, ts_ms, BGR image, dets)``——decode+detect 阶段的逐帧产物。"""
+
+_POLL_SEC = 0.1
+"""队列阻塞操作的轮询周期（秒）：兼顾 ``stop`` 响应延迟与空转开销。"""
+
+
+class _End:
+    """流结束哨兵（上游正常耗尽）。"""
+
+
+_END = _End()
+
+
+@dataclass(frozen=True, slots=True)
+class _Failure:
+    """上游阶段异常的搬运壳（沿队列下传，在消费侧原样重抛）。"""
+
+    exc: BaseException
+
+
+def _put(q: queue.Queue[object], item: object, stop: threading.Event) -> bool:
+    """阻塞 ``put``（背压），期间轮询 ``stop``；被叫停返回 False。"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_SEC)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
+def _drain(q: queue.Queue[object], stop: threading.Event) -> Iterator[T]:
+    """按 FIFO 取出上游产物直至 ``_END``；遇 ``_Failure`` 原样重抛；被叫停即返回。"""
+    while not stop.is_set():
+        try:
+            item = q.get(timeout=_POLL_SEC)
+        except queue.Empty:
+            continue
+        if isinstance(item, _End):
+            return
+        if isinstance(item, _Failure):
+            raise item.exc
+        yield item  # type: ignore[misc]  # 队列同构：上游只 put T / _End / _Failure
+
+
+def _pump(src: Iterable[object], q: queue.Queue[object], stop: threading.Event) -> None:
+    """阶段线程主体：迭代 ``src`` 逐项 ``put``；耗尽发 ``_END``，异常发 ``_Failure``。"""
+    it = iter(src)
+    try:
+        for item in it:
+            if not _put(q, item, stop):
+                return
+    except BaseException as ex:  # noqa: BLE001 — 搬运到消费侧重抛，非吞错
+        _put(q, _Failure(ex), stop)
+        return
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            close()  # 提前退出时释放生成器持有的资源（如 VideoCapture）
+    _put(q, _END, stop)
+
+
+def _detect_each(
+    detector: Detector, frames: Iterable[tuple[int, int, np.ndarray]], batch: int = 1
+) -> Generator[Detected]:
+    """逐帧检测，附带原帧（tracker/pose 需要 image）。
+
+    ``batch > 1`` 时累积 ``batch`` 帧调用一次 ``detector.detect_batch``（尾部不足一批
+    也照常下发），再按原帧序逐帧产出——下游 tracker 看到的帧序不变。
+    """
+    if batch == 1:
+        for frame_idx, ts_ms, image in frames:
+            yield frame_idx, ts_ms, image, detector.detect(image)
+        return
+    pending: list[tuple[int, int, np.ndarray]] = []
+    for frame in frames:
+        pending.append(frame)
+        if len(pending) == batch:
+            yield from _flush(detector, pending)
+            pending = []
+    if pending:
+        yield from _flush(detector, pending)
+
+
+def _flush(
+    detector: Detector, pending: list[tuple[int, int, np.ndarray]]
+) -> Iterator[Detected]:
+    """一次 forward 检测一个微批，按帧序拆回逐帧产物。"""
+    dets_list = detector.detect_batch([image for _, _, image in pending])
+    if len(dets_list) != len(pending):
+        raise ValueError(
+            f"detect_batch 返回 {len(dets_list)} 帧结果，期望 {len(pending)}"
+        )
+    for (frame_idx, ts_ms, image), dets in zip(pending, dets_list, strict=True):
+        yield frame_idx, ts_ms, image, dets
+
+
+def iter_detected(
+    decoder: Decoder, detector: Detector, cfg: ExecCfg, batch: int = 1
+) -> Generator[Detected]:
+    """按 ``cfg.mode`` 产出 ``(frame_idx, ts_ms, image, dets)``（帧序与 decoder 一致）。
+
+    Args:
+        decoder: 视频解码器（一次性迭代）。
+        detector: 检测器（``threaded`` 模式下在独立线程调用）。
+        cfg: 执行模式与队列容量。
+        batch: 检测微批帧数（``DetCfg.batch``）；1 = 逐帧 ``detect``。
+
+    Returns:
+        逐帧检测产物迭代器；``threaded`` 模式下迭代器关闭即停止并回收阶段线程。
+    """
+    if batch < 1:
+        raise ValueError(f"batch 必须 ≥ 1，实际 {batch}")
+    if cfg.mode == "serial":
+        return _detect_each(detector, decoder, batch)
+    return _iter_threaded(decoder, detector, cfg.queue_size, batch)
+
+
+def _iter_threaded(
+    decoder: Decoder, detector: Detector, queue_size: int, batch: int
+) -> Generator[Detected]:
+    """decode 线程 + detect 线程，经两条有界队列衔接到调用方线程。"""
+    stop = threading.Event()
+    q_dec: queue.Queue[object] = queue.Queue(maxsize=queue_size)
+    q_det: queue.Queue[object] = queue.Queue(maxsize=queue_size)
+    decoded: Iterator[tuple[int, int, np.ndarray]] = _drain(q_dec, stop)
+    threads = [
+        threading.Thread(
+            target=_pump, args=(decoder, q_dec, stop), name="vdt-decode", daemon=True
+        ),
+        threading.Thread(
+            target=_pump,
+            args=(_detect_each(detector, decoded, batch), q_det, stop),
+            name="vdt-detect",
+            daemon=True,
+        ),
+    ]
+    for t in threads:
+        t.start()
+    try:
+        yield from _drain(q_det, stop)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+
+# ---------------------------------------------------------------------------
+# 单测（自包含：内联 fake 满足协议，零模型、零真实视频）
+# ---------------------------------------------------------------------------
+
+import pytest  # noqa: E402
+
+
+class _ListDecoder:
+    """合成解码器：发射 ``n`` 帧（像素值 = 帧序），记录已产出帧数。"""
+
+    def __init__(self, n: int, fail_at: int | None = None) -> None:
+        self.n = n
+        self.fail_at = fail_at
+        self.produced = 0
+
+    def __iter__(self) -> Iterator[tuple[int, int, np.ndarray]]:
+        from jxl.vdt.types import DecodeError
+
+        for i in range(self.n):
+            if i == self.fail_at:
+                raise DecodeError(f"synthetic decode failure @ {i}")
+            self.produced += 1
+            yield i, i * 40, np.full((4, 4, 3), i % 256, dtype=np.uint8)
+
+
+class _PixelDetector:
+    """合成检测器：按帧像素值产出 ``v % 3`` 个目标（conf 编码帧序，便于断言对齐）。"""
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+
+    def detect(self, image: np.ndarray) -> list[D2dObject]:
+        from jvi.geo.rectangle import Rect
+
+        v = int(image[0, 0, 0])
+        return [
+            D2dObject(id=0, cls=0, conf=v / 1000.0, rect=Rect.one())
+            for _ in range(v % 3)
+        ]
+
+    def detect_batch(self, images: list[np.ndarray]) -> list[list[D2dObject]]:
+        self.batch_sizes.append(len(images))
+        return [self.detect(im) for im in images]
+
+
+def test_threaded_matches_serial() -> None:
+    """threaded 与 serial 产出逐项相同（帧序、ts、dets 对齐）。"""
+    serial = list(iter_detected(_ListDecoder(50), _PixelDetector(), ExecCfg()))
+    threaded = list(
+        iter_detected(
+            _ListDecoder(50), _PixelDetector(), ExecCfg(mode="threaded", queue_size=2)
+        )
+    )
+    assert [(i, ts, d) for i, ts, _, d in threaded] == [
+        (i, ts, d) for i, ts, _, d in serial
+    ]
+    assert [i for i, _, _, _ in threaded] == list(range(50))
+
+
+def test_threaded_backpressure_bounds_decode_ahead() -> None:
+    """消费侧停住时，decode 最多领先 ≈ 两条队列容量 + 各阶段在手 1 帧。"""
+    import time
+
+    dec = _ListDecoder(1000)
+    it = iter_detected(dec, _PixelDetector(), ExecCfg(mode="threaded", queue_size=3))
+    next(it)
+    time.sleep(0.3)  # 给上游充足时间跑满队列
+    assert dec.produced <= 1 + 3 + 3 + 2
+    it.close()
+
+
+def test_threaded_reraises_stage_error() -> None:
+    """decode 阶段异常在消费侧原样重抛（类型不变），此前帧正常产出。"""
+    from jxl.vdt.types import DecodeError
+
+    got: list[int] = []
+    with pytest.raises(DecodeError, match="@ 5"):
+        for i, _, _, _ in iter_detected(
+            _ListDecoder(10, fail_at=5), _PixelDetector(), ExecCfg(mode="threaded")
+        ):
+            got.append(i)
+    assert got == [0, 1, 2, 3, 4]
+
+
+def test_threaded_early_close_joins_threads() -> None:
+    """消费侧提前关闭 → 阶段线程全部退出（无遗留后台线程）。"""
+    it = iter_detected(
+        _ListDecoder(10_000), _PixelDetector(), ExecCfg(mode="threaded", queue_size=1)
+    )
+    next(it)
+    it.close()
+    alive = [t.name for t in threading.enumerate() if t.name.startswith("vdt-")]
+    assert alive == []
+
+
+@pytest.mark.parametrize("mode", ["serial", "threaded"])
+def test_micro_batch_matches_per_frame(mode: str) -> None:
+    """微批检测与逐帧检测产出一致；尾部不足一批照常下发。"""
+    cfg = ExecCfg(mode=mode, queue_size=2)
+    ref = list(iter_detected(_ListDecoder(11), _PixelDetector(), cfg))
+    det = _PixelDetector()
+    got = list(iter_detected(_ListDecoder(11), det, cfg, batch=4))
+    assert [(i, ts, d) for i, ts, _, d in got] == [(i, ts, d) for i, ts, _, d in ref]
+    assert det.batch_sizes == [4, 4, 3]
+
+
+def test_micro_batch_rejects_bad_batch() -> None:
+    with pytest.raises(ValueError, match="batch"):
+        iter_detected(_ListDecoder(1), _PixelDetector(), ExecCfg(), batch=0)
@@ -18,7 +18,9 @@
 
 → 按 ByteTrack-on-detections 的轻量 greedy 版自行实现（spec §4 注："或 BoxMOT
    ByteTrack-on-detections"，此处实现等价的贪心 IoU 关联——最高 IoU 优先一对一，
-   近似 Hungarian，帧内检测数小 O(n²) 可接受）。
+   近似 Hungarian）。轨迹框存于 ``[T,4]`` ndarray，det×track IoU 矩阵一次向量化
+   计算（同 :func:`jxl.det.d2d_peoplenet._iou_matrix`），拥挤场景（百人级/帧）不再
+   受 Python 双重循环拖累；``IouCfg.assign="hungarian"`` 可切换 ``lap`` 最优指派。
 """
 
 from __future__ import annotations
@@ -29,6 +31,7 @@ import numpy as np
 from jvi.geo.rectangle import Rect
 
 from jxl.det.d2d import D2dObject
+from jxl.vdt import _kalman as kf
 from jxl.vdt.types import IouCfg
 
 
@@ -38,13 +41,12 @@ class _TrackState:
 
     有状态、仅程序内构造、**非可序列化**（刻意避免 pydantic——轨迹状态每帧就地
     更新以避免无谓的对象分配；设计原则 5：可变状态显式声明且最小化，此即跟踪器
-    的最小可变状态）。``Rect`` 字段虽是 pydantic 模型，但本 dataclass 不参与序列化。
+    的最小可变状态）。轨迹框不在此处，而在 ``IouTracker._boxes`` 同序 ndarray 中
+    （向量化 IoU 的数据布局）。
     """
 
     id: int
     """轨迹 id（>=1；0 是哨兵，表示未被关联/未确认）。"""
-    rect: Rect
-    """最后一次命中的归一化位置。"""
     last_frame: int
     """最后一次命中的帧序（用于判别本帧是否命中）。"""
     miss_count: int
@@ -63,12 +65,23 @@ class IouTracker:
 
     算法（纯关联逻辑，状态集中于此 imperative shell）：
 
-    1. 计算本帧检测与既有轨迹的 IoU 矩阵，收集 ``iou >= iou_thr`` 的候选对。
-    2. 按 IoU **降序**贪心一对一匹配（最高 IoU 先配，配过的 det/trk 不再参与——
-       近似 Hungarian）。
+    1. 向量化计算本帧检测与既有轨迹的 IoU 矩阵 ``[D,T]``，收集 ``iou >= iou_thr``
+       的候选对。
+    2. ``assign="greedy"``（默认）：按 IoU **降序**贪心一对一匹配（最高 IoU 先配，
+       配过的 det/trk 不再参与——近似 Hungarian）；``assign="hungarian"``：
+       ``lap.lapjv`` 最小化 ``1-IoU`` 的最优一对一指派（仍只接受 ``>= iou_thr``）。
     3. 匹配的：更新轨迹 rect/last_frame，miss_count 清零，hit_count++；
        ``hit_count >= min_hits`` 则 confirmed。
     4. 未匹配检测：开新轨迹（``hit_count=1``，``confirmed = 1>=min_hits``）。
+
+    可选（``IouCfg``，默认关闭，行为同上）：
+
+    - ``motion="kalman"``：每帧先对全部轨迹做匀速卡尔曼预测（:mod:`jxl.vdt._kalman`），
+      用**预测框**而非上次命中框参与 IoU；命中即以检测框校正。快速运动 / 短暂遮挡
+      后仍能接回原 id，可在更低 ``DecodeCfg.fps`` 下保持身份稳定。
+    - ``two_stage=True``（ByteTrack）：``conf >= high_conf`` 的高分检测先与全部轨迹
+      关联；剩余轨迹再与低分检测按 ``low_iou_thr`` 二次关联。低分检测只续命既有
+      轨迹、**不开新轨迹**（未配上 → ``id=0``）。低分下限即 ``DetCfg.conf``，需相应调低。
     5. 未匹配轨迹：``miss_count++``；``miss_count > max_age`` 移除（轨迹结束）。
     6. emit：与 ``dets`` 同序，confirmed 填 ``track_id``，未确认填 ``0``。
     """
@@ -82,7 +95,19 @@ class IouTracker:
         self._iou_thr: float = cfg.iou_thr
         self._max_age: int = cfg.max_age
         self._min_hits: int = cfg.min_hits
+        self._assign = cfg.assign
+        self._kalman: bool = cfg.motion == "kalman"
+        self._two_stage: bool = cfg.two_stage
+        self._high_conf: float = cfg.high_conf
+        self._low_iou_thr: float = cfg.low_iou_thr
         self._tracks: list[_TrackState] = []
+        self._boxes: np.ndarray = _EMPTY_BOXES
+        """与 ``_tracks`` 同序的关联框 ``[T,4]``（归一化 xywh，float64）：上次命中框；
+        kalman 模式下每帧被预测框覆盖。"""
+        self._kf_mean: np.ndarray = _EMPTY_MEAN
+        """kalman 模式：与 ``_tracks`` 同序的状态均值 ``[T,8]``。"""
+        self._kf_cov: np.ndarray = _EMPTY_COV
+        """kalman 模式：与 ``_tracks`` 同序的状态协方差 ``[T,8,8]``。"""
         self._next_id: int = 1  # >=1；0 是哨兵。单调递增，不复用已结束 id。
         self._ended_ids: set[int] = set()
         self.reset()
@@ -98,6 +123,9 @@ class IouTracker:
         清空轨迹并将 ``_next_id`` 归 1——新视频从头分配，不继承上一视频的身份。
         """
         self._tracks = []
+        self._boxes = _EMPTY_BOXES
+        self._kf_mean = _EMPTY_MEAN
+        self._kf_cov = _EMPTY_COV
         self._next_id = 1
         self._ended_ids = set()
 
@@ -113,75 +141,106 @@ class IouTracker:
         ``image`` / ``ts_ms`` 在 iou 模式**忽略**（仅用 ``frame_idx`` 关联，spec §4）；
         保留签名以满足 ``Tracker`` 协议对称性（IoU/ReID 同接口，image 供 ReID 提嵌入）。
         """
-        matched = self._match(dets)
-        det_track = self._refresh(dets, matched, frame_idx)
+        det_boxes = _boxes_of(dets)
+        if self._kalman and self._tracks:
+            self._kf_mean, self._kf_cov = kf.predict(self._kf_mean, self._kf_cov)
+            self._boxes = kf.to_xywh(self._kf_mean)
+        all_trk = np.arange(len(self._tracks))
+        if not self._two_stage:
+            high = np.ones(len(dets), dtype=bool)
+            matched = self._match(det_boxes, np.arange(len(dets)), all_trk, self._iou_thr)
+        else:
+            high = np.array([d.conf >= self._high_conf for d in dets], dtype=bool)
+            matched = self._match(det_boxes, np.flatnonzero(high), all_trk, self._iou_thr)
+            rest = np.setdiff1d(all_trk, list(matched.values()))
+            matched |= self._match(
+                det_boxes, np.flatnonzero(~high), rest, self._low_iou_thr
+            )
+        det_track = self._refresh(det_boxes, matched, high, frame_idx)
         self._age_unmatched(frame_idx)
         return self._emit(dets, det_track)
 
-    def _match(self, dets: list[D2dObject]) -> dict[int, int]:
-        """贪心降序 IoU 匹配。
+    def _match(
+        self,
+        det_boxes: np.ndarray,
+        det_idx: np.ndarray,
+        trk_idx: np.ndarray,
+        thr: float,
+    ) -> dict[int, int]:
+        """检测子集 × 轨迹子集的向量化 IoU + 一对一指派（``IouCfg.assign``）。
 
         Returns:
-            ``{det_idx: track_idx}``——仅含 ``iou >= iou_thr`` 且经降序贪心一对一
-            筛选后的匹配对（近似 Hungarian）。
+            ``{det_idx: track_idx}``（全局下标）——仅含 ``iou >= thr`` 的匹配对。
         """
-        if not self._tracks or not dets:
+        if len(det_idx) == 0 or len(trk_idx) == 0:
             return {}
-        candidates: list[tuple[float, int, int]] = []  # (iou, det_idx, trk_idx)
-        for di, d in enumerate(dets):
-            for ti, trk in enumerate(self._tracks):
-                iou = d.rect.iou(trk.rect)
-                if iou >= self._iou_thr:
-                    candidates.append((iou, di, ti))
-        candidates.sort(key=lambda c: c[0], reverse=True)
-        matched: dict[int, int] = {}
-        used_det: set[int] = set()
-        used_trk: set[int] = set()
-        for _iou, di, ti in candidates:
-            if di in used_det or ti in used_trk:
-                continue
-            matched[di] = ti
-            used_det.add(di)
-            used_trk.add(ti)
-        return matched
-
-    def _create(self, d: D2dObject, frame_idx: int) -> int:
-        """为新检测创建轨迹并追加到 ``_tracks``，返回其索引。"""
-        self._tracks.append(
-            _TrackState(
-                id=self._next_id,
-                rect=d.rect,
-                last_frame=frame_idx,
-                miss_count=0,
-                hit_count=1,
-                confirmed=self._min_hits <= 1,
-            )
+        iou = _iou_matrix(det_boxes[det_idx], self._boxes[trk_idx])
+        if self._assign == "hungarian":
+            local = _hungarian_match(iou, thr)
+        else:
+            local = _greedy_match(iou, thr)
+        return {int(det_idx[d]): int(trk_idx[t]) for d, t in local.items()}
+
+    def _create(self, frame_idx: int) -> _TrackState:
+        """为新检测创建轨迹状态（框由调用方并入 ``_boxes``）。"""
+        trk = _TrackState(
+            id=self._next_id,
+            last_frame=frame_idx,
+            miss_count=0,
+            hit_count=1,
+            confirmed=self._min_hits <= 1,
         )
         self._next_id += 1
-        return len(self._tracks) - 1
+        return trk
 
     def _refresh(
-        self, dets: list[D2dObject], matched: dict[int, int], frame_idx: int
+        self,
+        det_boxes: np.ndarray,
+        matched: dict[int, int],
+        spawn: np.ndarray,
+        frame_idx: int,
     ) -> dict[int, _TrackState]:
-        """更新命中的既有轨迹、为未匹配检测开新轨迹。
+        """更新命中的既有轨迹、为未匹配且 ``spawn`` 的检测开新轨迹。
 
         Returns:
-            ``{det_idx: _TrackState}``——每个检测对应的（新或旧）轨迹。
+            ``{det_idx: _TrackState}``——有轨迹的检测对应的（新或旧）轨迹；未匹配的
+            低分检测（two_stage）不在其中。
         """
         det_track: dict[int, _TrackState] = {}
-        for di, d in enumerate(dets):
+        new_rows: list[int] = []
+        hit_det: list[int] = []
+        hit_trk: list[int] = []
+        for di in range(len(det_boxes)):
             if di in matched:
-                trk = self._tracks[matched[di]]
-                trk.rect = d.rect
+                ti = matched[di]
+                trk = self._tracks[ti]
+                self._boxes[ti] = det_boxes[di]
                 trk.last_frame = frame_idx
                 trk.miss_count = 0
                 trk.hit_count += 1
                 if trk.hit_count >= self._min_hits:
                     trk.confirmed = True
+                hit_det.append(di)
+                hit_trk.append(ti)
+            elif spawn[di]:
+                trk = self._create(frame_idx)
+                self._tracks.append(trk)
+                new_rows.append(di)
             else:
-                ti = self._create(d, frame_idx)
-                trk = self._tracks[ti]
+                continue
             det_track[di] = trk
+        if self._kalman and hit_trk:
+            mean, cov = kf.update(
+                self._kf_mean[hit_trk], self._kf_cov[hit_trk], det_boxes[hit_det]
+            )
+            self._kf_mean[hit_trk] = mean
+            self._kf_cov[hit_trk] = cov
+        if new_rows:
+            self._boxes = np.concatenate([self._boxes, det_boxes[new_rows]])
+            if self._kalman:
+                mean, cov = kf.initiate(det_boxes[new_rows])
+                self._kf_mean = np.concatenate([self._kf_mean, mean])
+                self._kf_cov = np.concatenate([self._kf_cov, cov])
         return det_track
 
     def _age_unmatched(self, frame_idx: int) -> None:
@@ -190,18 +249,26 @@ class IouTracker:
         命中判据：``last_frame == frame_idx``（:meth:`_refresh` 中命中/新建轨迹均
         把 ``last_frame`` 置为本帧）。
         """
-        survivors: list[_TrackState] = []
+        keep: list[bool] = []
         for trk in self._tracks:
             if trk.last_frame == frame_idx:
-                survivors.append(trk)
+                keep.append(True)
                 continue
             trk.miss_count += 1
             if trk.miss_count <= self._max_age:
-                survivors.append(trk)
-            elif trk.confirmed:
+                keep.append(True)
+                continue
+            keep.append(False)
+            if trk.confirmed:
                 # max_age 淘汰的 confirmed 轨迹 → 记 ended（供 aggregate 标记，spec §9）
                 self._ended_ids.add(trk.id)
-        self._tracks = survivors
+        if not all(keep):
+            self._tracks = [t for t, k in zip(self._tracks, keep, strict=True) if k]
+            mask = np.asarray(keep, dtype=bool)
+            self._boxes = self._boxes[mask]
+            if self._kalman:
+                self._kf_mean = self._kf_mean[mask]
+                self._kf_cov = self._kf_cov[mask]
 
     def _emit(
         self, dets: list[D2dObject], det_track: dict[int, _TrackState]
@@ -212,12 +279,69 @@ class IouTracker:
         """
         out: list[D2dObject] = []
         for di, d in enumerate(dets):
-            trk = det_track[di]
-            tid = trk.id if trk.confirmed else 0
+            trk = det_track.get(di)
+            tid = trk.id if trk is not None and trk.confirmed else 0
             out.append(d.model_copy(update={"id": tid}))
         return out
 
 
+_EMPTY_BOXES = np.zeros((0, 4), np.float64)
+_EMPTY_MEAN = np.zeros((0, 8), np.float64)
+_EMPTY_COV = np.zeros((0, 8, 8), np.float64)
+
+
+def _boxes_of(dets: list[D2dObject]) -> np.ndarray:
+    """检测列表 → ``[D,4]`` 归一化 xywh（float64）。"""
+    if not dets:
+        return _EMPTY_BOXES
+    return np.array(
+        [(d.rect.x, d.rect.y, d.rect.width, d.rect.height) for d in dets],
+        dtype=np.float64,
+    )
+
+
+def _iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """``[N,4]`` × ``[M,4]`` xywh → 两两 IoU ``[N,M]``。
+
+    运算顺序与 ``Rect.iou`` 一致（交集宽高、面积、``s1 / (a1 + a2 - s1)``），重叠框
+    结果逐位相同；不相交框交集宽高按轴截断为 0 → IoU 恒为 0；零面积并集 → 0。
+    """
+    ax, ay, aw, ah = a.T
+    bx, by, bw, bh = b.T
+    il = np.maximum(ax[:, None], bx[None, :])
+    it = np.maximum(ay[:, None], by[None, :])
+    ir = np.minimum((ax + aw)[:, None], (bx + bw)[None, :])
+    ib = np.minimum((ay + ah)[:, None], (by + bh)[None, :])
+    inter = np.clip(ir - il, 0, None) * np.clip(ib - it, 0, None)
+    union = (aw * ah)[:, None] + (bw * bh)[None, :] - inter
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(union > 0, inter / union, 0.0)
+
+
+def _greedy_match(iou: np.ndarray, thr: float) -> dict[int, int]:
+    """IoU 降序贪心一对一；同 IoU 按 (det, track) 行优先序（稳定排序）。"""
+    di, ti = np.nonzero(iou >= thr)
+    order = np.argsort(-iou[di, ti], kind="stable")
+    matched: dict[int, int] = {}
+    used_trk: set[int] = set()
+    for d, t in zip(di[order].tolist(), ti[order].tolist(), strict=True):
+        if d in matched or t in used_trk:
+            continue
+        matched[d] = t
+        used_trk.add(t)
+    return matched
+
+
+def _hungarian_match(iou: np.ndarray, thr: float) -> dict[int, int]:
+    """``lap.lapjv`` 最优指派（最小化 ``1-IoU``），``cost_limit`` 截掉低于 thr 的对。"""
+    import lap
+
+    _, x, _ = lap.lapjv(1.0 - iou, extend_cost=True, cost_limit=1.0 - thr + 1e-9)
+    return {
+        d: int(t) for d, t in enumerate(x.tolist()) if t >= 0 and iou[d, t] >= thr
+    }
+
+
 _IMG = np.zeros((4, 4, 3), np.uint8)
 """IoU 测试用的占位帧（IoU 忽略 image，仅满足协议签名）。"""
 
@@ -358,3 +482,78 @@ def test_greedy_one_to_one_on_split() -> None:
     assert out[0].id == 1  # near 贪心胜出，复用旧 id
     assert out[1].id == 2  # far 开新轨迹（旧轨迹已被 near 占用）
     assert len(trk._tracks) == 2
+
+
+def test_iou_matrix_matches_rect_iou() -> None:
+    """向量化 IoU 与 ``Rect.iou`` 对重叠框逐位一致；不相交为 0。"""
+    rng = np.random.default_rng(0)
+    a = [_det(*rng.uniform(0.0, 0.3, 2), *rng.uniform(0.2, 0.5, 2)) for _ in range(20)]
+    b = [_det(*rng.uniform(0.0, 0.3, 2), *rng.uniform(0.2, 0.5, 2)) for _ in range(15)]
+    m = _iou_matrix(_boxes_of(a), _boxes_of(b))
+    for i, da in enumerate(a):
+        for j, db in enumerate(b):
+            ref = da.rect.iou(db.rect)
+            assert m[i, j] == (ref if ref > 0 else 0.0)
+    far = _iou_matrix(_boxes_of([_det(0.0, 0.0)]), _boxes_of([_det(0.7, 0.5)]))
+    assert far[0, 0] == 0.0
+
+
+def test_hungarian_beats_greedy_on_crossed_pair() -> None:
+    """贪心被最高 IoU 对锁死时，hungarian 给出总 IoU 更高的一对一指派。"""
+    iou = np.array([[0.9, 0.8], [0.7, 0.0]])
+    assert _greedy_match(iou, 0.3) == {0: 0}  # det1 唯一候选 trk0 已被占
+    assert _hungarian_match(iou, 0.3) == {0: 1, 1: 0}
+
+
+def test_hungarian_mode_tracks_like_greedy_on_easy_scene() -> None:
+    """无歧义场景两种指派结果一致（同 id 序列）。"""
+    seq = [
+        [_det(0.1, 0.1), _det(0.6, 0.1)],
+        [_det(0.12, 0.1), _det(0.58, 0.1)],
+        [_det(0.14, 0.1), _det(0.56, 0.1)],
+    ]
+    outs = []
+    for assign in ("greedy", "hungarian"):
+        trk = IouTracker(IouCfg(iou_thr=0.3, min_hits=1, assign=assign))
+        outs.append([[o.id for o in trk.update(i, 0, _IMG, ds)] for i, ds in enumerate(seq)])
+    assert outs[0] == outs[1] == [[1, 2]] * 3
+
+
+def _moving(t: int, conf: float = 1.0) -> D2dObject:
+    """匀速右移目标：每帧 +0.04（宽 0.2 → 相邻帧 IoU ≈ 0.67）。"""
+    d = _det(0.05 + 0.04 * t, 0.3)
+    return d.model_copy(update={"conf": conf})
+
+
+def test_kalman_bridges_occlusion_of_moving_object() -> None:
+    """匀速目标遮挡 3 帧后在外推位置重现：kalman 接回原 id，无运动模型则断开。"""
+    seen = [0, 1, 2, 3, 7, 8]  # 4..6 帧被遮挡
+    ids: dict[str, list[int]] = {}
+    for motion in ("none", "kalman"):
+        trk = IouTracker(IouCfg(iou_thr=0.3, max_age=5, min_hits=1, motion=motion))
+        out = []
+        for t in range(9):
+            got = trk.update(t, 0, _IMG, [_moving(t)] if t in seen else [])
+            out += [o.id for o in got]
+        ids[motion] = out
+    assert ids["kalman"] == [1] * 6
+    assert ids["none"][:4] == [1] * 4 and ids["none"][4] != 1
+
+
+def test_two_stage_low_conf_keeps_track_but_never_spawns() -> None:
+    """two_stage：低分检测续命既有轨迹；孤立低分检测不开新轨迹（id=0）。"""
+    cfg = IouCfg(iou_thr=0.5, min_hits=1, two_stage=True, high_conf=0.5, low_iou_thr=0.3)
+    trk = IouTracker(cfg)
+    assert [o.id for o in trk.update(0, 0, _IMG, [_moving(0)])] == [1]
+    stray = _det(0.7, 0.7).model_copy(update={"conf": 0.2})
+    out = trk.update(1, 0, _IMG, [_moving(1, conf=0.2), stray])
+    assert [o.id for o in out] == [1, 0]
+    assert len(trk._tracks) == 1
+    assert trk._tracks[0].hit_count == 2
+
+
+def test_two_stage_default_off_matches_single_stage() -> None:
+    """two_stage 关闭时，低分检测与高分同等对待（开新轨迹），保持旧行为。"""
+    trk = IouTracker(IouCfg(min_hits=1))
+    stray = _det(0.7, 0.7).model_copy(update={"conf": 0.2})
+    assert [o.id for o in trk.update(0, 0, _IMG, [stray])] == [1]
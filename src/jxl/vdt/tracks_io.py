@@ -0,0 +1,617 @@
+"""vdt 轨迹文件 IO：追加写 JSONL（NDJSON）轨迹流、列式 NPZ，以及还原 ``Tracks`` 的读取器。
+
+单个 ``tracks.json`` 需在视频结束后一次性序列化全部轨迹；长录像下改用 JSONL：
+每行一个带标签的单键对象，边跑边追加，轨迹定稿即落盘：
+
+- 首行 ``{"header": {src, fps, duration_ms, config}}``（:class:`TracksHeader`）；
+- 每条定稿轨迹一行 ``{"track": Track}``（顺序 = 结束顺序）；
+- 末行 ``{"end": {"n_tracks": N}}``——完整性标记：缺失即视为截断（进程中断）。
+
+读取器按 id 升序还原，结果与 ``run_pipeline`` 的 ``Tracks`` 一致（No Silent
+Degradation：截断/条数不符/格式错误一律 ``VdtError``，不返回半截结果）。
+
+列式 NPZ（:class:`TrackColumns`）：JSON 里每帧重复一层 ``FrameResult`` + 单元素
+``objects`` + 17 个 ``Point`` 字典，长录像动辄数百 MB、重载慢。NPZ 把每个目标观测
+压成一行定长列（``id``/``frame_idx``/``ts_ms``/``cls``/``conf``/``box[4]``/
+``kpts[K,3]``），轨迹边界用行偏移表达；``np.savez`` 不压缩（ZIP_STORED），读取时每列
+直接 ``np.memmap`` 到文件内偏移，按需换页。列全为 float64/int64，与 JSON 双向转换无损。
+"""
+
+from __future__ import annotations
+
+import struct
+import zipfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Literal, Self
+
+import numpy as np
+import orjson
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from jxl.vdt.types import Track, Tracks, VdtConfig, VdtError
+
+TracksFormat = Literal["json", "jsonl", "npz"]
+"""轨迹文件格式：整体 JSON / 流式 JSONL / 列式 NPZ。"""
+
+_FORMAT_SUFFIXES: dict[str, TracksFormat] = {
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".npz": "npz",
+}
+
+
+class TracksHeader(BaseModel):
+    """JSONL 轨迹文件头：``Tracks`` 除 ``tracks`` 外的全部字段。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    src: str
+    fps: float
+    duration_ms: int
+    config: VdtConfig
+
+
+class JsonlTracksWriter:
+    """追加写 JSONL 轨迹文件（上下文管理器）。
+
+    构造即写文件头；``write`` 每条轨迹一行并 flush（中断时已定稿轨迹不丢）；
+    正常退出写 ``end`` 标记，异常退出不写（读取器据此识别截断文件）。
+    """
+
+    def __init__(self, path: Path, header: TracksHeader) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._f: IO[bytes] = path.open("wb")
+        self._n = 0
+        self._line({"header": header.model_dump(mode="json")})
+
+    def _line(self, record: dict[str, object]) -> None:
+        self._f.write(orjson.dumps(record))
+        self._f.write(b"\n")
+        self._f.flush()
+
+    @property
+    def n_tracks(self) -> int:
+        """已写出的轨迹条数。"""
+        return self._n
+
+    def write(self, track: Track) -> None:
+        """追加一条定稿轨迹。"""
+        self._line({"track": track.model_dump(mode="json")})
+        self._n += 1
+
+    def close(self) -> None:
+        """写完整性标记并关闭文件。"""
+        if not self._f.closed:
+            self._line({"end": {"n_tracks": self._n}})
+            self._f.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._f.close()  # 异常：不写 end 标记，文件保持"截断"状态
+
+
+def iter_tracks_jsonl(path: Path) -> tuple[TracksHeader, Iterator[Track]]:
+    """流式读取：返回文件头与按文件顺序产出轨迹的迭代器（逐行解析，内存有界）。
+
+    迭代耗尽时校验 ``end`` 标记与条数；截断/不符 → ``VdtError``。
+    """
+    f = path.open("rb")
+    try:
+        first = f.readline()
+        if not first:
+            raise VdtError(f"轨迹文件为空: {path}")
+        header = TracksHeader.model_validate(_record(first, "header", path))
+    except (VdtError, ValidationError) as e:
+        f.close()
+        if isinstance(e, ValidationError):
+            raise VdtError(f"轨迹文件头非法 ({path}):\n{e}") from e
+        raise
+
+    def _tracks() -> Iterator[Track]:
+        n = 0
+        with f:
+            for lineno, line in enumerate(f, start=2):
+                if not line.strip():
+                    continue
+                rec = orjson.loads(line)
+                if isinstance(rec, dict) and "end" in rec:
+                    if rec["end"]["n_tracks"] != n:
+                        raise VdtError(
+                            f"轨迹条数不符 ({path}): end 标记 {rec['end']['n_tracks']}，"
+                            f"实际 {n}"
+                        )
+                    return
+                try:
+                    yield Track.model_validate(_record(line, "track", path, lineno))
+                except ValidationError as e:
+                    raise VdtError(f"轨迹行非法 ({path}:{lineno}):\n{e}") from e
+                n += 1
+        raise VdtError(f"轨迹文件截断（缺 end 标记）: {path}")
+
+    return header, _tracks()
+
+
+def _record(line: bytes, tag: str, path: Path, lineno: int = 1) -> object:
+    """解析一行并取出 ``tag`` 键的载荷；标签不符 → ``VdtError``。"""
+    try:
+        rec = orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        raise VdtError(f"非法 JSON 行 ({path}:{lineno}): {e}") from e
+    if not isinstance(rec, dict) or tag not in rec:
+        raise VdtError(f"期望 {tag!r} 记录 ({path}:{lineno})")
+    return rec[tag]
+
+
+def read_tracks_jsonl(path: Path) -> Tracks:
+    """读取完整 JSONL 轨迹文件并按 id 升序还原 ``Tracks``。"""
+    header, tracks = iter_tracks_jsonl(path)
+    return Tracks(
+        src=header.src,
+        fps=header.fps,
+        duration_ms=header.duration_ms,
+        tracks=sorted(tracks, key=lambda t: t.id),
+        config=header.config,
+    )
+
+
+# ---------------------------------------------------------------------------
+# 列式 NPZ
+# ---------------------------------------------------------------------------
+
+_NPZ_VERSION = 1
+"""列式布局版本（写入 ``version`` 列；读取不符即报错，布局变更时递增）。"""
+
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+"""ZIP local file header 定长部分（30 字节；末两字段为文件名长 / extra 长）。"""
+
+
+@dataclass(frozen=True, slots=True)
+class TrackColumns:
+    """``Tracks`` 的列式表示：每个目标观测一行，轨迹 = ``offsets`` 切出的连续行段。
+
+    行按轨迹聚集、轨迹内按帧序；同一轨迹内 ``(frame_idx, ts_ms)`` 相同的连续行还原为同一
+    ``FrameResult``。``kpts[r]`` 为 ``(x, y, conf)``；``has_kpts[r]=False`` 表示该位
+    ``Keypoints`` 为 None（此时 ``kpts[r]`` 全 0）。由 :func:`read_tracks_npz` 读出时各列
+    为 ``np.memmap``（只读）。
+    """
+
+    header: TracksHeader
+    track_id: np.ndarray  # [T] int64
+    track_cls: np.ndarray  # [T] int64
+    track_ended: np.ndarray  # [T] bool
+    offsets: np.ndarray  # [T+1] int64，轨迹 i 的行 = offsets[i]:offsets[i+1]
+    id: np.ndarray  # [R] int64（D2dObject.id）
+    frame_idx: np.ndarray  # [R] int64
+    ts_ms: np.ndarray  # [R] int64
+    cls: np.ndarray  # [R] int64
+    conf: np.ndarray  # [R] float64
+    box: np.ndarray  # [R,4] float64，归一化 (x, y, width, height)
+    kpts: np.ndarray  # [R,K,3] float64
+    has_kpts: np.ndarray  # [R] bool
+
+    def __len__(self) -> int:
+        """行数（目标观测总数）。"""
+        return int(self.id.shape[0])
+
+    @property
+    def n_tracks(self) -> int:
+        """轨迹条数。"""
+        return int(self.track_id.shape[0])
+
+    def rows(self, i: int) -> slice:
+        """第 ``i`` 条轨迹的行区间。"""
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    @classmethod
+    def from_tracks(cls, header: TracksHeader, tracks: Iterable[Track]) -> TrackColumns:
+        """``Track`` 序列 → 列（按给定顺序；流式来源可直接传 JSONL 迭代器）。
+
+        Raises:
+            VdtError: ``FrameResult`` 无目标 / ``objects`` 与 ``kpts`` 不等长 / 关键点数不一
+                （无法用定长列无损表达）。
+        """
+        t_id: list[int] = []
+        t_cls: list[int] = []
+        t_end: list[bool] = []
+        offsets = [0]
+        ints: list[tuple[int, int, int, int]] = []  # (id, frame_idx, ts_ms, cls)
+        floats: list[tuple[float, float, float, float, float]] = []  # (conf, x, y, w, h)
+        kpt_rows: list[list[float] | None] = []
+        n_kpt: int | None = None
+        for tr in tracks:
+            t_id.append(tr.id)
+            t_cls.append(tr.cls)
+            t_end.append(tr.ended)
+            for fr in tr.frames:
+                if not fr.objects or len(fr.objects) != len(fr.kpts):
+                    raise VdtError(
+                        f"轨迹 {tr.id} 帧 {fr.frame_idx}: objects={len(fr.objects)} "
+                        f"kpts={len(fr.kpts)}，列式格式要求 ≥1 且逐位对齐"
+                    )
+                for ob, kp in zip(fr.objects, fr.kpts, strict=True):
+                    r = ob.rect
+                    ints.append((ob.id, fr.frame_idx, fr.ts_ms, ob.cls))
+                    floats.append((ob.conf, r.x, r.y, r.width, r.height))
+                    if kp is None:
+                        kpt_rows.append(None)
+                        continue
+                    if len(kp.pts) != len(kp.conf) or n_kpt not in (None, len(kp.pts)):
+                        raise VdtError(f"轨迹 {tr.id} 帧 {fr.frame_idx}: 关键点数不一致")
+                    n_kpt = len(kp.pts)
+                    kpt_rows.append(
+                        [v for p, c in zip(kp.pts, kp.conf, strict=True) for v in (p.x, p.y, c)]
+                    )
+            offsets.append(len(ints))
+
+        k = n_kpt or 0
+        n = len(ints)
+        int_arr = np.array(ints, dtype=np.int64).reshape(n, 4)
+        float_arr = np.array(floats, dtype=np.float64).reshape(n, 5)
+        kpts = np.zeros((n, k, 3), dtype=np.float64)
+        has_kpts = np.array([kp is not None for kp in kpt_rows], dtype=bool)
+        if has_kpts.any():
+            kpts[has_kpts] = np.array(
+                [kp for kp in kpt_rows if kp is not None], dtype=np.float64
+            ).reshape(-1, k, 3)
+        return cls(
+            header=header,
+            track_id=np.array(t_id, dtype=np.int64),
+            track_cls=np.array(t_cls, dtype=np.int64),
+            track_ended=np.array(t_end, dtype=bool),
+            offsets=np.array(offsets, dtype=np.int64),
+            id=int_arr[:, 0],
+            frame_idx=int_arr[:, 1],
+            ts_ms=int_arr[:, 2],
+            cls=int_arr[:, 3],
+            conf=float_arr[:, 0],
+            box=float_arr[:, 1:],
+            kpts=kpts,
+            has_kpts=has_kpts,
+        )
+
+    def to_tracks(self) -> Tracks:
+        """列 → ``Tracks``（与写入前的 ``Tracks`` 逐字段相等）。
+
+        先拼纯 dict/list 树再单次 ``Tracks.model_validate``（pydantic-core 批量校验，
+        比逐个构造 ``Point``/``D2dObject`` 快数倍）。
+        """
+        ids = self.id.tolist()
+        frame_idx = self.frame_idx.tolist()
+        ts_ms = self.ts_ms.tolist()
+        cls_ = self.cls.tolist()
+        conf = self.conf.tolist()
+        box = self.box.tolist()
+        kpts = self.kpts.tolist()
+        has_kpts = self.has_kpts.tolist()
+
+        tracks: list[dict[str, object]] = []
+        for i in range(self.n_tracks):
+            frames: list[dict[str, object]] = []
+            last_key: tuple[int, int] | None = None
+            objs: list[dict[str, object]] = []
+            kps: list[dict[str, object] | None] = []
+            rows = self.rows(i)
+            for r in range(rows.start, rows.stop):
+                x, y, w, h = box[r]
+                ob = {
+                    "id": ids[r],
+                    "cls": cls_[r],
+                    "conf": conf[r],
+                    "rect": {"x": x, "y": y, "width": w, "height": h},
+                }
+                kp: dict[str, object] | None = None
+                if has_kpts[r]:
+                    kp = {
+                        "pts": [{"x": px, "y": py} for px, py, _ in kpts[r]],
+                        "conf": [c for _, _, c in kpts[r]],
+                    }
+                key = (frame_idx[r], ts_ms[r])
+                if key != last_key:
+                    objs, kps, last_key = [], [], key
+                    frames.append(
+                        {"frame_idx": key[0], "ts_ms": key[1], "objects": objs, "kpts": kps}
+                    )
+                objs.append(ob)
+                kps.append(kp)
+            tracks.append(
+                {
+                    "id": int(self.track_id[i]),
+                    "cls": int(self.track_cls[i]),
+                    "frames": frames,
+                    "ended": bool(self.track_ended[i]),
+                }
+            )
+        return Tracks.model_validate({**self.header.model_dump(), "tracks": tracks})
+
+
+_NPZ_COLUMNS: tuple[str, ...] = (
+    "track_id", "track_cls", "track_ended", "offsets",
+    "id", "frame_idx", "ts_ms", "cls", "conf", "box", "kpts", "has_kpts",
+)  # fmt: skip
+"""NPZ 成员名（= ``TrackColumns`` 数组字段）；另有 ``header``（JSON 字节）与 ``version``。"""
+
+
+def _header_of(tracks: Tracks) -> TracksHeader:
+    return TracksHeader(
+        src=tracks.src, fps=tracks.fps, duration_ms=tracks.duration_ms, config=tracks.config
+    )
+
+
+def write_tracks_npz(tracks: Tracks | TrackColumns, path: Path) -> None:
+    """写列式 NPZ（不压缩，以便读取端 memmap）。"""
+    cols = (
+        tracks
+        if isinstance(tracks, TrackColumns)
+        else TrackColumns.from_tracks(_header_of(tracks), tracks.tracks)
+    )
+    arrays = {name: np.ascontiguousarray(getattr(cols, name)) for name in _NPZ_COLUMNS}
+    arrays["header"] = np.frombuffer(cols.header.model_dump_json().encode(), dtype=np.uint8)
+    arrays["version"] = np.array(_NPZ_VERSION, dtype=np.int64)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:  # 传文件对象：np.savez 不改写后缀
+        np.savez(f, **arrays)  # type: ignore[arg-type]
+
+
+def _npz_members(path: Path, mmap: bool) -> dict[str, np.ndarray]:
+    """读出 NPZ 全部成员；``mmap`` 时未压缩成员直接 memmap 到文件内偏移。"""
+    out: dict[str, np.ndarray] = {}
+    with zipfile.ZipFile(path) as zf, path.open("rb") as f:
+        for info in zf.infolist():
+            name = info.filename.removesuffix(".npy")
+            if not mmap or info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as member:
+                    out[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+            # local header 的 extra 长度可能与中央目录不同（zip64），须读本地头定位数据。
+            f.seek(info.header_offset)
+            fields = _ZIP_LOCAL_HEADER.unpack(f.read(_ZIP_LOCAL_HEADER.size))
+            f.seek(info.header_offset + _ZIP_LOCAL_HEADER.size + fields[-2] + fields[-1])
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            elif version == (2, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            else:
+                raise VdtError(f"不支持的 npy 版本 {version} ({path}:{info.filename})")
+            if dtype.hasobject:
+                raise VdtError(f"NPZ 成员含 object 数组 ({path}:{info.filename})")
+            if int(np.prod(shape)) == 0:
+                out[name] = np.zeros(shape, dtype=dtype)  # mmap 不接受 0 字节
+                continue
+            out[name] = np.memmap(
+                path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                order="F" if fortran else "C",
+            )  # fmt: skip
+    return out
+
+
+def read_tracks_npz(path: Path, *, mmap: bool = True) -> TrackColumns:
+    """读列式 NPZ → :class:`TrackColumns`（默认各列 memmap，只读）。
+
+    Raises:
+        VdtError: 非 NPZ / 缺列 / 版本不符 / 文件头非法。
+    """
+    try:
+        arrs = _npz_members(path, mmap)
+    except (zipfile.BadZipFile, ValueError, OSError) as e:
+        raise VdtError(f"非法 NPZ 轨迹文件 ({path}): {e}") from e
+    missing = [n for n in (*_NPZ_COLUMNS, "header", "version") if n not in arrs]
+    if missing:
+        raise VdtError(f"NPZ 轨迹文件缺列 ({path}): {missing}")
+    if int(arrs["version"]) != _NPZ_VERSION:
+        raise VdtError(f"NPZ 轨迹版本 {int(arrs['version'])} ≠ {_NPZ_VERSION} ({path})")
+    try:
+        header = TracksHeader.model_validate_json(bytes(arrs["header"]))
+    except ValidationError as e:
+        raise VdtError(f"NPZ 轨迹文件头非法 ({path}):\n{e}") from e
+    return TrackColumns(header=header, **{n: arrs[n] for n in _NPZ_COLUMNS})
+
+
+# ---------------------------------------------------------------------------
+# 按格式分派（CLI ``--format`` / ``vdt convert``）
+# ---------------------------------------------------------------------------
+
+
+def infer_tracks_format(path: Path) -> TracksFormat:
+    """按后缀推断轨迹格式（未知后缀 → ``json``，沿用 ``--out-tracks`` 旧行为）。"""
+    return _FORMAT_SUFFIXES.get(path.suffix.lower(), "json")
+
+
+def read_tracks(path: Path, fmt: TracksFormat | None = None) -> Tracks:
+    """读任一格式的轨迹文件为 ``Tracks``（``fmt=None`` 按后缀推断）。"""
+    fmt = fmt or infer_tracks_format(path)
+    if fmt == "jsonl":
+        return read_tracks_jsonl(path)
+    if fmt == "npz":
+        return read_tracks_npz(path).to_tracks()
+    try:
+        return Tracks.model_validate_json(path.read_bytes())
+    except ValidationError as e:
+        raise VdtError(f"轨迹 JSON 非法 ({path}):\n{e}") from e
+
+
+def write_tracks_as(tracks: Tracks, path: Path, fmt: TracksFormat) -> None:
+    """按 ``fmt`` 写出完整 ``Tracks``（JSON 与 ``cli.write_tracks`` 同构）。"""
+    if fmt == "npz":
+        write_tracks_npz(tracks, path)
+    elif fmt == "jsonl":
+        with JsonlTracksWriter(path, _header_of(tracks)) as w:
+            for tr in tracks.tracks:
+                w.write(tr)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(orjson.dumps(tracks.model_dump(mode="json")))
+
+
+# ---------------------------------------------------------------------------
+# 单测（自包含，合成轨迹，零模型）
+# ---------------------------------------------------------------------------
+
+import pytest  # noqa: E402
+
+
+def _synth(n: int) -> tuple[TracksHeader, list[Track]]:
+    from jvi.geo.point2d import Point
+    from jvi.geo.rectangle import Rect
+
+    from jxl.det.d2d import D2dObject
+    from jxl.vdt.types import DecodeCfg, DetCfg, FrameResult, IouCfg
+
+    cfg = VdtConfig(
+        tracker="iou",
+        decode=DecodeCfg(fps=10.0),
+        det=DetCfg(model="x"),
+        tracker_cfg=IouCfg(),
+    )
+    rect = Rect.from_ltrb(Point(x=0.1, y=0.2), Point(x=0.3, y=0.6))
+    tracks = [
+        Track(
+            id=tid,
+            cls=0,
+            frames=[
+                FrameResult(
+                    frame_idx=i,
+                    ts_ms=i * 100,
+                    objects=[D2dObject(id=tid, cls=0, conf=0.5, rect=rect)],
+                    kpts=[None],
+                )
+                for i in range(3)
+            ],
+            ended=tid % 2 == 0,
+        )
+        for tid in range(n, 0, -1)  # 逆序写入：读取器须按 id 排序
+    ]
+    return TracksHeader(src="v.mkv", fps=10.0, duration_ms=300, config=cfg), tracks
+
+
+def test_jsonl_roundtrip_restores_tracks(tmp_path: Path) -> None:
+    header, tracks = _synth(3)
+    out = tmp_path / "t.jsonl"
+    with JsonlTracksWriter(out, header) as w:
+        for t in tracks:
+            w.write(t)
+    assert len(out.read_bytes().splitlines()) == 1 + 3 + 1
+
+    back = read_tracks_jsonl(out)
+    assert [t.id for t in back.tracks] == [1, 2, 3]
+    assert back.src == "v.mkv" and back.duration_ms == 300
+    assert back.tracks == sorted(tracks, key=lambda t: t.id)
+
+
+def test_jsonl_truncated_raises(tmp_path: Path) -> None:
+    """异常退出不写 end 标记 → 读取报截断。"""
+    header, tracks = _synth(2)
+    out = tmp_path / "t.jsonl"
+    with pytest.raises(RuntimeError), JsonlTracksWriter(out, header) as w:
+        w.write(tracks[0])
+        raise RuntimeError("boom")
+    with pytest.raises(VdtError, match="截断"):
+        read_tracks_jsonl(out)
+
+
+def test_jsonl_bad_header_raises(tmp_path: Path) -> None:
+    out = tmp_path / "t.jsonl"
+    out.write_bytes(b'{"track": {}}\n')
+    with pytest.raises(VdtError, match="header"):
+        read_tracks_jsonl(out)
+
+
+def _synth_pose(n: int) -> Tracks:
+    """带关键点（含 None 位）与多目标帧的轨迹，覆盖列式格式的全部分支。"""
+    from jvi.geo.point2d import Point
+
+    from jxl.vdt.types import Keypoints
+
+    header, tracks = _synth(n)
+    rng = np.random.default_rng(0)
+    for tr in tracks:
+        for j, fr in enumerate(tr.frames):
+            fr.kpts = [
+                None
+                if j == 1
+                else Keypoints(
+                    pts=[Point(x=float(x), y=float(y)) for x, y in rng.random((17, 2))],
+                    conf=rng.random(17).tolist(),
+                )
+            ]
+    tracks[0].frames[0].objects.append(tracks[0].frames[0].objects[0].model_copy())
+    tracks[0].frames[0].kpts.append(None)
+    return Tracks(
+        src=header.src,
+        fps=header.fps,
+        duration_ms=header.duration_ms,
+        tracks=sorted(tracks, key=lambda t: t.id),  # 同 run_pipeline 产物
+        config=header.config,
+    )
+
+
+def test_npz_roundtrip_lossless(tmp_path: Path) -> None:
+    tracks = _synth_pose(3)
+    out = tmp_path / "t.npz"
+    write_tracks_npz(tracks, out)
+    cols = read_tracks_npz(out)
+    assert isinstance(cols.kpts, np.memmap) and not cols.kpts.flags.writeable
+    assert cols.n_tracks == 3 and len(cols) == 3 * 3 + 1
+    assert cols.kpts.shape == (10, 17, 3)
+    assert cols.to_tracks() == tracks
+    # JSON 往返同样无损（JSON → NPZ → JSON 字节一致）
+    js = tmp_path / "t.json"
+    write_tracks_as(read_tracks(out), js, "json")
+    assert read_tracks(js) == tracks
+    assert js.read_bytes() == orjson.dumps(tracks.model_dump(mode="json"))
+
+
+def test_npz_no_pose_and_empty(tmp_path: Path) -> None:
+    header, tracks = _synth(2)
+    for trs in (tracks, []):
+        t = Tracks(src="v", fps=10.0, duration_ms=0, tracks=trs, config=header.config)
+        out = tmp_path / f"t{len(trs)}.npz"
+        write_tracks_npz(t, out)
+        cols = read_tracks_npz(out)
+        assert cols.kpts.shape[1:] == (0, 3)
+        back = cols.to_tracks()
+        assert back.tracks == t.tracks and back.src == "v"
+
+
+def test_npz_eager_matches_mmap(tmp_path: Path) -> None:
+    tracks = _synth_pose(2)
+    out = tmp_path / "t.npz"
+    write_tracks_npz(tracks, out)
+    eager = read_tracks_npz(out, mmap=False)
+    assert not isinstance(eager.box, np.memmap)
+    assert eager.to_tracks() == read_tracks_npz(out).to_tracks()
+
+
+def test_npz_rejects_empty_frame_and_bad_file(tmp_path: Path) -> None:
+    header, tracks = _synth(1)
+    tracks[0].frames[0].objects = []
+    tracks[0].frames[0].kpts = []
+    with pytest.raises(VdtError, match="列式"):
+        TrackColumns.from_tracks(header, tracks)
+    bad = tmp_path / "bad.npz"
+    bad.write_bytes(b"not a zip")
+    with pytest.raises(VdtError, match="NPZ"):
+        read_tracks_npz(bad)
+
+
+def test_read_tracks_dispatch_by_suffix(tmp_path: Path) -> None:
+    tracks = _synth_pose(2)
+    for name in ("a.json", "a.jsonl", "a.npz"):
+        path = tmp_path / name
+        write_tracks_as(tracks, path, infer_tracks_format(path))
+        assert read_tracks(path) == tracks
+    assert infer_tracks_format(Path("x.out")) == "json"
@@ -22,6 +22,7 @@ from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from jvi.geo.point2d import Point
 from jxl.det.d2d import D2dObject
+from jxl.onnx.session import OrtCfg  # reid / pose 配置字段类型, 经本模块再导出
 
 # ---------------------------------------------------------------------------
 # 异常（具体化，No Silent Degradation / fail-fast；禁止裸 Exception）
@@ -59,6 +60,19 @@ class DecodeCfg(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     fps: float = Field(gt=0, description="采样帧率 (>0)。iou 可设源 fps，reid 低帧率如 0.5")
+    seek: Literal["auto", "never", "always"] = Field(
+        default="auto",
+        description="稀疏采样策略：auto=采样间隔大于关键帧间隔时 seek；never=顺序解码；always=逐点 seek",
+    )
+    max_side: int | None = Field(
+        default=None, gt=0, description="解码期等比缩小到长边 ≤ 此值（None=原尺寸；坐标归一化不受影响）"
+    )
+    prefetch: int = Field(ge=0, default=0, description="后台解码线程队列深度（帧；0=不启用）")
+    backend: Literal["opencv", "ffmpeg", "pyav"] = Field(
+        default="opencv",
+        description="解码后端：opencv=cv2.VideoCapture；ffmpeg=子进程裸流管道；pyav=PyAV 多线程",
+    )
+    threads: int = Field(ge=0, default=0, description="ffmpeg/pyav 解码线程数（0=自动）")
 
 
 class DetCfg(BaseModel):
@@ -74,6 +88,9 @@ class DetCfg(BaseModel):
     )
     device: str = ""
     input_shape: tuple[int, int] = (640, 640)
+    batch: int = Field(
+        ge=1, default=1, description="检测微批帧数（>1 时累积 N 帧单次 forward）"
+    )
 
 
 class IouCfg(BaseModel):
@@ -84,6 +101,24 @@ class IouCfg(BaseModel):
     iou_thr: float = Field(ge=0.0, le=1.0, default=0.5, description="认定同轨迹的 IoU 阈值")
     max_age: int = Field(ge=0, default=30, description="轨迹失联后保留帧数上限")
     min_hits: int = Field(ge=0, default=3, description="轨迹确认前最小命中数")
+    assign: Literal["greedy", "hungarian"] = Field(
+        default="greedy",
+        description="det↔track 指派：greedy=IoU 降序贪心；hungarian=lap 最优指派",
+    )
+    motion: Literal["none", "kalman"] = Field(
+        default="none",
+        description="运动模型：none=用上次命中框关联；kalman=匀速卡尔曼预测框关联",
+    )
+    two_stage: bool = Field(
+        default=False,
+        description="ByteTrack 两阶段关联：高分检测先配，低分检测再配剩余轨迹（不开新轨迹）",
+    )
+    high_conf: float = Field(
+        ge=0.0, le=1.0, default=0.5, description="two_stage 高分检测阈值（低分下限 = DetCfg.conf）"
+    )
+    low_iou_thr: float = Field(
+        ge=0.0, le=1.0, default=0.5, description="two_stage 低分检测二次关联的 IoU 阈值"
+    )
 
 
 class ReidCfg(BaseModel):
@@ -98,6 +133,8 @@ class ReidCfg(BaseModel):
         ge=0.0, le=1.0, default=0.2, description="嵌入 EMA 融合系数 new=ema*new+(1-ema)*old"
     )
     ttl_sec: int = Field(gt=0, default=600, description="gallery 轨迹保留时长（秒）")
+    batch: int = Field(gt=0, default=32, description="嵌入单次 forward 最大 crop 数（分块上限）")
+    ort: OrtCfg = Field(default_factory=OrtCfg, description="onnxruntime 会话配置")
 
 
 class PoseCfg(BaseModel):
@@ -109,7 +146,55 @@ class PoseCfg(BaseModel):
     model: str = Field(description="RTMPose ONNX 路径（缺失即 fail-fast）")
     kpt_shape: tuple[int, int] = (17, 3)
     keyframe_every: int = Field(gt=0, default=5, description="周期关键帧间隔")
+    keyframe_max: int = Field(
+        ge=0,
+        default=0,
+        description="自适应关键帧间隔上限：框几乎不动时间隔拉长到此值（0=关闭，恒 keyframe_every）",
+    )
+    motion_thr: float = Field(
+        gt=0.0,
+        default=0.2,
+        description="自适应关键帧的框运动尺度（相对框尺寸）；运动达此值间隔回落到 keyframe_every",
+    )
+    reuse: Literal["copy", "warp"] = Field(
+        default="copy",
+        description="门控跳过帧的关键点复用：copy=原样复用；warp=按框平移/缩放变换上次结果",
+    )
     min_hits: int = Field(gt=0, default=3, description="确认后才开始 pose 的最小命中数")
+    max_per_frame: int = Field(
+        ge=0, default=0, description="每帧 pose crop 数上限（超出按优先级顺延到后续帧；0=不限）"
+    )
+    max_ms: float = Field(
+        ge=0.0,
+        default=0.0,
+        description="每帧 pose forward 耗时预算（毫秒，按实测每 crop 耗时折算 crop 数；0=不限）",
+    )
+    ort: OrtCfg = Field(default_factory=OrtCfg, description="onnxruntime 会话配置")
+
+    @model_validator(mode="after")
+    def _keyframe_max_covers_every(self) -> PoseCfg:
+        """``keyframe_max`` 非 0 时不得小于 ``keyframe_every``（加载即 fail-fast）。"""
+        if self.keyframe_max and self.keyframe_max < self.keyframe_every:
+            raise ValueError(
+                f"keyframe_max ({self.keyframe_max}) 须为 0 或 >= keyframe_every "
+                f"({self.keyframe_every})"
+            )
+        return self
+
+
+class ExecCfg(BaseModel):
+    """执行模式配置（串行 | 多阶段线程流水线）。
+
+    ``threaded``：decode / detect 各占一后台线程，track+pose 留在调用方（消费）线程，
+    阶段间以有界队列衔接（满则上游阻塞——背压，内存上限 ≈ ``queue_size`` 帧/队列）。
+    各阶段仍按帧序处理，轨迹 / 关键点结果与 ``serial`` 一致；``Tracks.config`` 快照
+    记录了 ``exec.mode``，故 tracks.json 文件本身不同。
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    mode: Literal["serial", "threaded"] = "serial"
+    queue_size: int = Field(gt=0, default=8, description="阶段间有界队列容量（帧）")
 
 
 class VdtConfig(BaseModel):
@@ -122,6 +207,7 @@ class VdtConfig(BaseModel):
     det: DetCfg
     tracker_cfg: IouCfg | ReidCfg
     pose: PoseCfg | None = None
+    exec: ExecCfg = Field(default_factory=ExecCfg)
 
     @model_validator(mode="after")
     def _tracker_cfg_matches_mode(self) -> VdtConfig:
@@ -202,11 +288,18 @@ class Decoder(Protocol):
 
 
 class Detector(Protocol):
-    """检测器：单帧 → 无 id 目标列表（id=0 哨兵，由 Tracker 填）。"""
+    """检测器：单帧 / 多帧微批 → 无 id 目标列表（id=0 哨兵，由 Tracker 填）。"""
 
     def detect(self, image: np.ndarray) -> list[D2dObject]:
         """对一帧 BGR 图像执行检测，返回 ``id=0`` 的 ``D2dObject`` 列表。"""
 
+    def detect_batch(self, images: list[np.ndarray]) -> list[list[D2dObject]]:
+        """对多帧 BGR 图像单次 forward 检测，返回与 ``images`` 逐位置对齐的结果。
+
+        语义与逐帧 ``detect`` 等价（仅摊薄调用开销）；``DetCfg.batch > 1`` 时由
+        管线调用。
+        """
+
 
 class Tracker(Protocol):
     """跟踪器：吃检测框 + 当前帧（ReID 用帧提嵌入，IoU 忽略帧）→ 填 track_id。
@@ -245,3 +338,28 @@ class PoseStep(Protocol):
 
     def reset(self) -> None:
         """视频边界清状态（门控状态/帧序/复用缓存；批处理多视频防泄漏）。"""
+
+
+class FrameSink(Protocol):
+    """逐帧旁路消费者：管线每产出一帧 ``FrameResult`` 即连同原图回调一次。
+
+    供同一趟解码里顺带产出副产物（如演示视频，见 :class:`jxl.vdt.render.RenderSink`）。
+    回调在 track+pose 线程按帧序调用；实现不得修改 ``image``（与管线共享）。
+    """
+
+    def __call__(self, image: np.ndarray, fr: FrameResult) -> None:
+        """接收一帧 BGR 原图与其 ``FrameResult``（含 ``id=0`` 哨兵目标）。"""
+
+
+class StageTimer(Protocol):
+    """阶段计时钩子：管线各阶段上报单次耗时与计数（``vdt run --profile``）。
+
+    decode / detect 可能在阶段线程调用（``ExecCfg.mode="threaded"``），实现须线程安全。
+    实现见 :class:`jxl.vdt.profile.StageProfiler`。
+    """
+
+    def add(self, stage: str, sec: float) -> None:
+        """记录 ``stage`` 的一次耗时（秒）。"""
+
+    def count(self, name: str, n: int = 1) -> None:
+        """累加计数器 ``name``（检测数、嵌入数、门控跳过的 pose 数……）。"""